@@ -8,6 +8,7 @@ from cromshell.utilities.submissions_file_utils import update_submission_db_form
 
 from .abort import command as abort
 from .alias import command as alias
+from .cleanup import command as cleanup
 from .cost import command as cost
 from .counts import command as counts
 from .list import command as list
@@ -17,6 +18,7 @@ from .metadata import command as metadata
 from .slim_metadata import command as slim_metadata
 from .status import command as status
 from .submit import command as submit
+from .submit_batch import command as submit_batch
 from .timing import command as timing
 from .update_server import command as update_server
 from .validate import command as validate
@@ -75,6 +77,25 @@ LOGGER = logging.getLogger(__name__)
     help="Specify the server connection timeout in seconds."
     "Must be an integer. Default is 5.",
 )
+@click.option(
+    "--requests_read_timeout",
+    type=int,
+    help="Specify how long to wait for the server to send data in seconds, "
+    "including metadata requests. Default is 60, 300 for metadata.",
+)
+@click.option(
+    "--requests_max_retries",
+    type=int,
+    help="Specify how many times a request failing with a connection error, "
+    "a timeout or a 429/502/503/504 response is retried. Default is 3.",
+)
+@click.option(
+    "--http_engine",
+    type=click.Choice(cromshellconfig.HTTP_ENGINES),
+    help="Engine sending many requests at once, e.g. to update the status of "
+    "workflows or fetch subworkflow metadata: a pool of threads (default), or "
+    "asyncio, which requires httpx or aiohttp and scales to more requests.",
+)
 @click.option(
     "--requests_skip_certs",
     flag_value=True,
@@ -106,6 +127,15 @@ LOGGER = logging.getLogger(__name__)
     flag_value=True,
     help="Uses color and other human readable formatting for output when possible.",
 )
+@click.option(
+    "--lazy_subworkflows",
+    "lazy_subworkflows",
+    flag_value=True,
+    help="Fetch the metadata of the workflow without its subworkflows, then the "
+    "metadata of each subworkflow concurrently, instead of asking the server to "
+    "expand them. Avoids server timeouts and metadata size limits on large "
+    "workflows.",
+)
 @click.pass_context
 def main_entry(
     cromshell_config,
@@ -113,11 +143,15 @@ def main_entry(
     no_turtle,
     cromwell_url,
     requests_timeout,
+    requests_read_timeout,
+    requests_max_retries,
+    http_engine,
     requests_skip_certs,
     gcloud_token_email,
     referer_header_url,
     machine_processable,
     colorful_output,
+    lazy_subworkflows,
 ):
     """
     Cromshell is a script for submitting workflows to a
@@ -145,11 +179,16 @@ def main_entry(
     cromshellconfig.resolve_cromwell_config_server_address(server_user=cromwell_url)
     cromshellconfig.override_requests_cert_parameters(skip_certs=requests_skip_certs)
     cromshellconfig.resolve_requests_connect_timeout(timeout_cli=requests_timeout)
+    cromshellconfig.resolve_requests_read_timeout(timeout_cli=requests_read_timeout)
+    cromshellconfig.resolve_requests_retries(max_retries_cli=requests_max_retries)
+    cromshellconfig.resolve_request_rate_limits()
+    cromshellconfig.resolve_http_engine(engine_cli=http_engine)
     cromshellconfig.resolve_gcloud_token_email(email=gcloud_token_email)
     cromshellconfig.resolve_referer_header_url(url=referer_header_url)
     cromshellconfig.resolve_color_output(
         machine_readable=machine_processable, colorful_output=colorful_output
     )
+    cromshellconfig.resolve_lazy_subworkflows(lazy_cli=lazy_subworkflows)
 
 
 @main_entry.command()
@@ -167,6 +206,7 @@ def print_version():
 # Update with new sub-commands here. Keep in alphabetical order:
 main_entry.add_command(abort.main)
 main_entry.add_command(alias.main)
+main_entry.add_command(cleanup.main)
 main_entry.add_command(cost.main)
 main_entry.add_command(counts.main)
 main_entry.add_command(list.main)
@@ -176,6 +216,7 @@ main_entry.add_command(metadata.main)
 main_entry.add_command(slim_metadata.main)
 main_entry.add_command(status.main)
 main_entry.add_command(submit.main)
+main_entry.add_command(submit_batch.main)
 main_entry.add_command(timing.main)
 main_entry.add_command(update_server.main)
 main_entry.add_command(validate.main)
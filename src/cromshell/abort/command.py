@@ -1,7 +1,6 @@
 import logging
 
 import click
-import requests
 
 from cromshell.utilities import command_setup_utils, http_utils, io_utils
 
@@ -23,17 +22,28 @@ def main(config, workflow_ids):
 
     return_code = 0
 
+    abort_urls = []
     for wdl_id in workflow_ids:
         command_setup_utils.resolve_workflow_id_and_server(
             workflow_id=wdl_id, cromshell_config=config
         )
-
-        requests_out = requests.post(
-            f"{config.cromwell_api_workflow_id}/abort",
-            headers=http_utils.generate_headers(config),
-        )
-
-        if requests_out.ok:
+        abort_urls.append(f"{config.cromwell_api_workflow_id}/abort")
+
+    # Abort all the workflows at once, a failure doesn't stop the other aborts
+    responses = http_utils.send_requests(
+        "POST",
+        abort_urls,
+        verify=config.requests_verify_certs,
+        headers=http_utils.generate_headers(config),
+        return_exceptions=True,
+    )
+
+    for abort_url, requests_out in zip(abort_urls, responses):
+        if isinstance(requests_out, Exception):
+            return_code = 1
+            LOGGER.error("Failed to abort workflow: %s", abort_url)
+            LOGGER.error("Reason: %s", requests_out)
+        elif requests_out.ok:
             io_utils.pretty_print_json(format_json=requests_out.json())
         else:
             return_code = 1
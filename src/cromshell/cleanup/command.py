@@ -0,0 +1,261 @@
+import logging
+from typing import Dict, List, Set
+
+import click
+
+import cromshell.utilities.workflow_status_utils as workflow_status_utils
+from cromshell.list_outputs import command as list_outputs_command
+from cromshell.metadata import command as metadata_command
+from cromshell.utilities import command_setup_utils, http_utils, storage_utils
+from cromshell.utilities.storage_utils import FileStat
+
+LOGGER = logging.getLogger(__name__)
+
+# Statuses of workflows whose files are no longer used, any other status
+# (including unknown ones) is refused as files can't be recovered once deleted
+CLEANUP_STATUSES = [
+    workflow_status_utils.WorkflowStatuses.SUCCEEDED.value[0],
+    workflow_status_utils.WorkflowStatuses.FAILED.value[0],
+    workflow_status_utils.WorkflowStatuses.ABORTED.value[0],
+]
+
+
+class CleanupError(Exception):
+    """Raised when the intermediate files of a workflow can't be safely determined"""
+
+
+@click.command(name="cleanup")
+@click.argument("workflow_ids", required=True, nargs=-1)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Only report the intermediate files that would be deleted and their "
+    "total size.",
+)
+@click.option(
+    "-l",
+    "--list-files",
+    is_flag=True,
+    default=False,
+    help="Print the path of every intermediate file.",
+)
+@click.option(
+    "-y",
+    "--yes",
+    is_flag=True,
+    default=False,
+    help="Delete the files without asking for confirmation.",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="Number of files removed per bulk delete request.",
+)
+@click.pass_obj
+def main(
+    config,
+    workflow_ids: tuple,
+    dry_run: bool,
+    list_files: bool,
+    yes: bool,
+    batch_size: int,
+):
+    """
+    Delete the intermediate files of finished workflows.
+
+    Every file under the workflow's execution root that is not a final
+    workflow output is deleted. Workflows must have succeeded, failed or been
+    aborted.
+
+    WORKFLOW_ID can be one or more workflow ids separated by a space.
+    (e.g. cleanup [workflow_id1] [[workflow_id2]...])
+    """
+
+    LOGGER.info("cleanup")
+
+    total_files = 0
+    total_bytes = 0
+
+    for workflow_id in workflow_ids:
+        resolved_workflow_id = command_setup_utils.resolve_workflow_id_and_server(
+            workflow_id=workflow_id, cromshell_config=config
+        )
+
+        workflow_metadata = metadata_command.format_metadata_params_and_get_metadata(
+            config=config,
+            exclude_keys=False,
+            metadata_param=[
+                "id",
+                "status",
+                "workflowRoot",
+                "callRoot",
+                "subWorkflowMetadata",
+                "subWorkflowId",
+            ],
+        )
+
+        check_workflow_can_be_cleaned_up(
+            workflow_id=resolved_workflow_id,
+            workflow_status=workflow_metadata.get("status"),
+        )
+
+        intermediate_files = get_intermediate_files(
+            workflow_id=resolved_workflow_id,
+            execution_roots=get_execution_roots(workflow_metadata),
+            final_outputs=get_final_output_files(config),
+        )
+        workflow_bytes = sum(f.size or 0 for f in intermediate_files.values())
+        total_files += len(intermediate_files)
+        total_bytes += workflow_bytes
+
+        if list_files:
+            for path in intermediate_files:
+                print(path)
+
+        print(
+            f"{resolved_workflow_id}: {len(intermediate_files)} intermediate files, "
+            f"{workflow_bytes} bytes ({storage_utils.format_bytes(workflow_bytes)})"
+        )
+
+        if dry_run or not intermediate_files:
+            continue
+
+        if not yes and not click.confirm(
+            f"Delete {len(intermediate_files)} files of workflow "
+            f"{resolved_workflow_id}?"
+        ):
+            LOGGER.info("Skipping deletion for %s", resolved_workflow_id)
+            continue
+
+        deleted_files = storage_utils.delete_files(
+            paths=list(intermediate_files), batch_size=batch_size
+        )
+        print(f"{resolved_workflow_id}: deleted {deleted_files} files")
+
+    if len(workflow_ids) > 1:
+        print(
+            f"Total: {total_files} intermediate files, {total_bytes} bytes "
+            f"({storage_utils.format_bytes(total_bytes)})"
+        )
+
+    return 0
+
+
+def check_workflow_can_be_cleaned_up(workflow_id: str, workflow_status: str) -> None:
+    """Check that a workflow finished, so none of its files are still in use.
+
+    :param workflow_id: Hexadecimal identifier of the workflow
+    :param workflow_status: Status of the workflow
+    :return: None
+    """
+
+    if workflow_status not in CLEANUP_STATUSES:
+        LOGGER.error(
+            "Workflow %s has status %s, only workflows with status %s can be "
+            "cleaned up.",
+            workflow_id,
+            workflow_status,
+            ", ".join(CLEANUP_STATUSES),
+        )
+        raise CleanupError(
+            f"Workflow {workflow_id} has status {workflow_status}, only workflows "
+            f"with status {', '.join(CLEANUP_STATUSES)} can be cleaned up."
+        )
+
+
+def get_execution_roots(workflow_metadata: dict) -> List[str]:
+    """Get the execution root directories of a workflow.
+
+    The 'workflowRoot' holds all call and subworkflow directories, if it is
+    missing the call roots of the (sub)workflow calls are used instead.
+
+    :param workflow_metadata: Metadata with the workflowRoot and callRoot keys
+    :return: List of directories
+    """
+
+    if workflow_metadata.get("workflowRoot"):
+        return [workflow_metadata["workflowRoot"]]
+
+    call_roots = []
+    for shards in workflow_metadata.get("calls", {}).values():
+        for shard in shards:
+            if "subWorkflowMetadata" in shard:
+                call_roots.extend(get_execution_roots(shard["subWorkflowMetadata"]))
+            elif shard.get("callRoot"):
+                call_roots.append(shard["callRoot"])
+
+    return call_roots
+
+
+def get_final_output_files(config) -> Set[str]:
+    """Get the file paths of the workflow level outputs, which are kept.
+
+    Failed and aborted workflows usually have no outputs, all their files are
+    then intermediate.
+
+    :param config: The cromshell config object
+    :return: Set of output file paths
+    """
+
+    requests_out = http_utils.send_request(
+        "GET",
+        f"{config.cromwell_api_workflow_id}/outputs",
+        timeout=config.requests_connect_timeout,
+        verify=config.requests_verify_certs,
+        headers=http_utils.generate_headers(config),
+    )
+
+    # Without the outputs every file would be considered intermediate
+    if not requests_out.ok or "outputs" not in requests_out.json():
+        http_utils.check_http_request_status_code(
+            short_error_message="Failed to retrieve outputs for "
+            f"workflow: {config.workflow_id}",
+            response=requests_out,
+            raise_exception=False,
+        )
+        raise CleanupError(
+            f"Unable to retrieve the outputs of workflow {config.workflow_id}, "
+            "refusing to delete any of its files."
+        )
+
+    return set(
+        list_outputs_command.get_file_like_values(requests_out.json()["outputs"])
+    )
+
+
+def get_intermediate_files(
+    workflow_id: str, execution_roots: List[str], final_outputs: Set[str]
+) -> Dict[str, FileStat]:
+    """List the files under the execution roots that are not final outputs.
+
+    :param workflow_id: Hexadecimal identifier of the workflow
+    :param execution_roots: Directories holding the workflow's execution files
+    :param final_outputs: Paths of files to keep
+    :return: Dictionary of intermediate file path to FileStat
+    """
+
+    if not execution_roots:
+        raise CleanupError(
+            f"No execution root was found in the metadata of workflow {workflow_id}."
+        )
+
+    intermediate_files = {}
+    for root in dict.fromkeys(execution_roots):
+        # Cromwell execution roots (including those of subworkflows) always
+        # contain the top level workflow id, this guards against deleting a
+        # bucket or directory outside the workflow.
+        if workflow_id not in root:
+            raise CleanupError(
+                f"Execution root {root} does not belong to workflow {workflow_id}."
+            )
+
+        LOGGER.info("Listing files under %s", root)
+        for path, file_stat in storage_utils.find_files(root).items():
+            if path not in final_outputs:
+                intermediate_files[path] = file_stat
+
+    return intermediate_files
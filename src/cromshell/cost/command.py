@@ -1,6 +1,9 @@
 import logging
 import statistics
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
 
 import click
 from google.cloud import bigquery
@@ -9,16 +12,32 @@ from tabulate import tabulate
 import cromshell.metadata.command as metadata
 import cromshell.utilities.command_setup_utils as command_setup_utils
 import cromshell.utilities.config_options_file_utils as cofu
+import cromshell.utilities.submissions_file_utils as sfu
 import cromshell.utilities.workflow_id_utils as workflow_id_utils
 import cromshell.utilities.workflow_status_utils as workflow_status_utils
 from cromshell import log
-from cromshell.utilities import io_utils
+from cromshell.utilities import (
+    cost_aggregation_utils,
+    cost_cache_utils,
+    cost_estimate_utils,
+    http_utils,
+    io_utils,
+    storage_utils,
+)
 
 LOGGER = logging.getLogger(__name__)
 
+MAX_METADATA_REQUESTS = 10
+# Metadata keys needed to query the cost of a workflow
+COST_METADATA_KEYS = ["start", "status", "id", "end", "workflowProcessingEvents"]
+# Value prefix of the 'cromwell-workflow-id' label Cromwell adds to cloud resources
+WORKFLOW_ID_LABEL_PREFIX = "cromwell-"
+
+_bigquery_client = None
+
 
 @click.command(name="cost")
-@click.argument("workflow_ids", required=True, nargs=-1)
+@click.argument("workflow_ids", required=False, nargs=-1)
 @click.option(
     "-c",
     "--color",
@@ -33,8 +52,74 @@ LOGGER = logging.getLogger(__name__)
     default=False,
     help="Get the cost for a workflow at the task level",
 )
+@click.option(
+    "--refresh",
+    is_flag=True,
+    default=False,
+    help="Query the cost of workflows even if it was cached.",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Report the bytes the BigQuery query would process without running it.",
+)
+@click.option(
+    "-a",
+    "--aggregate",
+    is_flag=True,
+    default=False,
+    help="Aggregate the task level cost of all the workflows, with the total, "
+    "quantiles and number of outlier workflows of each task. Workflows whose cost "
+    "isn't available yet are skipped.",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Include the workflows of the submission database submitted since this "
+    "date (YYYY-MM-DD).",
+)
+@click.option(
+    "--until",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Include the workflows of the submission database submitted until this "
+    "date (YYYY-MM-DD).",
+)
+@click.option(
+    "--wdl-name",
+    help="Include the workflows of the submission database running this WDL, "
+    "may be a pattern (e.g. 'Joint*.wdl').",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the aggregated costs to this CSV file, or Parquet file if it "
+    "ends with '.parquet' (requires pyarrow).",
+)
+@click.option(
+    "-e",
+    "--estimate",
+    is_flag=True,
+    default=False,
+    help="Estimate the cost from the workflow metadata and a price table instead "
+    "of querying BigQuery, works for running workflows.",
+)
 @click.pass_obj
-def main(config, workflow_ids: str or int, detailed: bool, color: bool):
+def main(
+    config,
+    workflow_ids: str or int,
+    detailed: bool,
+    color: bool,
+    refresh: bool,
+    dry_run: bool,
+    aggregate: bool,
+    since: datetime,
+    until: datetime,
+    wdl_name: str,
+    output: str,
+    estimate: bool,
+):
     """
     Get the cost for a workflow.
     Only works for workflows that completed more than 24 hours ago on GCS.
@@ -44,70 +129,115 @@ def main(config, workflow_ids: str or int, detailed: bool, color: bool):
     Costs here DO NOT include any call cached tasks.
     Costs rounded to the nearest cent (approximately).
 
+    The cost of workflows that finished more than 'cost_settle_days' (config
+    file key, default 3) ago is cached, use --refresh to query it again.
+
+    Workflows are given by id or alias, and/or selected from the submission
+    database with --since, --until and --wdl-name.
+
+    With --estimate the cost is instead estimated from the runtime attributes
+    and run time of the calls in the workflow metadata, using the prices of the
+    JSON file set with the 'cost_price_table' config file key or default
+    us-central1 prices. No BigQuery table is needed and workflows can still be
+    running.
+
     """
 
     LOGGER.info("cost")
-    for workflow_id in workflow_ids:
-        resolved_workflow_id = command_setup_utils.resolve_workflow_id_and_server(
-            workflow_id=workflow_id,
-            cromshell_config=config,
-        )
 
-        workflow_id_utils.check_workflow_id_in_submission_file(
-            workflow_id=resolved_workflow_id,
-            submission_file=config.submission_file_path,
+    if output and not aggregate:
+        raise click.UsageError("--output can only be used with --aggregate.")
+    if estimate and (dry_run or refresh):
+        raise click.UsageError(
+            "--dry-run and --refresh can't be used with --estimate, which doesn't "
+            "query BigQuery."
         )
 
-        cofu.check_key_is_configured(
-            key_to_check="bq_cost_table",
-            config_options=config.cromshell_config_options,
-            config_file_path=config.cromshell_config_path,
+    workflow_ids = list(workflow_ids)
+    selected_workflow_ids = []
+    if since or until or wdl_name:
+        selected_workflow_ids = sfu.filter_submission_file(
+            submission_file_path=config.submission_file_path,
+            since=since.date() if since else None,
+            until=until.date() if until else None,
+            wdl_name=wdl_name,
         )
         LOGGER.info(
-            "Using cost table: %s", config.cromshell_config_options["bq_cost_table"]
+            "Selected %d workflows from the submission database",
+            len(selected_workflow_ids),
         )
-
-        # Get time workflow finished using metadata command (error if not finished)
-        LOGGER.info("Retrieving workflow metadata")
-        workflow_metadata = metadata.format_metadata_params_and_get_metadata(
-            config=config,
-            exclude_keys=False,
-            metadata_param=["start", "status", "id", "end", "workflowProcessingEvents"],
+        workflow_ids += selected_workflow_ids
+    if not workflow_ids:
+        raise click.UsageError(
+            "No workflows to get the cost of, give workflow ids or aliases, or "
+            "filters matching workflows of the submission database."
         )
-
-        workflow_status_utils.confirm_workflow_in_terminal_status(
-            workflow_status=workflow_metadata.get("status")
+    # The cost per task is needed to aggregate
+    detailed = detailed or aggregate
+
+    # Resolve every workflow first, the server of each workflow is set in the
+    # config so the metadata requests are prepared here and sent concurrently.
+    metadata_requests = {}
+    # Workflows selected from the submission database are known to be in it, the
+    # other ones are looked up in it
+    submitted_workflow_ids = set(selected_workflow_ids)
+    for workflow_id in workflow_ids:
+        resolved_workflow_id = command_setup_utils.resolve_workflow_id_and_server(
+            workflow_id=workflow_id,
+            cromshell_config=config,
         )
 
-        start_time, end_time = get_submission_start_end_time(workflow_metadata)
+        if resolved_workflow_id not in submitted_workflow_ids:
+            workflow_id_utils.check_workflow_id_in_submission_file(
+                workflow_id=resolved_workflow_id,
+                submission_file=config.submission_file_path,
+            )
 
-        LOGGER.info("Checking workflow completed and finished past 24hrs")
-        checks_before_query(
-            start_time=start_time, end_time=end_time, workflow_id=resolved_workflow_id
+        metadata_requests[resolved_workflow_id] = dict(
+            api_workflow_id=config.cromwell_api_workflow_id,
+            timeout=config.requests_connect_timeout,
+            verify_certs=config.requests_verify_certs,
+            headers=http_utils.generate_headers(config),
         )
 
-        LOGGER.info("Querying BQ")
-        # Create start and end time for query, plus/minus a day from start and finish
-        query_start_time = str(
-            datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S.%f%z") - timedelta(days=1)
-        )
-        query_end_time = str(
-            datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S.%f%z") + timedelta(days=1)
+    if estimate:
+        workflows_query_rows = estimate_workflows_cost(
+            config=config, metadata_requests=metadata_requests
         )
-
-        query_results = query_bigquery(
-            workflow_id=resolved_workflow_id,
-            bq_cost_table=config.cromshell_config_options["bq_cost_table"],
-            start_date=query_start_time,
-            end_date=query_end_time,
+    else:
+        workflows_query_rows = get_workflows_bq_cost(
+            config=config,
+            metadata_requests=metadata_requests,
             detailed=detailed,
+            refresh=refresh,
+            dry_run=dry_run,
+            # One workflow whose cost isn't available doesn't stop an aggregate
+            skip_unavailable=aggregate,
         )
-
-        LOGGER.info("Formatting Query Results")
-        TASK_HEADER: str = "TASK"
-        COST_HEADER: str = "$ COST"
+        if workflows_query_rows is None:
+            return 0
+
+    if aggregate:
+        if estimate:
+            print("Costs estimated from the workflow metadata, not billed costs.\n")
+        print_aggregated_costs(workflows_query_rows=workflows_query_rows, output=output)
+        skipped_workflows = len(metadata_requests) - len(workflows_query_rows)
+        if skipped_workflows:
+            print(
+                f"Skipped {skipped_workflows} workflows whose cost isn't available, "
+                "see the warnings above."
+            )
+        return 0
+
+    LOGGER.info("Formatting Query Results")
+    TASK_HEADER: str = "TASK"
+    COST_HEADER: str = "$ COST"
+    log.display_logo(io_utils.turtle)
+    if estimate:
+        print("Costs estimated from the workflow metadata, not billed costs.\n")
+    for resolved_workflow_id, query_rows in workflows_query_rows.items():
         formatted_query_rows: list = format_bq_query_results(
-            query_results=query_results,
+            query_results=query_rows,
             cost_header=COST_HEADER,
             task_header=TASK_HEADER,
         )
@@ -115,7 +245,6 @@ def main(config, workflow_ids: str or int, detailed: bool, color: bool):
         total_cost: str = get_query_total_cost(
             query_rows=formatted_query_rows, cost_header=COST_HEADER
         )
-        log.display_logo(io_utils.turtle)
         if detailed:
             formatted_rounded_rows: list = round_cost_values(
                 query_rows=formatted_query_rows, cost_header=COST_HEADER
@@ -134,41 +263,433 @@ def main(config, workflow_ids: str or int, detailed: bool, color: bool):
     return 0
 
 
+def get_workflows_bq_cost(
+    config,
+    metadata_requests: dict,
+    detailed: bool,
+    refresh: bool = False,
+    dry_run: bool = False,
+    skip_unavailable: bool = False,
+) -> Optional[dict]:
+    """
+    Get the cost of workflows from the BigQuery billing export, or the cost cache.
+
+    :param config: cromshell config object
+    :param metadata_requests: Dictionary of workflow id to the keyword arguments
+    of metadata.get_workflow_metadata
+    :param detailed: Whether to get the cost sum or cost per task
+    :param refresh: Query the cost of workflows even if it was cached
+    :param dry_run: Only report the bytes the query would process
+    :param skip_unavailable: Leave out, with a warning, the workflows whose cost
+    isn't available (not finished for 24 hours, or without cost entries) instead
+    of exiting
+    :return: Dictionary of workflow id to its cost query rows, None for a dry run
+    """
+
+    cofu.check_key_is_configured(
+        key_to_check="bq_cost_table",
+        config_options=config.cromshell_config_options,
+        config_file_path=config.cromshell_config_path,
+    )
+    bq_cost_table = config.cromshell_config_options["bq_cost_table"]
+    LOGGER.info("Using cost table: %s", bq_cost_table)
+
+    cost_cache_dir = cost_cache_utils.get_cost_cache_dir(config)
+    cached_query_rows = {}
+    if not refresh:
+        for resolved_workflow_id in metadata_requests:
+            query_rows = cost_cache_utils.get_cached_workflow_cost(
+                cache_dir=cost_cache_dir,
+                workflow_id=resolved_workflow_id,
+                detailed=detailed,
+                bq_cost_table=bq_cost_table,
+            )
+            if query_rows is not None:
+                cached_query_rows[resolved_workflow_id] = query_rows
+
+    queried_query_rows = {}
+    uncached_metadata_requests = {
+        resolved_workflow_id: request
+        for resolved_workflow_id, request in metadata_requests.items()
+        if resolved_workflow_id not in cached_query_rows
+    }
+    workflow_time_ranges = (
+        get_workflow_time_ranges(
+            metadata_requests=uncached_metadata_requests,
+            skip_unavailable=skip_unavailable,
+        )
+        if uncached_metadata_requests
+        else {}
+    )
+    if workflow_time_ranges:
+        query_start_time, query_end_time = get_query_time_range(
+            workflow_time_ranges=workflow_time_ranges
+        )
+
+        if dry_run:
+            bytes_processed = dry_run_bigquery(
+                workflow_ids=list(workflow_time_ranges),
+                bq_cost_table=bq_cost_table,
+                start_date=query_start_time,
+                end_date=query_end_time,
+                detailed=detailed,
+            )
+            print(
+                f"Query would process {bytes_processed} bytes "
+                f"({storage_utils.format_bytes(bytes_processed)}) for "
+                f"{len(workflow_time_ranges)} workflow(s)."
+            )
+            return None
+
+        LOGGER.info("Querying BQ")
+        queried_query_rows = query_bigquery(
+            workflow_ids=list(workflow_time_ranges),
+            bq_cost_table=bq_cost_table,
+            start_date=query_start_time,
+            end_date=query_end_time,
+            detailed=detailed,
+            skip_unavailable=skip_unavailable,
+        )
+
+        cache_settled_workflow_costs(
+            workflows_query_rows=queried_query_rows,
+            workflow_time_ranges=workflow_time_ranges,
+            bq_cost_table=bq_cost_table,
+            detailed=detailed,
+            cost_cache_dir=cost_cache_dir,
+            settle_window=cost_cache_utils.get_cost_settle_window(
+                config.cromshell_config_options
+            ),
+        )
+    elif dry_run:
+        print(
+            "The cost of all the workflows is cached or unavailable, no query "
+            "would be run."
+        )
+        return None
+
+    # Report the costs in the order of the given workflow ids
+    all_query_rows = {**queried_query_rows, **cached_query_rows}
+    return {
+        resolved_workflow_id: all_query_rows[resolved_workflow_id]
+        for resolved_workflow_id in metadata_requests
+        if resolved_workflow_id in all_query_rows
+    }
+
+
+def estimate_workflows_cost(config, metadata_requests: dict) -> dict:
+    """
+    Estimate the cost of the tasks of workflows from their metadata and the
+    price table set with the 'cost_price_table' config file key, or the default
+    prices.
+
+    :param config: cromshell config object
+    :param metadata_requests: Dictionary of workflow id to the keyword arguments
+    of metadata.get_workflow_metadata
+    :return: Dictionary of workflow id to its estimated cost rows, with the
+    columns of the detailed cost query
+    """
+
+    price_table = cost_estimate_utils.load_price_table(
+        config.cromshell_config_options.get("cost_price_table")
+    )
+
+    LOGGER.info("Retrieving workflow metadata")
+    workflows_metadata = get_workflows_metadata(
+        metadata_requests=metadata_requests,
+        metadata_keys=cost_estimate_utils.COST_ESTIMATE_METADATA_KEYS,
+    )
+
+    now = datetime.now(timezone.utc)
+    return {
+        workflow_id: cost_estimate_utils.estimate_workflow_cost(
+            workflow_metadata=workflow_metadata, price_table=price_table, now=now
+        )
+        for workflow_id, workflow_metadata in workflows_metadata.items()
+    }
+
+
+def print_aggregated_costs(workflows_query_rows: dict, output: str = None) -> None:
+    """
+    Prints the task level cost of workflows aggregated across all of them, and
+    writes it to a file if requested.
+
+    :param workflows_query_rows: Dictionary of workflow id to its detailed cost
+    query rows
+    :param output: Path of the CSV or Parquet file to write the aggregated costs to
+    :return:
+    """
+
+    aggregated_costs = cost_aggregation_utils.aggregate_workflow_costs(
+        workflows_query_rows=workflows_query_rows
+    )
+
+    log.display_logo(io_utils.turtle)
+    print(tabulate(aggregated_costs, headers="keys", tablefmt="rst", floatfmt=".2f"))
+
+    if aggregated_costs:
+        total_cost = aggregated_costs[-1]["TOTAL"]
+        print(
+            f"Total Cost for {len(workflows_query_rows)} workflows: ${total_cost:.2f}"
+        )
+
+    if output:
+        cost_aggregation_utils.write_aggregated_costs(
+            aggregated_costs=aggregated_costs, output_path=output
+        )
+
+
+def get_workflow_time_ranges(
+    metadata_requests: dict, skip_unavailable: bool = False
+) -> dict:
+    """
+    Get the start and end time of finished workflows from their metadata, exits
+    if a workflow isn't finished or finished less than 24 hours ago.
+
+    :param metadata_requests: Dictionary of workflow id to the keyword arguments
+    of metadata.get_workflow_metadata
+    :param skip_unavailable: Leave out, with a warning, the workflows that aren't
+    finished or finished less than 24 hours ago instead of exiting
+    :return: Dictionary of workflow id to (start, end) time
+    """
+
+    # Get time workflows finished using metadata (error if not finished)
+    LOGGER.info("Retrieving workflow metadata")
+    workflows_metadata = get_workflows_metadata(metadata_requests=metadata_requests)
+
+    workflow_time_ranges = {}
+    for workflow_id, workflow_metadata in workflows_metadata.items():
+        start_time, end_time = get_submission_start_end_time(workflow_metadata)
+
+        if skip_unavailable:
+            reason = get_cost_unavailable_reason(
+                workflow_status=workflow_metadata.get("status"),
+                start_time=start_time,
+                end_time=end_time,
+            )
+            if reason:
+                LOGGER.warning("Skipping workflow %s: %s", workflow_id, reason)
+                continue
+
+        workflow_status_utils.confirm_workflow_in_terminal_status(
+            workflow_status=workflow_metadata.get("status")
+        )
+
+        LOGGER.info("Checking workflow completed and finished past 24hrs")
+        checks_before_query(
+            start_time=start_time, end_time=end_time, workflow_id=workflow_id
+        )
+
+        workflow_time_ranges[workflow_id] = (start_time, end_time)
+
+    return workflow_time_ranges
+
+
+def cache_settled_workflow_costs(
+    workflows_query_rows: dict,
+    workflow_time_ranges: dict,
+    bq_cost_table: str,
+    detailed: bool,
+    cost_cache_dir: Path,
+    settle_window: timedelta,
+) -> None:
+    """
+    Cache the cost of the workflows that finished long enough ago for it to be
+    final.
+
+    :param workflows_query_rows: Dictionary of workflow id to its query result rows
+    :param workflow_time_ranges: Dictionary of workflow id to (start, end) time
+    :param bq_cost_table: The bq cost table name queried for workflow cost.
+    :param detailed: Whether the rows are the cost sum or cost per task
+    :param cost_cache_dir: Cost cache directory
+    :param settle_window: Time after which the cost of a finished workflow is final
+    :return:
+    """
+
+    for workflow_id, (_, end_time) in workflow_time_ranges.items():
+        # Workflows without cost entries may have been left out of the rows
+        if (
+            workflow_id in workflows_query_rows
+            and cost_cache_utils.is_workflow_cost_settled(
+                end_time=end_time, settle_window=settle_window
+            )
+        ):
+            cost_cache_utils.cache_workflow_cost(
+                cache_dir=cost_cache_dir,
+                workflow_id=workflow_id,
+                detailed=detailed,
+                bq_cost_table=bq_cost_table,
+                query_rows=workflows_query_rows[workflow_id],
+            )
+
+
+def get_workflows_metadata(
+    metadata_requests: dict,
+    metadata_keys: list = COST_METADATA_KEYS,
+    max_workers: int = MAX_METADATA_REQUESTS,
+) -> dict:
+    """
+    Concurrently get the metadata keys needed to get the cost of workflows.
+
+    :param metadata_requests: Dictionary of workflow id to the keyword arguments
+    of metadata.get_workflow_metadata (api_workflow_id, timeout, verify_certs and
+    headers)
+    :param metadata_keys: Metadata keys to include
+    :param max_workers: Maximum number of metadata requests sent at once
+    :return: Dictionary of workflow id to metadata, in the order of the requests
+    """
+
+    meta_params = metadata.format_metadata_params(
+        list_of_keys=metadata_keys,
+        exclude_keys=False,
+        expand_subworkflows=True,
+    )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            workflow_id: executor.submit(
+                metadata.get_workflow_metadata, meta_params=meta_params, **request
+            )
+            for workflow_id, request in metadata_requests.items()
+        }
+
+        return {workflow_id: future.result() for workflow_id, future in futures.items()}
+
+
+def get_query_time_range(workflow_time_ranges: dict) -> (datetime, datetime):
+    """
+    Union the time ranges of the workflows into a single range to query, plus/minus
+    a day from the earliest start and the latest finish.
+
+    :param workflow_time_ranges: Dictionary of workflow id to (start, end) time
+    obtained from the workflow metadata
+    :return: Start and end date of the query
+    """
+
+    start_times = [
+        datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S.%f%z")
+        for start_time, _ in workflow_time_ranges.values()
+    ]
+    end_times = [
+        datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S.%f%z")
+        for _, end_time in workflow_time_ranges.values()
+    ]
+
+    return (
+        min(start_times) - timedelta(days=1),
+        max(end_times) + timedelta(days=1),
+    )
+
+
+def get_bigquery_client() -> bigquery.Client:
+    """Returns the BigQuery client shared by all the queries of this process"""
+
+    global _bigquery_client
+
+    if _bigquery_client is None:
+        _bigquery_client = bigquery.Client()
+
+    return _bigquery_client
+
+
 def query_bigquery(
-    workflow_id: str, bq_cost_table: str, start_date: str, end_date: str, detailed: bool
-):
+    workflow_ids: list,
+    bq_cost_table: str,
+    start_date: datetime,
+    end_date: datetime,
+    detailed: bool,
+    skip_unavailable: bool = False,
+) -> dict:
     """
-    Query BigQuery for workflow cost.
+    Query BigQuery for the cost of workflows, with a single query for all of them.
 
     :param detailed: Whether to query cost sum or cost per task
-    :param workflow_id:
+    :param workflow_ids: Ids of the workflows to query
     :param bq_cost_table: The bq cost table name being queried for workflow cost.
-    :param start_date: Date workflow started
-    :param end_date: Date workflow finished
-    :return:
+    :param start_date: Date the earliest workflow started
+    :param end_date: Date the latest workflow finished
+    :param skip_unavailable: Leave out, with a warning, the workflows without cost
+    entries (e.g. fully call cached) instead of raising
+    :return: Dictionary of workflow id to its query result rows, in the order of
+    the workflow ids
     """
 
-    client = bigquery.Client()
+    client = get_bigquery_client()
 
     query = create_bq_query(detailed=detailed, bq_cost_table=bq_cost_table)
 
     job_config = create_bq_query_job_config(
-        workflow_id=workflow_id, start_date=start_date, end_date=end_date
+        workflow_ids=workflow_ids, start_date=start_date, end_date=end_date
     )
 
     query_job = client.query(query, job_config=job_config)
 
     check_bq_query_for_errors(query_job=query_job)
-    check_bq_query_results(query_job=query_job)
-    query_results = query_job.result()
+    query_rows = list(query_job.result())
 
-    return query_results
+    workflows_query_rows = split_bq_query_rows_by_workflow(
+        query_rows=query_rows, workflow_ids=workflow_ids
+    )
+    if not skip_unavailable:
+        check_bq_query_results(workflows_query_rows=workflows_query_rows)
+        return workflows_query_rows
+
+    workflows_without_cost = get_workflows_without_cost(
+        workflows_query_rows=workflows_query_rows
+    )
+    for workflow_id in workflows_without_cost:
+        LOGGER.warning("Skipping workflow %s: no cost entries found", workflow_id)
+
+    return {
+        workflow_id: query_rows
+        for workflow_id, query_rows in workflows_query_rows.items()
+        if workflow_id not in workflows_without_cost
+    }
+
+
+def dry_run_bigquery(
+    workflow_ids: list,
+    bq_cost_table: str,
+    start_date: datetime,
+    end_date: datetime,
+    detailed: bool,
+) -> int:
+    """
+    Dry run the cost query of workflows, nothing is billed for a dry run.
+
+    :param workflow_ids: Ids of the workflows to query
+    :param bq_cost_table: The bq cost table name being queried for workflow cost.
+    :param start_date: Date the earliest workflow started
+    :param end_date: Date the latest workflow finished
+    :param detailed: Whether to query cost sum or cost per task
+    :return: Number of bytes the query would process
+    """
+
+    client = get_bigquery_client()
+
+    query = create_bq_query(detailed=detailed, bq_cost_table=bq_cost_table)
+
+    job_config = create_bq_query_job_config(
+        workflow_ids=workflow_ids,
+        start_date=start_date,
+        end_date=end_date,
+        dry_run=True,
+    )
+
+    query_job = client.query(query, job_config=job_config)
+
+    check_bq_query_for_errors(query_job=query_job)
+
+    return query_job.total_bytes_processed
 
 
 def create_bq_query(detailed: bool, bq_cost_table: str) -> str:
     """
     Create an SQL query to be executed in BQ to retrieve workflow cost summary or
-    cost breakdown per workflow task.
+    cost breakdown per workflow task, for each of the queried workflows.
+
+    The billing export is partitioned by day, filtering on _PARTITIONTIME limits
+    the scan to the partitions of the queried time range.
 
     :param detailed: Bool to determine whether to get cost summary or breakdown
     :param bq_cost_table: Bigquery cost table to query
@@ -178,58 +699,129 @@ def create_bq_query(detailed: bool, bq_cost_table: str) -> str:
         return f"""
                 SELECT wfid.value as cromwell_workflow_id, service.description, task.value as task_name, sum(cost) as cost
                 FROM {bq_cost_table} as billing, UNNEST(labels) as wfid, UNNEST(labels) as task
-                WHERE cost > 0
-                AND task.key LIKE "wdl-task-name"
-                AND wfid.key LIKE "cromwell-workflow-id"
-                AND wfid.value like @workflow_id
+                WHERE _PARTITIONTIME BETWEEN TIMESTAMP_TRUNC(@start_date, DAY) AND TIMESTAMP_TRUNC(@end_date, DAY)
+                AND usage_start_time BETWEEN @start_date AND @end_date
                 AND export_time BETWEEN @start_date AND @end_date
+                AND cost > 0
+                AND task.key = "wdl-task-name"
+                AND wfid.key = "cromwell-workflow-id"
+                AND wfid.value IN UNNEST(@workflow_ids)
                 GROUP BY 1,2,3
                 ORDER BY 4 DESC
                 """
     else:
         return f"""
-                SELECT sum(cost) as cost
-                FROM {bq_cost_table}, UNNEST(labels)
-                WHERE value LIKE @workflow_id AND export_time BETWEEN @start_date AND @end_date
+                SELECT wfid.value as cromwell_workflow_id, sum(cost) as cost
+                FROM {bq_cost_table}, UNNEST(labels) as wfid
+                WHERE _PARTITIONTIME BETWEEN TIMESTAMP_TRUNC(@start_date, DAY) AND TIMESTAMP_TRUNC(@end_date, DAY)
+                AND usage_start_time BETWEEN @start_date AND @end_date
+                AND export_time BETWEEN @start_date AND @end_date
+                AND wfid.key = "cromwell-workflow-id"
+                AND wfid.value IN UNNEST(@workflow_ids)
+                GROUP BY 1
                 """
 
 
+def get_workflow_id_label_value(workflow_id: str) -> str:
+    """
+    Cromwell labels the cloud resources of a workflow with its id, the label
+    value is prefixed because GCP label values can't start with a digit.
+
+    :param workflow_id: Hexadecimal identifier of workflow submission
+    :return: Value of the 'cromwell-workflow-id' label of the workflow resources
+    """
+
+    return f"{WORKFLOW_ID_LABEL_PREFIX}{workflow_id}"
+
+
 def create_bq_query_job_config(
-    workflow_id, start_date, end_date
+    workflow_ids: list,
+    start_date: datetime,
+    end_date: datetime,
+    dry_run: bool = False,
 ) -> bigquery.QueryJobConfig:
     """
     Create BQ Job config to be used while executing query.
-    :param workflow_id:
+    :param workflow_ids:
     :param start_date:
     :param end_date:
+    :param dry_run: Only validate the query and estimate the bytes it processes
     :return:
     """
     return bigquery.QueryJobConfig(
+        dry_run=dry_run,
+        # A cached result of a dry run processes no bytes
+        use_query_cache=not dry_run,
         query_parameters=[
-            bigquery.ScalarQueryParameter("workflow_id", "STRING", "%" + workflow_id),
-            bigquery.ScalarQueryParameter("start_date", "STRING", start_date),
-            bigquery.ScalarQueryParameter("end_date", "STRING", end_date),
-        ]
+            bigquery.ArrayQueryParameter(
+                "workflow_ids",
+                "STRING",
+                [get_workflow_id_label_value(wf_id) for wf_id in workflow_ids],
+            ),
+            bigquery.ScalarQueryParameter("start_date", "TIMESTAMP", start_date),
+            bigquery.ScalarQueryParameter("end_date", "TIMESTAMP", end_date),
+        ],
     )
 
 
-def check_bq_query_results(query_job: bigquery.QueryJob) -> None:
+def split_bq_query_rows_by_workflow(query_rows: list, workflow_ids: list) -> dict:
+    """
+    Group the rows of a query over many workflows by workflow.
+
+    :param query_rows: Rows of the query result, each with a
+    'cromwell_workflow_id' column holding the workflow id label value
+    :param workflow_ids: Ids of the queried workflows
+    :return: Dictionary of workflow id to its rows, in the order of the workflow
+    ids, workflows without cost entries have no rows
+    """
+
+    workflows_query_rows = {workflow_id: [] for workflow_id in workflow_ids}
+    label_value_to_workflow_id = {
+        get_workflow_id_label_value(workflow_id): workflow_id
+        for workflow_id in workflow_ids
+    }
+
+    for row in query_rows:
+        workflow_id = label_value_to_workflow_id.get(row.get("cromwell_workflow_id"))
+        if workflow_id is not None:
+            workflows_query_rows[workflow_id].append(row)
+
+    return workflows_query_rows
+
+
+def check_bq_query_results(workflows_query_rows: dict) -> None:
     """
     Checks the contents of the query result
-    :param query_job: Response from the BQ query execution
+    :param workflows_query_rows: Dictionary of workflow id to its query result rows
     :return:
     """
-    query_results = query_job.result()
-    # First condition applies to a 'detailed' query to confirm results were obtained,
-    # zero rows in the results indicates the failure to obtain cost for a workflow.
-    # Second condition applies to 'non-detailed' query, because the results are
-    # aggregated there will always be one row minimum, so this condition will confirm
-    # the results for that row is not 'None'.
-    if query_results.total_rows == 0 or (
-        query_results.total_rows == 1 and next(query_job.result()).get("cost") is None
-    ):
-        LOGGER.error("Could not retrieve cost - no cost entries found.")
-        raise ValueError("Could not retrieve cost - no cost entries found.")
+    workflows_without_cost = get_workflows_without_cost(
+        workflows_query_rows=workflows_query_rows
+    )
+    if workflows_without_cost:
+        LOGGER.error(
+            "Could not retrieve cost - no cost entries found for: %s",
+            ", ".join(workflows_without_cost),
+        )
+        raise ValueError(
+            "Could not retrieve cost - no cost entries found for: "
+            + ", ".join(workflows_without_cost)
+        )
+
+
+def get_workflows_without_cost(workflows_query_rows: dict) -> list:
+    """
+    Get the workflows that have no cost in the query result
+    :param workflows_query_rows: Dictionary of workflow id to its query result rows
+    :return: Ids of the workflows without cost
+    """
+    # A workflow without rows had no cost entries in the queried time range. Cost
+    # is summed per workflow, so a 'non-detailed' workflow row always has a cost.
+    return [
+        workflow_id
+        for workflow_id, query_rows in workflows_query_rows.items()
+        if not query_rows or all(row.get("cost") is None for row in query_rows)
+    ]
 
 
 def check_bq_query_for_errors(query_job: bigquery.QueryJob) -> None:
@@ -350,6 +942,40 @@ def checks_before_query(start_time: str, end_time: str, workflow_id: str) -> Non
         exit()
 
 
+def get_cost_unavailable_reason(
+    workflow_status: str, start_time: str, end_time: str
+) -> Optional[str]:
+    """
+    Get why the cost of a workflow can't be queried yet, the same conditions
+    checks_before_query exits on.
+
+    :param workflow_status: Status of the workflow
+    :param start_time: Time workflow started
+    :param end_time: Time workflow finished
+    :return: The reason, None if the cost can be queried
+    """
+
+    if (
+        not start_time
+        or not end_time
+        or workflow_status
+        in (
+            workflow_status_utils.WorkflowStatuses.SUBMITTED.value
+            + workflow_status_utils.WorkflowStatuses.RUNNING.value
+            + ["Aborting"]
+        )
+    ):
+        return f"workflow is not finished (status: {workflow_status})"
+
+    minimum_time_passed, _ = minimum_time_passed_since_workflow_completion(
+        end_time=end_time
+    )
+    if not minimum_time_passed:
+        return "workflow finished less than 24 hours ago"
+
+    return None
+
+
 def round_cost_values(query_rows: list, cost_header: str) -> list:
     """
     Round the cost value to 2 decimal points and set minimum cost values to .01
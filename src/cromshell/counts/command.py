@@ -1,5 +1,4 @@
 import logging
-from itertools import groupby
 from typing import Dict
 
 import click
@@ -7,11 +6,26 @@ from termcolor import colored
 
 from cromshell.log import DelayedLogMessage
 from cromshell.metadata import command as metadata_command
-from cromshell.utilities import command_setup_utils, http_utils, io_utils
+from cromshell.utilities import (
+    command_setup_utils,
+    http_utils,
+    io_utils,
+    metadata_record_utils,
+)
 from cromshell.utilities.workflow_status_utils import TaskStatus
 
 LOGGER = logging.getLogger(__name__)
 
+# Metadata keys needed to count the statuses of the calls of a workflow
+COUNTS_METADATA_KEYS = [
+    "id",
+    "status",
+    "shardIndex",
+    "executionStatus",
+    "subWorkflowMetadata",
+    "subWorkflowId",
+]
+
 
 @click.command(name="counts")
 @click.argument("workflow_ids", required=True, nargs=-1)
@@ -47,10 +61,10 @@ def main(config, workflow_ids, json_summary, compress_subworkflows):
             workflow_id=workflow_id, cromshell_config=config
         )
 
-        # Get metadata
+        # Get only the metadata needed to count the statuses
         formatted_metadata_parameter = metadata_command.format_metadata_params(
-            list_of_keys=config.METADATA_KEYS_TO_OMIT,
-            exclude_keys=True,
+            list_of_keys=COUNTS_METADATA_KEYS,
+            exclude_keys=False,
             expand_subworkflows=not compress_subworkflows,
         )
 
@@ -61,29 +75,34 @@ def main(config, workflow_ids, json_summary, compress_subworkflows):
             verify_certs=config.requests_verify_certs,
             headers=http_utils.generate_headers(config),
         )
+        # Only keep the compact record of the calls
+        workflow_record = metadata_record_utils.build_workflow_record(workflow_metadata)
+        del workflow_metadata
 
         if json_summary:
-            print_task_status_summary(workflow_metadata=workflow_metadata)
+            print_task_status_summary(workflow_record=workflow_record)
         else:
             pretty_status_counts(
                 workflow_id=resolved_workflow_id,
-                workflow_metadata=workflow_metadata,
+                workflow_record=workflow_record,
             )
 
         DelayedLogMessage.display_log_messages()
     return 0
 
 
-def pretty_status_counts(workflow_id: str, workflow_metadata: dict) -> None:
+def pretty_status_counts(
+    workflow_id: str, workflow_record: metadata_record_utils.WorkflowRecord
+) -> None:
     """
     Prints the workflow status and runs the function to print
     the workflow status summary.
 
     :param workflow_id: Hexadecimal identifier of workflow submission
-    :param workflow_metadata: Metadata of the workflow to process
+    :param workflow_record: Record of the workflow to process
     :return:
     """
-    workflow_status = workflow_metadata.get("status")
+    workflow_status = workflow_record.status
     print(
         colored(
             workflow_id + "\t" + workflow_status,
@@ -92,61 +111,45 @@ def pretty_status_counts(workflow_id: str, workflow_metadata: dict) -> None:
         )
     )
     print_workflow_status(
-        workflow_metadata=workflow_metadata,
+        workflow_record=workflow_record,
         indent="\t",
     )
 
 
-def print_workflow_status(workflow_metadata: dict, indent: str) -> None:
+def print_workflow_status(
+    workflow_record: metadata_record_utils.WorkflowRecord, indent: str
+) -> None:
     """
-    Recursively parses a (sub-)workflow's metadata and prints out
-    the summary on its tasks statuses.
-    :param workflow_metadata: Metadata of the workflow to process
+    Parses a (sub-)workflow's record and prints out the summary on its tasks
+    statuses, indenting the tasks of each level of subworkflows.
+    :param workflow_record: Record of the workflow to process
     :param indent: Indent string given as "\t", used to indent print out
     :return:
     """
-    calls_metadata = workflow_metadata["calls"]
-    calls = list(calls_metadata.keys())
-
-    for call in calls:
-        # If task has a key called 'subworkflowMetadata' in its
-        # first (zero) element (shard) then perform recursion.
-        if "subWorkflowMetadata" in calls_metadata[call][0]:
-            sub_workflow_name = call
-            sub_calls = calls_metadata[sub_workflow_name]
-            print(f"{indent}SubWorkflow {sub_workflow_name}")
-
-            # For each call in subworkflow calls get the subworkflow metadata.
-            # This loop will go through each shard if task is scattered
-            for sub_call in sub_calls:
-                print_workflow_status(
-                    workflow_metadata=sub_call["subWorkflowMetadata"],
-                    indent=indent + "\t",
-                )
-
-        # If no subworkflow is found then print status summary for task
+
+    for depth, call_record in metadata_record_utils.iter_call_records(workflow_record):
+        call_indent = indent + "\t" * depth
+        if call_record.subworkflows:
+            print(f"{call_indent}SubWorkflow {call_record.name}")
         else:
-            print_call_status(
-                call=call, indent=indent, workflow_calls_metadata=calls_metadata
-            )
+            print_call_status(call_record=call_record, indent=call_indent)
 
 
-def print_call_status(call: str, indent: str, workflow_calls_metadata: dict) -> None:
+def print_call_status(
+    call_record: metadata_record_utils.CallRecord, indent: str
+) -> None:
     """
     Prints the task name and status count
 
-    :param call: Name of the call to print
+    :param call_record: Record of the call to print
     :param indent: Indent string given as "\t", used to indent print out
-    :param workflow_calls_metadata: The 'calls' of the workflow to process
     :return:
     """
 
     # Scattered task calls and unscattered calls are treated similarly.
-    # Thus, `shards` list can either have one item (-1) representing an unscattered
-    # task call, or multiple items (0,1,...N) representing scattered task
-    shards: list = workflow_calls_metadata[call]
-
-    shard_status_count: dict = get_shard_status_count(shards)
+    # Thus, the call can either have one shard (-1) representing an unscattered
+    # task call, or multiple shards (0,1,...N) representing scattered task
+    shard_status_count: dict = call_record.get_status_counts()
 
     shards_done = shard_status_count.get(TaskStatus.DONE.value, 0)
     shards_running = shard_status_count.get(TaskStatus.RUNNING.value, 0)
@@ -170,7 +173,7 @@ def print_call_status(call: str, indent: str, workflow_calls_metadata: dict) ->
 
     # Format and print task summary
     formatted_task_summary = (
-        f"{indent}{call}\t{shards_running} Running, "
+        f"{indent}{call_record.name}\t{shards_running} Running, "
         f"{shards_done} Done, {shards_retried} Preempted, {shards_failed} Failed"
     )
 
@@ -178,7 +181,9 @@ def print_call_status(call: str, indent: str, workflow_calls_metadata: dict) ->
 
     # If the task has shards that failed list them
     if shards_failed:
-        failed_shards_index = get_list_of_failed_shards(shards=shards)
+        failed_shards_index = call_record.get_shard_indices_with_status(
+            TaskStatus.FAILED.value
+        )
         if failed_shards_index != [-1]:  # Prints only if task was scattered
             # Format and print task failed shards
             failed_shards_summary = f"{indent}Failed shards: {failed_shards_index}"
@@ -198,72 +203,27 @@ def print_call_status(call: str, indent: str, workflow_calls_metadata: dict) ->
 
 
 def print_task_status_summary(
-    workflow_metadata: dict, print_color: bool = None
+    workflow_record: metadata_record_utils.WorkflowRecord, print_color: bool = None
 ) -> None:
     """
     Prints the status count for each task in a workflow.
     Does NOT run expose subworkflows
 
     :param print_color: If True, print status summary with color
-    :param workflow_metadata: Metadata of the workflow to process
+    :param workflow_record: Record of the workflow to process
     :return:
     """
 
-    workflow_status_summary = {}
-    for task in workflow_metadata["calls"]:
-        shards = workflow_metadata["calls"][task]
-
-        # Add the status counts for this task to dictionary holding other
-        # task status counts
-        workflow_status_summary[task] = get_shard_status_count(shards=shards)
+    workflow_status_summary = {
+        task: call_record.get_status_counts()
+        for task, call_record in workflow_record.calls.items()
+    }
 
     io_utils.pretty_print_json(
         format_json=workflow_status_summary, add_color=print_color
     )
 
 
-def get_shard_status_count(shards: list) -> Dict[str, int]:
-    """
-    Count the number of shards for each status type and return as dictionary.
-    :param shards: The metadata for all shards in a scatter or shard of a single task
-    :return:
-    """
-
-    statuses_counts = {}
-    grouped_shards = group_shards_by_status(shards=shards)
-
-    for status in grouped_shards:
-        statuses_counts[status] = len(grouped_shards[status])
-
-    return statuses_counts
-
-
-def get_list_of_failed_shards(shards: list) -> list:
-    """
-    Get a list of the failed shards' indexes
-    :param shards: The metadata for all shards in a scatter or shard of a single task
-    :return:
-    """
-
-    return [
-        shard["shardIndex"]
-        for shard in group_shards_by_status(shards=shards).get("Failed", list())
-    ]
-
-
-def group_shards_by_status(shards: list) -> Dict[str, list]:
-    """
-    Groups shards by their status
-    :param shards: The metadata for all shards in a scatter or shard of a single task
-    :return:
-    """
-    grouped_shards = {}
-    sorted_shards = sorted(shards, key=lambda y: y["executionStatus"])
-    for status, group in groupby(sorted_shards, lambda x: x["executionStatus"]):
-        grouped_shards[status] = list(group)
-    return grouped_shards
-
-
 def get_unknown_status(
     shard_status_count: Dict[str, int], known_statuses: list
 ) -> (int, str):
@@ -3,11 +3,10 @@ import json
 import logging
 
 import click
-import requests
 from tabulate import tabulate
 
 import cromshell.utilities.submissions_file_utils
-from cromshell.utilities import command_setup_utils, cromshellconfig, http_utils
+from cromshell.utilities import cromshellconfig, http_utils
 
 LOGGER = logging.getLogger(__name__)
 
@@ -52,43 +51,53 @@ def main(config, color, update):
 
 
 def update_submission_db(config):
-    # Iterate over the submissions text database and update their status
-    workflow_ids = []
+    """Update the status of the unfinished workflows of the submission database,
+    requesting all their statuses at once"""
+
+    # Server of each unfinished workflow
+    workflow_servers = {}
     with open(cromshellconfig.submission_file_path, "r") as sub_f:
-        reader = csv.reader(sub_f, delimiter="\t", lineterminator="\n")
-        for table_row in reader:
-            if table_row[2] != "RUN_ID" and table_row[4] in [
-                "Submitted",
-                "Running",
-                "DOOMED",
-            ]:
-                workflow_ids.append(table_row[2])
-
-    for workflow_id in workflow_ids:
-        command_setup_utils.resolve_workflow_id_and_server(
-            workflow_id=workflow_id, cromshell_config=config
-        )
-
-        # Request workflow status
-        request_out = requests.get(
-            f"{config.cromwell_api_workflow_id}/status",
-            timeout=config.requests_connect_timeout,
-            verify=config.requests_verify_certs,
-            headers=http_utils.generate_headers(config),
-        )
-
-        workflow_status_description = json.loads(request_out.content)
-
-        # Hold our status string here
-        workflow_status = workflow_status_description["status"]
-
-        # Update config.submission_file:
-        cromshell.utilities.submissions_file_utils.update_row_values_in_submission_db(
-            workflow_database_path=config.submission_file_path,
-            workflow_id=workflow_id,
-            column_to_update="STATUS",
-            update_value=workflow_status,
-        )
+        reader = csv.DictReader(sub_f, delimiter="\t", lineterminator="\n")
+        for row in reader:
+            if row["STATUS"] in ["Submitted", "Running", "DOOMED"]:
+                workflow_servers[row["RUN_ID"]] = row["CROMWELL_SERVER"]
+    if not workflow_servers:
+        return
+
+    # Check each server once, rather than once per workflow
+    for cromwell_server in sorted(set(workflow_servers.values())):
+        config.cromwell_server = cromwell_server
+        http_utils.assert_can_communicate_with_server(config)
+
+    # Request workflow statuses
+    responses = http_utils.send_requests(
+        "GET",
+        [
+            f"{cromwell_server}{config.CROMWELL_API_STRING}/{workflow_id}/status"
+            for workflow_id, cromwell_server in workflow_servers.items()
+        ],
+        verify=config.requests_verify_certs,
+        headers=http_utils.generate_headers(config),
+    )
+
+    workflow_statuses = {}
+    for workflow_id, response in zip(workflow_servers, responses):
+        if response.ok:
+            workflow_statuses[workflow_id] = json.loads(response.content)["status"]
+        else:
+            http_utils.check_http_request_status_code(
+                short_error_message=f"Failed to get the status of {workflow_id}",
+                response=response,
+                # Update the status of the other workflows
+                raise_exception=False,
+            )
+
+    # Update config.submission_file:
+    cromshell.utilities.submissions_file_utils.update_column_values_in_submission_db(
+        workflow_database_path=config.submission_file_path,
+        column_to_update="STATUS",
+        updated_values=workflow_statuses,
+    )
 
 
 def format_status(table_row):
@@ -1,15 +1,31 @@
 import logging
+from typing import Dict, Iterator, List
 
 import click
-import requests
+from tabulate import tabulate
 
 import cromshell.utilities.http_utils as http_utils
 import cromshell.utilities.io_utils as io_utils
 from cromshell.metadata import command as metadata_command
-from cromshell.utilities import command_setup_utils
+from cromshell.utilities import (
+    command_setup_utils,
+    metadata_record_utils,
+    storage_utils,
+)
 
 LOGGER = logging.getLogger(__name__)
 
+# Metadata keys needed to list the outputs of the calls of a workflow
+OUTPUTS_METADATA_KEYS = [
+    "id",
+    "status",
+    "outputs",
+    "shardIndex",
+    "executionStatus",
+    "subWorkflowMetadata",
+    "subWorkflowId",
+]
+
 
 @click.command(name="list-outputs")
 @click.argument("workflow_ids", required=True, nargs=-1)
@@ -27,8 +43,16 @@ LOGGER = logging.getLogger(__name__)
     default=False,
     help="Print a json summary of outputs, including non-file types.",
 )
+@click.option(
+    "-s",
+    "--stat",
+    is_flag=True,
+    default=False,
+    help="Report the size, modification time and existence of all task output "
+    "files, with per-task and total bytes. Use with -d to list every file.",
+)
 @click.pass_obj
-def main(config, workflow_ids, detailed, json_summary):
+def main(config, workflow_ids, detailed, json_summary, stat):
     """List all output files produced by a workflow."""
 
     LOGGER.info("list-outputs")
@@ -40,7 +64,16 @@ def main(config, workflow_ids, detailed, json_summary):
             workflow_id=workflow_id, cromshell_config=config
         )
 
-        if not detailed:
+        if stat:
+            output_stats = get_task_output_stats(
+                get_workflow_record_for_outputs(config)
+            )
+
+            if json_summary:
+                io_utils.pretty_print_json(format_json=output_stats)
+            else:
+                print_task_output_stats(output_stats, detailed=detailed)
+        elif not detailed:
             workflow_outputs = get_workflow_level_outputs(config).get("outputs")
 
             if json_summary:
@@ -68,7 +101,8 @@ def get_workflow_level_outputs(config) -> dict:
         config (dict): The cromshell config object
     """
 
-    requests_out = requests.get(
+    requests_out = http_utils.send_request(
+        "GET",
         f"{config.cromwell_api_workflow_id}/outputs",
         timeout=config.requests_connect_timeout,
         verify=config.requests_verify_certs,
@@ -95,10 +129,22 @@ def get_task_level_outputs(config) -> dict:
     Args:
         config (dict): The cromshell config object
     """
-    # Get metadata
+
+    return filter_outputs_from_workflow_metadata(
+        get_workflow_record_for_outputs(config)
+    )
+
+
+def get_workflow_record_for_outputs(config) -> metadata_record_utils.WorkflowRecord:
+    """Get the record of the workflow metadata holding the task level outputs
+
+    Args:
+        config (dict): The cromshell config object
+    """
+
     formatted_metadata_parameter = metadata_command.format_metadata_params(
-        list_of_keys=config.METADATA_KEYS_TO_OMIT,
-        exclude_keys=True,
+        list_of_keys=OUTPUTS_METADATA_KEYS,
+        exclude_keys=False,
         expand_subworkflows=True,
     )
 
@@ -110,38 +156,172 @@ def get_task_level_outputs(config) -> dict:
         headers=http_utils.generate_headers(config),
     )
 
-    return filter_outputs_from_workflow_metadata(workflow_metadata)
+    return metadata_record_utils.build_workflow_record(
+        workflow_metadata, keep_shards=True
+    )
 
 
-def filter_outputs_from_workflow_metadata(workflow_metadata: dict) -> dict:
-    """Get the outputs from the workflow metadata
+def filter_outputs_from_workflow_metadata(
+    workflow_record: metadata_record_utils.WorkflowRecord,
+) -> dict:
+    """Get the outputs from the workflow record, the outputs of the calls of
+    subworkflows being nested under the call of their subworkflow
 
     Args:
-        workflow_metadata (dict): The workflow metadata
+        workflow_record (WorkflowRecord): The workflow record, with shards
     """
-    calls_metadata = workflow_metadata["calls"]
-    output_metadata = {}
     extract_task_key = "outputs"
+    output_metadata = {}
+    # Outputs of the workflow and of the subworkflows left to fill
+    stack = [(workflow_record, output_metadata)]
+
+    while stack:
+        record, outputs = stack.pop()
+        for call, call_record in record.calls.items():
+            if call_record.subworkflows:
+                outputs[call] = []
+                for subworkflow_record in call_record.subworkflows:
+                    subworkflow_outputs = {}
+                    outputs[call].append(subworkflow_outputs)
+                    stack.append((subworkflow_record, subworkflow_outputs))
+            else:
+                outputs[call] = [
+                    getattr(shard, extract_task_key) for shard in call_record.shards
+                ]
 
-    for call, index_list in calls_metadata.items():
-        if "subWorkflowMetadata" in calls_metadata[call][0]:
-            output_metadata[call] = []
-            for scatter in calls_metadata[call]:
-                output_metadata[call].append(
-                    filter_outputs_from_workflow_metadata(
-                        scatter["subWorkflowMetadata"]
-                    )
-                )
-        else:
-            output_metadata[call] = []
-            for index in index_list:
-                output_metadata[call].append(index.get(extract_task_key))
-
-    check_for_empty_output(output_metadata, workflow_metadata["id"])
+    check_for_empty_output(output_metadata, workflow_record.id)
 
     return output_metadata
 
 
+def get_task_output_files(
+    workflow_record: metadata_record_utils.WorkflowRecord,
+) -> Dict[str, List[str]]:
+    """Get the file like outputs of every task, including subworkflow tasks
+
+    Args:
+        workflow_record (WorkflowRecord): The workflow record, with shards
+    """
+    task_output_files = {}
+
+    for _, call_record in metadata_record_utils.iter_call_records(workflow_record):
+        if call_record.subworkflows:
+            continue
+        task_files = task_output_files.setdefault(call_record.name, [])
+        for shard in call_record.shards:
+            task_files.extend(get_file_like_values(shard.outputs))
+
+    return task_output_files
+
+
+def get_file_like_values(output_value) -> Iterator[str]:
+    """Yield the path or url like strings held in an output value, which can be
+    a single value or an array, map, pair or struct of values.
+
+    Args:
+        output_value: Value of a task output
+    """
+    if isinstance(output_value, str):
+        if is_path_or_url_like(output_value):
+            yield output_value
+    elif isinstance(output_value, list):
+        for item in output_value:
+            yield from get_file_like_values(item)
+    elif isinstance(output_value, dict):
+        for item in output_value.values():
+            yield from get_file_like_values(item)
+
+
+def get_task_output_stats(
+    workflow_record: metadata_record_utils.WorkflowRecord,
+) -> dict:
+    """Get the size, modification time and existence of every task output file
+    and summarize the bytes per task and for the whole workflow.
+
+    The file metadata is queried for all outputs at once (see
+    storage_utils.get_file_stats) rather than one file at a time.
+
+    Args:
+        workflow_record (WorkflowRecord): The workflow record, with shards
+    """
+    task_output_files = get_task_output_files(workflow_record)
+
+    file_stats = storage_utils.get_file_stats(
+        path for files in task_output_files.values() for path in files
+    )
+
+    tasks = {}
+    for task, files in task_output_files.items():
+        task_file_stats = [file_stats[path]._asdict() for path in files]
+        tasks[task] = {
+            "files": task_file_stats,
+            "file_count": len(task_file_stats),
+            "missing_count": sum(not f["exists"] for f in task_file_stats),
+            "total_bytes": sum(f["size"] or 0 for f in task_file_stats),
+        }
+
+    # Files shared between tasks are only counted once in the workflow total
+    return {
+        "id": workflow_record.id,
+        "tasks": tasks,
+        "file_count": len(file_stats),
+        "missing_count": sum(not f.exists for f in file_stats.values()),
+        "total_bytes": sum(f.size or 0 for f in file_stats.values()),
+    }
+
+
+def print_task_output_stats(output_stats: dict, detailed: bool) -> None:
+    """Print the per-task and total output bytes of a workflow
+
+    Args:
+        output_stats (dict): Output of get_task_output_stats
+        detailed (bool): Whether to also print the stats of each file
+    """
+    if detailed:
+        file_rows = [
+            [
+                task,
+                file_stat["path"],
+                file_stat["exists"],
+                storage_utils.format_bytes(file_stat["size"]),
+                file_stat["modified"] or "-",
+            ]
+            for task, task_stats in output_stats["tasks"].items()
+            for file_stat in task_stats["files"]
+        ]
+        print(
+            tabulate(
+                file_rows,
+                headers=["TASK", "PATH", "EXISTS", "SIZE", "MODIFIED"],
+                tablefmt="rst",
+            )
+        )
+
+    task_rows = [
+        [
+            task,
+            task_stats["file_count"],
+            task_stats["missing_count"],
+            task_stats["total_bytes"],
+            storage_utils.format_bytes(task_stats["total_bytes"]),
+        ]
+        for task, task_stats in output_stats["tasks"].items()
+    ]
+    print(
+        tabulate(
+            task_rows,
+            headers=["TASK", "FILES", "MISSING", "BYTES", "SIZE"],
+            tablefmt="rst",
+        )
+    )
+    print(
+        f"Total: {output_stats['file_count']} files, "
+        f"{output_stats['missing_count']} missing, "
+        f"{output_stats['total_bytes']} bytes "
+        f"({storage_utils.format_bytes(output_stats['total_bytes'])})"
+    )
+
+
 def print_task_level_outputs(output_metadata: dict) -> None:
     """Print the outputs from the workflow metadata
     output_metadata: {call_name:[index1{output_name: outputvalue}, index2{...}, ...], call_name:[], ...}
@@ -6,7 +6,7 @@ import gcsfs
 from termcolor import colored
 
 from cromshell.metadata import command as metadata_command
-from cromshell.utilities import command_setup_utils, http_utils
+from cromshell.utilities import command_setup_utils, http_utils, metadata_record_utils
 from cromshell.utilities.io_utils import get_color_for_status_key
 
 LOGGER = logging.getLogger(__name__)
@@ -139,9 +139,15 @@ def obtain_and_print_logs(
 
     check_workflow_for_calls(workflow_status_json)
 
+    # Only keep the compact record of the calls and their logs
+    workflow_record = metadata_record_utils.build_workflow_record(
+        workflow_status_json, keep_shards=True
+    )
+    del workflow_status_json
+
     # Parse the metadata for logs and print them to the output
     found_logs = print_workflow_logs(
-        workflow_metadata=workflow_status_json,
+        workflow_record=workflow_record,
         indent="",
         expand_sub_workflows=not dont_expand_subworkflows,
         status_keys=status_params,
@@ -156,56 +162,40 @@ def obtain_and_print_logs(
 
 
 def print_workflow_logs(
-    workflow_metadata: dict,
+    workflow_record: metadata_record_utils.WorkflowRecord,
     indent: str,
     expand_sub_workflows: bool,
     status_keys: list,
     cat_logs: bool,
 ) -> bool:
     """
-    Recursively runs through each task of a workflow metadata and calls function to
-    call out to the helper in order to print found logs
-    :param workflow_metadata: Metadata of the workflow to process
+    Runs through each task of a workflow record, and of its subworkflows if
+    expanded, and prints the logs of the calls with one of the given statuses
+    :param workflow_record: Record of the workflow to process, with shards
     :param indent: Indent string given as "\t", used to indent print out
     :param expand_sub_workflows:  Boolean, whether to print subworkflows
+    :param status_keys: Determines what logs to show based on call status
+    :param cat_logs: Will use GCS to attempt to print the logs
     :return: true if any logs matching the parameters were found
     """
+
     did_print = False
 
-    tasks = list(workflow_metadata["calls"].keys())
-
-    for task in tasks:  # For each task in given metadata
-        # If task has a key called 'subworkflowMetadata' in its first (zero) element
-        # (shard) and expand_sub_workflow parameter is set to true then rerun this
-        # function on that subworkflow
-        if (
-            "subWorkflowMetadata" in workflow_metadata["calls"][task][0]
-            and expand_sub_workflows
-        ):
-            sub_workflow_name = task
-            task_shards = workflow_metadata["calls"][sub_workflow_name]
-            print(f"{indent}SubWorkflow {sub_workflow_name}")
-
-            # For each element in total number of subworkflow calls get the subworkflow
-            # metadata. This loop will go through each shard if task is scattered
-            for i in range(len(task_shards) - 1):
-                sub_workflow_metadata = task_shards[i]["subWorkflowMetadata"]
-
-                print_workflow_logs(
-                    workflow_metadata=sub_workflow_metadata,
-                    indent=indent + "\t",
-                    expand_sub_workflows=expand_sub_workflows,
-                    status_keys=status_keys,
-                    cat_logs=cat_logs,
-                )
+    for depth, call_record in metadata_record_utils.iter_call_records(workflow_record):
+        if depth and not expand_sub_workflows:
+            continue
+        task_indent = indent + "\t" * depth
 
-        # If no subworkflow is found then print status summary for the task
-        else:
+        if call_record.subworkflows and expand_sub_workflows:
+            print(f"{task_indent}SubWorkflow {call_record.name}")
+            continue
+
+        for shard in call_record.shards:
             did_print = (
-                print_task_logs(
-                    task=task,
-                    indent=indent,
-                    workflow_metadata=workflow_metadata,
+                print_shard_logs(
+                    task=call_record.name,
+                    indent=task_indent,
+                    shard=shard,
                     status_keys=status_keys,
                     cat_logs=cat_logs,
                 )
@@ -215,83 +205,71 @@ def print_workflow_logs(
     return did_print
 
 
-def print_task_logs(
+def print_shard_logs(
     task: str,
     indent: str,
-    workflow_metadata: dict,
+    shard: metadata_record_utils.ShardRecord,
     status_keys: list,
     cat_logs: bool,
 ) -> bool:
     """
-    Prints the backend logs from the workflow
+    Prints the backend log of a shard of a task, if it has one of the statuses
     :param task: Name of the task
     :param indent: Indent string given as a string of "\t" characters,
     used to indent print out
-    :param workflow_metadata: Metadata of the workflow to process
+    :param shard: Record of the shard
     :param status_keys: Determines what logs to show based on call status
     :param cat_logs: Will use GCS to attempt to print the logs
-    :return: true if any logs were printed
+    :return: true if the log was printed
     """
 
-    did_print = False
+    status = shard.status
+    if "ALL" not in status_keys and status not in status_keys:
+        return False
 
-    shard_list = workflow_metadata["calls"][task]
+    task_status_font = get_color_for_status_key(status)
 
-    sharded = workflow_metadata["calls"][task][0]["shardIndex"] != -1
+    shardstring = "" if shard.shard_index == -1 else f"-shard-{shard.shard_index}"
 
-    for i in range(len(shard_list)):
-        status = shard_list[i]["executionStatus"]
-        if "ALL" in status_keys or status in status_keys:
-            task_status_font = get_color_for_status_key(status)
+    logs = get_backend_logs(shard)
 
-            shardstring = (
-                "" if not sharded else "-shard-" + str(shard_list[i]["shardIndex"])
+    if cat_logs:
+        print(
+            colored(
+                f"\n\n\n{'=' * os.get_terminal_size().columns}\n{indent}{task}{shardstring}:\t{status}\t {logs}\n{'=' * os.get_terminal_size().columns}",
+                color=task_status_font,
             )
+        )
+        fs = gcsfs.GCSFileSystem()
+        if fs.exists(logs):
+            with fs.open(logs, "r") as f:
+                print(f.read())
+        else:
+            print(f"Unable to locate logs at {logs}.")
 
-            logs = get_backend_logs(shard_list[i])
+    else:
+        print(
+            colored(
+                f"{indent}{task}{shardstring}:\t{status}\t {logs}",
+                color=task_status_font,
+            )
+        )
 
-            if cat_logs:
-                print(
-                    colored(
-                        f"\n\n\n{'=' * os.get_terminal_size().columns}\n{indent}{task}{shardstring}:\t{status}\t {logs}\n{'=' * os.get_terminal_size().columns}",
-                        color=task_status_font,
-                    )
-                )
-                fs = gcsfs.GCSFileSystem()
-                if fs.exists(logs):
-                    with fs.open(logs, "r") as f:
-                        print(f.read())
-                else:
-                    print(f"Unable to locate logs at {logs}.")
-
-            else:
-                print(
-                    colored(
-                        f"{indent}{task}{shardstring}:\t{status}\t {logs}",
-                        color=task_status_font,
-                    )
-                )
-            did_print = True
-    return did_print
+    return True
 
 
-def get_backend_logs(task_instance: dict) -> str:
+def get_backend_logs(task_instance: metadata_record_utils.ShardRecord) -> str:
     """
     Gets the backend log for an instance of a task call
 
-    :param task_instance: Metadata info of a task instance
-        e.g. (workflow_metadata['calls'][SomeWorkflow.SomeTask][0])
+    :param task_instance: Record of a task instance
+        e.g. (workflow_record.calls[SomeWorkflow.SomeTask].shards[0])
     :return:
     """
-    if task_instance.get("backend") == "Local":
-        backend_logs = {"log": "Backend Logs Not Available Due to Local Execution"}
-
-    else:
-        backend_logs = task_instance.get(
-            "backendLogs", {"log": "Backend Logs Not Found"}
-        )
+    if task_instance.backend == "Local":
+        return "Backend Logs Not Available Due to Local Execution"
 
-    return backend_logs.get("log")
+    return task_instance.backend_log or "Backend Logs Not Found"
 
 
 if __name__ == "__main__":
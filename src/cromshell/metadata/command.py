@@ -1,13 +1,17 @@
 import logging
+import sys
+from pathlib import Path
+from typing import BinaryIO, Optional
 
 import click
-import requests
 
 from cromshell.utilities import (
     command_setup_utils,
     cromshellconfig,
     http_utils,
     io_utils,
+    metadata_export_utils,
+    metadata_utils,
 )
 
 LOGGER = logging.getLogger(__name__)
@@ -22,16 +26,74 @@ LOGGER = logging.getLogger(__name__)
     default=False,
     help="Do not expand subworkflow info in metadata",
 )
+@click.option(
+    "-e",
+    "--export",
+    "export_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Instead of printing the metadata, write one row per call (shard "
+    "attempt) of the workflow and its subworkflows to this file. The format "
+    "depends on the extension: .csv, .jsonl or .parquet (requires pyarrow).",
+)
+@click.option(
+    "-r",
+    "--raw",
+    is_flag=True,
+    default=False,
+    help="Write the metadata to stdout as the server sends it, without sorting, "
+    "indenting or coloring it. Much faster for large workflows, e.g. when "
+    "piping to jq.",
+)
 @click.pass_obj
-def main(config, workflow_id: str, dont_expand_subworkflows: bool):
+def main(
+    config,
+    workflow_id: str,
+    dont_expand_subworkflows: bool,
+    export_path: str,
+    raw: bool,
+):
     """Get the full metadata of a workflow."""
 
     LOGGER.info("metadata")
 
+    if export_path and raw:
+        raise click.UsageError("--raw can't be used with --export.")
+
     command_setup_utils.resolve_workflow_id_and_server(
         workflow_id=workflow_id, cromshell_config=config
     )
 
+    if export_path:
+        if Path(export_path).suffix not in metadata_export_utils.CALL_EXPORT_FORMATS:
+            raise click.BadParameter(
+                "Export file must end with one of: "
+                f"{', '.join(metadata_export_utils.CALL_EXPORT_FORMATS)}",
+                param_hint="--export",
+            )
+
+        workflow_metadata_json = format_metadata_params_and_get_metadata(
+            config=config,
+            metadata_param=metadata_export_utils.CALL_EXPORT_METADATA_KEYS,
+            exclude_keys=False,
+            dont_expand_subworkflows=dont_expand_subworkflows,
+        )
+        call_count = metadata_export_utils.write_call_rows(
+            metadata_export_utils.iter_call_rows(workflow_metadata_json),
+            output_path=export_path,
+        )
+        print(f"Exported {call_count} calls to {export_path}")
+
+        return 0
+
+    if raw:
+        format_metadata_params_and_stream_metadata(
+            config=config,
+            metadata_param=config.METADATA_KEYS_TO_OMIT,
+            exclude_keys=True,
+            dont_expand_subworkflows=dont_expand_subworkflows,
+        )
+        return 0
+
     workflow_metadata_json = format_metadata_params_and_get_metadata(
         config=config,
         metadata_param=config.METADATA_KEYS_TO_OMIT,
@@ -75,14 +137,32 @@ def get_workflow_metadata(
     timeout: int,
     verify_certs: bool,
     headers: map,
+    lazy_subworkflows: Optional[bool] = None,
 ) -> dict:
     """Uses requests to get the metadata or sub-metadata of a workflow
-    from the cromwell server and returns it as a dictionary."""
+    from the cromwell server and returns it as a dictionary.
+
+    If lazy_subworkflows (by default the lazy_subworkflows config option) is set
+    and the parameters ask to expand subworkflows, they are expanded by
+    get_workflow_metadata_lazily instead of by the server."""
+
+    if lazy_subworkflows is None:
+        lazy_subworkflows = cromshellconfig.lazy_subworkflows
+    if lazy_subworkflows and meta_params.get("expandSubWorkflows") == "true":
+        return get_workflow_metadata_lazily(
+            meta_params=meta_params,
+            api_workflow_id=api_workflow_id,
+            timeout=timeout,
+            verify_certs=verify_certs,
+            headers=headers,
+        )
 
-    requests_out = requests.get(
+    requests_out = http_utils.send_request(
+        "GET",
         f"{api_workflow_id}/metadata",
         params=meta_params,
         timeout=timeout,
+        read_timeout=cromshellconfig.metadata_read_timeout,
         verify=verify_certs,
         headers=headers,
     )
@@ -94,6 +174,124 @@ def get_workflow_metadata(
     return requests_out.json()
 
 
+def get_workflow_metadata_lazily(
+    meta_params: dict,
+    api_workflow_id: str,
+    timeout: int,
+    verify_certs: bool,
+    headers: map,
+) -> dict:
+    """
+    Get the metadata of a workflow with its subworkflows expanded, without asking
+    the server to expand them: the metadata of the workflow is fetched without its
+    subworkflows, then the metadata of the subworkflows it runs, concurrently and
+    one level of nesting at a time, and each subWorkflowId is replaced by the
+    subWorkflowMetadata, as in the metadata expanded by the server. The requests
+    of a level are sent at once with http_utils.send_requests.
+
+    Many small requests avoid the server timeouts and metadata size limits hit
+    when the server assembles the expanded metadata of a large workflow.
+
+    :param meta_params: Metadata parameters, see format_metadata_params
+    :param api_workflow_id: Cromwell API URL of the workflow
+    :param timeout: Timeout of each request in seconds
+    :param verify_certs: Whether to verify the TLS certificate of the server
+    :param headers: Headers of the requests
+    :return: Workflow metadata with expanded subworkflows
+    """
+
+    meta_params = {
+        key: value for key, value in meta_params.items() if key != "expandSubWorkflows"
+    }
+    # The ids of the subworkflows are needed to fetch them
+    if "subWorkflowId" not in meta_params.get("includeKey", ["subWorkflowId"]):
+        meta_params["includeKey"] = [*meta_params["includeKey"], "subWorkflowId"]
+    if "subWorkflowId" in meta_params.get("excludeKey", []):
+        meta_params["excludeKey"] = [
+            key for key in meta_params["excludeKey"] if key != "subWorkflowId"
+        ]
+    # Subworkflows are served by the same endpoint as workflows
+    api_workflows = api_workflow_id.rsplit("/", 1)[0]
+
+    workflow_metadata = get_workflow_metadata(
+        meta_params=meta_params,
+        api_workflow_id=api_workflow_id,
+        timeout=timeout,
+        verify_certs=verify_certs,
+        headers=headers,
+        lazy_subworkflows=False,
+    )
+
+    depth = 0
+    workflows = [workflow_metadata]
+    while workflows:
+        subworkflow_shards = [
+            shard
+            for workflow in workflows
+            for _, _, shard in metadata_utils.walk_workflow_calls(
+                workflow, expand_subworkflows=False
+            )
+            if "subWorkflowId" in shard
+        ]
+        LOGGER.info(
+            "Fetching the metadata of %d subworkflows at depth %d",
+            len(subworkflow_shards),
+            depth + 1,
+        )
+        responses = http_utils.send_requests(
+            "GET",
+            [
+                f"{api_workflows}/{shard['subWorkflowId']}/metadata"
+                for shard in subworkflow_shards
+            ],
+            params=meta_params,
+            timeout=timeout,
+            read_timeout=cromshellconfig.metadata_read_timeout,
+            verify=verify_certs,
+            headers=headers,
+        )
+        workflows = []
+        for shard, response in zip(subworkflow_shards, responses):
+            http_utils.check_http_request_status_code(
+                short_error_message="Failed to get subworkflow metadata",
+                response=response,
+            )
+            del shard["subWorkflowId"]
+            shard["subWorkflowMetadata"] = response.json()
+            workflows.append(shard["subWorkflowMetadata"])
+        depth += 1
+
+    return workflow_metadata
+
+
+def stream_workflow_metadata(
+    meta_params: dict,
+    api_workflow_id: str,
+    timeout: int,
+    verify_certs: bool,
+    headers: map,
+    output: BinaryIO,
+) -> None:
+    """Uses requests to get the metadata or sub-metadata of a workflow
+    from the cromwell server and writes the response to output as it is
+    received, without parsing it."""
+
+    with http_utils.send_request(
+        "GET",
+        f"{api_workflow_id}/metadata",
+        params=meta_params,
+        timeout=timeout,
+        read_timeout=cromshellconfig.metadata_read_timeout,
+        verify=verify_certs,
+        headers=headers,
+        stream=True,
+    ) as requests_out:
+        http_utils.check_http_request_status_code(
+            short_error_message="Failed to get metadata", response=requests_out
+        )
+        http_utils.write_response_content(response=requests_out, output=output)
+
+
 def format_metadata_params_and_get_metadata(
     config: object,
     exclude_keys: bool,
@@ -125,3 +323,38 @@ def format_metadata_params_and_get_metadata(
         verify_certs=config.requests_verify_certs,
         headers=http_utils.generate_headers(config),
     )
+
+
+def format_metadata_params_and_stream_metadata(
+    config: object,
+    exclude_keys: bool,
+    metadata_param: list = cromshellconfig.METADATA_KEYS_TO_OMIT,
+    dont_expand_subworkflows: bool = False,
+    output: Optional[BinaryIO] = None,
+) -> None:
+    """
+    Format metadata parameters and write the metadata from the cromwell server
+    to output, unparsed
+
+    :param config: cromshell config object
+    :param exclude_keys: Whether to the given keys should be excluded from the metadata
+    :param metadata_param: Keys present in the workflow metadata
+    :param dont_expand_subworkflows: Whether to the included subworkflow metadata
+    :param output: Binary file to write the metadata to, stdout by default
+    :return:
+    """
+
+    formatted_metadata_parameter = format_metadata_params(
+        list_of_keys=metadata_param,
+        exclude_keys=exclude_keys,
+        expand_subworkflows=not dont_expand_subworkflows,  # Invert variable
+    )
+
+    stream_workflow_metadata(
+        meta_params=formatted_metadata_parameter,
+        api_workflow_id=config.cromwell_api_workflow_id,
+        timeout=config.requests_connect_timeout,
+        verify_certs=config.requests_verify_certs,
+        headers=http_utils.generate_headers(config),
+        output=output or sys.stdout.buffer,
+    )
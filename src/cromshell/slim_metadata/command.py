@@ -32,6 +32,14 @@ LOGGER = logging.getLogger(__name__)
     help="Toggle to either include or exclude keys that are specified "
     "by the --keys option or in the cromshell config JSON.",
 )
+@click.option(
+    "-r",
+    "--raw",
+    is_flag=True,
+    default=False,
+    help="Write the metadata to stdout as the server sends it, without sorting, "
+    "indenting or coloring it.",
+)
 @click.pass_obj
 def main(
     config,
@@ -39,6 +47,7 @@ def main(
     keys: list,
     dont_expand_subworkflows: bool,
     exclude_keys: bool,
+    raw: bool,
 ):
     """Get a subset of the workflow metadata."""
 
@@ -62,6 +71,15 @@ def main(
     key_action = "include" if not exclude_keys else "exclude"
     LOGGER.info("Metadata keys set to %s: %s", key_action, metadata_parameter)
 
+    if raw:
+        metadata_command.format_metadata_params_and_stream_metadata(
+            config=config,
+            metadata_param=metadata_parameter,
+            exclude_keys=exclude_keys,
+            dont_expand_subworkflows=dont_expand_subworkflows,
+        )
+        return 0
+
     workflow_metadata_json = metadata_command.format_metadata_params_and_get_metadata(
         config=config,
         metadata_param=metadata_parameter,
@@ -2,13 +2,17 @@ import json
 import logging
 
 import click
-import requests
 
 import cromshell.utilities.submissions_file_utils
 import cromshell.utilities.workflow_status_utils as wsu
 from cromshell import log
 from cromshell.metadata import command as metadata_command
-from cromshell.utilities import command_setup_utils, http_utils, io_utils
+from cromshell.utilities import (
+    command_setup_utils,
+    http_utils,
+    io_utils,
+    metadata_record_utils,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -28,7 +32,8 @@ def main(config, workflow_id):
     )
 
     # Request workflow status
-    request_out = requests.get(
+    request_out = http_utils.send_request(
+        "GET",
         f"{config.cromwell_api_workflow_id}/status",
         timeout=config.requests_connect_timeout,
         verify=config.requests_verify_certs,
@@ -58,19 +63,19 @@ def main(config, workflow_id):
             expand_subworkflows=True,
         )
 
-        request_meta_out = requests.get(
-            f"{config.cromwell_api_workflow_id}/metadata",
-            params=formatted_metadata_parameter,
+        workflow_metadata = metadata_command.get_workflow_metadata(
+            meta_params=formatted_metadata_parameter,
+            api_workflow_id=config.cromwell_api_workflow_id,
             timeout=config.requests_connect_timeout,
-            verify=config.requests_verify_certs,
+            verify_certs=config.requests_verify_certs,
             headers=http_utils.generate_headers(config),
         )
 
-        # metadata holds the workflow metadata as a dictionary
-        metadata = json.loads(request_meta_out.content.decode("utf-8"))
+        # Only keep the compact record of the calls of the workflow metadata
+        workflow_record = metadata_record_utils.build_workflow_record(workflow_metadata)
 
         # Check for failures:
-        if not workflow_failed(metadata):
+        if not workflow_failed(workflow_record):
             # We could not find 'Fail' in our metadata, so our
             # original Running status is correct.
             log.display_logo(io_utils.turtle)
@@ -109,47 +114,29 @@ def main(config, workflow_id):
     return ret_val
 
 
-def workflow_failed(metadata: dict) -> bool:
-    """Checks a workflow metadata dictionary for failing statuses
+def workflow_failed(workflow_record: metadata_record_utils.WorkflowRecord) -> bool:
+    """Checks a workflow record for failing statuses
     Returns True to indicate workflow or some task(s) has failed"""
 
-    # If the given dictionary contains a 'status' key and has value of "Failed"
-    # then exit the function returning "True" to indicate workflow has failed
-    if metadata.get("status") == wsu.WorkflowStatuses.FAILED.value[0]:
+    failed_status = wsu.WorkflowStatuses.FAILED.value[0]
+
+    # If the workflow status is "Failed" then exit the function returning
+    # "True" to indicate workflow has failed
+    if workflow_record.status == failed_status:
         return True
 
-    # If the dictionary does not contain a failed value for its status key or
-    # if status key does does not exist then we'll iterate through the dictionary
-    # value in search of a nested dictionary (indicating subworkflows)
-    # or a list which holds the task statuses.
-    for value in metadata.values():
-        # If a dictionary value is encountered then Depth First Search recursion
-        # is used to traverse the dictionary by iterating through the given dictionary
-        # and reporting whether it found a failure. The reason for this is due to the
-        # tree structure of the metadata dictionary which holds the task statuses
-        # in a nested dictionary key called "calls".
-        if isinstance(value, dict):
-            if workflow_failed(value):
+    # Otherwise look for a failed shard of a task, or a failed subworkflow,
+    # anywhere in the workflow
+    for _, call_record in metadata_record_utils.iter_call_records(workflow_record):
+        if call_record.subworkflows:
+            if any(
+                subworkflow.status == failed_status
+                for subworkflow in call_record.subworkflows
+            ):
                 return True
+        elif call_record.get_shard_indices_with_status(failed_status):
+            return True
 
-        # If a list value is encountered then the dictionary being traversed through is
-        # a key and value pair where the key is the task name and the value is the
-        # number of times the task was executed (shard), which is normally 1 unless the
-        # task was scattered. Hence the value for the key is a list to account
-        # for all the shards for a task. Each item(shard) within this list is a
-        # dictionary holding status for the shard.
-        # We'll want to check each shard to determine whether it's status has "Failed".
-        elif isinstance(value, list):
-            for shard in value:
-                # If a key in the shard is labeled "subWorkflowMetadata", then this
-                # will contain another dictionary layer of subworkflow tasks that will
-                # require traversal.
-                if "subWorkflowMetadata" in shard.keys():
-                    if workflow_failed(shard["subWorkflowMetadata"]):
-                        return True
-                else:
-                    if shard["executionStatus"] == wsu.WorkflowStatuses.FAILED.value[0]:
-                        return True
     return False
 
 
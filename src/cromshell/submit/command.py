@@ -1,20 +1,25 @@
 import contextlib
 import csv
+import functools
 import json
 import logging
 import tempfile
 from datetime import datetime
 from pathlib import Path, PurePath
+from typing import Optional, Tuple
 
 import click
-import requests
 from requests import Response
 
-import cromshell.utilities.miniwdl_utils as miniwdl
-import cromshell.utilities.womtool_utils as womtool_utils
 import cromshell.utilities.workflow_status_utils
 from cromshell import log
-from cromshell.utilities import cromshellconfig, http_utils, io_utils
+from cromshell.utilities import (
+    cromshellconfig,
+    http_utils,
+    io_utils,
+    validation_cache_utils,
+    validation_utils,
+)
 from cromshell.utilities.io_utils import dead_turtle
 
 LOGGER = logging.getLogger(__name__)
@@ -68,6 +73,13 @@ class ValidationFailedError(Exception):
     default=False,
     help=".",
 )
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    default=False,
+    help="Stop validating as soon as one validator fails instead of waiting "
+    "for the other one to finish.",
+)
 @click.pass_obj
 def main(
     config,
@@ -77,6 +89,7 @@ def main(
     dependencies_zip,
     no_validation,
     do_not_flatten_wdls,
+    fail_fast,
 ):
     """Submit a workflow and arguments to the Cromwell Server"""
 
@@ -84,13 +97,13 @@ def main(
 
     http_utils.assert_can_communicate_with_server(config=config)
 
-    if not do_not_flatten_wdls and io_utils.has_nested_dependencies(wdl):
-        tempdir = tempfile.TemporaryDirectory(prefix="cromshell_")
-
-        LOGGER.info(f"Flattening WDL structure to {tempdir.name}.")
-
-        wdl = io_utils.flatten_nested_dependencies(tempdir, wdl)
-        dependencies_zip = tempdir.name
+    # The temporary directory is removed once tempdir is garbage collected,
+    # so it's held until the end of the submission.
+    wdl, dependencies_zip, tempdir = flatten_wdl_if_needed(
+        wdl=wdl,
+        dependencies_zip=dependencies_zip,
+        do_not_flatten_wdls=do_not_flatten_wdls,
+    )
 
     if no_validation:
         LOGGER.info("Skipping WDL validation")
@@ -101,6 +114,7 @@ def main(
             options_json=options_json,
             dependencies_zip=dependencies_zip,
             config=config,
+            fail_fast=fail_fast,
         )
 
     LOGGER.info("Submitting job to server: %s", cromshellconfig.cromwell_server)
@@ -135,15 +149,45 @@ def main(
     return 0
 
 
+def flatten_wdl_if_needed(
+    wdl: str, dependencies_zip: str, do_not_flatten_wdls: bool
+) -> Tuple[str, str, Optional[tempfile.TemporaryDirectory]]:
+    """
+    Flattens the WDL's nested imports into a temporary directory, which then
+    replaces the dependencies zip.
+
+    :return: The WDL and dependencies to submit, and the temporary directory
+    holding the flattened WDLs (None if the WDL was not flattened)
+    """
+
+    if do_not_flatten_wdls:
+        return wdl, dependencies_zip, None
+
+    # Each WDL of the import tree is read once, for both the check and the
+    # flattening
+    import_graph = io_utils.get_wdl_import_graph(wdl)
+    if not io_utils.has_nested_dependencies(wdl, import_graph=import_graph):
+        return wdl, dependencies_zip, None
+
+    tempdir = tempfile.TemporaryDirectory(prefix="cromshell_")
+
+    LOGGER.info(f"Flattening WDL structure to {tempdir.name}.")
+
+    wdl = io_utils.flatten_nested_dependencies(tempdir, wdl, import_graph=import_graph)
+
+    return wdl, tempdir.name, tempdir
+
+
 def validate_input(
     wdl: str,
     wdl_json: str,
     options_json: str,
     dependencies_zip: str,
     config: cromshellconfig,
+    fail_fast: bool = False,
 ) -> None:
-    """Asserts files are not empty and if womtool is
-    in path validates WDL and WDL input JSON"""
+    """Asserts files are not empty and validates the WDL and WDL input JSON
+    with womtool and miniwdl, concurrently"""
 
     io_utils.assert_path_is_not_empty(path=wdl, description="WDL")
     io_utils.assert_path_is_not_empty(path=wdl_json, description="Input JSON")
@@ -154,18 +198,58 @@ def validate_input(
             path=dependencies_zip, description="Dependencies Zip"
         )
 
+    # A repeat submission of byte-identical files skips both validators
+    validator_versions = validation_cache_utils.get_validator_versions(
+        config=config, use_miniwdl=True, use_womtool=dependencies_zip is None
+    )
+    cache_key = (
+        None
+        if validator_versions is None
+        else validation_cache_utils.get_validation_cache_key(
+            wdl=wdl,
+            wdl_json=wdl_json,
+            dependencies=dependencies_zip,
+            validator_versions=validator_versions,
+            validation_options={"strict": False, "suppress": []},
+        )
+    )
+    cache_dir = validation_cache_utils.get_validation_cache_dir(config)
+    if validation_cache_utils.is_validation_cached(cache_key, cache_dir):
+        LOGGER.info("Skipping validation, these files were previously validated.")
+        return
+
+    validators = {}
     if dependencies_zip is None:
-        womtool_utils.womtool_validate_wdl_and_json(
-            wdl=wdl, wdl_json=wdl_json, config=config
+        validators["womtool"] = functools.partial(
+            validation_utils.validate_with_womtool,
+            wdl=wdl,
+            wdl_json=wdl_json,
+            config=config,
         )
     else:
         # See: https://github.com/broadinstitute/cromshell/issues/139
         LOGGER.debug("Skipping validation of WDL plus a dependencies zip")
+    validators["miniwdl"] = functools.partial(
+        validation_utils.validate_with_miniwdl, wdl=Path(wdl), show_warnings=False
+    )
 
-    if miniwdl.miniwdl_validate_wdl(wdl=Path(wdl), show_warnings=False) == 0:
-        LOGGER.debug("Miniwdl validation passed.")
-    else:
-        raise ValidationFailedError("MiniWDL Validation failed.")
+    # The womtool request and miniwdl run concurrently
+    validation_results = validation_utils.run_validators(
+        validators=validators, fail_fast=fail_fast
+    )
+    if validation_utils.validation_failed(validation_results):
+        validation_utils.print_validation_report(validation_results)
+        raise ValidationFailedError(
+            "Validation failed: "
+            + ", ".join(
+                name for name, error in validation_results.items() if error is not None
+            )
+        )
+    LOGGER.debug("Validation passed.")
+
+    validation_cache_utils.cache_validation_success(
+        cache_key=cache_key, cache_dir=cache_dir, wdl=wdl
+    )
 
 
 def submit_workflow_to_server(
@@ -184,44 +268,66 @@ def submit_workflow_to_server(
     # handler, which avoids errors if optional files are NONE.
     with open(wdl, "rb") as wdl_file, open(wdl_json, "rb") as wdl_json_file, (
         open(options_json, "rb") if options_json is not None else none_context
-    ) as options_file, io_utils.open_or_zip(dependencies_zip) as dependencies_file:
+    ) as options_file, io_utils.open_or_zip(
+        dependencies_zip, cache_dir=get_dependency_zip_cache_dir(config)
+    ) as dependencies_file:
         submission_params = {
             "workflowSource": wdl_file,
             "workflowInputs": wdl_json_file,
+            "workflowOptions": options_file,
+            "workflowDependencies": dependencies_file,
         }
-        if options_json is not None:
-            submission_params["workflowOptions"] = options_file
-        if dependencies_zip is not None:
-            submission_params["workflowDependencies"] = dependencies_file
-
-        requests_out = requests.post(
-            f"{config.get_cromwell_api()}",
-            files=submission_params,
-            timeout=config.requests_connect_timeout,
-            verify=config.requests_verify_certs,
-            headers=http_utils.generate_headers(config),
+
+        # The files are streamed to the server rather than loaded in memory
+        requests_out = http_utils.post_multipart_form_data(
+            url=f"{config.get_cromwell_api()}",
+            fields=submission_params,
+            config=config,
         )
 
         return requests_out
 
 
+def get_dependency_zip_cache_dir(config: cromshellconfig) -> Path:
+    """Directory holding previously built zips of dependency directories"""
+
+    return Path(config.config_dir).joinpath(config.DEPENDENCY_ZIP_CACHE_DIR_NAME)
+
+
 def add_submission_to_all_database_tsv(
     cromwell_server: str, submissions_file: str, wdl: str, workflow_status: dict
 ) -> None:
     """Update the submission file with recently submitted job"""
 
-    submission_row = [
-        datetime.now().strftime("%Y%m%d_%H%M%S"),
-        cromwell_server,
-        workflow_status["id"],
-        PurePath(wdl).name,
-        workflow_status["status"],
-        "",  # Placeholder for Alias column
+    add_submissions_to_all_database_tsv(
+        cromwell_server=cromwell_server,
+        submissions_file=submissions_file,
+        wdl=wdl,
+        workflow_statuses=[workflow_status],
+    )
+
+
+def add_submissions_to_all_database_tsv(
+    cromwell_server: str, submissions_file: str, wdl: str, workflow_statuses: list
+) -> None:
+    """Update the submission file with recently submitted jobs in a single write"""
+
+    submission_date = datetime.now().strftime("%Y%m%d_%H%M%S")
+    submission_rows = [
+        [
+            submission_date,
+            cromwell_server,
+            workflow_status["id"],
+            PurePath(wdl).name,
+            workflow_status["status"],
+            "",  # Placeholder for Alias column
+        ]
+        for workflow_status in workflow_statuses
     ]
 
     with open(submissions_file, "a") as sub_f:
         writer = csv.writer(sub_f, delimiter="\t", lineterminator="\n")
-        writer.writerow(submission_row)
+        writer.writerows(submission_rows)
 
 
 def post_submission_checks(request_out: Response, workflow_status: dict) -> None:
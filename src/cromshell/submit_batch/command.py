@@ -0,0 +1,427 @@
+import contextlib
+import csv
+import json
+import logging
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import Iterator, List
+
+import click
+from requests import Response
+
+from cromshell import log
+from cromshell.submit import command as submit_command
+from cromshell.utilities import (
+    cromshellconfig,
+    http_utils,
+    io_utils,
+    workflow_status_utils,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BatchSubmissionError(Exception):
+    """Raised when the server response to a batch submission is not as expected"""
+
+
+@click.command(name="submit-batch")
+@click.argument("wdl", type=click.Path(exists=True), required=True)
+@click.argument("inputs", type=click.Path(exists=True), required=True, nargs=-1)
+@click.option(
+    "-op",
+    "--options-json",
+    type=click.Path(exists=True),
+    required=False,
+    help="JSON file containing configuration options "
+    "for the execution of the workflows.",
+)
+@click.option(
+    "-d",
+    "--dependencies-zip",
+    type=click.Path(exists=True),
+    required=False,
+    help="ZIP file or directory containing workflow source files that are "
+    "used to resolve local imports. This zip bundle will be "
+    "unpacked in a sandbox accessible to the workflows.",
+)
+@click.option(
+    "-n",
+    "--no-validation",
+    is_flag=True,
+    default=False,
+    help="Do not validate the WDL and inputs before submitting.",
+)
+@click.option(
+    "--do-not-flatten-wdls",
+    is_flag=True,
+    default=False,
+    help="Do not flatten WDLs with nested imports before submitting.",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    default=False,
+    help="Stop validating as soon as one validator fails instead of waiting "
+    "for the other one to finish.",
+)
+@click.option(
+    "-c",
+    "--chunk-size",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="Number of workflows submitted per request to the server.",
+)
+@click.pass_obj
+def main(
+    config,
+    wdl,
+    inputs,
+    options_json,
+    dependencies_zip,
+    no_validation,
+    do_not_flatten_wdls,
+    fail_fast,
+    chunk_size,
+):
+    """
+    Submit a workflow once for each of many sets of inputs.
+
+    INPUTS can be one or more input JSON files, each holding either the inputs
+    of one workflow or a JSON list of inputs, or TSV files with a header row of
+    input names (e.g. 'MyWorkflow.sample') and one row of values per workflow.
+    TSV values holding a JSON array or object are parsed, the others are passed
+    as strings.
+
+    The WDL is flattened, validated and zipped once, and the workflows are
+    submitted through the Cromwell batch endpoint in chunks.
+    """
+
+    LOGGER.info("submit-batch")
+
+    workflow_inputs = load_batch_inputs(inputs)
+    LOGGER.info("Loaded %d sets of workflow inputs", len(workflow_inputs))
+
+    http_utils.assert_can_communicate_with_server(config=config)
+
+    # The temporary directory is removed once tempdir is garbage collected,
+    # so it's held until the end of the submission.
+    wdl, dependencies_zip, tempdir = submit_command.flatten_wdl_if_needed(
+        wdl=wdl,
+        dependencies_zip=dependencies_zip,
+        do_not_flatten_wdls=do_not_flatten_wdls,
+    )
+
+    if no_validation:
+        LOGGER.info("Skipping WDL validation")
+    else:
+        validate_batch_inputs(
+            wdl=wdl,
+            workflow_inputs=workflow_inputs,
+            options_json=options_json,
+            dependencies_zip=dependencies_zip,
+            config=config,
+            fail_fast=fail_fast,
+        )
+
+    LOGGER.info(
+        "Submitting %d workflows to server: %s",
+        len(workflow_inputs),
+        cromshellconfig.cromwell_server,
+    )
+    workflow_statuses = []
+    try:
+        for chunk_statuses in submit_batch_to_server(
+            wdl=wdl,
+            workflow_inputs=workflow_inputs,
+            options_json=options_json,
+            dependencies_zip=dependencies_zip,
+            chunk_size=chunk_size,
+            config=config,
+        ):
+            workflow_statuses.extend(chunk_statuses)
+    finally:
+        # Track every workflow that made it to the server, even if a
+        # later chunk failed or the server rejected some workflows.
+        if workflow_statuses:
+            post_batch_submission_logging(
+                wdl=wdl,
+                workflow_inputs=workflow_inputs,
+                options_json=options_json,
+                config=config,
+                workflow_statuses=workflow_statuses,
+            )
+
+    check_submitted_workflows(workflow_statuses=workflow_statuses)
+
+    log.display_logo(logo=io_utils.turtle)
+    io_utils.pretty_print_json(format_json=workflow_statuses)
+
+    return 0
+
+
+def load_batch_inputs(input_paths: List[str]) -> List[dict]:
+    """
+    Load the sets of workflow inputs from JSON and TSV files.
+
+    A JSON file holds either a single inputs object or a list of them. A TSV
+    file has a header row of input names and one row of values per workflow,
+    values holding a JSON array or object are parsed and the others are used as
+    strings (see parse_tsv_value).
+
+    :param input_paths: Paths to JSON or TSV input files
+    :return: List of workflow inputs dictionaries
+    """
+
+    workflow_inputs = []
+
+    for input_path in input_paths:
+        if Path(input_path).suffix.lower() == ".tsv":
+            workflow_inputs.extend(load_tsv_inputs(input_path))
+            continue
+
+        with open(input_path, "r") as f:
+            loaded_inputs = json.load(f)
+
+        for inputs in (
+            loaded_inputs if isinstance(loaded_inputs, list) else [loaded_inputs]
+        ):
+            if not isinstance(inputs, dict):
+                raise ValueError(
+                    f"Expected a JSON object of workflow inputs in {input_path}, "
+                    f"but found: {inputs}"
+                )
+            workflow_inputs.append(inputs)
+
+    if not workflow_inputs:
+        raise ValueError("No workflow inputs were found in the input files.")
+
+    return workflow_inputs
+
+
+def load_tsv_inputs(tsv_path: str) -> List[dict]:
+    """Load one workflow inputs dictionary per row of a TSV file"""
+
+    with open(tsv_path, "r") as f:
+        reader = csv.DictReader(f, delimiter="\t")
+        return [
+            {name: parse_tsv_value(value) for name, value in row.items()}
+            for row in reader
+        ]
+
+
+def parse_tsv_value(value: str):
+    """
+    Parse a TSV cell holding a JSON array or object, other cells are kept as
+    strings: a String input such as a numeric sample id must not become a number,
+    and Cromwell converts strings to Int, Float and Boolean inputs.
+    """
+
+    if value.lstrip().startswith(("[", "{")):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+
+    return value
+
+
+def validate_batch_inputs(
+    wdl: str,
+    workflow_inputs: List[dict],
+    options_json: str,
+    dependencies_zip: str,
+    config,
+    fail_fast: bool = False,
+) -> None:
+    """
+    Validate the WDL against the batch inputs.
+
+    Validation runs once for each distinct set of input names (normally only
+    once, as every row of a TSV shares the same names) instead of once per
+    workflow.
+    """
+
+    validated_input_names = set()
+
+    with tempfile.TemporaryDirectory(prefix="cromshell_") as tmp_dir:
+        for inputs in workflow_inputs:
+            input_names = frozenset(inputs)
+            if input_names in validated_input_names:
+                continue
+
+            inputs_json = Path(tmp_dir).joinpath(
+                f"inputs_{len(validated_input_names)}.json"
+            )
+            inputs_json.write_text(json.dumps(inputs))
+
+            submit_command.validate_input(
+                wdl=wdl,
+                wdl_json=str(inputs_json),
+                options_json=options_json,
+                dependencies_zip=dependencies_zip,
+                config=config,
+                fail_fast=fail_fast,
+            )
+            validated_input_names.add(input_names)
+
+
+def submit_batch_to_server(
+    wdl: str,
+    workflow_inputs: List[dict],
+    options_json: str,
+    dependencies_zip: str,
+    chunk_size: int,
+    config,
+) -> Iterator[List[dict]]:
+    """
+    Submits the workflows to the Cromwell batch endpoint, chunk_size workflows
+    per request. The WDL, options and dependencies zip are built once and
+    re-sent with each chunk.
+
+    :return: Yields the statuses ({"id": ..., "status": ...}) of the
+    workflows of each submitted chunk
+    """
+
+    none_context = contextlib.nullcontext()  # Give to file handler if file is None
+    with open(wdl, "rb") as wdl_file, (
+        open(options_json, "rb") if options_json is not None else none_context
+    ) as options_file, io_utils.open_or_zip(
+        dependencies_zip, cache_dir=submit_command.get_dependency_zip_cache_dir(config)
+    ) as dependencies_file:
+        for chunk_start in range(0, len(workflow_inputs), chunk_size):
+            chunk_inputs = workflow_inputs[chunk_start : chunk_start + chunk_size]
+            LOGGER.info(
+                "Submitting workflows %d to %d",
+                chunk_start + 1,
+                chunk_start + len(chunk_inputs),
+            )
+
+            for file_obj in [wdl_file, options_file, dependencies_file]:
+                if file_obj is not None:
+                    file_obj.seek(0)
+
+            request_out = http_utils.post_multipart_form_data(
+                url=f"{config.get_cromwell_api()}/batch",
+                fields={
+                    "workflowSource": wdl_file,
+                    "workflowInputs": BytesIO(json.dumps(chunk_inputs).encode()),
+                    "workflowOptions": options_file,
+                    "workflowDependencies": dependencies_file,
+                },
+                config=config,
+            )
+
+            yield check_batch_response(
+                request_out=request_out, expected_count=len(chunk_inputs)
+            )
+
+
+def check_batch_response(request_out: Response, expected_count: int) -> List[dict]:
+    """
+    Checks the server answered a batch submission with the status of each of
+    its workflows. Whether it accepted each workflow is checked by
+    check_submitted_workflows, once the workflows are tracked.
+
+    :param request_out: Response of the batch submission request
+    :param expected_count: Number of workflows in the batch
+    :return: List of workflow statuses
+    """
+
+    http_utils.check_http_request_status_code(
+        short_error_message="Failed to Submit Workflow Batch", response=request_out
+    )
+
+    workflow_statuses = request_out.json()
+
+    if not isinstance(workflow_statuses, list) or (
+        len(workflow_statuses) != expected_count
+    ):
+        raise BatchSubmissionError(
+            f"Expected {expected_count} workflow statuses from the server but got: "
+            f"{request_out.text}"
+        )
+
+    return workflow_statuses
+
+
+def is_workflow_tracked(workflow_status: dict) -> bool:
+    """Whether a submitted workflow has an id to track it by"""
+
+    return io_utils.is_workflow_id_valid(str(workflow_status.get("id")))
+
+
+def check_submitted_workflows(workflow_statuses: List[dict]) -> None:
+    """
+    Checks the server accepted every workflow of a batch submission, i.e.
+    gave it an id and the Submitted status.
+
+    :param workflow_statuses: Statuses of the submitted workflows
+    :return:
+    """
+
+    rejected_statuses = [
+        workflow_status
+        for workflow_status in workflow_statuses
+        if workflow_status.get("status")
+        not in workflow_status_utils.WorkflowStatuses.SUBMITTED.value
+        or not is_workflow_tracked(workflow_status)
+    ]
+
+    if rejected_statuses:
+        log.display_logo(logo=io_utils.dead_turtle)
+
+        LOGGER.error(
+            "Error: Server reports %d of %d workflows were not properly submitted.",
+            len(rejected_statuses),
+            len(workflow_statuses),
+        )
+        LOGGER.error("Cromshell Server Message: %s", json.dumps(rejected_statuses))
+        raise BatchSubmissionError(
+            f"Error: Server reports {len(rejected_statuses)} of "
+            f"{len(workflow_statuses)} workflows were not properly submitted.\n"
+            f"Cromshell Server Message: {json.dumps(rejected_statuses)}"
+        )
+
+
+def post_batch_submission_logging(
+    wdl: str,
+    workflow_inputs: List[dict],
+    options_json: str,
+    config,
+    workflow_statuses: List[dict],
+) -> None:
+    """
+    Saves the WDL, options and inputs of each submitted workflow to its local
+    directory and adds all the submissions to the submission database tsv in
+    a single write. Workflows the server didn't give an id are skipped.
+    """
+
+    server_folder_name = config.get_local_folder_name()
+
+    tracked_submissions = [
+        (workflow_status, inputs)
+        for workflow_status, inputs in zip(workflow_statuses, workflow_inputs)
+        if is_workflow_tracked(workflow_status)
+    ]
+
+    for workflow_status, inputs in tracked_submissions:
+        run_directory = Path(config.config_dir).joinpath(
+            server_folder_name, workflow_status["id"]
+        )
+        io_utils.create_directory(dir_path=run_directory)
+        io_utils.copy_files_to_directory(
+            directory=run_directory, inputs=[wdl, options_json]
+        )
+        run_directory.joinpath("inputs.json").write_text(json.dumps(inputs, indent=2))
+
+    submit_command.add_submissions_to_all_database_tsv(
+        cromwell_server=config.cromwell_server,
+        submissions_file=config.submission_file_path,
+        wdl=wdl,
+        workflow_statuses=[
+            workflow_status for workflow_status, _ in tracked_submissions
+        ],
+    )
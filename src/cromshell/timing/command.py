@@ -1,27 +1,132 @@
+import json
 import logging
 import webbrowser
 
 import click
+from tabulate import tabulate
 
+import cromshell.metadata.command as metadata
 from cromshell import log
-from cromshell.utilities import command_setup_utils, io_utils
+from cromshell.utilities import (
+    command_setup_utils,
+    io_utils,
+    timing_diagram_utils,
+    timing_utils,
+)
 
 LOGGER = logging.getLogger(__name__)
 
 
 @click.command(name="timing")
-@click.argument("workflow_id")
+@click.argument("workflow_id", required=False)
+@click.option(
+    "-r",
+    "--report",
+    is_flag=True,
+    default=False,
+    help="Compute the timing report of the workflow from its metadata instead of "
+    "opening the timing diagram in a browser.",
+)
+@click.option(
+    "-j",
+    "--json-report",
+    is_flag=True,
+    default=False,
+    help="Print the timing report as JSON.",
+)
+@click.option(
+    "-n",
+    "--longest-shards",
+    type=click.IntRange(min=0),
+    default=timing_utils.DEFAULT_LONGEST_SHARDS,
+    show_default=True,
+    help="Number of longest running calls in the timing report.",
+)
+@click.option(
+    "-e",
+    "--export",
+    "export_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write a self-contained timing diagram to this file, as SVG if it ends "
+    "with '.svg', HTML otherwise.",
+)
+@click.option(
+    "-m",
+    "--metadata-file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Read the workflow metadata (with expanded subworkflows) from this JSON "
+    "file, e.g. saved with 'cromshell metadata', instead of the server.",
+)
 @click.pass_obj
-def main(config, workflow_id):
-    """Open the timing diagram in a browser"""
+def main(
+    config,
+    workflow_id,
+    report: bool,
+    json_report: bool,
+    longest_shards: int,
+    export_path: str,
+    metadata_file: str,
+):
+    """Open the timing diagram in a browser, or print a timing report
+
+    The report includes the wall time, queue time and CPU hours of each task,
+    the critical path (the chain of calls that determined when the workflow
+    finished) and the longest running calls.
+
+    The diagram exported with --export draws large scatters as the number of
+    shards running over time, so its size is bounded and it opens quickly
+    even for workflows with hundreds of thousands of shards.
+    """
 
     LOGGER.info("timing")
 
     ret_val = 0
 
-    command_setup_utils.resolve_workflow_id_and_server(
-        workflow_id=workflow_id, cromshell_config=config
-    )
+    if metadata_file is None and workflow_id is None:
+        raise click.UsageError("Provide a workflow id or a --metadata-file.")
+    if metadata_file is not None and not (report or json_report or export_path):
+        raise click.UsageError(
+            "--metadata-file requires --report, --json-report or --export."
+        )
+
+    if metadata_file is None:
+        command_setup_utils.resolve_workflow_id_and_server(
+            workflow_id=workflow_id, cromshell_config=config
+        )
+
+    if report or json_report or export_path:
+        if metadata_file is None:
+            workflow_metadata = metadata.format_metadata_params_and_get_metadata(
+                config=config,
+                metadata_param=timing_utils.TIMING_METADATA_KEYS,
+                exclude_keys=False,
+            )
+        else:
+            with open(metadata_file, "r") as f:
+                workflow_metadata = json.load(f)
+
+        if export_path:
+            timing_diagram_utils.write_timing_diagram(
+                call_timings=list(timing_utils.iter_call_timings(workflow_metadata)),
+                output_path=export_path,
+                title=f"{workflow_metadata.get('id')} "
+                f"({workflow_metadata.get('status')})",
+            )
+            if not (report or json_report):
+                print(f"Timing diagram written to {export_path}")
+                return ret_val
+
+        timing_report = timing_utils.get_timing_report(
+            workflow_metadata=workflow_metadata, longest_shards=longest_shards
+        )
+
+        if json_report:
+            print(json.dumps(timing_report, indent=2))
+        else:
+            log.display_logo(logo=io_utils.turtle)
+            print_timing_report(timing_report)
+
+        return ret_val
 
     # Print some status info.
     log.display_logo(logo=io_utils.turtle)
@@ -37,5 +142,46 @@ def main(config, workflow_id):
     return ret_val
 
 
+def print_timing_report(timing_report: dict) -> None:
+    """
+    Print the timing report of a workflow as tables.
+
+    :param timing_report: Report returned by timing_utils.get_timing_report
+    :return:
+    """
+
+    print(
+        f"Workflow {timing_report['id']} ({timing_report['status']}): "
+        f"{timing_report['wall_hours']:.2f} wall hours, "
+        f"{timing_report['cpu_hours']:.2f} CPU hours, "
+        f"{timing_report['calls']} calls\n"
+    )
+
+    print("Tasks:")
+    print(
+        tabulate(timing_report["tasks"], headers="keys", tablefmt="rst", floatfmt=".2f")
+    )
+
+    print("\nCritical path:")
+    print(
+        tabulate(
+            timing_report["critical_path"],
+            headers="keys",
+            tablefmt="rst",
+            floatfmt=".2f",
+        )
+    )
+
+    print("\nLongest running calls:")
+    print(
+        tabulate(
+            timing_report["longest_shards"],
+            headers="keys",
+            tablefmt="rst",
+            floatfmt=".2f",
+        )
+    )
+
+
 if __name__ == "__main__":
     main()
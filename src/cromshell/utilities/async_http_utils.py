@@ -0,0 +1,289 @@
+import asyncio
+import importlib.util
+import io
+import logging
+from typing import Iterable, List, Optional, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from cromshell.utilities import cromshellconfig, http_utils, rate_limit_utils
+
+LOGGER = logging.getLogger(__name__)
+
+# Libraries the asyncio engine can send requests with, in order of preference
+ASYNC_HTTP_LIBRARIES = ["httpx", "aiohttp"]
+
+
+class AsyncHttpUnavailableError(Exception):
+    """Raised when the asyncio engine is used without an async HTTP library"""
+
+    pass
+
+
+def get_async_http_library() -> Optional[str]:
+    """Get the first of ASYNC_HTTP_LIBRARIES that is installed, if any"""
+
+    for library in ASYNC_HTTP_LIBRARIES:
+        if importlib.util.find_spec(library) is not None:
+            return library
+
+    return None
+
+
+def build_response(
+    url: str, status_code: int, reason: str, headers, content: bytes
+) -> requests.Response:
+    """Wrap a response received by the asyncio engine in a requests.Response,
+    so callers handle it like the responses of http_utils.send_request"""
+
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.raw = io.BytesIO(content)
+
+    return response
+
+
+class HttpxClient:
+    """Client of the asyncio engine using httpx, with HTTP/2 if h2 is installed"""
+
+    def __init__(
+        self, timeout: float, read_timeout: float, verify: bool, max_connections: int
+    ):
+        import httpx  # pylint: disable=C0415
+
+        self.httpx = httpx
+        self.client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            verify=verify,
+            timeout=httpx.Timeout(read_timeout, connect=timeout),
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    async def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except self.httpx.TimeoutException as error:
+            raise requests.exceptions.Timeout(str(error)) from error
+        except self.httpx.TransportError as error:
+            raise requests.exceptions.ConnectionError(str(error)) from error
+
+        return build_response(
+            url=str(response.url),
+            status_code=response.status_code,
+            reason=response.reason_phrase,
+            headers=response.headers,
+            content=response.content,
+        )
+
+
+class AiohttpClient:
+    """Client of the asyncio engine using aiohttp (HTTP/1.1 only)"""
+
+    def __init__(
+        self, timeout: float, read_timeout: float, verify: bool, max_connections: int
+    ):
+        import aiohttp  # pylint: disable=C0415
+
+        self.aiohttp = aiohttp
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=max_connections, ssl=None if verify else False
+            ),
+            timeout=aiohttp.ClientTimeout(sock_connect=timeout, sock_read=read_timeout),
+        )
+
+    async def close(self) -> None:
+        await self.session.close()
+
+    async def request(
+        self, method: str, url: str, params: Optional[dict] = None, **kwargs
+    ) -> requests.Response:
+        # aiohttp takes repeated parameters (e.g. includeKey) as a list of pairs
+        query = [
+            (key, value)
+            for key, values in (params or {}).items()
+            for value in (values if isinstance(values, list) else [values])
+        ]
+        try:
+            async with self.session.request(
+                method, url, params=query, **kwargs
+            ) as response:
+                content = await response.read()
+        except asyncio.TimeoutError as error:
+            raise requests.exceptions.Timeout(str(error)) from error
+        except self.aiohttp.ClientConnectionError as error:
+            raise requests.exceptions.ConnectionError(str(error)) from error
+
+        return build_response(
+            url=str(response.url),
+            status_code=response.status,
+            reason=response.reason,
+            headers=response.headers,
+            content=content,
+        )
+
+
+async def send_request_async(
+    client: Union[HttpxClient, AiohttpClient],
+    limits_changed: asyncio.Condition,
+    method: str,
+    url: str,
+    retry: bool,
+    **kwargs,
+) -> requests.Response:
+    """
+    Send a request with the asyncio engine, retried and rate limited like
+    http_utils.send_request.
+
+    :param client: Client of the asyncio engine
+    :param limits_changed: Condition notified when a request finishes, so
+    requests waiting for the concurrency limit of their server check it again
+    :param method: HTTP method
+    :param url: URL of the request
+    :param retry: Whether the request is safe to repeat
+    :param kwargs: Other arguments of the request (params, headers, data, json)
+    :return: Response, possibly of the last retry
+    """
+
+    max_retries = cromshellconfig.requests_max_retries if retry else 0
+    rate_limiter = rate_limit_utils.get_server_rate_limiter(url)
+
+    attempt = 0
+    while True:
+        response = None
+        try:
+            async with limits_changed:
+                await limits_changed.wait_for(
+                    rate_limiter.concurrency_limit.try_acquire
+                )
+            try:
+                if rate_limiter.token_bucket is not None:
+                    await asyncio.sleep(rate_limiter.token_bucket.get_wait())
+                response = await client.request(method, url, **kwargs)
+            finally:
+                rate_limiter.release(
+                    overloaded=response is not None
+                    and response.status_code in rate_limit_utils.OVERLOAD_STATUS_CODES
+                )
+                async with limits_changed:
+                    limits_changed.notify_all()
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ) as error:
+            if attempt >= max_retries or not http_utils.take_retry_from_budget():
+                raise
+            reason = type(error).__name__
+        else:
+            if (
+                response.status_code not in http_utils.RETRY_STATUS_CODES
+                or attempt >= max_retries
+                or not http_utils.take_retry_from_budget()
+            ):
+                return response
+            reason = f"status code {response.status_code}"
+
+        delay = http_utils.get_retry_delay(attempt, response)
+        LOGGER.warning(
+            "%s %s failed (%s), retrying in %.1f sec", method, url, reason, delay
+        )
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def gather_requests(
+    method: str,
+    urls: List[str],
+    timeout: float,
+    read_timeout: float,
+    retry: bool,
+    verify: bool,
+    return_exceptions: bool,
+    **kwargs,
+) -> list:
+    """Send requests concurrently with one pooled client, see send_requests"""
+
+    library = get_async_http_library()
+    if library is None:
+        LOGGER.error("The asyncio engine requires the httpx or aiohttp package.")
+        raise AsyncHttpUnavailableError(
+            "The asyncio engine requires the httpx or aiohttp package, install "
+            "one with 'pip install httpx[http2]' or 'pip install aiohttp', or "
+            "use the 'threads' http engine instead."
+        )
+    client_class = HttpxClient if library == "httpx" else AiohttpClient
+    client = client_class(
+        timeout=timeout,
+        read_timeout=read_timeout,
+        verify=verify,
+        max_connections=cromshellconfig.max_requests_in_flight,
+    )
+
+    limits_changed = asyncio.Condition()
+    tasks = [
+        asyncio.ensure_future(
+            send_request_async(
+                client, limits_changed, method=method, url=url, retry=retry, **kwargs
+            )
+        )
+        for url in urls
+    ]
+    try:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        # Stop the other requests if one failed or we were interrupted (Ctrl-C)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await client.close()
+
+
+def send_requests(
+    method: str,
+    urls: Iterable[str],
+    timeout: float,
+    read_timeout: float,
+    retry: bool,
+    verify: bool = True,
+    return_exceptions: bool = False,
+    **kwargs,
+) -> list:
+    """
+    Send the same request to many URLs concurrently with asyncio, see
+    http_utils.send_requests. Connections are pooled, using HTTP/2 when httpx and
+    h2 are installed and the server supports it. Interrupting (Ctrl-C) cancels
+    the requests in flight.
+
+    :param method: HTTP method
+    :param urls: URLs of the requests
+    :param timeout: Seconds to wait to connect
+    :param read_timeout: Seconds to wait for data
+    :param retry: Whether the requests are safe to repeat
+    :param verify: Whether to verify the TLS certificate of the server
+    :param return_exceptions: Whether to return the exception of a failed request
+    in place of its response rather than raise it
+    :param kwargs: Other arguments of the requests (params, headers, data, json)
+    :return: Responses (or exceptions), in the order of the URLs
+    """
+
+    return asyncio.run(
+        gather_requests(
+            method=method,
+            urls=list(urls),
+            timeout=timeout,
+            read_timeout=read_timeout,
+            retry=retry,
+            verify=verify,
+            return_exceptions=return_exceptions,
+            **kwargs,
+        )
+    )
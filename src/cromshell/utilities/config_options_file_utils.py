@@ -9,9 +9,20 @@ LOGGER = logging.getLogger(__name__)
 CONFIG_FILE_TEMPLATE = {
     "cromwell_server": "str",
     "requests_timeout": "int",
+    "requests_read_timeout": "int",
+    "metadata_read_timeout": "int",
+    "requests_max_retries": "int",
+    "requests_retry_budget": "int",
+    "requests_per_second": "number",
+    "max_requests_in_flight": "int",
+    "http_engine": "str",
+    "lazy_subworkflows": "bool",
     "gcloud_token_email": "str",
     "referer_header_url": "str",
     "bq_cost_table": "str",
+    "cost_settle_days": "number",
+    "cost_price_table": "str",
+    "slim_metadata_keys": "list",
 }
 
 
@@ -60,6 +71,9 @@ def validate_json_schema(loaded_json: dict, json_schema: dict) -> None:
         "Int": int,
         "float": float,
         "Float": float,
+        "number": (int, float),
+        "bool": bool,
+        "Boolean": bool,
         "str": str,
         "String": str,
         "list": list,
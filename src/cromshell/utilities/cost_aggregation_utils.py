@@ -0,0 +1,155 @@
+import csv
+import logging
+import statistics
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Union
+
+LOGGER = logging.getLogger(__name__)
+
+# Row of the aggregated costs holding the cost of whole workflows
+ALL_TASKS = "ALL TASKS"
+AGGREGATED_COST_COLUMNS = [
+    "TASK",
+    "WORKFLOWS",
+    "TOTAL",
+    "MEAN",
+    "P50",
+    "P90",
+    "P99",
+    "MAX",
+    "OUTLIERS",
+]
+
+
+class ParquetUnavailableError(Exception):
+    """Raised when writing Parquet without pyarrow installed"""
+
+
+def get_workflow_task_costs(workflows_query_rows: Dict[str, list]) -> dict:
+    """
+    Sum the detailed cost query rows (one per task and service) of each workflow
+    into the cost of each of its tasks.
+
+    :param workflows_query_rows: Dictionary of workflow id to its detailed cost
+    query rows, with 'task_name' and 'cost' columns
+    :return: Dictionary of task name to a dictionary of workflow id to the cost
+    of the task in the workflow
+    """
+
+    task_costs = defaultdict(lambda: defaultdict(float))
+    for workflow_id, query_rows in workflows_query_rows.items():
+        for row in query_rows:
+            if row.get("cost") is None:
+                continue
+            task_costs[row.get("task_name")][workflow_id] += float(row["cost"])
+
+    return task_costs
+
+
+def summarize_costs(task: str, costs: List[float]) -> dict:
+    """
+    Summarize the cost of a task across workflows.
+
+    Outliers are the workflows more expensive than the upper Tukey fence
+    (third quartile plus 1.5 times the interquartile range), which unlike
+    standard scores stays meaningful for the skewed costs of large cohorts.
+
+    :param task: Name of the task
+    :param costs: Cost of the task in each workflow running it
+    :return: Dictionary of the AGGREGATED_COST_COLUMNS
+    """
+
+    if len(costs) > 1:
+        percentiles = statistics.quantiles(costs, n=100, method="inclusive")
+        quartiles = statistics.quantiles(costs, n=4, method="inclusive")
+        upper_fence = quartiles[2] + 1.5 * (quartiles[2] - quartiles[0])
+    else:
+        percentiles = costs * 99
+        upper_fence = costs[0]
+
+    return {
+        "TASK": task,
+        "WORKFLOWS": len(costs),
+        "TOTAL": sum(costs),
+        "MEAN": statistics.fmean(costs),
+        "P50": percentiles[49],
+        "P90": percentiles[89],
+        "P99": percentiles[98],
+        "MAX": max(costs),
+        "OUTLIERS": sum(cost > upper_fence for cost in costs),
+    }
+
+
+def aggregate_workflow_costs(workflows_query_rows: Dict[str, list]) -> List[dict]:
+    """
+    Aggregate the detailed costs of a cohort of workflows per task.
+
+    :param workflows_query_rows: Dictionary of workflow id to its detailed cost
+    query rows
+    :return: One row per task, most expensive first, followed by an ALL_TASKS
+    row summarizing the cost of whole workflows
+    """
+
+    task_costs = get_workflow_task_costs(workflows_query_rows)
+
+    workflow_costs = defaultdict(float)
+    aggregated_costs = []
+    for task, costs_by_workflow in task_costs.items():
+        for workflow_id, cost in costs_by_workflow.items():
+            workflow_costs[workflow_id] += cost
+        aggregated_costs.append(
+            summarize_costs(task=task, costs=list(costs_by_workflow.values()))
+        )
+
+    aggregated_costs.sort(key=lambda row: row["TOTAL"], reverse=True)
+    if workflow_costs:
+        aggregated_costs.append(
+            summarize_costs(task=ALL_TASKS, costs=list(workflow_costs.values()))
+        )
+
+    return aggregated_costs
+
+
+def write_aggregated_costs(
+    aggregated_costs: List[dict], output_path: Union[str, Path]
+) -> None:
+    """
+    Write aggregated costs to a CSV file, or a Parquet file if the path ends
+    with '.parquet' (requires pyarrow).
+
+    :param aggregated_costs: Rows returned by aggregate_workflow_costs
+    :param output_path: Path of the file to write
+    :return:
+    """
+
+    if Path(output_path).suffix == ".parquet":
+        try:
+            import pyarrow  # pylint: disable=C0415
+            import pyarrow.parquet  # pylint: disable=C0415
+        except ImportError:
+            LOGGER.error("Writing Parquet files requires the pyarrow package.")
+            raise ParquetUnavailableError(
+                "Writing Parquet files requires the pyarrow package, install it "
+                "with 'pip install pyarrow' or write a CSV file instead."
+            )
+
+        table = pyarrow.Table.from_pylist(
+            aggregated_costs,
+            schema=pyarrow.schema(
+                [("TASK", pyarrow.string()), ("WORKFLOWS", pyarrow.int64())]
+                + [
+                    (column, pyarrow.float64())
+                    for column in AGGREGATED_COST_COLUMNS[2:-1]
+                ]
+                + [("OUTLIERS", pyarrow.int64())]
+            ),
+        )
+        pyarrow.parquet.write_table(table, str(output_path))
+    else:
+        with open(output_path, "w", newline="") as output_file:
+            writer = csv.DictWriter(output_file, fieldnames=AGGREGATED_COST_COLUMNS)
+            writer.writeheader()
+            writer.writerows(aggregated_costs)
+
+    LOGGER.info("Wrote aggregated costs to %s", output_path)
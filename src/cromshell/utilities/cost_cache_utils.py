@@ -0,0 +1,135 @@
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from cromshell.utilities import cromshellconfig, io_utils
+
+LOGGER = logging.getLogger(__name__)
+
+# Days after a workflow finished for its billing export to be considered final
+DEFAULT_COST_SETTLE_DAYS = 3
+
+
+def get_cost_cache_dir(config: cromshellconfig) -> Path:
+    """Directory holding the cost of settled workflows"""
+
+    return Path(config.config_dir).joinpath(config.COST_CACHE_DIR_NAME)
+
+
+def get_cost_settle_window(config_options: dict) -> timedelta:
+    """
+    Get the time after a workflow finished from which its cost no longer changes
+    and can be cached, from the 'cost_settle_days' key of the cromshell config
+    file or the default.
+
+    :param config_options: Options of the cromshell configuration file
+    :return:
+    """
+
+    settle_days = config_options.get("cost_settle_days", DEFAULT_COST_SETTLE_DAYS)
+    if not isinstance(settle_days, (int, float)) or settle_days < 0:
+        LOGGER.error(
+            "Config key 'cost_settle_days' must be a non-negative number of days, "
+            "got: %s",
+            settle_days,
+        )
+        raise ValueError(
+            "Config key 'cost_settle_days' must be a non-negative number of days, "
+            f"got: {settle_days}"
+        )
+
+    return timedelta(days=settle_days)
+
+
+def is_workflow_cost_settled(end_time: str, settle_window: timedelta) -> bool:
+    """
+    Check whether a workflow finished long enough ago for its cost to be final.
+
+    :param end_time: Workflow completion time obtained from cromwell job metadata
+    :param settle_window: Time after the completion of a workflow during which
+    billing entries can still be exported
+    :return:
+    """
+
+    finished = datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S.%f%z")
+
+    return datetime.now(timezone.utc) - finished > settle_window
+
+
+def get_cost_cache_path(cache_dir: Path, workflow_id: str, detailed: bool) -> Path:
+    """Path of the cached cost of a workflow, detailed and summary costs are
+    cached separately"""
+
+    mode = "detailed" if detailed else "summary"
+
+    return Path(cache_dir).joinpath(f"{workflow_id}.{mode}.json")
+
+
+def get_cached_workflow_cost(
+    cache_dir: Path, workflow_id: str, detailed: bool, bq_cost_table: str
+) -> Optional[list]:
+    """
+    Get the cost query rows of a workflow from the cache.
+
+    :param cache_dir: Cost cache directory
+    :param workflow_id: Hexadecimal identifier of workflow submission
+    :param detailed: Whether the rows are the cost per task or the cost sum
+    :param bq_cost_table: The bq cost table the cost is queried from
+    :return: List of query rows as dictionaries, or None if the cost of the
+    workflow isn't cached
+    """
+
+    cache_path = get_cost_cache_path(
+        cache_dir=cache_dir, workflow_id=workflow_id, detailed=detailed
+    )
+    if not cache_path.exists():
+        return None
+
+    try:
+        cached_cost = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        LOGGER.warning("Ignoring unreadable cached cost: %s", cache_path)
+        return None
+
+    if cached_cost.get("bq_cost_table") != bq_cost_table:
+        LOGGER.debug("Cost of %s was cached from another cost table.", workflow_id)
+        return None
+
+    LOGGER.info("Using cached cost of %s from %s", workflow_id, cached_cost["date"])
+
+    return cached_cost["rows"]
+
+
+def cache_workflow_cost(
+    cache_dir: Path,
+    workflow_id: str,
+    detailed: bool,
+    bq_cost_table: str,
+    query_rows: list,
+) -> None:
+    """
+    Save the cost query rows of a settled workflow to the cache.
+
+    :param cache_dir: Cost cache directory
+    :param workflow_id: Hexadecimal identifier of workflow submission
+    :param detailed: Whether the rows are the cost per task or the cost sum
+    :param bq_cost_table: The bq cost table the cost was queried from
+    :param query_rows: Rows of the workflow cost query result
+    :return:
+    """
+
+    io_utils.create_directory(dir_path=cache_dir, exist_ok=True)
+    get_cost_cache_path(
+        cache_dir=cache_dir, workflow_id=workflow_id, detailed=detailed
+    ).write_text(
+        json.dumps(
+            {
+                "workflow_id": workflow_id,
+                "bq_cost_table": bq_cost_table,
+                "date": datetime.now().strftime("%Y%m%d_%H%M%S"),
+                "rows": [dict(row) for row in query_rows],
+            }
+        )
+    )
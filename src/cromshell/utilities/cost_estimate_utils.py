@@ -0,0 +1,207 @@
+import json
+import logging
+import re
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Union
+
+from cromshell.utilities import metadata_utils
+
+LOGGER = logging.getLogger(__name__)
+
+# On-demand and preemptible (spot) prices in USD of custom N1 machines and
+# persistent disks in us-central1. Override them with a JSON file of the same
+# keys, set with the 'cost_price_table' key of the cromshell config file.
+DEFAULT_PRICE_TABLE = {
+    "cpu_hour": 0.033174,
+    "cpu_hour_preemptible": 0.00698,
+    "memory_gb_hour": 0.004446,
+    "memory_gb_hour_preemptible": 0.00094,
+    "disk_gb_month": {"HDD": 0.04, "SSD": 0.17, "LOCAL": 0.08},
+}
+HOURS_PER_MONTH = 730
+DEFAULT_BOOT_DISK_SIZE_GB = 10
+# Metadata keys needed to estimate the cost of the calls of a workflow
+COST_ESTIMATE_METADATA_KEYS = [
+    "id",
+    "status",
+    "start",
+    "end",
+    "attempt",
+    "shardIndex",
+    "executionStatus",
+    "preemptible",
+    "callCaching",
+    "runtimeAttributes",
+    "executionEvents",
+    "subWorkflowMetadata",
+    "subWorkflowId",
+]
+
+# Memory units accepted by Cromwell, in GB
+MEMORY_UNITS_GB = {
+    "B": 1e-9,
+    "KB": 1e-6,
+    "MB": 1e-3,
+    "GB": 1.0,
+    "TB": 1e3,
+    "KIB": 1024 / 1e9,
+    "MIB": 1024**2 / 1e9,
+    "GIB": 1024**3 / 1e9,
+    "TIB": 1024**4 / 1e9,
+}
+MEMORY_UNITS_GB.update(
+    {unit[:-1]: size for unit, size in MEMORY_UNITS_GB.items() if len(unit) > 1}
+)
+memory_pattern = re.compile(r"^\s*([0-9.]+)\s*([A-Za-z]*)\s*$")
+
+
+def load_price_table(price_table_path: Union[str, Path, None] = None) -> dict:
+    """
+    Load the prices used to estimate costs.
+
+    :param price_table_path: JSON file overriding some or all of the
+    DEFAULT_PRICE_TABLE prices, None to use the defaults
+    :return: Price table
+    """
+
+    price_table = json.loads(json.dumps(DEFAULT_PRICE_TABLE))
+    if price_table_path is None:
+        return price_table
+
+    with open(price_table_path, "r") as price_table_file:
+        custom_prices = json.load(price_table_file)
+
+    LOGGER.info("Using prices from %s", price_table_path)
+    price_table["disk_gb_month"].update(custom_prices.pop("disk_gb_month", {}))
+    price_table.update(custom_prices)
+
+    return price_table
+
+
+def parse_memory_gb(memory: str) -> float:
+    """
+    Convert a memory runtime attribute (e.g. '3.75 GB', '2048 MiB') to GB.
+
+    :param memory: Value of the memory runtime attribute
+    :return: Memory in GB
+    """
+
+    match = memory_pattern.match(memory)
+    unit = (match.group(2).upper() or "B") if match else None
+    if unit not in MEMORY_UNITS_GB:
+        raise ValueError(f"Unable to parse memory runtime attribute: '{memory}'")
+
+    return float(match.group(1)) * MEMORY_UNITS_GB[unit]
+
+
+def parse_disks_gb(disks: str) -> dict:
+    """
+    Sum the size of the disks of a disks runtime attribute by disk type, e.g.
+    'local-disk 100 HDD, /mnt/ssd 50 SSD'.
+
+    :param disks: Value of the disks runtime attribute
+    :return: Dictionary of disk type to size in GB
+    """
+
+    disks_gb = defaultdict(float)
+    for disk in disks.split(","):
+        fields = disk.split()
+        if len(fields) < 2:
+            raise ValueError(f"Unable to parse disks runtime attribute: '{disks}'")
+        disks_gb[fields[-1].upper()] += float(fields[-2])
+
+    return disks_gb
+
+
+def is_call_preemptible(call: dict) -> bool:
+    """
+    Check whether a call ran on a preemptible VM, from the call metadata or, if
+    missing, from its attempt and preemptible runtime attribute.
+
+    :param call: Call metadata
+    :return:
+    """
+
+    if "preemptible" in call:
+        return bool(call["preemptible"])
+
+    preemptible_attempts = int(
+        call.get("runtimeAttributes", {}).get("preemptible", 0) or 0
+    )
+
+    return call.get("attempt", 1) <= preemptible_attempts
+
+
+def estimate_call_cost(call: dict, price_table: dict, now: datetime) -> float:
+    """
+    Estimate the cost of a call from its runtime attributes and run time.
+
+    Call cached calls cost nothing, as do calls without runtime attributes
+    (e.g. calls that never started).
+
+    :param call: Call metadata
+    :param price_table: Price table returned by load_price_table
+    :param now: Current time, the end of the calls that are still running
+    :return: Estimated cost in USD
+    """
+
+    runtime_attributes = call.get("runtimeAttributes")
+    if not runtime_attributes or call.get("callCaching", {}).get("hit"):
+        return 0.0
+
+    start, end = metadata_utils.get_call_run_time(call, now=now)
+    hours = max((end - start).total_seconds(), 0) / 3600
+
+    price_suffix = "_preemptible" if is_call_preemptible(call) else ""
+    cpu = float(runtime_attributes.get("cpu", 1))
+    memory_gb = parse_memory_gb(runtime_attributes.get("memory", "2 GB"))
+    hourly_cost = (
+        cpu * price_table[f"cpu_hour{price_suffix}"]
+        + memory_gb * price_table[f"memory_gb_hour{price_suffix}"]
+    )
+
+    disks_gb = parse_disks_gb(runtime_attributes.get("disks", "local-disk 10 HDD"))
+    disks_gb["HDD"] += float(
+        runtime_attributes.get("bootDiskSizeGb", DEFAULT_BOOT_DISK_SIZE_GB)
+    )
+    for disk_type, size_gb in disks_gb.items():
+        disk_price = price_table["disk_gb_month"].get(disk_type)
+        if disk_price is None:
+            LOGGER.warning("No price for disk type %s, not included.", disk_type)
+            continue
+        hourly_cost += size_gb * disk_price / HOURS_PER_MONTH
+
+    return hours * hourly_cost
+
+
+def estimate_workflow_cost(
+    workflow_metadata: dict, price_table: dict, now: Optional[datetime] = None
+) -> list:
+    """
+    Estimate the cost of each task of a workflow, including its subworkflows,
+    in a single pass over its calls.
+
+    :param workflow_metadata: Workflow metadata with expanded subworkflows and
+    at least the COST_ESTIMATE_METADATA_KEYS
+    :param price_table: Price table returned by load_price_table
+    :param now: Current time, the end of the calls that are still running
+    :return: Rows with 'task_name' and 'cost' columns (like the detailed cost
+    BigQuery rows), most expensive task first
+    """
+
+    now = now or datetime.now(timezone.utc)
+
+    task_costs = defaultdict(float)
+    for call_name, call in metadata_utils.iter_workflow_calls(workflow_metadata):
+        task_costs[call_name] += estimate_call_cost(
+            call, price_table=price_table, now=now
+        )
+
+    return [
+        {"task_name": task_name, "cost": cost}
+        for task_name, cost in sorted(
+            task_costs.items(), key=lambda task_cost: task_cost[1], reverse=True
+        )
+    ]
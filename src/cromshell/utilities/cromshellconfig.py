@@ -34,16 +34,32 @@ cromwell_api_workflow_id = None
 config_dir = None
 SUBMISSION_FILE_NAME = "all.workflow.database.tsv"
 CROMSHELL_CONFIG_FILE_NAME = "cromshell_config.json"
+DEPENDENCY_ZIP_CACHE_DIR_NAME = "dependency_zip_cache"
+VALIDATION_CACHE_DIR_NAME = "validation_cache"
+COST_CACHE_DIR_NAME = "cost_cache"
 submission_file_path = None
 cromshell_config_path = None
 cromshell_config_options = None
 cromwell_server = None
 # Request defaults
 requests_connect_timeout = 5
+# Seconds to wait for the server to send data, metadata can take much longer
+requests_read_timeout = 60
+metadata_read_timeout = 300
+# Retries of each request, and of all the requests of a command
+requests_max_retries = 3
+requests_retry_budget = 20
+# Limits of the requests sent to each server, 0 requests per second for no limit
+requests_per_second = 20
+max_requests_in_flight = 8
+# Engine sending many requests at once: "threads" or "async" (needs httpx or aiohttp)
+HTTP_ENGINES = ["threads", "async"]
+http_engine = "threads"
 referer_header_url = None
 gcloud_token_email = None
 requests_verify_certs = True
 color_output = None
+lazy_subworkflows = False
 
 CROMSHELL_CONFIG_OPTIONS_TEMPLATE = {
     "cromwell_server": "String",
@@ -259,6 +275,109 @@ def resolve_requests_connect_timeout(timeout_cli: int) -> None:
         LOGGER.info("Request Timeout value: %d sec", requests_connect_timeout)
 
 
+def resolve_requests_read_timeout(timeout_cli: int) -> None:
+    """Override the default read timeouts of requests, and of metadata requests.
+    A timeout given in the command line is used for both.
+    CLI > Config File > Default
+    """
+
+    global requests_read_timeout, metadata_read_timeout
+
+    if timeout_cli:
+        LOGGER.info("Setting requests read timeout from command line options.")
+        requests_read_timeout = metadata_read_timeout = timeout_cli
+    else:
+        requests_read_timeout = cromshell_config_options.get(
+            "requests_read_timeout", requests_read_timeout
+        )
+        metadata_read_timeout = cromshell_config_options.get(
+            "metadata_read_timeout", metadata_read_timeout
+        )
+
+    LOGGER.info(
+        "Request read timeout: %d sec, metadata read timeout: %d sec",
+        requests_read_timeout,
+        metadata_read_timeout,
+    )
+
+
+def resolve_requests_retries(max_retries_cli: int) -> None:
+    """Override the default number of retries of each request, the number of
+    retries of all the requests of a command is read from the config file.
+    CLI > Config File > Default
+    """
+
+    global requests_max_retries, requests_retry_budget
+
+    if max_retries_cli is not None:
+        LOGGER.info("Setting requests retries from command line options.")
+        requests_max_retries = max_retries_cli
+    elif "requests_max_retries" in cromshell_config_options:
+        requests_max_retries = cromshell_config_options["requests_max_retries"]
+    requests_retry_budget = cromshell_config_options.get(
+        "requests_retry_budget", requests_retry_budget
+    )
+
+    LOGGER.info(
+        "Requests retries: %d per request, %d per command",
+        requests_max_retries,
+        requests_retry_budget,
+    )
+
+
+def resolve_request_rate_limits() -> None:
+    """Override the default rate and concurrency limits of the requests sent to
+    each server with the values in the config file.
+    Config File > Default
+    """
+
+    global requests_per_second, max_requests_in_flight
+
+    config_requests_per_second = cromshell_config_options.get(
+        "requests_per_second", requests_per_second
+    )
+    config_max_requests_in_flight = cromshell_config_options.get(
+        "max_requests_in_flight", max_requests_in_flight
+    )
+    if config_requests_per_second < 0 or config_max_requests_in_flight < 1:
+        LOGGER.error(
+            "requests_per_second must be at least 0 and max_requests_in_flight "
+            "at least 1."
+        )
+        raise ValueError(
+            "requests_per_second must be at least 0 and max_requests_in_flight "
+            "at least 1."
+        )
+    requests_per_second = config_requests_per_second
+    max_requests_in_flight = config_max_requests_in_flight
+
+    LOGGER.info(
+        "Requests limits: %s per second, %d at once",
+        requests_per_second,
+        max_requests_in_flight,
+    )
+
+
+def resolve_http_engine(engine_cli: str) -> None:
+    """Override the default engine sending many requests at once.
+    CLI > Config File > Default
+    """
+
+    global http_engine
+
+    engine = engine_cli or cromshell_config_options.get("http_engine", http_engine)
+    if engine not in HTTP_ENGINES:
+        LOGGER.error(
+            "Invalid http_engine '%s', expected one of: %s", engine, HTTP_ENGINES
+        )
+        raise ValueError(
+            f"Invalid http_engine '{engine}', expected one of: {HTTP_ENGINES}"
+        )
+    http_engine = engine
+
+    LOGGER.info("Using the %s http engine.", http_engine)
+
+
 def resolve_referer_header_url(url: str) -> None:
     global referer_header_url
 
@@ -312,6 +431,24 @@ def resolve_color_output(machine_readable: bool, colorful_output: bool) -> None:
         color_output = False
 
 
+def resolve_lazy_subworkflows(lazy_cli: bool) -> None:
+    """Override whether to expand subworkflows by fetching the metadata of
+    each subworkflow separately instead of asking the server to expand them.
+    CLI > Config File > Default"""
+    global lazy_subworkflows
+
+    if lazy_cli:
+        LOGGER.info("Will fetch subworkflow metadata lazily from command line options.")
+        lazy_subworkflows = True
+    elif "lazy_subworkflows" in cromshell_config_options:
+        lazy_subworkflows = bool(cromshell_config_options["lazy_subworkflows"])
+        LOGGER.info(
+            "Setting lazy subworkflow metadata to %s from config.", lazy_subworkflows
+        )
+    else:
+        LOGGER.debug("Subworkflow metadata will be expanded by the server.")
+
+
 # Get and Set Cromshell Configuration Default Values
 config_dir = __get_config_dir()
 submission_file_path = __get_submission_file(
@@ -1,19 +1,272 @@
+import email.utils
 import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from subprocess import check_output
+from typing import BinaryIO, Dict, Iterable, Optional
 
 import requests
+from urllib3.filepost import choose_boundary
 
 from cromshell import log
-from cromshell.utilities import cromshellconfig, io_utils
+from cromshell.utilities import cromshellconfig, io_utils, rate_limit_utils
 
 LOGGER = logging.getLogger(__name__)
 
+# Size of the chunks of streamed responses written as they're received (bytes)
+RESPONSE_CHUNK_SIZE = 1024 * 1024
+
+# Methods retried by default, requests with other methods are only retried if
+# the caller knows they're safe to repeat
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+# Responses of a busy or restarting server, or of the load balancer in front of it
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+# Backoff of the retries, in seconds
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+_retry_budget_lock = threading.Lock()
+_retries_used = 0
+
+
+def parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+    """
+    Parse the value of a Retry-After header, either seconds or an HTTP date.
+
+    :param retry_after: Value of the header
+    :return: Seconds to wait, or None if the value is missing or invalid
+    """
+
+    if not retry_after:
+        return None
+
+    try:
+        return max(float(retry_after), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_date = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+
+    return max((retry_date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def get_retry_delay(retry: int, response: Optional[requests.Response] = None) -> float:
+    """
+    Get the seconds to wait before retrying a request: the Retry-After of the
+    response if given, otherwise an exponential backoff with full jitter, so the
+    retries of many clients don't hit the server at the same time.
+
+    :param retry: Number of retries already done
+    :param response: Response of the failed request, if any
+    :return: Seconds to wait, at most RETRY_MAX_DELAY
+    """
+
+    if response is not None:
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(retry_after, RETRY_MAX_DELAY)
+
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**retry))
+
+
+def take_retry_from_budget() -> bool:
+    """Take a retry from the retry budget of the command, so a failing server
+    isn't hammered with retries. Return False if the budget is spent."""
+
+    global _retries_used
+
+    with _retry_budget_lock:
+        if _retries_used >= cromshellconfig.requests_retry_budget:
+            return False
+        _retries_used += 1
+
+        return True
+
+
+def send_request(
+    method: str,
+    url: str,
+    timeout: Optional[float] = None,
+    read_timeout: Optional[float] = None,
+    retry: Optional[bool] = None,
+    session: Optional[requests.Session] = None,
+    **kwargs,
+) -> requests.Response:
+    """
+    Send a request to the server, retrying connection errors, timeouts and
+    RETRY_STATUS_CODES responses with get_retry_delay backoff, up to
+    requests_max_retries times and while the retry budget of the command lasts.
+
+    Requests (and retries) wait for the rate limiter of the server, see
+    rate_limit_utils.get_server_rate_limiter. Streamed responses count as in
+    flight until their headers are received.
+
+    :param method: HTTP method
+    :param url: URL of the request
+    :param timeout: Seconds to wait to connect, requests_connect_timeout by default
+    :param read_timeout: Seconds to wait for data, requests_read_timeout by default
+    :param retry: Whether the request is safe to repeat, by default only if its
+    method is in RETRY_METHODS. Bodies must be repeatable, e.g. not file objects
+    :param session: Session sending the request, reusing its connections, a new
+    one by default
+    :param kwargs: Other arguments of requests.request
+    :return: Response, possibly of the last retry
+    """
+
+    if timeout is None:
+        timeout = cromshellconfig.requests_connect_timeout
+    if read_timeout is None:
+        read_timeout = cromshellconfig.requests_read_timeout
+    if retry is None:
+        retry = method.upper() in RETRY_METHODS
+    max_retries = cromshellconfig.requests_max_retries if retry else 0
+    rate_limiter = rate_limit_utils.get_server_rate_limiter(url)
+
+    attempt = 0
+    while True:
+        response = None
+        try:
+            rate_limiter.acquire()
+            try:
+                response = (session or requests).request(
+                    method, url, timeout=(timeout, read_timeout), **kwargs
+                )
+            finally:
+                rate_limiter.release(
+                    overloaded=response is not None
+                    and response.status_code in rate_limit_utils.OVERLOAD_STATUS_CODES
+                )
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ) as error:
+            if attempt >= max_retries or not take_retry_from_budget():
+                raise
+            reason = type(error).__name__
+        else:
+            if (
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt >= max_retries
+                or not take_retry_from_budget()
+            ):
+                return response
+            reason = f"status code {response.status_code}"
+            response.close()
+
+        delay = get_retry_delay(attempt, response)
+        LOGGER.warning(
+            "%s %s failed (%s), retrying in %.1f sec", method, url, reason, delay
+        )
+        time.sleep(delay)
+        attempt += 1
+
+
+def send_requests(
+    method: str,
+    urls: Iterable[str],
+    timeout: Optional[float] = None,
+    read_timeout: Optional[float] = None,
+    retry: Optional[bool] = None,
+    return_exceptions: bool = False,
+    **kwargs,
+) -> list:
+    """
+    Send the same request to many URLs concurrently, each one retried and rate
+    limited like with send_request, with the http_engine option: a pool of
+    threads ('threads'), or asyncio ('async', see async_http_utils) which scales
+    to many more requests at once.
+
+    :param method: HTTP method
+    :param urls: URLs of the requests
+    :param timeout: Seconds to wait to connect, requests_connect_timeout by default
+    :param read_timeout: Seconds to wait for data, requests_read_timeout by default
+    :param retry: Whether the requests are safe to repeat, see send_request
+    :param return_exceptions: Whether to return the exception of a failed request
+    in place of its response rather than raise it
+    :param kwargs: Other arguments of the requests: params, headers, data, json
+    and verify
+    :return: Responses (or exceptions), in the order of the URLs
+    """
+
+    if timeout is None:
+        timeout = cromshellconfig.requests_connect_timeout
+    if read_timeout is None:
+        read_timeout = cromshellconfig.requests_read_timeout
+    if retry is None:
+        retry = method.upper() in RETRY_METHODS
+
+    if cromshellconfig.http_engine == "async":
+        from cromshell.utilities import async_http_utils  # pylint: disable=C0415
+
+        return async_http_utils.send_requests(
+            method=method,
+            urls=urls,
+            timeout=timeout,
+            read_timeout=read_timeout,
+            retry=retry,
+            return_exceptions=return_exceptions,
+            **kwargs,
+        )
+
+    # The threads share a pool of connections, rather than each request opening
+    # (and holding until its response is released) its own connection
+    pool_size = cromshellconfig.max_requests_in_flight
+    session = requests.Session()
+    for prefix in ("http://", "https://"):
+        session.mount(
+            prefix,
+            requests.adapters.HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size
+            ),
+        )
+    with session, ThreadPoolExecutor(max_workers=pool_size) as executor:
+        futures = [
+            executor.submit(
+                send_request,
+                method,
+                url,
+                timeout=timeout,
+                read_timeout=read_timeout,
+                retry=retry,
+                session=session,
+                **kwargs,
+            )
+            for url in urls
+        ]
+        responses = []
+        try:
+            for future in futures:
+                try:
+                    responses.append(future.result())
+                except requests.exceptions.RequestException as error:
+                    if not return_exceptions:
+                        raise
+                    responses.append(error)
+        except BaseException:
+            # Don't send the requests not sent yet if one failed or we were
+            # interrupted (Ctrl-C)
+            for future in futures:
+                future.cancel()
+            raise
+
+    return responses
+
 
 def assert_can_communicate_with_server(config: cromshellconfig) -> None:
     """Check Connection with Cromwell Server"""
 
     try:
-        request_out = requests.get(
+        request_out = send_request(
+            "GET",
             f"{config.get_cromwell_api()}/backends",
             timeout=config.requests_connect_timeout,
             verify=config.requests_verify_certs,
@@ -38,6 +291,29 @@ def assert_can_communicate_with_server(config: cromshellconfig) -> None:
         )
 
 
+def get_cromwell_version(config: cromshellconfig) -> Optional[str]:
+    """Get the version of the Cromwell server (which is also the version of its
+    womtool), or None if it can't be retrieved"""
+
+    try:
+        request_out = send_request(
+            "GET",
+            f"{config.cromwell_server}/engine/v1/version",
+            timeout=config.requests_connect_timeout,
+            verify=config.requests_verify_certs,
+            headers=generate_headers(config),
+        )
+    except requests.exceptions.RequestException:
+        LOGGER.debug("Failed to get the version of %s", config.cromwell_server)
+        return None
+
+    if not request_out.ok:
+        LOGGER.debug("Failed to get the version of %s", config.cromwell_server)
+        return None
+
+    return request_out.json().get("cromwell")
+
+
 def check_http_request_status_code(
     short_error_message: str,
     response: requests.models.Response,
@@ -91,6 +367,110 @@ def generate_headers(config: cromshellconfig) -> dict:
     return headers
 
 
+class MultipartFormDataStream:
+    """A multipart/form-data request body that streams its parts from files.
+
+    requests reads every file given through `files=` into memory to build the
+    body. Passing this object as `data=` instead lets the body be sent straight
+    from the file objects, in blocks, with a known Content-Length. The body is
+    byte-for-byte what requests would have built from the same file objects.
+
+    - fields: form field name to a seekable binary file object, None values
+      are skipped
+    """
+
+    def __init__(self, fields: Dict[str, Optional[BinaryIO]]):
+        self.boundary = choose_boundary()
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self._segments = []
+
+        for name, file_obj in fields.items():
+            if file_obj is None:
+                continue
+            # Same filename requests would use: the file's base name if it has
+            # a real path, otherwise the field name.
+            file_path = getattr(file_obj, "name", None)
+            if isinstance(file_path, str) and file_path and file_path[0] != "<":
+                filename = os.path.basename(file_path)
+            else:
+                filename = name
+            self._segments.append(
+                (
+                    f"--{self.boundary}\r\n"
+                    f'Content-Disposition: form-data; name="{name}"; '
+                    f'filename="{filename}"\r\n\r\n'
+                ).encode()
+            )
+            self._segments.append(file_obj)
+            self._segments.append(b"\r\n")
+        self._segments.append(f"--{self.boundary}--\r\n".encode())
+
+        self._length = sum(self._segment_length(seg) for seg in self._segments)
+        self._index = 0
+        self._offset = 0
+
+    @staticmethod
+    def _segment_length(segment) -> int:
+        if isinstance(segment, bytes):
+            return len(segment)
+        position = segment.tell()
+        size = segment.seek(0, os.SEEK_END) - position
+        segment.seek(position)
+        return size
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes of the body (all remaining bytes if negative)"""
+
+        chunks = []
+        remaining = size
+        while self._index < len(self._segments) and remaining != 0:
+            segment = self._segments[self._index]
+            if isinstance(segment, bytes):
+                end = (
+                    len(segment)
+                    if remaining < 0
+                    else min(len(segment), self._offset + remaining)
+                )
+                chunk = segment[self._offset : end]
+                self._offset = end
+                if self._offset >= len(segment):
+                    self._index += 1
+                    self._offset = 0
+            else:
+                chunk = segment.read(remaining)
+                if not chunk:
+                    self._index += 1
+                    continue
+            chunks.append(chunk)
+            if remaining > 0:
+                remaining -= len(chunk)
+
+        return b"".join(chunks)
+
+
+def post_multipart_form_data(
+    url: str, fields: Dict[str, Optional[BinaryIO]], config: cromshellconfig
+) -> requests.Response:
+    """POST file fields as a streamed multipart/form-data body
+    (see MultipartFormDataStream)"""
+
+    body = MultipartFormDataStream(fields)
+    headers = generate_headers(config)
+    headers["Content-Type"] = body.content_type
+
+    return send_request(
+        "POST",
+        url,
+        data=body,
+        timeout=config.requests_connect_timeout,
+        verify=config.requests_verify_certs,
+        headers=headers,
+    )
+
+
 def set_and_check_cromwell_server(config: cromshellconfig, workflow_id: str) -> None:
     """
     Checks for an associated cromwell server for the workflow_id
@@ -108,3 +488,24 @@ def set_and_check_cromwell_server(config: cromshellconfig, workflow_id: str) ->
 
     # Check if Cromwell Server Backend works
     assert_can_communicate_with_server(config)
+
+
+def write_response_content(
+    response: requests.models.Response,
+    output: BinaryIO,
+    chunk_size: int = RESPONSE_CHUNK_SIZE,
+) -> None:
+    """
+    Write the body of a streamed response to a binary file as it's received,
+    without decoding or reformatting it.
+
+    :param response: Response of a request made with stream=True
+    :param output: Binary file to write to, e.g. sys.stdout.buffer
+    :param chunk_size: Size of the chunks read from the response (bytes)
+    :return:
+    """
+
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        output.write(chunk)
+    output.write(b"\n")
+    output.flush()
@@ -1,12 +1,14 @@
+import glob
+import hashlib
 import json
 import logging
+import os
 import re
 import shutil
 import tempfile
 from contextlib import nullcontext
-from io import BytesIO
 from pathlib import Path
-from typing import BinaryIO, List, Union
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Union
 from zipfile import ZIP_DEFLATED, ZipFile
 
 from pygments import formatters, highlight, lexers
@@ -17,6 +19,22 @@ LOGGER = logging.getLogger(__name__)
 workflow_id_pattern = re.compile(
     "[0-9A-Fa-f]{8}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{12}"
 )
+# Groups: the statement up to the opening quote, the imported uri and the
+# rest of the line
+wdl_import_statement_pattern = re.compile(
+    r'^([ \t]*import[ \t]+")([^"]+)("[^\n]*)$', re.MULTILINE
+)
+wdl_import_alias_pattern = re.compile(r'"\s+as\s')
+# Indentation at the start of each line of a JSON string
+json_indent_pattern = re.compile(r"^( +)", re.MULTILINE)
+
+# Zips of dependency directories are kept in memory up to this size (bytes)
+# before being written to a temporary file on disk.
+ZIP_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+MAX_CACHED_ZIPS = 20
+# JSON larger than this (characters) is printed without color
+MAX_COLOR_JSON_SIZE = 16 * 1024 * 1024
 
 
 def dead_turtle() -> None:
@@ -102,19 +120,86 @@ def assert_path_is_not_empty(path: Union[str, Path], description: str) -> None:
             raise EOFError(f"ERROR: {description} is empty: {path}.")
 
 
-def has_nested_dependencies(wdl_path: str or Path) -> bool:
-    """Determine if a WDL has any nested imports."""
+class WdlDocument(NamedTuple):
+    """The source of a WDL file and the files it imports"""
+
+    source: str
+    # Imported uri -> resolved local path, None for http(s) imports
+    imports: Dict[str, Optional[Path]]
+
+
+def get_wdl_import_graph(wdl_path: Union[str, Path]) -> Dict[Path, WdlDocument]:
+    """Read a WDL and every local WDL it imports, directly or transitively.
+
+    Each file is read once, so a file imported by many others (diamond
+    imports) or cyclic imports are only visited once. Imports of http(s)
+    URLs and of missing files are recorded but not followed.
+
+    Returns a dictionary of resolved path to WdlDocument, starting with the
+    given WDL.
+    """
+
+    import_graph = {}
+    to_visit = [Path(wdl_path).resolve()]
+
+    while to_visit:
+        current = to_visit.pop()
+        if current in import_graph:
+            continue
+
+        source = current.read_text()
+        imports = {}
+        for m in wdl_import_statement_pattern.finditer(source):
+            imported_wdl_name = m.group(2)
+            if "://" in imported_wdl_name:
+                imports[imported_wdl_name] = None
+                continue
+            # Normalized like miniwdl and Cromwell do (".." removes the previous
+            # path component), which is also much cheaper than resolving links
+            imported_wdl_path = Path(
+                os.path.normpath(current.parent / imported_wdl_name)
+            )
+            imports[imported_wdl_name] = imported_wdl_path
+            if imported_wdl_path not in import_graph and imported_wdl_path.is_file():
+                to_visit.append(imported_wdl_path)
+
+        import_graph[current] = WdlDocument(source=source, imports=imports)
+
+    return import_graph
+
+
+def has_nested_dependencies(
+    wdl_path: str or Path, import_graph: Optional[Dict[Path, WdlDocument]] = None
+) -> bool:
+    """Determine if a WDL, or any WDL it imports, has nested imports (imports
+    from a parent directory)."""
+
+    if import_graph is None:
+        import_graph = get_wdl_import_graph(wdl_path)
+
+    return any(
+        "../" in imported_wdl_name
+        for document in import_graph.values()
+        for imported_wdl_name in document.imports
+    )
+
+
+def resolve_local_wdl_imports(wdl_path: Union[str, Path]) -> List[Path]:
+    """List the WDL and every local file it imports, directly or transitively."""
+
+    return list(get_wdl_import_graph(wdl_path))
+
 
-    with open(wdl_path, "r") as rf:
-        for line in rf:
-            if line.startswith("import"):
-                m = re.match(r'import "(.+)"', line)
+def hash_file(path: Union[str, Path], digest=None) -> str:
+    """Compute the sha256 digest of a file's contents, or add the contents to
+    the given hashlib digest"""
 
-                imported_wdl_name = m.group(1)
-                if "../" in imported_wdl_name:
-                    return True
+    digest = hashlib.sha256() if digest is None else digest
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
 
-    return False
+    return digest.hexdigest()
 
 
 def get_flattened_filename(tempdir: str, wdl_path: str or Path) -> Path:
@@ -136,52 +221,68 @@ def get_flattened_filename(tempdir: str, wdl_path: str or Path) -> Path:
 
 
 def flatten_nested_dependencies(
-    tempdir: tempfile.TemporaryDirectory, wdl_path: str
+    tempdir: tempfile.TemporaryDirectory,
+    wdl_path: str,
+    import_graph: Optional[Dict[Path, WdlDocument]] = None,
 ) -> Path:
     """Flatten a WDL directory structure and rewrite imports accordingly.
 
+    Every unique WDL of the import graph is written once, with its imports
+    pointing to the flattened file names. Imports without an alias get one
+    so their namespace is unchanged by the renaming.
+
     Return string representing the filesystem location of the rewritten WDL.
 
     tempdir: /path/2/tempdir/
     wdl_path: /dir/path/2/wdl.wdl
+    import_graph: The WDL's import graph, if already computed
     returns: /path/2/tempdir/dir-path-2-wdl.wdl
     """
 
-    p = Path(wdl_path)
-    wdl_dir = p.parent
-
-    new_wdl_path = get_flattened_filename(tempdir.name, wdl_path)
-
-    with open(wdl_path, "r") as rf, open(new_wdl_path, "w") as wf:
-        for line in rf:
-            if line.startswith("import"):
-                m = re.match(r'import "(.+)"', line)
-                imported_wdl_name = m.group(1)
-                imported_wdl_path = (Path(wdl_dir) / imported_wdl_name).resolve()
-                import_line = re.sub(
-                    imported_wdl_name,
-                    Path(get_flattened_filename(tempdir.name, imported_wdl_path)).name,
-                    line,
+    if import_graph is None:
+        import_graph = get_wdl_import_graph(wdl_path)
+
+    flattened_filenames = {
+        path: get_flattened_filename(tempdir.name, path) for path in import_graph
+    }
+
+    for path, document in import_graph.items():
+
+        def rewrite_import(m: re.Match) -> str:
+            imported_wdl_path = document.imports[m.group(2)]
+            if imported_wdl_path is None:
+                return m.group(0)
+            if imported_wdl_path not in import_graph:
+                raise FileNotFoundError(
+                    f"WDL {imported_wdl_path} imported by {path} does not exist."
                 )
 
-                if " as " in line:
-                    wf.write(import_line)
-                else:
-                    wf.write(
-                        f'{import_line.strip()} as {re.sub(".wdl", "", Path(imported_wdl_path).name)}\n'
-                    )
+            rest_of_line = m.group(3)
+            if not wdl_import_alias_pattern.match(rest_of_line):
+                # The namespace comes right after the uri, before any struct
+                # alias clauses or comment
+                rest_of_line = f'" as {imported_wdl_path.stem}{rest_of_line[1:]}'
+
+            return (
+                m.group(1) + flattened_filenames[imported_wdl_path].name + rest_of_line
+            )
 
-                flatten_nested_dependencies(tempdir, imported_wdl_path)
-            else:
-                wf.write(line)
+        flattened_filenames[path].write_text(
+            wdl_import_statement_pattern.sub(rewrite_import, document.source)
+        )
 
-    return new_wdl_path
+    return flattened_filenames[next(iter(import_graph))]
 
 
-def open_or_zip(path: Union[str, Path, None]) -> Union[nullcontext, BytesIO, BinaryIO]:
+def open_or_zip(
+    path: Union[str, Path, None], cache_dir: Union[str, Path, None] = None
+) -> Union[nullcontext, BinaryIO]:
     """Return a context that may be used for reading the contents from the path.
 
-    If path is a directory returns the contents as an in memory zip file.
+    If path is a directory returns the contents as a zip file. When a cache_dir
+    is given the zip is built once per unique directory content and reused
+    from the cache (see zip_dir_cached), otherwise it is built in a spooled
+    temporary file.
     """
 
     if not path:
@@ -189,36 +290,108 @@ def open_or_zip(path: Union[str, Path, None]) -> Union[nullcontext, BytesIO, Bin
 
     path = Path(path)
     if path.is_dir():
+        if cache_dir is not None:
+            return zip_dir_cached(directory=path, cache_dir=Path(cache_dir)).open("rb")
         return zip_dir(path)
     else:
         return path.open("rb")
 
 
-def zip_dir(directory: Path) -> BytesIO:
-    """Zip the directory to an in memory BytesIO."""
+def iter_dir_tree(directory: Path) -> List[Path]:
+    """List every file and subdirectory of a directory, sorted so the
+    order (and therefore any zip or hash built from it) is deterministic."""
+
+    return sorted(Path(directory).rglob("*"))
+
+
+def zip_dir(directory: Path) -> BinaryIO:
+    """Zip the directory to a spooled temporary file.
+
+    The zip is kept in memory while small and rolls over to disk once it
+    grows past ZIP_SPOOL_MAX_SIZE, so large dependency trees are never fully
+    held in RAM.
+    """
+
+    zip_file_obj = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_SIZE)
+    write_zip(directory=directory, zip_file_obj=zip_file_obj)
+    zip_file_obj.seek(0)
+
+    return zip_file_obj
+
+
+def write_zip(directory: Path, zip_file_obj: BinaryIO) -> None:
+    """Write the contents of the directory as a zip into a binary file object."""
 
-    zip_buffer = BytesIO()
     base = Path(directory)
     LOGGER.debug("Zipping directory: %s", directory)
-    # Based off of https://stackoverflow.com/questions/2463770/python-in-memory-zip-library
-    with ZipFile(zip_buffer, "a", ZIP_DEFLATED, False) as zip_file:
-        for child in base.iterdir():
-            add_to_zip(zip_file, base, child)
+    with ZipFile(zip_file_obj, "w", ZIP_DEFLATED, False) as zip_file:
+        for path in iter_dir_tree(base):
+            relative_path = path.relative_to(base)
+            LOGGER.debug("Zipping: %s", relative_path)
+            zip_file.write(path, relative_path)
+
 
-    zip_buffer.seek(0)
-    return zip_buffer
+def hash_dir(directory: Path) -> str:
+    """Compute a sha256 digest over the relative paths and contents of every
+    file and subdirectory in a directory."""
 
+    digest = hashlib.sha256()
+    base = Path(directory)
+    for path in iter_dir_tree(base):
+        digest.update(path.relative_to(base).as_posix().encode())
+        if path.is_dir():
+            digest.update(b"/\0")
+            continue
+        digest.update(b"\0")
+        hash_file(path, digest=digest)
+        digest.update(b"\0")
 
-def add_to_zip(zip_file: ZipFile, base: Path, path: Path) -> None:
-    """Add the path to the zip file relative to the base."""
+    return digest.hexdigest()
 
-    relative_path = path.relative_to(base)
-    LOGGER.debug("Zipping: %s", relative_path)
-    zip_file.write(path, relative_path)
 
-    if path.is_dir():
-        for child in path.iterdir():
-            add_to_zip(zip_file, base, child)
+def zip_dir_cached(
+    directory: Path, cache_dir: Path, max_cached_zips: int = MAX_CACHED_ZIPS
+) -> Path:
+    """Return the path of a zip of the directory, reusing a previously built
+    zip when the directory content is unchanged.
+
+    Zips are stored in cache_dir named after the content hash of the
+    directory (see hash_dir). Only the most recently used max_cached_zips
+    zips are kept.
+    """
+
+    Path.mkdir(cache_dir, parents=True, exist_ok=True)
+    cached_zip = cache_dir / f"{hash_dir(directory)}.zip"
+
+    if cached_zip.exists():
+        LOGGER.debug("Reusing cached dependencies zip: %s", cached_zip)
+        # Refresh the modification time, it is used to prune the oldest zips
+        cached_zip.touch()
+        return cached_zip
+
+    # Write to a temporary file first and rename it, so an interrupted
+    # zip is never picked up as a cache hit.
+    with tempfile.NamedTemporaryFile(
+        dir=cache_dir, suffix=".zip.tmp", delete=False
+    ) as tmp_zip:
+        write_zip(directory=directory, zip_file_obj=tmp_zip)
+    os.replace(tmp_zip.name, cached_zip)
+    LOGGER.debug("Cached dependencies zip: %s", cached_zip)
+
+    prune_zip_cache(cache_dir=cache_dir, max_cached_zips=max_cached_zips)
+
+    return cached_zip
+
+
+def prune_zip_cache(cache_dir: Path, max_cached_zips: int) -> None:
+    """Delete all but the max_cached_zips most recently used zips in the cache"""
+
+    cached_zips = sorted(
+        Path(cache_dir).glob("*.zip"), key=lambda p: p.stat().st_mtime, reverse=True
+    )
+    for old_zip in cached_zips[max_cached_zips:]:
+        LOGGER.debug("Removing old cached dependencies zip: %s", old_zip)
+        old_zip.unlink(missing_ok=True)
 
 
 def is_workflow_id_valid(workflow_id: str):
@@ -239,9 +412,40 @@ def color_json(formatted_json: str) -> str:
     return highlight(formatted_json, lexers.JsonLexer(), formatters.TerminalFormatter())
 
 
+def dumps_pretty_json(loaded_json: Union[dict, list, str]) -> str:
+    """
+    Serialize JSON indented by 4 spaces with sorted keys, using orjson if it's
+    installed (an order of magnitude faster on large metadata) and the json
+    module otherwise. Non-ASCII characters are kept as is, as orjson does.
+
+    :param loaded_json: JSON serializable object
+    :return: Indented JSON string
+    """
+
+    try:
+        import orjson  # pylint: disable=C0415
+    except ImportError:
+        return json.dumps(loaded_json, indent=4, sort_keys=True, ensure_ascii=False)
+
+    try:
+        pretty_json = orjson.dumps(
+            loaded_json, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+        ).decode()
+    except TypeError:
+        # e.g. keys that are not strings, which orjson doesn't serialize
+        return json.dumps(loaded_json, indent=4, sort_keys=True, ensure_ascii=False)
+
+    # orjson only indents by 2 spaces. Newlines inside JSON strings are
+    # escaped, so all the leading spaces of a line are indentation.
+    return json_indent_pattern.sub(r"\1\1", pretty_json)
+
+
 def pretty_print_json(format_json: str or dict, add_color: bool = None) -> None:
     """Prints JSON String in a fancy way
 
+    JSON larger than MAX_COLOR_JSON_SIZE characters is printed without color,
+    highlighting it would take minutes.
+
     Args:
     - json_text: valid json string or dictionary, NOT json file path
     - add_color: whether to add color to the json string
@@ -257,7 +461,10 @@ def pretty_print_json(format_json: str or dict, add_color: bool = None) -> None:
         loaded_json = json.loads(format_json)
     else:
         loaded_json = format_json
-    pretty_json = json.dumps(loaded_json, indent=4, sort_keys=True)
+    pretty_json = dumps_pretty_json(loaded_json)
+    if add_color and len(pretty_json) > MAX_COLOR_JSON_SIZE:
+        LOGGER.info("Not coloring JSON larger than %d characters.", MAX_COLOR_JSON_SIZE)
+        add_color = False
     if add_color:
         print(color_json(pretty_json))
     else:
@@ -322,6 +529,38 @@ def check_if_dir_contains_wdl(dir):
         raise FileNotFoundError(f"Directory {dir} does not contain a WDL file.")
 
 
+def is_glob_pattern(path: str) -> bool:
+    """Checks if a path contains glob wildcards"""
+
+    return glob.has_magic(str(path))
+
+
+def find_wdl_files(path: Union[str, Path]) -> List[Path]:
+    """Finds the WDL files in a directory (recursively) or matching a glob
+    pattern (** matches any number of directories).
+
+    Args:
+      path: A WDL file, a directory or a glob pattern.
+
+    Returns:
+      Sorted list of WDL file paths.
+    """
+
+    if not is_glob_pattern(str(path)):
+        return (
+            sorted(Path(path).rglob("*.wdl")) if Path(path).is_dir() else [Path(path)]
+        )
+
+    wdl_files = set()
+    for match in map(Path, glob.glob(str(path), recursive=True)):
+        if match.is_dir():
+            wdl_files.update(match.rglob("*.wdl"))
+        elif match.suffix == ".wdl":
+            wdl_files.add(match)
+
+    return sorted(wdl_files)
+
+
 class TextStatusesColor:
     """Holds stdout formatting per workflow status"""
 
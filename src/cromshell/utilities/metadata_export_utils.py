@@ -0,0 +1,204 @@
+import csv
+import json
+import logging
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+from cromshell.utilities import metadata_utils
+from cromshell.utilities.cost_aggregation_utils import ParquetUnavailableError
+
+LOGGER = logging.getLogger(__name__)
+
+# Metadata keys needed to export the calls of a workflow
+CALL_EXPORT_METADATA_KEYS = [
+    "id",
+    "status",
+    "attempt",
+    "shardIndex",
+    "executionStatus",
+    "backendStatus",
+    "start",
+    "end",
+    "returnCode",
+    "runtimeAttributes",
+    "stdout",
+    "stderr",
+    "callRoot",
+    "backendLogs",
+    "subWorkflowMetadata",
+    "subWorkflowId",
+]
+# Runtime attributes exported as their own columns, all of them are also
+# exported as a JSON object in the runtime_attributes column
+CALL_EXPORT_RUNTIME_ATTRIBUTES = ["cpu", "memory", "disks", "docker", "preemptible"]
+CALL_EXPORT_COLUMNS = [
+    "task",
+    "shard",
+    "attempt",
+    "execution_status",
+    "backend_status",
+    "start",
+    "end",
+    "return_code",
+    *CALL_EXPORT_RUNTIME_ATTRIBUTES,
+    "runtime_attributes",
+    "stdout",
+    "stderr",
+    "log",
+    "call_root",
+]
+CALL_EXPORT_FORMATS = [".csv", ".jsonl", ".parquet"]
+EXPORT_BATCH_SIZE = 10_000
+
+
+def get_call_row(call_name: str, call: dict) -> dict:
+    """
+    Flatten the metadata of a call into a row of the CALL_EXPORT_COLUMNS.
+
+    :param call_name: Name of the call, e.g. 'HelloWorld.HelloWorldTask'
+    :param call: Call metadata
+    :return: Row of the call
+    """
+
+    runtime_attributes = call.get("runtimeAttributes", {})
+
+    return {
+        "task": call_name,
+        "shard": call.get("shardIndex", -1),
+        "attempt": call.get("attempt", 1),
+        "execution_status": call.get("executionStatus"),
+        "backend_status": call.get("backendStatus"),
+        "start": call.get("start"),
+        "end": call.get("end"),
+        "return_code": call.get("returnCode"),
+        # Runtime attribute values are strings in the metadata, but keep the
+        # columns typed even if a backend reports numbers
+        **{
+            attribute: (
+                str(runtime_attributes[attribute])
+                if attribute in runtime_attributes
+                else None
+            )
+            for attribute in CALL_EXPORT_RUNTIME_ATTRIBUTES
+        },
+        "runtime_attributes": json.dumps(runtime_attributes, sort_keys=True),
+        "stdout": call.get("stdout"),
+        "stderr": call.get("stderr"),
+        "log": call.get("backendLogs", {}).get("log"),
+        "call_root": call.get("callRoot"),
+    }
+
+
+def iter_call_rows(workflow_metadata: dict) -> Iterator[dict]:
+    """
+    Iterate over the rows of the calls (one per shard attempt) of a workflow
+    and of its expanded subworkflows.
+
+    :param workflow_metadata: Workflow metadata with expanded subworkflows and
+    at least the CALL_EXPORT_METADATA_KEYS
+    :return: Iterator of rows of the CALL_EXPORT_COLUMNS
+    """
+
+    for call_name, call in metadata_utils.iter_workflow_calls(workflow_metadata):
+        yield get_call_row(call_name, call)
+
+
+def iter_batches(rows: Iterable[dict], batch_size: int) -> Iterator[list]:
+    """Split rows into lists of at most batch_size rows"""
+
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def write_call_rows(
+    call_rows: Iterable[dict],
+    output_path: Union[str, Path],
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    """
+    Write call rows to a CSV, JSON lines or Parquet (requires pyarrow) file,
+    depending on the extension of the path.
+
+    Rows are consumed and written in batches of batch_size rows, so only one
+    batch is held in memory at a time.
+
+    :param call_rows: Rows of the CALL_EXPORT_COLUMNS, e.g. from iter_call_rows
+    :param output_path: Path of the file to write
+    :param batch_size: Number of rows written at a time
+    :return: Number of rows written
+    """
+
+    suffix = Path(output_path).suffix
+    if suffix not in CALL_EXPORT_FORMATS:
+        raise ValueError(
+            f"Unsupported export format '{suffix}', use one of: "
+            f"{', '.join(CALL_EXPORT_FORMATS)}"
+        )
+
+    if suffix == ".parquet":
+        row_count = write_call_rows_parquet(
+            call_rows, output_path=output_path, batch_size=batch_size
+        )
+    else:
+        row_count = 0
+        with open(output_path, "w", newline="") as output_file:
+            if suffix == ".csv":
+                writer = csv.DictWriter(output_file, fieldnames=CALL_EXPORT_COLUMNS)
+                writer.writeheader()
+            for batch in iter_batches(call_rows, batch_size):
+                if suffix == ".csv":
+                    writer.writerows(batch)
+                else:
+                    output_file.writelines(json.dumps(row) + "\n" for row in batch)
+                row_count += len(batch)
+
+    LOGGER.info("Wrote %d calls to %s", row_count, output_path)
+
+    return row_count
+
+
+def write_call_rows_parquet(
+    call_rows: Iterable[dict], output_path: Union[str, Path], batch_size: int
+) -> int:
+    """
+    Write call rows to a Parquet file, one row group per batch.
+
+    :param call_rows: Rows of the CALL_EXPORT_COLUMNS
+    :param output_path: Path of the file to write
+    :param batch_size: Number of rows per row group
+    :return: Number of rows written
+    """
+
+    try:
+        import pyarrow  # pylint: disable=C0415
+        import pyarrow.parquet  # pylint: disable=C0415
+    except ImportError:
+        LOGGER.error("Writing Parquet files requires the pyarrow package.")
+        raise ParquetUnavailableError(
+            "Writing Parquet files requires the pyarrow package, install it "
+            "with 'pip install pyarrow' or export to CSV or JSON lines instead."
+        )
+
+    integer_columns = {"shard", "attempt", "return_code"}
+    schema = pyarrow.schema(
+        [
+            (
+                column,
+                pyarrow.int64() if column in integer_columns else pyarrow.string(),
+            )
+            for column in CALL_EXPORT_COLUMNS
+        ]
+    )
+
+    row_count = 0
+    with pyarrow.parquet.ParquetWriter(str(output_path), schema) as writer:
+        for batch in iter_batches(call_rows, batch_size):
+            writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+            row_count += len(batch)
+
+    return row_count
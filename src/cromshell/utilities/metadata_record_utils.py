@@ -0,0 +1,207 @@
+import logging
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cromshell.utilities import metadata_utils
+
+LOGGER = logging.getLogger(__name__)
+
+# Execution statuses seen so far, status codes are indexes in this list
+STATUS_NAMES: List[str] = []
+_status_codes: Dict[str, int] = {}
+
+
+def get_status_code(status: str) -> int:
+    """Get the code of an execution status, registering it if it's new"""
+
+    status_code = _status_codes.get(status)
+    if status_code is None:
+        status_code = _status_codes[status] = len(STATUS_NAMES)
+        STATUS_NAMES.append(sys.intern(status))
+
+    return status_code
+
+
+class ShardRecord:
+    """Metadata of a shard (attempt) of a call needed by logs and list-outputs"""
+
+    __slots__ = (
+        "shard_index",
+        "attempt",
+        "status",
+        "backend",
+        "backend_log",
+        "outputs",
+    )
+
+    def __init__(
+        self,
+        shard_index: int,
+        attempt: int,
+        status: Optional[str],
+        backend: Optional[str] = None,
+        backend_log: Optional[str] = None,
+        outputs: Optional[dict] = None,
+    ):
+        self.shard_index = shard_index
+        self.attempt = attempt
+        self.status = status
+        self.backend = backend
+        self.backend_log = backend_log
+        self.outputs = outputs
+
+    @classmethod
+    def from_metadata(cls, shard_metadata: dict) -> "ShardRecord":
+        """Keep the needed fields of the metadata of a call shard"""
+
+        status = shard_metadata.get("executionStatus")
+        backend = shard_metadata.get("backend")
+
+        return cls(
+            shard_index=shard_metadata.get("shardIndex", -1),
+            attempt=shard_metadata.get("attempt", 1),
+            status=sys.intern(status) if status is not None else None,
+            backend=sys.intern(backend) if backend is not None else None,
+            backend_log=shard_metadata.get("backendLogs", {}).get("log"),
+            outputs=shard_metadata.get("outputs"),
+        )
+
+
+class CallRecord:
+    """
+    Compact metadata of a call: the shard index and status code of each of its
+    shards (attempts) in arrays, the ShardRecord of each shard only if
+    requested, and the record of the subworkflow run by each shard, if any.
+    """
+
+    __slots__ = ("name", "shard_indices", "status_codes", "shards", "subworkflows")
+
+    def __init__(self, name: str, keep_shards: bool = False):
+        self.name = sys.intern(name)
+        self.shard_indices = array("q")
+        self.status_codes = array("H")
+        self.shards: Optional[List[ShardRecord]] = [] if keep_shards else None
+        self.subworkflows: List[WorkflowRecord] = []
+
+    def __len__(self) -> int:
+        return len(self.shard_indices)
+
+    def add_shard(self, shard_metadata: dict) -> None:
+        """Add a shard (attempt) of the call from its metadata"""
+
+        self.shard_indices.append(shard_metadata.get("shardIndex", -1))
+        self.status_codes.append(
+            get_status_code(shard_metadata.get("executionStatus", "Unknown"))
+        )
+        if self.shards is not None:
+            self.shards.append(ShardRecord.from_metadata(shard_metadata))
+
+    def get_status_counts(self) -> Dict[str, int]:
+        """Count the shards of the call with each status, sorted by status"""
+
+        status_counts = {}
+        for status_code in self.status_codes:
+            status = STATUS_NAMES[status_code]
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+        return dict(sorted(status_counts.items()))
+
+    def get_shard_indices_with_status(self, status: str) -> List[int]:
+        """Get the indices of the shards of the call with the given status"""
+
+        status_code = _status_codes.get(status)
+
+        return [
+            shard_index
+            for shard_index, shard_status_code in zip(
+                self.shard_indices, self.status_codes
+            )
+            if shard_status_code == status_code
+        ]
+
+
+class WorkflowRecord:
+    """Compact metadata of a workflow or subworkflow and its calls"""
+
+    __slots__ = ("id", "status", "calls")
+
+    def __init__(self, workflow_id: Optional[str], status: Optional[str]):
+        self.id = workflow_id
+        self.status = status
+        self.calls: Dict[str, CallRecord] = {}
+
+
+def build_workflow_record(
+    workflow_metadata: dict, keep_shards: bool = False
+) -> WorkflowRecord:
+    """
+    Build the compact record of a workflow, and of its expanded subworkflows,
+    from its metadata. Once built, the metadata can be released.
+
+    :param workflow_metadata: Workflow metadata
+    :param keep_shards: Whether to keep a ShardRecord of each shard, needed for
+    the logs and outputs of the shards
+    :return: Record of the workflow
+    """
+
+    workflow_record = WorkflowRecord(
+        workflow_id=workflow_metadata.get("id"), status=workflow_metadata.get("status")
+    )
+    workflow_records = {(): workflow_record}
+
+    for path, call_name, shard in metadata_utils.walk_workflow_calls(workflow_metadata):
+        calls = workflow_records[path].calls
+        call_record = calls.get(call_name)
+        if call_record is None:
+            call_record = calls[call_name] = CallRecord(
+                name=call_name, keep_shards=keep_shards
+            )
+        call_record.add_shard(shard)
+
+        if "subWorkflowMetadata" in shard:
+            subworkflow_metadata = shard["subWorkflowMetadata"]
+            subworkflow_record = WorkflowRecord(
+                workflow_id=subworkflow_metadata.get("id"),
+                status=subworkflow_metadata.get("status"),
+            )
+            call_record.subworkflows.append(subworkflow_record)
+            # The calls of the subworkflow are walked next
+            workflow_records[path + ((call_name, shard.get("shardIndex", -1)),)] = (
+                subworkflow_record
+            )
+
+    return workflow_record
+
+
+def iter_call_records(
+    workflow_record: WorkflowRecord,
+) -> Iterator[Tuple[int, CallRecord]]:
+    """
+    Iterate over the call records of a workflow and of its subworkflows, depth
+    first: the calls of the subworkflows run by a call follow it, one
+    subworkflow after the other.
+
+    :param workflow_record: Record of the workflow
+    :return: Iterator of (subworkflow depth, call record)
+    """
+
+    stack = [(0, iter(workflow_record.calls.values()))]
+    while stack:
+        depth, call_records = stack[-1]
+        for call_record in call_records:
+            yield depth, call_record
+            if call_record.subworkflows:
+                stack.append(
+                    (
+                        depth + 1,
+                        (
+                            subworkflow_call_record
+                            for subworkflow in call_record.subworkflows
+                            for subworkflow_call_record in subworkflow.calls.values()
+                        ),
+                    )
+                )
+                break
+        else:
+            stack.pop()
@@ -0,0 +1,104 @@
+import logging
+from datetime import datetime
+from typing import Iterator, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+# Path of a call within the subworkflows of a workflow: the (call name, shard
+# index) of each subworkflow call leading to it
+CallPath = Tuple[Tuple[str, int], ...]
+
+
+def iter_workflow_shards(workflow_metadata: dict) -> Iterator[Tuple[str, dict]]:
+    """Iterate over the (call name, shard) of the calls of a single workflow"""
+
+    for call_name, shards in workflow_metadata.get("calls", {}).items():
+        for shard in shards:
+            yield call_name, shard
+
+
+def walk_workflow_calls(
+    workflow_metadata: dict, expand_subworkflows: bool = True
+) -> Iterator[Tuple[CallPath, str, dict]]:
+    """
+    Walk the calls (every shard and attempt) of a workflow and of its expanded
+    subworkflows, depth first and in the order of the metadata.
+
+    Subworkflows are walked with an explicit stack of iterators rather than
+    recursion, so deeply nested workflows don't hit the recursion limit, and
+    no intermediate lists are built, so wide scatters are walked in constant
+    memory. The calls running a subworkflow are yielded too, right before the
+    calls of their subworkflow.
+
+    :param workflow_metadata: Workflow metadata
+    :param expand_subworkflows: Whether to walk the calls of subworkflows
+    :return: Iterator of (path, call name, shard metadata), the path being the
+    (call name, shard index) of the subworkflow calls leading to the call, ()
+    for the calls of the workflow itself
+    """
+
+    stack = [((), iter_workflow_shards(workflow_metadata))]
+    while stack:
+        path, shards = stack[-1]
+        for call_name, shard in shards:
+            yield path, call_name, shard
+            if expand_subworkflows and "subWorkflowMetadata" in shard:
+                subworkflow_path = path + ((call_name, shard.get("shardIndex", -1)),)
+                stack.append(
+                    (
+                        subworkflow_path,
+                        iter_workflow_shards(shard["subWorkflowMetadata"]),
+                    )
+                )
+                break
+        else:
+            stack.pop()
+
+
+def iter_workflow_calls(workflow_metadata: dict) -> Iterator[Tuple[str, dict]]:
+    """
+    Iterate over the calls (every shard and attempt) of a workflow and of its
+    expanded subworkflows, see walk_workflow_calls. The calls running a
+    subworkflow are not yielded themselves, only the calls of the subworkflow.
+
+    :param workflow_metadata: Workflow metadata, with expanded subworkflows
+    :return: Iterator of (call name, call metadata)
+    """
+
+    for _, call_name, call in walk_workflow_calls(workflow_metadata):
+        if "subWorkflowMetadata" not in call:
+            yield call_name, call
+
+
+def get_call_run_time(call: dict, now: datetime) -> Tuple[datetime, datetime]:
+    """
+    Get the time the VM of a call was running, from when a worker was assigned
+    to when it was released, or the call start and end if the execution events
+    don't include the worker lifetime. Calls still running end now.
+
+    :param call: Call metadata
+    :param now: Current time
+    :return: Start and end of the billed run time
+    """
+
+    vm_start = vm_end = None
+    for event in call.get("executionEvents", []):
+        description = event.get("description", "")
+        if description.startswith("Worker ") and " assigned " in description:
+            vm_start = event.get("startTime")
+        elif description == "Worker released":
+            vm_end = event.get("startTime")
+
+    start = vm_start or call.get("start")
+    end = vm_end or call.get("end")
+
+    return (
+        parse_timestamp(start) if start else now,
+        parse_timestamp(end) if end else now,
+    )
+
+
+def parse_timestamp(timestamp: str) -> datetime:
+    """Parse a metadata timestamp, e.g. '2022-10-21T19:09:48.048Z'"""
+
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
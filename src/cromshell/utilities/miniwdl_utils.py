@@ -1,10 +1,13 @@
-import io
 import logging
+import os
+import sys
 import tempfile
+import threading
 import zipfile
-from contextlib import redirect_stdout
 from os import listdir
 from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from urllib import parse
 
 from cromshell import log
 from cromshell.utilities import io_utils
@@ -17,21 +20,307 @@ class ValidationFailedError(Exception):
     pass
 
 
+class Diagnostic(NamedTuple):
+    """An error or lint warning reported by miniwdl"""
+
+    severity: str  # "error" or "warning"
+    kind: str  # Exception or linter class name, e.g. UnusedDeclaration
+    message: str
+    uri: str
+    line: int = 0
+    column: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"({self.uri} Ln {self.line}, Col {self.column}) {self.kind}, "
+            f"{self.message}"
+        )
+
+
+class MiniwdlValidator:
+    """Validates WDL files with miniwdl, keeping loaded documents between calls.
+
+    Each document is read, parsed, typechecked and linted once, and cached by
+    its absolute path and the import search path. A cached document (for
+    instance a library imported by many WDLs) is reused as long as neither it
+    nor anything it imports was modified since it was loaded.
+
+    Imports by URL (e.g. https://) are downloaded by miniwdl on every load,
+    and documents importing them are not cached.
+    """
+
+    def __init__(self) -> None:
+        # (abspath, search path) -> (document, modification stamps of the
+        # document and all its transitive imports)
+        self._documents: Dict[Tuple[str, Tuple[str, ...]], tuple] = {}
+        # miniwdl's linters share module level state
+        self._lock = threading.Lock()
+
+    def validate(
+        self,
+        wdl: Union[str, Path],
+        path: Optional[List[str]] = None,
+        strict: bool = False,
+        suppress: Iterable[str] = (),
+    ) -> List[Diagnostic]:
+        """Validates a WDL file and its imports.
+
+        Args:
+          wdl: The path to the WDL file.
+          path: Directories searched for imports that are not found relative
+            to the importing WDL.
+          strict: Whether to report lint warnings as errors.
+          suppress: Names of lint warnings to ignore, each item may be a comma
+            separated list.
+
+        Returns:
+          The errors and unsuppressed lint warnings, an empty list if the WDL
+          is valid and raises no warnings.
+        """
+
+        from WDL import Lint  # pylint: disable=C0415
+
+        suppressed = {
+            name.strip()
+            for item in suppress
+            for name in str(item).split(",")
+            if name.strip()
+        }
+
+        with self._lock:
+            try:
+                doc, _ = self._load(str(wdl), path=list(path or []))
+            except Exception as exn:  # pylint: disable=W0703
+                return get_error_diagnostics(exn, uri=str(wdl))
+
+            linted = Lint.collect(doc)
+
+        # Shared imports are collected once per importer, dict keys remove
+        # the duplicates while keeping the order.
+        diagnostics = {}
+        for pos, linter, message, is_suppressed in linted:
+            if is_suppressed or linter in suppressed:
+                continue
+            diagnostic = Diagnostic(
+                severity="error" if strict else "warning",
+                kind=linter,
+                message=message,
+                uri=pos.uri,
+                line=pos.line,
+                column=pos.column,
+            )
+            diagnostics[diagnostic] = None
+
+        return list(diagnostics)
+
+    def load(self, wdl: Union[str, Path], path: Optional[List[str]] = None):
+        """Loads (reads, parses, typechecks and lints) a WDL document and its
+        imports, reusing the documents that were previously loaded.
+
+        Returns:
+          The WDL.Tree.Document.
+        """
+
+        with self._lock:
+            return self._load(str(wdl), path=list(path or []))[0]
+
+    def _load(
+        self,
+        uri: str,
+        path: List[str],
+        importer_abspath: Optional[str] = None,
+        import_max_depth: int = 10,
+    ) -> tuple:
+        import WDL  # pylint: disable=C0415
+
+        if is_remote_wdl_uri(uri):
+            return self._load_remote(uri, path=path, import_max_depth=import_max_depth)
+
+        abspath = resolve_wdl_import(uri, path=path, importer_abspath=importer_abspath)
+        cache_key = (abspath, tuple(path))
+
+        cached = self._documents.get(cache_key)
+        if cached is not None and all(
+            get_modification_stamp(p) == stamp for p, stamp in cached[1].items()
+        ):
+            LOGGER.debug("Reusing loaded WDL %s", abspath)
+            return cached
+
+        LOGGER.debug("Loading WDL %s", abspath)
+        stamps = {abspath: get_modification_stamp(abspath)}
+        with open(abspath, "r") as wdl_file:
+            # Documents are shared by importers, so they are named by absolute
+            # path rather than by the (relative) uri of the first import.
+            doc = WDL.parse_document(wdl_file.read(), uri=abspath)
+
+        for i, imp in enumerate(doc.imports):
+            if import_max_depth <= 1:
+                raise WDL.Error.ImportError(
+                    imp.pos, imp.uri, "exceeded import_max_depth; circular imports?"
+                )
+            try:
+                subdoc, substamps = self._load(
+                    imp.uri,
+                    path=path,
+                    importer_abspath=abspath,
+                    import_max_depth=import_max_depth - 1,
+                )
+            except Exception as exn:
+                raise WDL.Error.ImportError(imp.pos, imp.uri) from exn
+            stamps.update(substamps)
+            doc.imports[i] = WDL.Tree.DocImport(
+                pos=imp.pos,
+                uri=imp.uri,
+                namespace=imp.namespace,
+                aliases=imp.aliases,
+                doc=subdoc,
+            )
+
+        doc.typecheck(check_quant=True)
+        # The imports were linted when they were loaded
+        WDL.Lint.lint(doc, descend_imports=False)
+
+        if any(is_remote_wdl_uri(p) for p in stamps):
+            return doc, stamps
+
+        self._documents[cache_key] = (doc, stamps)
+
+        return self._documents[cache_key]
+
+    @staticmethod
+    def _load_remote(uri: str, path: List[str], import_max_depth: int) -> tuple:
+        """Downloads and loads a WDL imported by URL, along with its imports,
+        the same way `miniwdl check` does."""
+
+        import WDL  # pylint: disable=C0415
+        from WDL.CLI import make_read_source  # pylint: disable=C0415
+
+        LOGGER.debug("Downloading WDL %s", uri)
+        doc = WDL.load(
+            uri,
+            path=path,
+            read_source=make_read_source(False),
+            import_max_depth=import_max_depth,
+        )
+        WDL.Lint.lint(doc)
+
+        return doc, {uri: None}
+
+
+_miniwdl_validator = None
+
+
+def get_miniwdl_validator() -> MiniwdlValidator:
+    """Returns the validator shared by all validations of this process"""
+
+    global _miniwdl_validator
+
+    if _miniwdl_validator is None:
+        _miniwdl_validator = MiniwdlValidator()
+
+    return _miniwdl_validator
+
+
+def resolve_wdl_import(
+    uri: str, path: List[str], importer_abspath: Optional[str] = None
+) -> str:
+    """Resolves a WDL (import) uri to an absolute path, the same way miniwdl does.
+
+    Relative imports are looked up relative to the importing WDL (or the
+    current directory for the top level WDL) and then in the path directories.
+    URLs are returned as is.
+    """
+
+    if is_remote_wdl_uri(uri):
+        return uri
+
+    if uri.startswith("file://"):
+        uri = uri[len("file://") :]
+
+    if os.path.isabs(uri):
+        return os.path.abspath(uri)
+
+    search_dirs = [
+        os.path.dirname(importer_abspath) if importer_abspath else os.getcwd()
+    ] + list(reversed(path))
+    for search_dir in search_dirs:
+        candidate = os.path.abspath(os.path.join(search_dir, uri))
+        if os.path.isfile(candidate):
+            return candidate
+
+    raise FileNotFoundError(f"WDL not found: {uri}")
+
+
+def is_remote_wdl_uri(uri: str) -> bool:
+    """Whether a WDL (import) uri is a URL to download, e.g. https://..."""
+
+    # Single letter schemes are Windows drive letters
+    scheme = parse.urlsplit(uri).scheme
+    return len(scheme) > 1 and scheme != "file"
+
+
+def get_modification_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """Returns the modification time and size of a file, None if it's missing"""
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_error_diagnostics(exn: BaseException, uri: str) -> List[Diagnostic]:
+    """Converts a miniwdl loading error into diagnostics.
+
+    Import errors are followed down to the error in the imported WDL.
+    """
+
+    from WDL import Error  # pylint: disable=C0415
+
+    if isinstance(exn, Error.MultipleValidationErrors):
+        return [
+            diagnostic
+            for inner_exn in exn.exceptions
+            for diagnostic in get_error_diagnostics(inner_exn, uri=uri)
+        ]
+
+    pos = getattr(exn, "pos", None)
+    diagnostic = Diagnostic(
+        severity="error",
+        kind=type(exn).__name__,
+        message=str(exn),
+        uri=pos.uri if pos else uri,
+        line=pos.line if pos else 0,
+        column=pos.column if pos else 0,
+    )
+
+    if isinstance(exn, Error.ImportError) and exn.__cause__ is not None:
+        return [diagnostic] + get_error_diagnostics(exn.__cause__, uri=uri)
+
+    return [diagnostic]
+
+
 def miniwdl_validate_wdl(
     wdl: Path,
     dependencies: str or Path = None,
     strict: bool = False,
     suppress=None,
     show_warnings: bool = True,
+    show_logo: bool = True,
 ) -> int:
     """Validates a WDL file.
 
+    Documents loaded by previous validations in this process are reused, see
+    MiniwdlValidator.
+
     Args:
       wdl: The path to the WDL file.
       dependencies: A list of paths to the WDL file's dependencies.
       strict: Whether to be strict about the WDL file's syntax.
       suppress: A list of errors to suppress.
       show_warnings: Whether to show warnings.
+      show_logo: Whether to display the dead turtle logo if the WDL is invalid.
 
     Returns:
       0 if the WDL file is valid, 1 otherwise.
@@ -49,35 +338,29 @@ def miniwdl_validate_wdl(
             f"Contents dependencies location: {listdir(resolved_dependencies)}"
         )
 
-    try:
-        f = io.StringIO()
-        with redirect_stdout(f):
-            # Importing miniwdl.check here to help with stdout redirection
-            from WDL.CLI import check as miniwdl_check
-
-            miniwdl_check(
-                uri=[str(wdl)],
-                path=[resolved_dependencies],
-                strict=strict,
-                suppress=",".join([str(item) for item in suppress]),  # Turn into string
-            )
-
-        captured_outputs = f.getvalue()
-    except Exception as exn:
-        # Importing miniwdl.print_error here to help with stdout redirection
-        from WDL.CLI import print_error as miniwdl_print_error
+    diagnostics = get_miniwdl_validator().validate(
+        wdl=wdl,
+        path=[str(resolved_dependencies)] if resolved_dependencies else [],
+        strict=strict,
+        suppress=suppress,
+    )
+    errors = [d for d in diagnostics if d.severity == "error"]
 
-        log.display_logo(logo=dead_turtle)
-        miniwdl_print_error(exn)
+    if errors:
+        if show_logo:
+            log.display_logo(logo=dead_turtle)
+        for error in errors:
+            print(error, file=sys.stderr)
 
         if logging.getLogger().level == logging.DEBUG:
-            LOGGER.error(exn)
-            raise ValidationFailedError(exn)
+            LOGGER.error(errors[0])
+            raise ValidationFailedError("\n".join(str(error) for error in errors))
 
         return 1
 
     if show_warnings:
-        print(captured_outputs)
+        for warning in diagnostics:
+            print(warning)
 
     return 0
 
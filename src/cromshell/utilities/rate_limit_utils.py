@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict
+from urllib.parse import urlsplit
+
+from cromshell.utilities import cromshellconfig
+
+LOGGER = logging.getLogger(__name__)
+
+# Responses telling that the server is overloaded, which shrink the number of
+# requests sent to it at once
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+# The limit on requests in flight is multiplied by this factor on overload...
+CONCURRENCY_DECREASE_FACTOR = 0.5
+# ...and grows by one after about as many successful requests as the limit
+CONCURRENCY_INCREASE = 1.0
+
+_server_rate_limiters_lock = threading.Lock()
+_server_rate_limiters: Dict[str, "ServerRateLimiter"] = {}
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter: tokens are added at a fixed rate up to a
+    capacity, and each request takes one, waiting for it if the bucket is empty.
+    Thread safe.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        :param rate: Tokens added per second
+        :param capacity: Maximum number of tokens, i.e. of requests sent at once
+        after an idle period
+        :param clock: Monotonic clock, in seconds
+        :param sleep: Function waiting for a number of seconds
+        """
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def get_wait(self) -> float:
+        """Take a token, possibly one that isn't there yet, and return the
+        seconds to wait until it is"""
+
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def acquire(self) -> None:
+        """Wait for a token"""
+
+        wait = self.get_wait()
+        if wait > 0:
+            self.sleep(wait)
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Limit on the number of requests in flight, adapted by additive increase and
+    multiplicative decrease (AIMD): it grows by CONCURRENCY_INCREASE every
+    `limit` successful requests up to max_limit, and is multiplied by
+    CONCURRENCY_DECREASE_FACTOR when the server reports it is overloaded, down
+    to 1. Thread safe.
+    """
+
+    def __init__(self, max_limit: int):
+        """
+        :param max_limit: Maximum number of requests in flight
+        """
+
+        self.max_limit = max_limit
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Wait until a request can be sent"""
+
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+    def try_acquire(self) -> bool:
+        """Count a request as sent if the limit allows it, without waiting.
+        Return whether it does."""
+
+        with self.condition:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+
+            return True
+
+    def release(self, overloaded: bool = False) -> None:
+        """
+        Record that a request finished.
+
+        :param overloaded: Whether the server responded that it's overloaded
+        """
+
+        with self.condition:
+            self.in_flight -= 1
+            if overloaded:
+                limit = max(1.0, self.limit * CONCURRENCY_DECREASE_FACTOR)
+                if int(limit) < int(self.limit):
+                    LOGGER.warning(
+                        "Server overloaded, sending at most %d requests at once",
+                        int(limit),
+                    )
+                self.limit = limit
+            else:
+                self.limit = min(
+                    float(self.max_limit),
+                    self.limit + CONCURRENCY_INCREASE / self.limit,
+                )
+            self.condition.notify_all()
+
+
+class ServerRateLimiter:
+    """Rate and concurrency limits of the requests sent to a server"""
+
+    def __init__(self, requests_per_second: float, max_requests_in_flight: int):
+        """
+        :param requests_per_second: Average rate of requests, bursts of up to a
+        second of requests are allowed. 0 for no rate limit
+        :param max_requests_in_flight: Maximum number of requests sent at once
+        """
+
+        self.token_bucket = (
+            TokenBucket(
+                rate=requests_per_second, capacity=max(requests_per_second, 1.0)
+            )
+            if requests_per_second > 0
+            else None
+        )
+        self.concurrency_limit = AdaptiveConcurrencyLimit(
+            max_limit=max_requests_in_flight
+        )
+
+    def acquire(self) -> None:
+        """Wait until a request can be sent"""
+
+        self.concurrency_limit.acquire()
+        if self.token_bucket is not None:
+            self.token_bucket.acquire()
+
+    def release(self, overloaded: bool = False) -> None:
+        """Record that a request finished, see AdaptiveConcurrencyLimit.release"""
+
+        self.concurrency_limit.release(overloaded=overloaded)
+
+
+def get_server_rate_limiter(url: str) -> ServerRateLimiter:
+    """
+    Get the rate limiter of the server of a URL, shared by all the requests sent
+    to the server and created with the requests_per_second and
+    max_requests_in_flight options on the first request.
+
+    :param url: URL of a request
+    :return: Rate limiter of the server
+    """
+
+    split_url = urlsplit(url)
+    server = f"{split_url.scheme}://{split_url.netloc}"
+
+    with _server_rate_limiters_lock:
+        rate_limiter = _server_rate_limiters.get(server)
+        if rate_limiter is None:
+            LOGGER.debug(
+                "Limiting requests to %s to %s per second and %d at once",
+                server,
+                cromshellconfig.requests_per_second,
+                cromshellconfig.max_requests_in_flight,
+            )
+            rate_limiter = _server_rate_limiters[server] = ServerRateLimiter(
+                requests_per_second=cromshellconfig.requests_per_second,
+                max_requests_in_flight=cromshellconfig.max_requests_in_flight,
+            )
+
+        return rate_limiter
@@ -0,0 +1,250 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+GCS_PREFIX = "gs://"
+# Number of storage metadata calls (listings or single object lookups) in flight.
+DEFAULT_MAX_WORKERS = 32
+
+
+class FileStat(NamedTuple):
+    """Size, modification time and existence of a single file"""
+
+    path: str
+    exists: bool
+    size: Optional[int] = None
+    modified: Optional[str] = None
+
+
+def is_gcs_path(path: str) -> bool:
+    """Check if the path points to a Google Cloud Storage object"""
+
+    return path.startswith(GCS_PREFIX)
+
+
+def is_local_path(path: str) -> bool:
+    """Check if the path points to a file on the local filesystem"""
+
+    return path.startswith("/")
+
+
+def get_filesystem(path: str):
+    """Return the fsspec filesystem able to handle the given path.
+
+    gcsfs is imported lazily as creating the filesystem is slow and
+    not needed for local paths.
+    """
+
+    if is_gcs_path(path):
+        import gcsfs  # pylint: disable=C0415
+
+        return gcsfs.GCSFileSystem()
+    elif is_local_path(path):
+        from fsspec.implementations.local import (  # pylint: disable=C0415
+            LocalFileSystem,
+        )
+
+        return LocalFileSystem()
+    else:
+        raise ValueError(f"Unsupported path, expected a gs:// or local path: {path}")
+
+
+def strip_protocol(path: str) -> str:
+    """Remove the gs:// protocol, fsspec returns object names without it"""
+
+    return path[len(GCS_PREFIX) :] if is_gcs_path(path) else path
+
+
+def group_paths_by_prefix(paths: Iterable[str]) -> Dict[str, List[str]]:
+    """Group paths by their parent "directory" (everything before the last '/')"""
+
+    grouped_paths = {}
+    for path in paths:
+        grouped_paths.setdefault(path.rsplit("/", 1)[0], []).append(path)
+
+    return grouped_paths
+
+
+def format_modified_time(info: dict) -> Optional[str]:
+    """Get the modification time from a fsspec info dictionary as an ISO string.
+
+    GCS objects report an 'updated' timestamp string while local files
+    report 'mtime' as seconds since the epoch.
+    """
+
+    if info.get("updated"):
+        return str(info["updated"])
+    if info.get("mtime") is not None:
+        return datetime.fromtimestamp(info["mtime"], tz=timezone.utc).isoformat()
+
+    return None
+
+
+def stat_from_info(path: str, info: dict) -> FileStat:
+    """Convert a fsspec info dictionary into a FileStat"""
+
+    return FileStat(
+        path=path,
+        exists=True,
+        size=info.get("size"),
+        modified=format_modified_time(info),
+    )
+
+
+def stat_paths_in_prefix(fs, prefix: str, paths: List[str]) -> List[FileStat]:
+    """Stat the paths that share a prefix.
+
+    A single listing of the prefix is used when more than one path is
+    requested, which replaces one metadata request per object with one
+    request per prefix. A lone path is looked up directly so a large
+    prefix is not listed for the sake of one object.
+    """
+
+    if len(paths) == 1:
+        try:
+            return [stat_from_info(paths[0], fs.info(paths[0]))]
+        except FileNotFoundError:
+            return [FileStat(path=paths[0], exists=False)]
+
+    try:
+        listing = {
+            strip_protocol(info["name"]).rstrip("/"): info
+            for info in fs.ls(prefix, detail=True)
+        }
+    except FileNotFoundError:
+        listing = {}
+
+    stats = []
+    for path in paths:
+        info = listing.get(strip_protocol(path))
+        if info is None or info.get("type") == "directory":
+            stats.append(FileStat(path=path, exists=False))
+        else:
+            stats.append(stat_from_info(path, info))
+
+    return stats
+
+
+def get_file_stats(
+    paths: Iterable[str], max_workers: int = DEFAULT_MAX_WORKERS
+) -> Dict[str, FileStat]:
+    """Get the size, modification time and existence of many files at once.
+
+    Paths are grouped by prefix and each prefix is queried on a thread pool.
+    Paths that are neither gs:// nor local (e.g. http urls) are reported as
+    not existing, as there is no metadata to look up.
+
+    :param paths: gs:// or local file paths
+    :param max_workers: Maximum number of concurrent metadata requests
+    :return: Dictionary of path to FileStat, in the order paths were given
+    """
+
+    unique_paths = list(dict.fromkeys(paths))
+    stats = {}
+    prefix_jobs = []
+    filesystems = {}
+
+    for prefix, prefix_paths in group_paths_by_prefix(unique_paths).items():
+        if not (is_gcs_path(prefix_paths[0]) or is_local_path(prefix_paths[0])):
+            LOGGER.debug("Unable to stat unsupported paths under %s", prefix)
+            for path in prefix_paths:
+                stats[path] = FileStat(path=path, exists=False)
+            continue
+
+        protocol = "gs" if is_gcs_path(prefix_paths[0]) else "file"
+        if protocol not in filesystems:
+            filesystems[protocol] = get_filesystem(prefix_paths[0])
+        prefix_jobs.append((filesystems[protocol], prefix, prefix_paths))
+
+    LOGGER.debug(
+        "Querying metadata of %d files under %d prefixes",
+        len(unique_paths),
+        len(prefix_jobs),
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for prefix_stats in executor.map(
+            lambda job: stat_paths_in_prefix(*job), prefix_jobs
+        ):
+            for file_stat in prefix_stats:
+                stats[file_stat.path] = file_stat
+
+    return {path: stats[path] for path in unique_paths}
+
+
+def find_files(root: str) -> Dict[str, FileStat]:
+    """Recursively list every file under a gs:// or local directory.
+
+    A single recursive listing is used instead of walking each
+    "directory" of the tree.
+
+    :param root: gs:// or local directory
+    :return: Dictionary of file path to FileStat
+    """
+
+    fs = get_filesystem(root)
+    protocol = GCS_PREFIX if is_gcs_path(root) else ""
+
+    try:
+        listing = fs.find(root, detail=True)
+    except FileNotFoundError:
+        return {}
+
+    files = {}
+    for name, info in listing.items():
+        if info.get("type") == "directory":
+            continue
+        path = f"{protocol}{strip_protocol(name)}"
+        files[path] = stat_from_info(path, info)
+
+    return files
+
+
+def delete_files(
+    paths: List[str],
+    batch_size: int = 1000,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> int:
+    """Delete many files using batched, parallel bulk deletes.
+
+    Files are split into batches that are each removed with a single bulk
+    delete (gcsfs sends these through the GCS batch API) and the batches are
+    deleted concurrently on a thread pool.
+
+    :param paths: gs:// or local file paths, all using the same protocol
+    :param batch_size: Number of files removed per bulk delete
+    :param max_workers: Maximum number of bulk deletes in flight
+    :return: Number of files deleted
+    """
+
+    if not paths:
+        return 0
+
+    fs = get_filesystem(paths[0])
+    batches = [paths[i : i + batch_size] for i in range(0, len(paths), batch_size)]
+
+    def delete_batch(batch: List[str]) -> int:
+        fs.rm(batch)
+        LOGGER.debug("Deleted batch of %d files", len(batch))
+        return len(batch)
+
+    LOGGER.info("Deleting %d files in %d batches", len(paths), len(batches))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sum(executor.map(delete_batch, batches))
+
+
+def format_bytes(num_bytes: Optional[int]) -> str:
+    """Format a byte count as a human readable string (e.g. 1.5 GiB)"""
+
+    if num_bytes is None:
+        return "-"
+
+    size = float(num_bytes)
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+        if size < 1024 or unit == "TiB":
+            break
+        size /= 1024
+
+    return f"{int(size)} {unit}" if unit == "B" else f"{size:.2f} {unit}"
@@ -1,10 +1,11 @@
 import csv
+import fnmatch
 import logging
 import shutil
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
 from pathlib import Path
-from typing import Union
+from typing import Dict, List, Optional, Union
 
 LOGGER = logging.getLogger(__name__)
 
@@ -93,6 +94,30 @@ def update_row_values_in_submission_db(
     :return:
     """
 
+    update_column_values_in_submission_db(
+        workflow_database_path=workflow_database_path,
+        column_to_update=column_to_update,
+        updated_values={workflow_id: update_value},
+        fields=fields,
+    )
+
+
+def update_column_values_in_submission_db(
+    workflow_database_path: str,
+    column_to_update: str,
+    updated_values: Dict[str, str],
+    fields: list = WorkflowDatabaseColumns.get_submission_file_headers(),
+) -> None:
+    """
+    Updates a column of the all_workflow_database_tsv for many workflows at once,
+    rewriting the file a single time
+    :param workflow_database_path: Path to all_workflow_database tsv file
+    :param column_to_update:["STATUS", "ALIAS"]
+    :param updated_values: New value of the cell of each workflow id to update
+    :param fields: submission db column name
+    :return:
+    """
+
     mutable_columns = [column.value for column in MutableSubmissionFileHeader]
     if column_to_update not in mutable_columns:
         raise KeyError(
@@ -111,10 +136,45 @@ def update_row_values_in_submission_db(
         reader = csv.DictReader(tsv_file, delimiter="\t", fieldnames=fields)
         writer = csv.DictWriter(tempfile_tsv, delimiter="\t", fieldnames=fields)
         for row in reader:
-            if row["RUN_ID"] == workflow_id:
-                row[column_to_update] = update_value
+            if row["RUN_ID"] in updated_values:
+                row[column_to_update] = updated_values[row["RUN_ID"]]
             writer.writerow(row)
 
     # copy over submission tsv with tempfile
     shutil.move(tmp.name, workflow_database_path)
     tmp.close()
+
+
+def filter_submission_file(
+    submission_file_path: Union[str, Path],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    wdl_name: Optional[str] = None,
+) -> List[str]:
+    """
+    Get the ids of the workflows in the submission database submitted in a date
+    range and/or running a WDL.
+
+    :param submission_file_path: Path to all_workflow_database tsv file
+    :param since: Earliest submission date, inclusive
+    :param until: Latest submission date, inclusive
+    :param wdl_name: Name of the submitted WDL, may be a shell-style pattern
+    (e.g. 'Joint*.wdl')
+    :return: Workflow ids in order of submission
+    """
+
+    workflow_ids = []
+    with open(submission_file_path, "r") as tsv_file:
+        for row in csv.DictReader(tsv_file, delimiter="\t"):
+            submission_date = datetime.strptime(row["DATE"], "%Y%m%d_%H%M%S").date()
+            if since is not None and submission_date < since:
+                continue
+            if until is not None and submission_date > until:
+                continue
+            if wdl_name is not None and not fnmatch.fnmatchcase(
+                row["WDL_NAME"], wdl_name
+            ):
+                continue
+            workflow_ids.append(row["RUN_ID"])
+
+    return workflow_ids
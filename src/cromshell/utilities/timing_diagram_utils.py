@@ -0,0 +1,218 @@
+import heapq
+import html
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Union
+
+from cromshell.utilities.timing_utils import CallTiming
+
+LOGGER = logging.getLogger(__name__)
+
+# Tasks with more calls are drawn as the number of running calls over time
+# instead of one bar per call, bounding the size of the diagram.
+MAX_CALLS_PER_TASK = 200
+TIME_BUCKETS = 400
+LABEL_WIDTH = 260
+PLOT_WIDTH = 1000
+LANE_HEIGHT = 12
+HISTOGRAM_HEIGHT = 48
+TASK_PADDING = 8
+AXIS_HEIGHT = 24
+STATUS_COLORS = {"Failed": "#d9534f", "Running": "#f0ad4e"}
+DEFAULT_COLOR = "#5b9bd5"
+
+
+def assign_lanes(call_timings: List[CallTiming]) -> List[int]:
+    """
+    Assign the calls of a task to the fewest lanes in which they don't overlap.
+
+    :param call_timings: Timing of the calls, sorted by start time
+    :return: Lane of each call
+    """
+
+    lanes = []
+    # (end of the last call of the lane, lane)
+    lane_ends = []
+    for call_timing in call_timings:
+        if lane_ends and lane_ends[0][0] <= call_timing.start:
+            _, lane = heapq.heappop(lane_ends)
+        else:
+            lane = len(lane_ends)
+        heapq.heappush(lane_ends, (call_timing.end, lane))
+        lanes.append(lane)
+
+    return lanes
+
+
+def get_concurrency_histogram(
+    call_timings: List[CallTiming], start: float, end: float, buckets: int
+) -> List[int]:
+    """
+    Count the calls running during each of a number of equal time buckets.
+
+    :param call_timings: Timing of the calls
+    :param start: Start of the first bucket (POSIX timestamp)
+    :param end: End of the last bucket (POSIX timestamp)
+    :param buckets: Number of buckets
+    :return: Number of calls running at some point of each bucket
+    """
+
+    bucket_seconds = max(end - start, 1e-9) / buckets
+    changes = [0] * (buckets + 1)
+    for call_timing in call_timings:
+        first = min(int((call_timing.start - start) / bucket_seconds), buckets - 1)
+        last = min(int((call_timing.end - start) / bucket_seconds), buckets - 1)
+        changes[max(first, 0)] += 1
+        changes[max(last, 0) + 1] -= 1
+
+    histogram = []
+    running = 0
+    for change in changes[:buckets]:
+        running += change
+        histogram.append(running)
+
+    return histogram
+
+
+def render_timing_svg(call_timings: List[CallTiming], title: str) -> str:
+    """
+    Render a Gantt chart of the calls of a workflow as a standalone SVG.
+
+    Tasks with up to MAX_CALLS_PER_TASK calls get one bar per call, packed into
+    lanes. Larger tasks (e.g. big scatters) are downsampled into TIME_BUCKETS
+    buckets and drawn as the number of calls running over time, so the size of
+    the diagram depends on the number of tasks, not of calls.
+
+    :param call_timings: Timing of the calls
+    :param title: Title of the diagram
+    :return: SVG document
+    """
+
+    if call_timings:
+        start = min(call_timing.start for call_timing in call_timings)
+        end = max(call_timing.end for call_timing in call_timings)
+    else:
+        start = end = 0.0
+    seconds_per_pixel = max(end - start, 1e-9) / PLOT_WIDTH
+
+    def x(timestamp: float) -> float:
+        return LABEL_WIDTH + (timestamp - start) / seconds_per_pixel
+
+    tasks = defaultdict(list)
+    for call_timing in call_timings:
+        tasks[call_timing.task].append(call_timing)
+
+    elements = []
+    y = AXIS_HEIGHT
+    for task, task_call_timings in sorted(
+        tasks.items(), key=lambda task_calls: min(c.start for c in task_calls[1])
+    ):
+        task_call_timings.sort(key=lambda call_timing: call_timing.start)
+        elements.append(
+            f'<text x="4" y="{y + 10}" class="label">{html.escape(task)} '
+            f"({len(task_call_timings)})</text>"
+        )
+
+        if len(task_call_timings) <= MAX_CALLS_PER_TASK:
+            lanes = assign_lanes(task_call_timings)
+            for call_timing, lane in zip(task_call_timings, lanes):
+                bar_width = max(call_timing.wall_seconds / seconds_per_pixel, 1)
+                color = STATUS_COLORS.get(call_timing.status, DEFAULT_COLOR)
+                elements.append(
+                    f'<rect x="{x(call_timing.start):.1f}" '
+                    f'y="{y + lane * LANE_HEIGHT}" width="{bar_width:.1f}" '
+                    f'height="{LANE_HEIGHT - 2}" fill="{color}">'
+                    f"<title>{html.escape(task)} shard {call_timing.shard} "
+                    f"attempt {call_timing.attempt}: "
+                    f"{call_timing.wall_seconds / 3600:.2f} h</title></rect>"
+                )
+            y += (max(lanes) + 1) * LANE_HEIGHT + TASK_PADDING
+        else:
+            histogram = get_concurrency_histogram(
+                task_call_timings, start=start, end=end, buckets=TIME_BUCKETS
+            )
+            peak = max(histogram) or 1
+            bucket_width = PLOT_WIDTH / TIME_BUCKETS
+            for bucket, running in enumerate(histogram):
+                if not running:
+                    continue
+                height = HISTOGRAM_HEIGHT * running / peak
+                elements.append(
+                    f'<rect x="{LABEL_WIDTH + bucket * bucket_width:.1f}" '
+                    f'y="{y + HISTOGRAM_HEIGHT - height:.1f}" '
+                    f'width="{bucket_width:.1f}" height="{height:.1f}" '
+                    f'fill="{DEFAULT_COLOR}"><title>{running} running</title></rect>'
+                )
+            elements.append(
+                f'<text x="{LABEL_WIDTH - 4}" y="{y + 10}" class="axis" '
+                f'text-anchor="end">{peak} max</text>'
+            )
+            y += HISTOGRAM_HEIGHT + TASK_PADDING
+
+    # Time axis, 10 ticks in hours since the start of the first call
+    for tick in range(11):
+        tick_x = LABEL_WIDTH + tick * PLOT_WIDTH / 10
+        elements.append(
+            f'<line x1="{tick_x:.1f}" y1="{AXIS_HEIGHT - 4}" x2="{tick_x:.1f}" '
+            f'y2="{y}" class="grid"/>'
+            f'<text x="{tick_x:.1f}" y="{AXIS_HEIGHT - 8}" class="axis" '
+            f'text-anchor="middle">'
+            f"{tick * (end - start) / 10 / 3600:.1f}h</text>"
+        )
+
+    width = LABEL_WIDTH + PLOT_WIDTH + 40
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{y}" '
+        f'viewBox="0 0 {width} {y}">'
+        f"<title>{html.escape(title)}</title>"
+        "<style>.label,.axis{font:11px sans-serif}.axis{fill:#666}"
+        ".grid{stroke:#ddd}</style>" + "".join(elements) + "</svg>"
+    )
+
+
+def render_timing_html(call_timings: List[CallTiming], title: str) -> str:
+    """
+    Render a Gantt chart of the calls of a workflow as a self-contained HTML
+    page, see render_timing_svg.
+    """
+
+    started = (
+        datetime.fromtimestamp(
+            min(call_timing.start for call_timing in call_timings), timezone.utc
+        ).isoformat()
+        if call_timings
+        else "-"
+    )
+
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset='utf-8'>"
+        f"<title>{html.escape(title)}</title></head>"
+        "<body style='font-family:sans-serif'>"
+        f"<h3>{html.escape(title)}</h3>"
+        f"<p>{len(call_timings)} calls, first call started {started}</p>"
+        + render_timing_svg(call_timings, title=title)
+        + "</body></html>\n"
+    )
+
+
+def write_timing_diagram(
+    call_timings: List[CallTiming], output_path: Union[str, Path], title: str
+) -> None:
+    """
+    Write the timing diagram of a workflow to an SVG file if the path ends with
+    '.svg', an HTML file otherwise.
+
+    :param call_timings: Timing of the calls
+    :param output_path: Path of the file to write
+    :param title: Title of the diagram
+    :return:
+    """
+
+    render = (
+        render_timing_svg if Path(output_path).suffix == ".svg" else render_timing_html
+    )
+    Path(output_path).write_text(render(call_timings, title=title))
+
+    LOGGER.info("Wrote timing diagram to %s", output_path)
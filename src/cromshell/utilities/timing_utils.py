@@ -0,0 +1,257 @@
+import bisect
+import heapq
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from cromshell.utilities import metadata_utils
+
+LOGGER = logging.getLogger(__name__)
+
+# Metadata keys needed for the timing report of a workflow
+TIMING_METADATA_KEYS = [
+    "id",
+    "status",
+    "start",
+    "end",
+    "attempt",
+    "shardIndex",
+    "executionStatus",
+    "runtimeAttributes",
+    "executionEvents",
+    "subWorkflowMetadata",
+    "subWorkflowId",
+]
+# Cromwell execution events of calls waiting for resources, used for the queue
+# time of calls without a worker assignment event
+QUEUE_EVENT_DESCRIPTIONS = {
+    "Pending",
+    "RequestingExecutionToken",
+    "WaitingForValueStore",
+    "waiting for quota",
+}
+DEFAULT_LONGEST_SHARDS = 10
+
+
+class CallTiming(NamedTuple):
+    """Timing of a single call attempt, times are POSIX timestamps"""
+
+    task: str
+    shard: int
+    attempt: int
+    start: float
+    end: float
+    queue_seconds: float
+    cpu_hours: float
+    status: Optional[str] = None
+
+    @property
+    def wall_seconds(self) -> float:
+        return self.end - self.start
+
+
+def get_call_queue_seconds(call: dict, call_start: float) -> float:
+    """
+    Get the time a call waited for resources (execution token, quota, a worker)
+    after it started, until its worker was assigned or, for backends without
+    worker events, the total duration of the known queue events.
+
+    :param call: Call metadata
+    :param call_start: POSIX timestamp of the start of the call
+    :return: Queue time in seconds
+    """
+
+    queue_seconds = 0.0
+    for event in call.get("executionEvents", []):
+        description = event.get("description", "")
+        if description.startswith("Worker ") and " assigned " in description:
+            worker_start = metadata_utils.parse_timestamp(event["startTime"])
+            return max(worker_start.timestamp() - call_start, 0.0)
+        if description in QUEUE_EVENT_DESCRIPTIONS and event.get("endTime"):
+            queue_seconds += (
+                metadata_utils.parse_timestamp(event["endTime"])
+                - metadata_utils.parse_timestamp(event["startTime"])
+            ).total_seconds()
+
+    return queue_seconds
+
+
+def iter_call_timings(
+    workflow_metadata: dict, now: Optional[datetime] = None
+) -> Iterator[CallTiming]:
+    """
+    Iterate over the timing of the calls of a workflow and its subworkflows
+    that started, calls still running end now.
+
+    :param workflow_metadata: Workflow metadata with expanded subworkflows and
+    at least the TIMING_METADATA_KEYS
+    :param now: Current time
+    :return: Iterator of CallTiming
+    """
+
+    now = now or datetime.now(timezone.utc)
+
+    for call_name, call in metadata_utils.iter_workflow_calls(workflow_metadata):
+        if not call.get("start"):
+            continue
+        start = metadata_utils.parse_timestamp(call["start"]).timestamp()
+        end = (
+            metadata_utils.parse_timestamp(call["end"]) if call.get("end") else now
+        ).timestamp()
+
+        run_start, run_end = metadata_utils.get_call_run_time(call, now=now)
+        cpu = float(call.get("runtimeAttributes", {}).get("cpu", 1))
+
+        yield CallTiming(
+            task=call_name,
+            shard=call.get("shardIndex", -1),
+            attempt=call.get("attempt", 1),
+            start=start,
+            end=end,
+            queue_seconds=get_call_queue_seconds(call, call_start=start),
+            cpu_hours=cpu * max((run_end - run_start).total_seconds(), 0) / 3600,
+            status=call.get("executionStatus"),
+        )
+
+
+def summarize_task_timings(call_timings: Iterable[CallTiming]) -> List[dict]:
+    """
+    Summarize the timing of the calls of each task.
+
+    :param call_timings: Timing of the calls
+    :return: One row per task, longest total wall time first
+    """
+
+    tasks = defaultdict(lambda: [0, 0.0, 0.0, 0.0, 0.0])
+    for call_timing in call_timings:
+        task = tasks[call_timing.task]
+        task[0] += 1
+        task[1] += call_timing.wall_seconds
+        task[2] = max(task[2], call_timing.wall_seconds)
+        task[3] += call_timing.queue_seconds
+        task[4] += call_timing.cpu_hours
+
+    task_summaries = [
+        {
+            "task": task_name,
+            "calls": calls,
+            "wall_hours": wall_seconds / 3600,
+            "max_wall_hours": max_wall_seconds / 3600,
+            "mean_queue_minutes": queue_seconds / calls / 60,
+            "cpu_hours": cpu_hours,
+        }
+        for task_name, (
+            calls,
+            wall_seconds,
+            max_wall_seconds,
+            queue_seconds,
+            cpu_hours,
+        ) in tasks.items()
+    ]
+    task_summaries.sort(key=lambda summary: summary["wall_hours"], reverse=True)
+
+    return task_summaries
+
+
+def get_critical_path(call_timings: List[CallTiming]) -> List[CallTiming]:
+    """
+    Get the critical path of a workflow, the chain of calls that determined
+    when it finished.
+
+    Cromwell metadata doesn't include the call graph, so the path is derived
+    from the timing: starting from the last call to finish, each call is
+    preceded by the last call that finished before it started (the call it was
+    most likely waiting for). Sorting by end time makes this O(n log n).
+
+    :param call_timings: Timing of the calls
+    :return: Calls of the critical path, in order of execution
+    """
+
+    if not call_timings:
+        return []
+
+    calls_by_end = sorted(call_timings, key=lambda call_timing: call_timing.end)
+    ends = [call_timing.end for call_timing in calls_by_end]
+
+    current = len(calls_by_end) - 1
+    critical_path = [calls_by_end[current]]
+    while True:
+        # Latest call to end at or before the start of the current one, always
+        # earlier in the order so the walk terminates (even for calls that
+        # ended when they started).
+        current = min(
+            bisect.bisect_right(ends, calls_by_end[current].start) - 1, current - 1
+        )
+        if current < 0:
+            break
+        critical_path.append(calls_by_end[current])
+    critical_path.reverse()
+
+    return critical_path
+
+
+def get_timing_report(
+    workflow_metadata: dict,
+    longest_shards: int = DEFAULT_LONGEST_SHARDS,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    Compute the timing report of a workflow from its metadata: timing per task,
+    total CPU hours, critical path and longest running calls.
+
+    :param workflow_metadata: Workflow metadata with expanded subworkflows and
+    at least the TIMING_METADATA_KEYS
+    :param longest_shards: Number of longest running calls to report
+    :param now: Current time, the end of the calls and workflow still running
+    :return: JSON serializable report
+    """
+
+    now = now or datetime.now(timezone.utc)
+    call_timings = list(iter_call_timings(workflow_metadata, now=now))
+
+    workflow_start = workflow_metadata.get("start")
+    workflow_end = workflow_metadata.get("end")
+    wall_seconds = (
+        (
+            (metadata_utils.parse_timestamp(workflow_end) if workflow_end else now)
+            - metadata_utils.parse_timestamp(workflow_start)
+        ).total_seconds()
+        if workflow_start
+        else 0.0
+    )
+
+    return {
+        "id": workflow_metadata.get("id"),
+        "status": workflow_metadata.get("status"),
+        "wall_hours": wall_seconds / 3600,
+        "cpu_hours": sum(call_timing.cpu_hours for call_timing in call_timings),
+        "calls": len(call_timings),
+        "tasks": summarize_task_timings(call_timings),
+        "critical_path": [
+            format_call_timing(call_timing)
+            for call_timing in get_critical_path(call_timings)
+        ],
+        "longest_shards": [
+            format_call_timing(call_timing)
+            for call_timing in heapq.nlargest(
+                longest_shards,
+                call_timings,
+                key=lambda call_timing: call_timing.wall_seconds,
+            )
+        ],
+    }
+
+
+def format_call_timing(call_timing: CallTiming) -> dict:
+    """Convert the timing of a call to a JSON serializable dictionary"""
+
+    return {
+        "task": call_timing.task,
+        "shard": call_timing.shard,
+        "attempt": call_timing.attempt,
+        "start": datetime.fromtimestamp(call_timing.start, timezone.utc).isoformat(),
+        "end": datetime.fromtimestamp(call_timing.end, timezone.utc).isoformat(),
+        "wall_hours": call_timing.wall_seconds / 3600,
+        "queue_minutes": call_timing.queue_seconds / 60,
+    }
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+from typing import Optional, Union
+
+from cromshell.utilities import cromshellconfig, http_utils, io_utils
+
+LOGGER = logging.getLogger(__name__)
+
+MAX_CACHED_VALIDATIONS = 1000
+
+
+def get_validation_cache_dir(config: cromshellconfig) -> Path:
+    """Directory holding the keys of previously successful validations"""
+
+    return Path(config.config_dir).joinpath(config.VALIDATION_CACHE_DIR_NAME)
+
+
+def get_miniwdl_version() -> str:
+    """Get the version of the installed miniwdl package"""
+
+    try:
+        return metadata.version("miniwdl")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def get_validator_versions(
+    config: cromshellconfig, use_miniwdl: bool, use_womtool: bool
+) -> Optional[dict]:
+    """
+    Get the versions of the validators that will run.
+
+    womtool runs on the Cromwell server so its version is the server's.
+
+    :return: Dictionary of validator name to version, or None if the version of
+    an enabled validator is unknown (in which case the result can't be cached)
+    """
+
+    versions = {}
+    if use_miniwdl:
+        versions["miniwdl"] = get_miniwdl_version()
+    if use_womtool:
+        cromwell_version = http_utils.get_cromwell_version(config)
+        if cromwell_version is None:
+            LOGGER.debug("Unknown womtool version, not using the validation cache.")
+            return None
+        versions["womtool"] = f"{config.cromwell_server}@{cromwell_version}"
+
+    return versions
+
+
+def get_validation_cache_key(
+    wdl: Union[str, Path],
+    wdl_json: Union[str, Path, None],
+    dependencies: Union[str, Path, None],
+    validator_versions: dict,
+    validation_options: dict,
+) -> str:
+    """
+    Compute the key identifying a validation, a sha256 digest over everything
+    that can change its outcome.
+
+    :param wdl: Path to the (flattened) WDL, its local imports are included
+    :param wdl_json: Path to the inputs JSON, if any
+    :param dependencies: Dependencies directory or zip, if any
+    :param validator_versions: Versions of the validators run (e.g. miniwdl and
+    the Cromwell server hosting womtool)
+    :param validation_options: Options passed to the validators (e.g. strict,
+    suppressed warnings, which validators are enabled)
+    :return: Hexadecimal digest
+    """
+
+    digest = hashlib.sha256()
+    digest.update(
+        json.dumps(
+            {"versions": validator_versions, "options": validation_options},
+            sort_keys=True,
+        ).encode()
+    )
+
+    wdl_dir = Path(wdl).resolve().parent
+    for wdl_path in io_utils.resolve_local_wdl_imports(wdl):
+        # Imports outside of the WDL directory are keyed by absolute path
+        try:
+            wdl_name = wdl_path.relative_to(wdl_dir).as_posix()
+        except ValueError:
+            wdl_name = wdl_path.as_posix()
+        digest.update(f"\0wdl:{wdl_name}\0".encode())
+        io_utils.hash_file(wdl_path, digest=digest)
+
+    if wdl_json is not None:
+        digest.update(b"\0inputs\0")
+        io_utils.hash_file(wdl_json, digest=digest)
+
+    if dependencies is not None:
+        digest.update(b"\0dependencies\0")
+        if Path(dependencies).is_dir():
+            digest.update(io_utils.hash_dir(Path(dependencies)).encode())
+        else:
+            io_utils.hash_file(dependencies, digest=digest)
+
+    return digest.hexdigest()
+
+
+def is_validation_cached(cache_key: Optional[str], cache_dir: Path) -> bool:
+    """Check whether a validation with this key previously succeeded"""
+
+    if cache_key is None:
+        return False
+
+    cached_validation = Path(cache_dir).joinpath(cache_key)
+    if cached_validation.exists():
+        # Refresh the modification time, it is used to prune the oldest entries
+        cached_validation.touch()
+        return True
+
+    return False
+
+
+def cache_validation_success(
+    cache_key: Optional[str],
+    cache_dir: Path,
+    wdl: Union[str, Path],
+    max_cached_validations: int = MAX_CACHED_VALIDATIONS,
+) -> None:
+    """Record that the validation with this key succeeded.
+
+    Only successful validations are cached so failures are always reported
+    by the validators themselves.
+    """
+
+    if cache_key is None:
+        return
+
+    io_utils.create_directory(dir_path=cache_dir, exist_ok=True)
+    Path(cache_dir).joinpath(cache_key).write_text(
+        json.dumps({"wdl": str(wdl), "date": datetime.now().strftime("%Y%m%d_%H%M%S")})
+    )
+
+    cached_validations = sorted(
+        Path(cache_dir).iterdir(), key=lambda p: p.stat().st_mtime, reverse=True
+    )
+    for old_validation in cached_validations[max_cached_validations:]:
+        old_validation.unlink(missing_ok=True)
@@ -0,0 +1,235 @@
+import functools
+import logging
+import math
+import os
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import cromshell.utilities.miniwdl_utils as miniwdl_utils
+import cromshell.utilities.womtool_utils as womtool_utils
+from cromshell import log
+from cromshell.utilities import cromshellconfig
+from cromshell.utilities.io_utils import dead_turtle
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_PROCESSES = os.cpu_count() or 1
+
+
+def run_in_daemon_thread(function: Callable, *args, **kwargs) -> Future:
+    """Run a function on a daemon thread and return a future of its result.
+
+    Unlike ThreadPoolExecutor workers, daemon threads are not joined when the
+    interpreter exits, so a validation that is no longer waited for (see
+    run_validators fail_fast) doesn't delay the exit of cromshell.
+    """
+
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(function(*args, **kwargs))
+        except BaseException as exn:  # pylint: disable=W0703
+            future.set_exception(exn)
+
+    threading.Thread(target=run, daemon=True).start()
+
+    return future
+
+
+def run_validators(
+    validators: Dict[str, Callable[[], None]], fail_fast: bool = False
+) -> Dict[str, Optional[BaseException]]:
+    """
+    Run independent validators concurrently, each on its own thread.
+
+    :param validators: Dictionary of validator name to a function that raises
+    an exception if the validation fails
+    :param fail_fast: Stop waiting for the other validators as soon as one fails
+    :return: Dictionary of validator name to None if the validation passed, the
+    exception it raised if it failed, or a CancelledError if it was abandoned
+    because of fail_fast
+    """
+
+    futures = {
+        run_in_daemon_thread(validator): name for name, validator in validators.items()
+    }
+    results = {}
+
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            results[futures[future]] = future.exception()
+            LOGGER.debug(
+                "%s validation finished: %s",
+                futures[future],
+                "failed" if future.exception() else "passed",
+            )
+
+        if fail_fast and pending and any(results.values()):
+            # Threads can't be interrupted, the running validators are
+            # abandoned and their results ignored.
+            for future in pending:
+                future.cancel()
+                results[futures[future]] = CancelledError()
+            break
+
+    return {name: results[name] for name in validators}
+
+
+def print_validation_report(results: Dict[str, Optional[BaseException]]) -> None:
+    """Print the merged results of the validators, with the dead turtle logo
+    if any of them failed"""
+
+    if validation_failed(results):
+        log.display_logo(logo=dead_turtle)
+
+    for name, error in results.items():
+        if error is None:
+            print(f"{name}: passed")
+        elif isinstance(error, CancelledError):
+            print(f"{name}: skipped, another validator failed")
+        else:
+            print(f"{name}: failed\n{error}")
+
+
+def validation_failed(results: Dict[str, Optional[BaseException]]) -> bool:
+    """Check whether any of the validators failed"""
+
+    return any(error is not None for error in results.values())
+
+
+def validate_with_miniwdl(
+    wdl: Path,
+    dependencies: Optional[str] = None,
+    strict: bool = False,
+    suppress=None,
+    show_warnings: bool = True,
+) -> None:
+    """Validate a WDL with miniwdl, raising an exception if it is invalid"""
+
+    if (
+        miniwdl_utils.miniwdl_validate_wdl(
+            wdl=Path(wdl),
+            dependencies=dependencies,
+            strict=strict,
+            suppress=suppress,
+            show_warnings=show_warnings,
+            show_logo=False,
+        )
+        != 0
+    ):
+        raise miniwdl_utils.ValidationFailedError("MiniWDL Validation failed.")
+
+
+def validate_with_womtool(wdl: str, wdl_json: str, config: cromshellconfig) -> None:
+    """Validate a WDL and its inputs with the Cromwell server's womtool API,
+    raising an exception if they are invalid"""
+
+    # The logo is displayed once with the merged report of both validators.
+    womtool_utils.womtool_validate_wdl_and_json(
+        wdl=str(wdl), wdl_json=str(wdl_json), config=config, show_logo=False
+    )
+
+
+def validate_wdls_with_miniwdl(
+    wdls: List[Path],
+    path: Optional[List[str]] = None,
+    strict: bool = False,
+    suppress: Iterable[str] = (),
+    max_processes: int = DEFAULT_MAX_PROCESSES,
+) -> Dict[str, List[miniwdl_utils.Diagnostic]]:
+    """
+    Validate many WDLs with miniwdl across a pool of processes.
+
+    The WDLs are handed to the workers in contiguous chunks, and each worker
+    keeps its own MiniwdlValidator, so the WDLs of a chunk sharing a library
+    (usually neighbours in a directory) only parse it once.
+
+    :param wdls: Paths of the WDLs to validate
+    :param path: Directories searched for imports
+    :param strict: Report lint warnings as errors
+    :param suppress: Names of the lint warnings to ignore
+    :param max_processes: Maximum number of worker processes
+    :return: Dictionary of WDL path to the diagnostics reported for it
+    """
+
+    validate = functools.partial(
+        validate_with_process_miniwdl_validator,
+        path=list(path or []),
+        strict=strict,
+        suppress=tuple(suppress),
+    )
+    wdl_paths = [str(wdl) for wdl in wdls]
+
+    if max_processes <= 1 or len(wdl_paths) <= 1:
+        return dict(zip(wdl_paths, map(validate, wdl_paths)))
+
+    max_processes = min(max_processes, len(wdl_paths))
+    # A few chunks per worker balances the load while keeping most WDLs of
+    # a directory in the same process.
+    chunksize = math.ceil(len(wdl_paths) / (max_processes * 4))
+    LOGGER.debug("Validating %d WDLs with %d processes", len(wdl_paths), max_processes)
+    with ProcessPoolExecutor(max_workers=max_processes) as executor:
+        return dict(
+            zip(wdl_paths, executor.map(validate, wdl_paths, chunksize=chunksize))
+        )
+
+
+def validate_with_process_miniwdl_validator(
+    wdl: str, path: List[str], strict: bool, suppress: Iterable[str]
+) -> List[miniwdl_utils.Diagnostic]:
+    """Validate a WDL with the MiniwdlValidator of the current process"""
+
+    return miniwdl_utils.get_miniwdl_validator().validate(
+        wdl=wdl, path=path, strict=strict, suppress=suppress
+    )
+
+
+def get_validation_summary(
+    results: Dict[str, List[miniwdl_utils.Diagnostic]],
+    cached_wdls: Iterable[str] = (),
+) -> dict:
+    """
+    Summarize the validation of many WDLs in a JSON serializable dictionary.
+
+    :param results: Dictionary of WDL path to its diagnostics
+    :param cached_wdls: WDLs that were previously validated successfully and
+    so were not validated again
+    :return: Counts of valid and invalid WDLs and the diagnostics of each WDL
+    """
+
+    wdl_summaries = [
+        {"wdl": wdl, "valid": True, "cached": True, "diagnostics": []}
+        for wdl in cached_wdls
+    ]
+    for wdl, diagnostics in results.items():
+        wdl_summaries.append(
+            {
+                "wdl": wdl,
+                "valid": all(d.severity != "error" for d in diagnostics),
+                "cached": False,
+                "diagnostics": [d._asdict() for d in diagnostics],
+            }
+        )
+    wdl_summaries.sort(key=lambda wdl_summary: wdl_summary["wdl"])
+
+    valid_count = sum(wdl_summary["valid"] for wdl_summary in wdl_summaries)
+
+    return {
+        "total": len(wdl_summaries),
+        "valid": valid_count,
+        "invalid": len(wdl_summaries) - valid_count,
+        "wdls": wdl_summaries,
+    }
@@ -1,5 +1,6 @@
 import json
 import logging
+from pathlib import Path
 
 import requests
 
@@ -16,7 +17,7 @@ class ValidationError(Exception):
 
 
 def womtool_validate_wdl_and_json(
-    wdl: str, wdl_json: str, config: cromshellconfig
+    wdl: str, wdl_json: str, config: cromshellconfig, show_logo: bool = True
 ) -> None:
     """Validates WDL and input JSON using the Cromwell server's Womtool REST API"""
 
@@ -30,7 +31,8 @@ def womtool_validate_wdl_and_json(
     validate_status = json.loads(request_out.content)
 
     if not validate_status["valid"]:
-        log.display_logo(logo=dead_turtle)
+        if show_logo:
+            log.display_logo(logo=dead_turtle)
 
         LOGGER.error("Error: Server reports workflow was not valid.")
         raise ValidationError(
@@ -42,18 +44,22 @@ def womtool_validate_wdl_and_json(
 def womtool_validate_to_server(
     wdl: str, wdl_json: str, config: cromshellconfig
 ) -> requests.Response:
+    # describe only reads the files it is sent, the request is retried, so the
+    # files are read in memory rather than sent from file objects
     with open(wdl, "rb") as wdl_file, open(wdl_json, "rb") as wdl_json_file:
         submission_params = {
-            "workflowSource": wdl_file,
-            "workflowInputs": wdl_json_file,
+            "workflowSource": (Path(wdl).name, wdl_file.read()),
+            "workflowInputs": (Path(wdl_json).name, wdl_json_file.read()),
         }
 
-        requests_out = requests.post(
-            f"{config.get_womtool_api()}/describe",
-            files=submission_params,
-            timeout=config.requests_connect_timeout,
-            verify=config.requests_verify_certs,
-            headers=http_utils.generate_headers(config),
-        )
+    requests_out = http_utils.send_request(
+        "POST",
+        f"{config.get_womtool_api()}/describe",
+        files=submission_params,
+        timeout=config.requests_connect_timeout,
+        verify=config.requests_verify_certs,
+        headers=http_utils.generate_headers(config),
+        retry=True,
+    )
 
-        return requests_out
+    return requests_out
@@ -36,10 +36,9 @@ def confirm_workflow_in_terminal_status(workflow_status: str) -> None:
     :param workflow_status:
     :return:
     """
-    non_terminal_statuses = [
-        WorkflowStatuses.SUBMITTED.value,
-        WorkflowStatuses.RUNNING.value,
-    ]
+    non_terminal_statuses = (
+        WorkflowStatuses.SUBMITTED.value + WorkflowStatuses.RUNNING.value + ["Aborting"]
+    )
 
     if workflow_status in non_terminal_statuses:
         LOGGER.error(
@@ -1,11 +1,18 @@
+import functools
+import json
 import logging
+from concurrent.futures import CancelledError
 from pathlib import Path
 
 import click
 
 import cromshell.utilities.http_utils as http_utils
-import cromshell.utilities.miniwdl_utils as miniwdl
-import cromshell.utilities.womtool_utils as womtool
+from cromshell.utilities import (
+    io_utils,
+    miniwdl_utils,
+    validation_cache_utils,
+    validation_utils,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -19,7 +26,7 @@ class MissingArgumentError(Exception):
 
 
 @click.command(name="validate")
-@click.argument("wdl", type=click.Path(exists=True), required=True)
+@click.argument("wdl", type=click.Path(), required=True)
 @click.argument("wdl_json", type=click.Path(exists=True), required=False)
 @click.option(
     "-d",
@@ -57,6 +64,29 @@ class MissingArgumentError(Exception):
     default=False,
     help="Disable womtool to validation.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Validate even if these files were previously validated successfully "
+    "(miniwdl warnings are only shown when the validators run).",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True,
+    default=False,
+    help="Stop as soon as one validator fails instead of waiting for the "
+    "other one to finish.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=validation_utils.DEFAULT_MAX_PROCESSES,
+    show_default="number of CPUs",
+    help="Number of processes validating WDLs in parallel when WDL is a "
+    "directory or a glob pattern.",
+)
 @click.pass_obj
 def main(
     config,
@@ -67,11 +97,20 @@ def main(
     suppress: tuple,
     no_miniwdl: bool,
     no_womtool: bool,
+    no_cache: bool,
+    fail_fast: bool,
+    jobs: int,
 ):
     """
     Validate a WDL workflow and its input JSON using the Cromwell server's womtool API
     and miniwdl.
 
+    Both validators run concurrently and their results are reported together.
+
+    WDL can also be a directory or a (quoted) glob pattern such as
+    'workflows/**/*.wdl', in which case every WDL found is validated with
+    miniwdl in parallel and a JSON summary is printed.
+
     Note: Womtool validation via Cromwell server API does not support validation of
     imported files, however miniwdl does.
 
@@ -79,8 +118,6 @@ def main(
 
     LOGGER.info("validate")
 
-    return_code = 0
-
     if no_womtool and no_miniwdl:
         LOGGER.error(
             "Both `--no-womtool` and `--no-miniwdl` options were used but"
@@ -91,6 +128,21 @@ def main(
             "at least one validation tool must be enabled."
         )
 
+    if Path(wdl).is_dir() or io_utils.is_glob_pattern(wdl):
+        return validate_wdl_files(
+            config=config,
+            wdl_pattern=wdl,
+            wdl_json=wdl_json,
+            dependencies_zip=dependencies_zip,
+            strict=strict,
+            suppress=suppress,
+            no_miniwdl=no_miniwdl,
+            no_cache=no_cache,
+            jobs=jobs,
+        )
+    if not Path(wdl).is_file():
+        raise click.BadParameter(f"File '{wdl}' does not exist.", param_hint="WDL")
+
     if not no_womtool:
         if not wdl_json:
             LOGGER.error("WDL JSON file is required.")
@@ -98,20 +150,145 @@ def main(
 
         http_utils.assert_can_communicate_with_server(config)
 
-        womtool.womtool_validate_wdl_and_json(
-            wdl=str(wdl), wdl_json=str(wdl_json), config=config
+    cache_key = None
+    cache_dir = validation_cache_utils.get_validation_cache_dir(config)
+    if not no_cache:
+        validator_versions = validation_cache_utils.get_validator_versions(
+            config=config, use_miniwdl=not no_miniwdl, use_womtool=not no_womtool
         )
+        if validator_versions is not None:
+            cache_key = validation_cache_utils.get_validation_cache_key(
+                wdl=wdl,
+                wdl_json=wdl_json,
+                dependencies=dependencies_zip,
+                validator_versions=validator_versions,
+                validation_options={"strict": strict, "suppress": sorted(suppress)},
+            )
+        if validation_cache_utils.is_validation_cached(cache_key, cache_dir):
+            print("Validation successful (previously validated).")
+            return 0
 
+    validators = {}
+    if not no_womtool:
+        validators["womtool"] = functools.partial(
+            validation_utils.validate_with_womtool,
+            wdl=wdl,
+            wdl_json=wdl_json,
+            config=config,
+        )
     # Todo: Have it support nested directories after PR 268 is merged
     # https://github.com/broadinstitute/cromshell/pull/268
     if not no_miniwdl:
-        return_code = miniwdl.miniwdl_validate_wdl(
-            wdl=wdl, dependencies=dependencies_zip, strict=strict, suppress=suppress
+        validators["miniwdl"] = functools.partial(
+            validation_utils.validate_with_miniwdl,
+            wdl=wdl,
+            dependencies=dependencies_zip,
+            strict=strict,
+            suppress=suppress,
         )
 
-    if return_code == 0:
-        print("Validation successful.")
-    else:
+    # The womtool request and miniwdl run concurrently
+    validation_results = validation_utils.run_validators(
+        validators=validators, fail_fast=fail_fast
+    )
+    validation_utils.print_validation_report(validation_results)
+
+    if validation_utils.validation_failed(validation_results):
         print("Validation failed.")
+        # As when the validators ran one after the other, a server side
+        # failure is raised while miniwdl failures only set the return code.
+        womtool_error = validation_results.get("womtool")
+        if womtool_error is not None and not isinstance(womtool_error, CancelledError):
+            raise womtool_error
+        return 1
+
+    validation_cache_utils.cache_validation_success(
+        cache_key=cache_key, cache_dir=cache_dir, wdl=wdl
+    )
+    print("Validation successful.")
+
+    return 0
+
+
+def validate_wdl_files(
+    config,
+    wdl_pattern: str,
+    wdl_json: str,
+    dependencies_zip: str,
+    strict: bool,
+    suppress: tuple,
+    no_miniwdl: bool,
+    no_cache: bool,
+    jobs: int,
+) -> int:
+    """
+    Validate every WDL in a directory or matching a glob pattern with miniwdl,
+    using a pool of processes, and print a JSON summary.
+
+    womtool is not used, it requires an input JSON for each WDL and a request
+    to the server per WDL.
+    """
+
+    if wdl_json:
+        raise click.UsageError(
+            "An input JSON can't be used when validating a directory or glob of WDLs."
+        )
+    if no_miniwdl:
+        raise click.UsageError(
+            "Directories and globs of WDLs are only validated with miniwdl."
+        )
+
+    wdls = io_utils.find_wdl_files(wdl_pattern)
+    if not wdls:
+        raise FileNotFoundError(f"No WDL file was found in {wdl_pattern}.")
+    LOGGER.info("Validating %d WDLs with miniwdl", len(wdls))
+
+    resolved_dependencies = miniwdl_utils.resolve_wdl_dependencies(dependencies_zip)
+    validation_options = {"strict": strict, "suppress": sorted(suppress)}
+    validator_versions = {"miniwdl": validation_cache_utils.get_miniwdl_version()}
+    cache_dir = validation_cache_utils.get_validation_cache_dir(config)
+
+    cache_keys = {}
+    cached_wdls = []
+    for wdl in wdls:
+        cache_key = None
+        if not no_cache:
+            cache_key = validation_cache_utils.get_validation_cache_key(
+                wdl=wdl,
+                wdl_json=None,
+                dependencies=dependencies_zip,
+                validator_versions=validator_versions,
+                validation_options=validation_options,
+            )
+        if validation_cache_utils.is_validation_cached(cache_key, cache_dir):
+            cached_wdls.append(str(wdl))
+        else:
+            cache_keys[str(wdl)] = cache_key
+
+    results = validation_utils.validate_wdls_with_miniwdl(
+        wdls=list(cache_keys),
+        path=[str(resolved_dependencies)] if resolved_dependencies else [],
+        strict=strict,
+        suppress=suppress,
+        max_processes=jobs,
+    )
+    summary = validation_utils.get_validation_summary(
+        results=results, cached_wdls=cached_wdls
+    )
+
+    for wdl_summary in summary["wdls"]:
+        if wdl_summary["valid"] and not wdl_summary["cached"]:
+            validation_cache_utils.cache_validation_success(
+                cache_key=cache_keys[wdl_summary["wdl"]],
+                cache_dir=cache_dir,
+                wdl=wdl_summary["wdl"],
+            )
+
+    print(json.dumps(summary, indent=2))
+
+    if summary["invalid"]:
+        raise ValidationFailedError(
+            f"{summary['invalid']} of {summary['total']} WDLs failed validation."
+        )
 
-    return return_code
+    return 0
@@ -0,0 +1,115 @@
+"""
+Benchmarks of cromshell commands run against the mock Cromwell server, for
+workflows of 10, 10k and 1M shards. They require pytest-benchmark, run them with
+`tox -e benchmark`, which saves the results under .benchmarks/ and compares them
+with the previous run, to track them over time.
+
+Workflows of more than CROMSHELL_BENCHMARK_MAX_SHARDS shards (10000 by
+default) are skipped: set it to 1000000 to run the largest benchmarks, which
+take minutes and several GB of memory.
+"""
+
+import os
+
+import pytest
+
+from cromshell.utilities import async_http_utils, cromshellconfig
+from tests.mock_cromwell.metadata_generators import SyntheticWorkflow, make_workflow
+
+pytest.importorskip("pytest_benchmark")
+
+BENCHMARK_SHARDS = [10, 10_000, 1_000_000]
+MAX_SHARDS = int(os.environ.get("CROMSHELL_BENCHMARK_MAX_SHARDS", 10_000))
+# Subworkflows of the benchmarked workflows, so their expansion is measured too
+SUBWORKFLOWS = 2
+
+
+def shard_params() -> list:
+    return [
+        pytest.param(
+            shards,
+            marks=pytest.mark.skipif(
+                shards > MAX_SHARDS,
+                reason=f"More than CROMSHELL_BENCHMARK_MAX_SHARDS={MAX_SHARDS} shards",
+            ),
+        )
+        for shards in BENCHMARK_SHARDS
+    ]
+
+
+def benchmark_command(benchmark, offline_cromshell, command: list, shards: int):
+    """Time a cromshell command, with fewer rounds for larger workflows"""
+
+    rounds = 1 if shards >= 1_000_000 else 3 if shards >= 10_000 else 10
+    benchmark.extra_info["shards"] = shards
+    benchmark.pedantic(offline_cromshell, args=(command,), rounds=rounds, iterations=1)
+
+
+class TestCommandBenchmarks:
+    """Benchmark commands on workflows of increasing sizes"""
+
+    @pytest.mark.parametrize("http_engine", ["threads", "async"])
+    @pytest.mark.parametrize("shards", shard_params())
+    def test_list_update(
+        self, benchmark, mock_cromwell, offline_cromshell, shards, http_engine
+    ):
+        """Update the status of as many running workflows as shards"""
+
+        if http_engine == "async" and async_http_utils.get_async_http_library() is None:
+            pytest.skip("No async HTTP library installed")
+        workflows = [SyntheticWorkflow(shards=1) for _ in range(shards)]
+        mock_cromwell.add_workflows(workflows)
+        with open(cromshellconfig.submission_file_path, "a") as submission_file:
+            submission_file.writelines(
+                f"2024-01-01\t{mock_cromwell.url}\t{workflow.id}\tsynthetic.wdl\t"
+                "Running\t\n"
+                for workflow in workflows
+            )
+
+        benchmark_command(
+            benchmark,
+            offline_cromshell,
+            ["--http_engine", http_engine, "list", "--update"],
+            shards,
+        )
+
+    @pytest.mark.parametrize("shards", shard_params())
+    def test_counts(self, benchmark, mock_cromwell, offline_cromshell, shards):
+        workflow = mock_cromwell.add_workflow(
+            make_workflow(shards=shards, subworkflows=SUBWORKFLOWS, failed_shards=1)
+        )
+
+        benchmark_command(benchmark, offline_cromshell, ["counts", workflow.id], shards)
+
+    @pytest.mark.parametrize("shards", shard_params())
+    def test_status(self, benchmark, mock_cromwell, offline_cromshell, shards):
+        """Status of a running workflow, whose shards are all checked for a
+        failure"""
+
+        workflow = mock_cromwell.add_workflow(
+            make_workflow(shards=shards, subworkflows=SUBWORKFLOWS)
+        )
+
+        benchmark_command(benchmark, offline_cromshell, ["status", workflow.id], shards)
+
+    @pytest.mark.parametrize("shards", shard_params())
+    def test_logs(self, benchmark, mock_cromwell, offline_cromshell, shards):
+        """Logs of the failed shards, 1% of the shards"""
+
+        workflow = mock_cromwell.add_workflow(
+            make_workflow(
+                shards=shards, subworkflows=SUBWORKFLOWS, failed_shards=shards // 100
+            )
+        )
+
+        benchmark_command(benchmark, offline_cromshell, ["logs", workflow.id], shards)
+
+    @pytest.mark.parametrize("shards", shard_params())
+    def test_metadata(self, benchmark, mock_cromwell, offline_cromshell, shards):
+        workflow = mock_cromwell.add_workflow(
+            make_workflow(shards=shards, subworkflows=SUBWORKFLOWS)
+        )
+
+        benchmark_command(
+            benchmark, offline_cromshell, ["metadata", workflow.id], shards
+        )
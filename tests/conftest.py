@@ -1,13 +1,39 @@
 import os
 from pathlib import Path
+from traceback import format_exception
 
 import pytest
+from click.testing import CliRunner
+
+from cromshell.__main__ import main_entry
+from cromshell.utilities import cromshellconfig, http_utils, rate_limit_utils
+from cromshell.utilities.submissions_file_utils import WorkflowDatabaseColumns
+from tests.mock_cromwell.server import MockCromwellServer
 
 # "The conftest.py file serves as a means of providing fixtures for an entire directory.
 # Fixtures defined in a conftest.py can be used by any test in that package without
 # needing to import them (pytest will automatically discover them)."
 # https://docs.pytest.org/en/latest/reference/fixtures.html
 
+# Options of cromshellconfig set by the main command, restored after each command
+# run against the mock Cromwell server
+RESOLVED_CONFIG_OPTIONS = [
+    "cromwell_server",
+    "requests_verify_certs",
+    "requests_connect_timeout",
+    "requests_read_timeout",
+    "metadata_read_timeout",
+    "requests_max_retries",
+    "requests_retry_budget",
+    "requests_per_second",
+    "max_requests_in_flight",
+    "http_engine",
+    "referer_header_url",
+    "gcloud_token_email",
+    "color_output",
+    "lazy_subworkflows",
+]
+
 
 @pytest.fixture
 def local_cromwell_url():
@@ -43,3 +69,58 @@ def get_current_version() -> str:
                 version = line.split("=")[1].strip().strip('"')
 
     return version
+
+
+@pytest.fixture
+def mock_cromwell():
+    """Mock Cromwell server serving synthetic workflows, see tests/mock_cromwell"""
+
+    with MockCromwellServer() as server:
+        yield server
+
+
+@pytest.fixture
+def offline_cromshell(mock_cromwell, tmp_path, monkeypatch):
+    """
+    Run cromshell commands against the mock Cromwell server, with a submission
+    database in a temporary directory and no limit on the rate of requests.
+
+    Returns a function taking the command (e.g. ["counts", workflow_id]) and its
+    expected exit code, and returning the result of the command.
+    """
+
+    for option in RESOLVED_CONFIG_OPTIONS:
+        monkeypatch.setattr(cromshellconfig, option, getattr(cromshellconfig, option))
+    submission_file_path = tmp_path.joinpath(cromshellconfig.SUBMISSION_FILE_NAME)
+    submission_file_path.write_text(
+        "\t".join(WorkflowDatabaseColumns.get_submission_file_headers()) + "\n"
+    )
+    monkeypatch.setattr(
+        cromshellconfig, "submission_file_path", str(submission_file_path)
+    )
+    monkeypatch.setattr(
+        cromshellconfig,
+        "cromshell_config_options",
+        {
+            "cromwell_server": mock_cromwell.url,
+            "requests_per_second": 0,
+            "max_requests_in_flight": 32,
+        },
+    )
+    monkeypatch.setattr(rate_limit_utils, "_server_rate_limiters", {})
+    monkeypatch.setattr(http_utils, "_retries_used", 0)
+
+    def run_cromshell(command: list, exit_code: int = 0):
+        result = CliRunner().invoke(
+            main_entry, ["--no_turtle", "--cromwell_url", mock_cromwell.url, *command]
+        )
+        assert result.exit_code == exit_code, (
+            f"\nEXIT_CODE: {result.exit_code}"
+            f"\nCOMMAND:\n{command}"
+            f"\nOUTPUT:\n{result.output}"
+            f"\n{''.join(format_exception(*result.exc_info))}"
+        )
+
+        return result
+
+    return run_cromshell
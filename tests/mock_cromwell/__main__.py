@@ -0,0 +1,54 @@
+"""
+Run the mock Cromwell server in the foreground, e.g. to point cromshell at it:
+
+    python -m tests.mock_cromwell --port 8000 --shards 10000 --subworkflows 2
+    cromshell --cromwell_url http://127.0.0.1:8000 counts <printed workflow id>
+"""
+
+import argparse
+
+from tests.mock_cromwell.metadata_generators import make_workflow
+from tests.mock_cromwell.server import MockCromwellServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve synthetic Cromwell workflows")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workflows", type=int, default=1)
+    parser.add_argument("--shards", type=int, default=10)
+    parser.add_argument("--subworkflows", type=int, default=0)
+    parser.add_argument("--failed-shards", type=int, default=0)
+    parser.add_argument("--status", default="Running")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockCromwellServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    for _ in range(args.workflows):
+        workflow = server.add_workflow(
+            make_workflow(
+                shards=args.shards,
+                subworkflows=args.subworkflows,
+                failed_shards=args.failed_shards,
+                status=args.status,
+            )
+        )
+        print(workflow.id)
+
+    print(f"Serving on {server.url}, press Ctrl-C to stop")
+    try:
+        server.http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Sequence
+
+TERMINAL_STATUSES = ["Succeeded", "Failed", "Aborted"]
+
+# Timestamps of the synthetic metadata are offsets from this date
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format a timestamp the way Cromwell does, seconds after _EPOCH"""
+
+    return (_EPOCH + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%S.%f")[
+        :-3
+    ] + "Z"
+
+
+class SyntheticWorkflow:
+    """
+    Synthetic workflow served by the mock Cromwell server: a scattered task
+    with `shards` shards, a task gathering them once the workflow succeeded,
+    and a call running each subworkflow.
+
+    The metadata of the shards is generated when requested rather than held in
+    memory, so workflows of millions of shards can be served.
+    """
+
+    __slots__ = ("id", "name", "status", "shards", "failed_shards", "subworkflows")
+
+    def __init__(
+        self,
+        workflow_id: Optional[str] = None,
+        name: str = "Synthetic",
+        status: str = "Running",
+        shards: int = 10,
+        failed_shards: int = 0,
+        subworkflows: Sequence["SyntheticWorkflow"] = (),
+    ):
+        """
+        :param workflow_id: Workflow UUID, random if not given
+        :param name: Workflow name, prefix of the names of its calls
+        :param status: Workflow status, e.g. 'Running' or 'Succeeded'
+        :param shards: Number of shards of the scattered task
+        :param failed_shards: Number of those shards that failed, the first ones
+        :param subworkflows: Subworkflows run by the workflow, one call each
+        """
+
+        self.id = workflow_id or str(uuid.uuid4())
+        self.name = name
+        self.status = status
+        self.shards = shards
+        self.failed_shards = failed_shards
+        self.subworkflows = list(subworkflows)
+
+    @property
+    def scatter_call_name(self) -> str:
+        return f"{self.name}.ScatterTask"
+
+    @property
+    def gather_call_name(self) -> str:
+        return f"{self.name}.GatherTask"
+
+    def get_subworkflow_call_name(self, index: int) -> str:
+        return f"{self.name}.SubWorkflow{index}"
+
+    def get_call_names(self) -> List[str]:
+        """Names of the calls of the workflow, in the order of its metadata"""
+
+        call_names = [self.scatter_call_name] if self.shards else []
+        if self.status == "Succeeded":
+            call_names.append(self.gather_call_name)
+        call_names.extend(
+            self.get_subworkflow_call_name(index)
+            for index in range(len(self.subworkflows))
+        )
+
+        return call_names
+
+    def get_root(self) -> str:
+        return f"/cromwell-executions/{self.name}/{self.id}"
+
+    def get_shard_status(self, shard_index: int) -> str:
+        if shard_index < self.failed_shards:
+            return "Failed"
+
+        return "Done" if self.status in TERMINAL_STATUSES else "Running"
+
+    def get_task_shard_metadata(self, call_name: str, shard_index: int) -> dict:
+        """
+        Metadata of a shard of a task call, with the keys of a shard run on the
+        local backend.
+
+        :param call_name: Name of the call
+        :param shard_index: Index of the shard, -1 if the call isn't scattered
+        :return: Shard metadata
+        """
+
+        task_name = call_name.rsplit(".", 1)[-1]
+        call_root = f"{self.get_root()}/call-{task_name}" + (
+            f"/shard-{shard_index}" if shard_index >= 0 else ""
+        )
+        status = (
+            self.get_shard_status(shard_index)
+            if call_name == self.scatter_call_name
+            else "Done"
+        )
+        start = 60.0 + max(shard_index, 0)
+        shard_metadata = {
+            "attempt": 1,
+            "backend": "Local",
+            "backendLogs": {"log": f"{call_root}/execution/log"},
+            "backendStatus": status,
+            "callCaching": {"allowResultReuse": True, "hit": False},
+            "callRoot": call_root,
+            "commandLine": f"echo {shard_index}",
+            "executionEvents": [
+                {
+                    "description": "RunningJob",
+                    "startTime": format_timestamp(start),
+                    "endTime": format_timestamp(start + 30.0),
+                }
+            ],
+            "executionStatus": status,
+            "inputs": {"index": shard_index},
+            "jobId": str(shard_index),
+            "runtimeAttributes": {
+                "cpu": "1",
+                "docker": "ubuntu:22.04",
+                "failOnStderr": "false",
+                "memory": "2 GB",
+            },
+            "shardIndex": shard_index,
+            "start": format_timestamp(start),
+            "stderr": f"{call_root}/execution/stderr",
+            "stdout": f"{call_root}/execution/stdout",
+        }
+        if status in ("Done", "Failed"):
+            shard_metadata["end"] = format_timestamp(start + 30.0)
+            shard_metadata["returnCode"] = 0 if status == "Done" else 1
+            shard_metadata["outputs"] = (
+                {"out": f"{call_root}/execution/out.txt"} if status == "Done" else {}
+            )
+        if status == "Failed":
+            shard_metadata["failures"] = [
+                {
+                    "message": f"Job {call_name}:{shard_index}:1 exited with "
+                    "return code 1",
+                    "causedBy": [],
+                }
+            ]
+
+        return shard_metadata
+
+    def get_subworkflow_shard_metadata(self, index: int) -> dict:
+        """
+        Unexpanded metadata of the call running a subworkflow, i.e. with the id
+        of the subworkflow rather than its metadata.
+
+        :param index: Index of the subworkflow
+        :return: Shard metadata
+        """
+
+        subworkflow = self.subworkflows[index]
+        status = {"Succeeded": "Done", "Failed": "Failed", "Aborted": "Aborted"}.get(
+            subworkflow.status, "Running"
+        )
+
+        return {
+            "attempt": 1,
+            "executionStatus": status,
+            "shardIndex": -1,
+            "start": format_timestamp(30.0),
+            "subWorkflowId": subworkflow.id,
+        }
+
+    def iter_call_shards(self, call_name: str) -> Iterator[dict]:
+        """Iterate over the unexpanded metadata of the shards of a call"""
+
+        if call_name == self.scatter_call_name:
+            for shard_index in range(self.shards):
+                yield self.get_task_shard_metadata(call_name, shard_index)
+        elif call_name == self.gather_call_name:
+            yield self.get_task_shard_metadata(call_name, -1)
+        else:
+            yield self.get_subworkflow_shard_metadata(
+                int(call_name[len(f"{self.name}.SubWorkflow") :])
+            )
+
+    def get_workflow_level_metadata(self) -> dict:
+        """Metadata of the workflow without its calls"""
+
+        workflow_metadata = {
+            "actualWorkflowLanguage": "WDL",
+            "actualWorkflowLanguageVersion": "1.0",
+            "id": self.id,
+            "inputs": {"shards": self.shards},
+            "labels": {"cromwell-workflow-id": f"cromwell-{self.id}"},
+            "status": self.status,
+            "submission": format_timestamp(0.0),
+            "start": format_timestamp(1.0),
+            "workflowName": self.name,
+            "workflowRoot": self.get_root(),
+        }
+        if self.status in TERMINAL_STATUSES:
+            workflow_metadata["end"] = format_timestamp(120.0 + self.shards)
+        if self.status == "Succeeded":
+            workflow_metadata["outputs"] = self.get_outputs()
+        if self.failed_shards:
+            workflow_metadata["failures"] = [
+                {"message": "Workflow failed", "causedBy": []}
+            ]
+
+        return workflow_metadata
+
+    def get_outputs(self) -> dict:
+        """Outputs of the workflow, the output file of each shard"""
+
+        call_root = f"{self.get_root()}/call-ScatterTask"
+
+        return {
+            f"{self.name}.outs": [
+                f"{call_root}/shard-{shard_index}/execution/out.txt"
+                for shard_index in range(self.failed_shards, self.shards)
+            ]
+        }
+
+    def iter_workflows(self) -> Iterator["SyntheticWorkflow"]:
+        """Iterate over the workflow and all its subworkflows, depth first"""
+
+        yield self
+        for subworkflow in self.subworkflows:
+            yield from subworkflow.iter_workflows()
+
+
+def make_workflow(
+    shards: int,
+    subworkflows: int = 0,
+    depth: int = 1,
+    failed_shards: int = 0,
+    status: str = "Running",
+    name: str = "Synthetic",
+) -> SyntheticWorkflow:
+    """
+    Make a synthetic workflow with a total number of task shards, split evenly
+    between the workflow and its subworkflows.
+
+    :param shards: Total number of shards of the workflow and its subworkflows
+    :param subworkflows: Number of subworkflows run by the workflow and, down to
+    the given depth, by each subworkflow
+    :param depth: Nesting depth of the subworkflows
+    :param failed_shards: Number of failed shards of the top-level workflow
+    :param status: Status of the workflow and its subworkflows
+    :param name: Workflow name
+    :return: Synthetic workflow
+    """
+
+    if subworkflows == 0 or depth == 0:
+        return SyntheticWorkflow(
+            name=name, status=status, shards=shards, failed_shards=failed_shards
+        )
+
+    subworkflow_shards = shards // (subworkflows + 1)
+
+    return SyntheticWorkflow(
+        name=name,
+        status=status,
+        shards=shards - subworkflows * subworkflow_shards,
+        failed_shards=failed_shards,
+        subworkflows=[
+            make_workflow(
+                shards=subworkflow_shards,
+                subworkflows=subworkflows,
+                depth=depth - 1,
+                status=status,
+                name=f"{name}Sub{index}",
+            )
+            for index in range(subworkflows)
+        ],
+    )
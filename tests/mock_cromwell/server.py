@@ -0,0 +1,508 @@
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from urllib.parse import parse_qs, urlsplit
+
+from tests.mock_cromwell.metadata_generators import TERMINAL_STATUSES, SyntheticWorkflow
+
+# Keys of the metadata kept whatever the includeKey and excludeKey parameters
+WORKFLOW_STRUCTURAL_KEYS = {"id", "calls"}
+SHARD_STRUCTURAL_KEYS = {"shardIndex", "attempt"}
+
+# Responses are sent in chunks of about this many characters
+CHUNK_SIZE = 1 << 16
+
+WORKFLOW_PATH = re.compile(
+    r"^/api/workflows/v1/(?P<workflow_id>[^/]+)/(?P<endpoint>status|metadata|outputs|abort)$"
+)
+
+
+def is_key_kept(key: str, include_keys: Set[str], exclude_keys: Set[str]) -> bool:
+    """
+    Whether Cromwell keeps a metadata key given the includeKey and excludeKey
+    parameters, which apply to the keys of the workflow and of its calls.
+
+    :param key: Name of a key of the workflow or of a call shard
+    :param include_keys: Keys to include, all keys if empty
+    :param exclude_keys: Keys to exclude
+    :return: Whether the key is kept
+    """
+
+    if key in exclude_keys:
+        return False
+
+    return not include_keys or key in include_keys
+
+
+def filter_keys(
+    metadata: dict,
+    include_keys: Set[str],
+    exclude_keys: Set[str],
+    structural_keys: Set[str],
+) -> dict:
+    """Keep the keys of the metadata of a workflow or call shard that Cromwell
+    keeps, see is_key_kept"""
+
+    return {
+        key: value
+        for key, value in metadata.items()
+        if key in structural_keys or is_key_kept(key, include_keys, exclude_keys)
+    }
+
+
+def iter_metadata_json(
+    workflow: SyntheticWorkflow,
+    workflows: Dict[str, SyntheticWorkflow],
+    include_keys: Set[str],
+    exclude_keys: Set[str],
+    expand_subworkflows: bool,
+) -> Iterator[str]:
+    """
+    Iterate over the pieces of the JSON metadata of a workflow, so the metadata
+    of large workflows is never held in memory as a whole.
+
+    Subworkflows are expanded like Cromwell does: the subWorkflowId of a call
+    is replaced with the (filtered) subWorkflowMetadata.
+
+    :param workflow: Workflow
+    :param workflows: All the workflows of the server, by id
+    :param include_keys: includeKey parameters
+    :param exclude_keys: excludeKey parameters
+    :param expand_subworkflows: expandSubWorkflows parameter
+    :return: Iterator of pieces of JSON
+    """
+
+    workflow_metadata = filter_keys(
+        workflow.get_workflow_level_metadata(),
+        include_keys,
+        exclude_keys,
+        WORKFLOW_STRUCTURAL_KEYS,
+    )
+    yield json.dumps(workflow_metadata)[:-1]
+    if "calls" in exclude_keys:
+        yield "}"
+        return
+
+    yield ', "calls": {' if workflow_metadata else '"calls": {'
+    for call_index, call_name in enumerate(workflow.get_call_names()):
+        yield f'{", " if call_index else ""}{json.dumps(call_name)}: ['
+        for shard_index, shard in enumerate(workflow.iter_call_shards(call_name)):
+            subworkflow_id = shard.get("subWorkflowId")
+            shard = filter_keys(
+                shard, include_keys, exclude_keys, SHARD_STRUCTURAL_KEYS
+            )
+            if shard_index:
+                yield ", "
+            if subworkflow_id is None or not expand_subworkflows:
+                yield json.dumps(shard)
+                continue
+
+            # Cromwell only expands the subworkflows whose id is requested
+            shard.pop("subWorkflowId", None)
+            yield json.dumps(shard)[:-1]
+            if is_key_kept("subWorkflowId", include_keys, exclude_keys):
+                yield ', "subWorkflowMetadata": '
+                yield from iter_metadata_json(
+                    workflows[subworkflow_id],
+                    workflows,
+                    include_keys,
+                    exclude_keys,
+                    expand_subworkflows,
+                )
+            yield "}"
+        yield "]"
+    yield "}}"
+
+
+class MockCromwellHTTPServer(ThreadingHTTPServer):
+    """HTTP server of a MockCromwellServer, handling each connection in a thread"""
+
+    daemon_threads = True
+    # Accept as many connections at once as cromshell may open
+    request_queue_size = 1024
+
+
+class MockCromwellServer:
+    """
+    Lightweight stand-in for a Cromwell server, serving synthetic workflows over
+    HTTP from a background thread, with injectable latency and errors.
+
+    Serves the status, metadata (with the includeKey, excludeKey and
+    expandSubWorkflows parameters), outputs, query, abort and backends
+    endpoints of the workflows API, the version of the engine API and the
+    describe endpoint of the womtool API.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status_code: int = 503,
+        seed: int = 0,
+    ):
+        """
+        :param host: Address to listen on
+        :param port: Port to listen on, a free one if 0
+        :param latency: Seconds to wait before answering each request
+        :param error_rate: Fraction of requests answered with error_status_code
+        :param error_status_code: Status code of the injected errors
+        :param seed: Seed of the random injection of errors
+        """
+
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status_code = error_status_code
+        self.random = random.Random(seed)
+        self.workflows: Dict[str, SyntheticWorkflow] = {}
+        # Workflows added by the user, rather than as subworkflows
+        self.top_level_workflow_ids: List[str] = []
+        # Number of requests received by endpoint, e.g. ('GET', 'metadata')
+        self.request_counts: Counter = Counter()
+        self.describe_response = {
+            "valid": True,
+            "errors": [],
+            "validWorkflow": True,
+            "isRunnableWorkflow": True,
+            "name": "",
+            "inputs": [],
+            "outputs": [],
+            "images": [],
+            "submittedDescriptorType": {
+                "descriptorType": "WDL",
+                "descriptorTypeVersion": "1.0",
+            },
+            "importedDescriptorTypes": [],
+            "meta": {},
+            "parameterMeta": {},
+        }
+        self._injected_errors: List[tuple] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.http_server = MockCromwellHTTPServer((host, port), MockCromwellHandler)
+        self.http_server.mock_cromwell = self
+
+    @property
+    def url(self) -> str:
+        host, port = self.http_server.server_address[:2]
+
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockCromwellServer":
+        """Serve requests from a background thread"""
+
+        self._thread = threading.Thread(
+            target=self.http_server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        """Stop serving requests and close the socket"""
+
+        if self._thread is not None:
+            self.http_server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.http_server.server_close()
+
+    def __enter__(self) -> "MockCromwellServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def add_workflow(self, workflow: SyntheticWorkflow) -> SyntheticWorkflow:
+        """Serve a workflow and its subworkflows"""
+
+        with self._lock:
+            for served_workflow in workflow.iter_workflows():
+                self.workflows[served_workflow.id] = served_workflow
+            self.top_level_workflow_ids.append(workflow.id)
+
+        return workflow
+
+    def add_workflows(self, workflows: Iterable[SyntheticWorkflow]) -> None:
+        for workflow in workflows:
+            self.add_workflow(workflow)
+
+    def fail_next(
+        self,
+        count: int = 1,
+        status_code: int = 503,
+        retry_after: Optional[str] = None,
+    ) -> None:
+        """
+        Answer the next requests with an error.
+
+        :param count: Number of requests to fail
+        :param status_code: Status code of the errors
+        :param retry_after: Value of the Retry-After header of the errors, if any
+        """
+
+        with self._lock:
+            self._injected_errors.extend([(status_code, retry_after)] * count)
+
+    def take_injected_error(self) -> Optional[tuple]:
+        """Get the (status code, Retry-After) of the error to answer the current
+        request with, if any"""
+
+        with self._lock:
+            if self._injected_errors:
+                return self._injected_errors.pop(0)
+            if self.error_rate and self.random.random() < self.error_rate:
+                return self.error_status_code, None
+
+        return None
+
+    def count_request(self, method: str, endpoint: str) -> None:
+        with self._lock:
+            self.request_counts[(method, endpoint)] += 1
+
+    def abort_workflow(self, workflow_id: str) -> Optional[str]:
+        """Abort a workflow, returning its previous status, or None if the
+        workflow is already in a terminal state"""
+
+        with self._lock:
+            workflow = self.workflows[workflow_id]
+            if workflow.status in TERMINAL_STATUSES:
+                return None
+            status, workflow.status = workflow.status, "Aborted"
+
+        return status
+
+    def query_workflows(self, query: List[tuple]) -> dict:
+        """
+        Query the workflows like Cromwell's query endpoint, supporting the id,
+        name, status, includeSubworkflows, page and pageSize parameters.
+
+        :param query: Query parameters, as (name, value) pairs
+        :return: Query response
+        """
+
+        values: Dict[str, List[str]] = {}
+        for name, value in query:
+            values.setdefault(name, []).append(value)
+
+        if values.get("includeSubworkflows", ["true"])[-1].lower() == "true":
+            workflow_ids = list(self.workflows)
+        else:
+            workflow_ids = list(self.top_level_workflow_ids)
+        results = [
+            {
+                "id": workflow.id,
+                "name": workflow.name,
+                "status": workflow.status,
+                **{
+                    key: value
+                    for key, value in workflow.get_workflow_level_metadata().items()
+                    if key in ("submission", "start", "end")
+                },
+            }
+            for workflow in map(self.workflows.get, workflow_ids)
+            if ("id" not in values or workflow.id in values["id"])
+            and ("name" not in values or workflow.name in values["name"])
+            and ("status" not in values or workflow.status in values["status"])
+        ]
+        total_results_count = len(results)
+        if "pageSize" in values:
+            page_size = int(values["pageSize"][-1])
+            page = int(values.get("page", ["1"])[-1])
+            results = results[(page - 1) * page_size : page * page_size]
+
+        return {"results": results, "totalResultsCount": total_results_count}
+
+
+class MockCromwellHandler(BaseHTTPRequestHandler):
+    """Handler of the requests sent to a MockCromwellServer"""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def mock_cromwell(self) -> MockCromwellServer:
+        return self.server.mock_cromwell
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.handle_request("GET")
+
+    def do_POST(self) -> None:
+        self.handle_request("POST")
+
+    def handle_request(self, method: str) -> None:
+        split_path = urlsplit(self.path)
+        query = [
+            (name, value)
+            for name, values in parse_qs(split_path.query).items()
+            for value in values
+        ]
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        route = self.get_route(method, split_path.path)
+        if route is None:
+            self.send_json(404, {"status": "fail", "message": "Not found"})
+            return
+        endpoint, workflow_id = route
+        self.mock_cromwell.count_request(method, endpoint)
+
+        if self.mock_cromwell.latency:
+            time.sleep(self.mock_cromwell.latency)
+        injected_error = self.mock_cromwell.take_injected_error()
+        if injected_error is not None:
+            status_code, retry_after = injected_error
+            self.send_json(
+                status_code,
+                {"status": "error", "message": "Injected error"},
+                headers={"Retry-After": retry_after} if retry_after else None,
+            )
+            return
+
+        if workflow_id is not None and workflow_id not in self.mock_cromwell.workflows:
+            self.send_json(
+                404,
+                {
+                    "status": "fail",
+                    "message": f"Unrecognized workflow ID: {workflow_id}",
+                },
+            )
+            return
+
+        getattr(self, f"handle_{endpoint}")(
+            workflow_id=workflow_id, query=query, body=body
+        )
+
+    @staticmethod
+    def get_route(method: str, path: str) -> Optional[tuple]:
+        """Get the (endpoint, workflow id) of a request, None if not served"""
+
+        if method == "GET" and path == "/engine/v1/version":
+            return "version", None
+        if method == "GET" and path == "/api/workflows/v1/backends":
+            return "backends", None
+        if path == "/api/workflows/v1/query":
+            return "query", None
+        if method == "POST" and path == "/api/womtool/v1/describe":
+            return "describe", None
+        match = WORKFLOW_PATH.match(path)
+        if match and (method == "POST") == (match["endpoint"] == "abort"):
+            return match["endpoint"], match["workflow_id"]
+
+        return None
+
+    def handle_version(self, **kwargs) -> None:
+        self.send_json(200, {"cromwell": "86-mock"})
+
+    def handle_backends(self, **kwargs) -> None:
+        self.send_json(200, {"defaultBackend": "Local", "supportedBackends": ["Local"]})
+
+    def handle_describe(self, **kwargs) -> None:
+        self.send_json(200, self.mock_cromwell.describe_response)
+
+    def handle_query(self, query: List[tuple], body: bytes, **kwargs) -> None:
+        if body:
+            # POST queries are a list of single parameter objects
+            query = query + [
+                (name, value)
+                for parameter in json.loads(body)
+                for name, value in parameter.items()
+            ]
+        self.send_json(200, self.mock_cromwell.query_workflows(query))
+
+    def handle_status(self, workflow_id: str, **kwargs) -> None:
+        workflow = self.mock_cromwell.workflows[workflow_id]
+        self.send_json(200, {"id": workflow.id, "status": workflow.status})
+
+    def handle_outputs(self, workflow_id: str, **kwargs) -> None:
+        workflow = self.mock_cromwell.workflows[workflow_id]
+        # Like Cromwell, only succeeded workflows have outputs
+        outputs = workflow.get_outputs() if workflow.status == "Succeeded" else {}
+        self.send_json(200, {"id": workflow.id, "outputs": outputs})
+
+    def handle_abort(self, workflow_id: str, **kwargs) -> None:
+        previous_status = self.mock_cromwell.abort_workflow(workflow_id)
+        if previous_status is None:
+            workflow = self.mock_cromwell.workflows[workflow_id]
+            self.send_json(
+                403,
+                {
+                    "status": "error",
+                    "message": f"Couldn't abort {workflow_id} because it is in a "
+                    f"terminal state ({workflow.status})",
+                },
+            )
+        else:
+            self.send_json(200, {"id": workflow_id, "status": "Aborting"})
+
+    def handle_metadata(self, workflow_id: str, query: List[tuple], **kwargs) -> None:
+        include_keys = {value for name, value in query if name == "includeKey"}
+        exclude_keys = {value for name, value in query if name == "excludeKey"}
+        if include_keys and exclude_keys:
+            self.send_json(
+                400,
+                {
+                    "status": "fail",
+                    "message": "includeKey and excludeKey may not be specified "
+                    "together",
+                },
+            )
+            return
+        expand_subworkflows = any(
+            name == "expandSubWorkflows" and value.lower() == "true"
+            for name, value in query
+        )
+
+        self.send_chunked_json(
+            200,
+            iter_metadata_json(
+                self.mock_cromwell.workflows[workflow_id],
+                self.mock_cromwell.workflows,
+                include_keys,
+                exclude_keys,
+                expand_subworkflows,
+            ),
+        )
+
+    def send_json(
+        self, status_code: int, content, headers: Optional[dict] = None
+    ) -> None:
+        body = json.dumps(content).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_chunked_json(self, status_code: int, pieces: Iterator[str]) -> None:
+        """Send a JSON response as it is generated, with chunked encoding"""
+
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        chunk: List[str] = []
+        chunk_size = 0
+        for piece in pieces:
+            chunk.append(piece)
+            chunk_size += len(piece)
+            if chunk_size >= CHUNK_SIZE:
+                self.write_chunk("".join(chunk).encode())
+                chunk, chunk_size = [], 0
+        if chunk:
+            self.write_chunk("".join(chunk).encode())
+        self.wfile.write(b"0\r\n\r\n")
+
+    def write_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
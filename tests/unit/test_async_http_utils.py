@@ -0,0 +1,101 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from cromshell.utilities import (
+    async_http_utils,
+    cromshellconfig,
+    http_utils,
+    rate_limit_utils,
+)
+
+
+class MockCromwellHandler(BaseHTTPRequestHandler):
+    """Answer with the path and query of the request, after failing with a 503
+    the first time a path ending with 'flaky' is requested"""
+
+    flaky_requests = set()
+
+    def do_GET(self):
+        split_path = urlsplit(self.path)
+        if split_path.path.endswith("flaky") and self.path not in self.flaky_requests:
+            self.flaky_requests.add(self.path)
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps(
+            {"path": split_path.path, "query": parse_qs(split_path.query)}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAsyncHttpUtils:
+    """Test the asyncio engine sending many requests at once"""
+
+    def test_send_requests(self, mock_server_url, async_config):
+        urls = [f"{mock_server_url}/api/workflows/v1/{i}/metadata" for i in range(200)]
+        urls[7] = f"{mock_server_url}/api/workflows/v1/flaky"
+
+        responses = http_utils.send_requests(
+            "GET", urls, params={"includeKey": ["id", "status"]}
+        )
+
+        assert all(isinstance(response, requests.Response) for response in responses)
+        assert [response.json()["path"] for response in responses] == [
+            urlsplit(url).path for url in urls
+        ]
+        assert responses[0].json()["query"] == {"includeKey": ["id", "status"]}
+        assert responses[7].status_code == 200
+        assert responses[0].headers["content-type"] == "application/json"
+
+    def test_send_requests_connection_error(self, async_config):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            http_utils.send_requests("GET", ["http://localhost:9/status"])
+
+        responses = http_utils.send_requests(
+            "GET", ["http://localhost:9/status"], return_exceptions=True
+        )
+        assert isinstance(responses[0], requests.exceptions.ConnectionError)
+
+    def test_send_requests_without_async_library(self, async_config, monkeypatch):
+        monkeypatch.setattr(async_http_utils, "ASYNC_HTTP_LIBRARIES", [])
+
+        with pytest.raises(async_http_utils.AsyncHttpUnavailableError):
+            http_utils.send_requests("GET", ["http://localhost:9/status"])
+
+    @pytest.fixture
+    def async_config(self, monkeypatch):
+        """Asyncio engine with an installed async HTTP library, no rate limit and
+        no retry delay"""
+
+        if async_http_utils.get_async_http_library() is None:
+            pytest.skip("No async HTTP library installed")
+        monkeypatch.setattr(cromshellconfig, "http_engine", "async")
+        monkeypatch.setattr(cromshellconfig, "requests_per_second", 0)
+        monkeypatch.setattr(cromshellconfig, "max_requests_in_flight", 16)
+        monkeypatch.setattr(cromshellconfig, "requests_max_retries", 1)
+        monkeypatch.setattr(cromshellconfig, "requests_retry_budget", 20)
+        monkeypatch.setattr(http_utils, "_retries_used", 0)
+        monkeypatch.setattr(rate_limit_utils, "_server_rate_limiters", {})
+
+    @pytest.fixture
+    def mock_server_url(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), MockCromwellHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_port}"
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,112 @@
+import pytest
+
+from cromshell.cleanup import command as cleanup_command
+from tests.mock_cromwell.metadata_generators import SyntheticWorkflow
+
+
+class TestCleanup:
+    """Test the cleanup command functions"""
+
+    workflow_id = "9ee4aa2e-7ac5-4c61-88b2-88a4d10f168b"
+
+    @pytest.mark.parametrize(
+        "workflow_metadata, expected_roots",
+        [
+            [
+                {"workflowRoot": "gs://b/wf/id", "calls": {}},
+                ["gs://b/wf/id"],
+            ],
+            [
+                {
+                    "calls": {
+                        "wf.A": [{"callRoot": "gs://b/wf/id/call-A/shard-0"}],
+                        "wf.Sub": [
+                            {
+                                "subWorkflowMetadata": {
+                                    "calls": {
+                                        "sub.B": [
+                                            {"callRoot": "gs://b/wf/id/call-Sub/B"}
+                                        ]
+                                    }
+                                }
+                            }
+                        ],
+                    }
+                },
+                ["gs://b/wf/id/call-A/shard-0", "gs://b/wf/id/call-Sub/B"],
+            ],
+        ],
+    )
+    def test_get_execution_roots(self, workflow_metadata, expected_roots):
+        assert cleanup_command.get_execution_roots(workflow_metadata) == expected_roots
+
+    @pytest.mark.parametrize("workflow_status", ["Succeeded", "Failed", "Aborted"])
+    def test_check_workflow_can_be_cleaned_up(self, workflow_status):
+        cleanup_command.check_workflow_can_be_cleaned_up(
+            workflow_id=self.workflow_id, workflow_status=workflow_status
+        )
+
+    @pytest.mark.parametrize(
+        "workflow_status",
+        ["Submitted", "Running", "Aborting", "On Hold", "fail", "Unknown", None],
+    )
+    def test_check_workflow_can_be_cleaned_up_not_finished(self, workflow_status):
+        with pytest.raises(cleanup_command.CleanupError):
+            cleanup_command.check_workflow_can_be_cleaned_up(
+                workflow_id=self.workflow_id, workflow_status=workflow_status
+            )
+
+    def test_get_intermediate_files(self, tmp_path):
+        workflow_root = tmp_path / "wf" / self.workflow_id
+        call_dir = workflow_root / "call-A" / "execution"
+        call_dir.mkdir(parents=True)
+        (call_dir / "stdout").write_text("log")
+        (call_dir / "tmp.bam").write_text("intermediate")
+        (call_dir / "final.bam").write_text("final")
+
+        intermediate_files = cleanup_command.get_intermediate_files(
+            workflow_id=self.workflow_id,
+            execution_roots=[str(workflow_root)],
+            final_outputs={str(call_dir / "final.bam")},
+        )
+
+        assert sorted(intermediate_files) == [
+            str(call_dir / "stdout"),
+            str(call_dir / "tmp.bam"),
+        ]
+        assert sum(f.size for f in intermediate_files.values()) == 15
+
+    def test_get_intermediate_files_outside_workflow(self, tmp_path):
+        with pytest.raises(cleanup_command.CleanupError):
+            cleanup_command.get_intermediate_files(
+                workflow_id=self.workflow_id,
+                execution_roots=[str(tmp_path)],
+                final_outputs=set(),
+            )
+
+    def test_get_intermediate_files_no_roots(self):
+        with pytest.raises(cleanup_command.CleanupError):
+            cleanup_command.get_intermediate_files(
+                workflow_id=self.workflow_id, execution_roots=[], final_outputs=set()
+            )
+
+    def test_cleanup_failed_workflow_without_outputs(
+        self, mock_cromwell, offline_cromshell, tmp_path, monkeypatch
+    ):
+        workflow = mock_cromwell.add_workflow(
+            SyntheticWorkflow(status="Failed", shards=2, failed_shards=2)
+        )
+        workflow_root = tmp_path / "cromwell-executions" / workflow.id
+        monkeypatch.setattr(
+            SyntheticWorkflow, "get_root", lambda self: str(workflow_root)
+        )
+        call_dir = workflow_root / "call-ScatterTask" / "shard-0" / "execution"
+        call_dir.mkdir(parents=True)
+        (call_dir / "stderr").write_text("error")
+        (call_dir / "tmp.bam").write_text("intermediate")
+
+        result = offline_cromshell(["cleanup", "--yes", workflow.id])
+
+        assert f"{workflow.id}: 2 intermediate files, 17 bytes" in result.output
+        assert f"{workflow.id}: deleted 2 files" in result.output
+        assert not any(path.is_file() for path in workflow_root.rglob("*"))
@@ -81,6 +81,20 @@ class TestConfigOptionsFileUtils:
                 False,
                 ValueError,
             ],
+            # numbers can be integers or floats
+            [{"cost_settle_days": 3}, True, None],
+            [{"cost_settle_days": 0.5}, True, None],
+            [{"cost_settle_days": "3"}, False, ValueError],
+            [{"cost_price_table": "prices.json"}, True, None],
+            [{"lazy_subworkflows": True}, True, None],
+            [{"lazy_subworkflows": "yes"}, False, ValueError],
+            [
+                {"requests_per_second": 0.5, "max_requests_in_flight": 4},
+                True,
+                None,
+            ],
+            [{"requests_per_second": 20, "lazy_subworkflows": True}, True, None],
+            [{"requests_per_second": "fast"}, False, ValueError],
         ],
     )
     def test_validate_json_schema(
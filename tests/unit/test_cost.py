@@ -1,5 +1,6 @@
 import json
 from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
 
 import pytest
 from google.cloud import bigquery
@@ -19,11 +20,13 @@ class TestCost:
                 """
                 SELECT wfid.value as cromwell_workflow_id, service.description, task.value as task_name, sum(cost) as cost
                 FROM cost:table:1 as billing, UNNEST(labels) as wfid, UNNEST(labels) as task
-                WHERE cost > 0
-                AND task.key LIKE "wdl-task-name"
-                AND wfid.key LIKE "cromwell-workflow-id"
-                AND wfid.value like @workflow_id
+                WHERE _PARTITIONTIME BETWEEN TIMESTAMP_TRUNC(@start_date, DAY) AND TIMESTAMP_TRUNC(@end_date, DAY)
+                AND usage_start_time BETWEEN @start_date AND @end_date
                 AND export_time BETWEEN @start_date AND @end_date
+                AND cost > 0
+                AND task.key = "wdl-task-name"
+                AND wfid.key = "cromwell-workflow-id"
+                AND wfid.value IN UNNEST(@workflow_ids)
                 GROUP BY 1,2,3
                 ORDER BY 4 DESC
                 """,
@@ -32,9 +35,14 @@ class TestCost:
                 False,
                 "cost:table1",
                 """
-                SELECT sum(cost) as cost
-                FROM cost:table1, UNNEST(labels)
-                WHERE value LIKE @workflow_id AND export_time BETWEEN @start_date AND @end_date
+                SELECT wfid.value as cromwell_workflow_id, sum(cost) as cost
+                FROM cost:table1, UNNEST(labels) as wfid
+                WHERE _PARTITIONTIME BETWEEN TIMESTAMP_TRUNC(@start_date, DAY) AND TIMESTAMP_TRUNC(@end_date, DAY)
+                AND usage_start_time BETWEEN @start_date AND @end_date
+                AND export_time BETWEEN @start_date AND @end_date
+                AND wfid.key = "cromwell-workflow-id"
+                AND wfid.value IN UNNEST(@workflow_ids)
+                GROUP BY 1
                 """,
             ],
         ],
@@ -44,27 +52,192 @@ class TestCost:
             detailed=detailed, bq_cost_table=bq_cost_table
         )
 
-    def test_create_bq_query_job_config(self):
-        workflow_id = "workflowid"
-        start_date = "startdate"
-        end_date = "enddate"
+    @pytest.mark.parametrize("dry_run", [False, True])
+    def test_create_bq_query_job_config(self, dry_run: bool):
+        workflow_ids = ["workflowid1", "workflowid2"]
+        start_date = datetime(2022, 1, 1, tzinfo=timezone.utc)
+        end_date = datetime(2022, 1, 3, tzinfo=timezone.utc)
+
+        job_config = cost_command.create_bq_query_job_config(
+            workflow_ids=workflow_ids,
+            start_date=start_date,
+            end_date=end_date,
+            dry_run=dry_run,
+        )
 
         assert (
-            cost_command.create_bq_query_job_config(
-                workflow_id=workflow_id,
-                start_date=start_date,
-                end_date=end_date,
-            ).query_parameters
+            job_config.query_parameters
             == bigquery.QueryJobConfig(
                 query_parameters=[
+                    bigquery.ArrayQueryParameter(
+                        "workflow_ids",
+                        "STRING",
+                        ["cromwell-workflowid1", "cromwell-workflowid2"],
+                    ),
                     bigquery.ScalarQueryParameter(
-                        "workflow_id", "STRING", "%" + workflow_id
+                        "start_date", "TIMESTAMP", start_date
                     ),
-                    bigquery.ScalarQueryParameter("start_date", "STRING", start_date),
-                    bigquery.ScalarQueryParameter("end_date", "STRING", end_date),
+                    bigquery.ScalarQueryParameter("end_date", "TIMESTAMP", end_date),
                 ]
             ).query_parameters
         )
+        assert bool(job_config.dry_run) == dry_run
+        assert job_config.use_query_cache != dry_run
+
+    def test_dry_run_bigquery(self):
+        client = MagicMock()
+        client.query.return_value.errors = None
+        client.query.return_value.total_bytes_processed = 1024
+
+        with patch.object(cost_command, "get_bigquery_client", return_value=client):
+            assert (
+                cost_command.dry_run_bigquery(
+                    workflow_ids=["workflowid"],
+                    bq_cost_table="cost:table",
+                    start_date=datetime(2022, 1, 1, tzinfo=timezone.utc),
+                    end_date=datetime(2022, 1, 3, tzinfo=timezone.utc),
+                    detailed=False,
+                )
+                == 1024
+            )
+
+        assert client.query.call_args.kwargs["job_config"].dry_run
+
+    def test_get_query_time_range(self):
+        assert cost_command.get_query_time_range(
+            workflow_time_ranges={
+                "wf1": ("2022-01-10T10:00:00.000Z", "2022-01-11T10:00:00.000Z"),
+                "wf2": ("2022-01-05T10:00:00.000Z", "2022-01-06T10:00:00.000Z"),
+                "wf3": ("2022-01-06T10:00:00.000Z", "2022-01-20T10:00:00.000Z"),
+            }
+        ) == (
+            datetime(2022, 1, 4, 10, tzinfo=timezone.utc),
+            datetime(2022, 1, 21, 10, tzinfo=timezone.utc),
+        )
+
+    def test_split_bq_query_rows_by_workflow(self):
+        query_rows = [
+            {"cromwell_workflow_id": "cromwell-wf2", "task_name": "a", "cost": 1.0},
+            {"cromwell_workflow_id": "cromwell-wf1", "task_name": "b", "cost": 2.0},
+            {"cromwell_workflow_id": "cromwell-wf2", "task_name": "c", "cost": 3.0},
+        ]
+
+        workflows_query_rows = cost_command.split_bq_query_rows_by_workflow(
+            query_rows=query_rows, workflow_ids=["wf1", "wf2", "wf3"]
+        )
+
+        assert workflows_query_rows == {
+            "wf1": [query_rows[1]],
+            "wf2": [query_rows[0], query_rows[2]],
+            "wf3": [],
+        }
+
+    @pytest.mark.parametrize(
+        "workflows_query_rows",
+        [
+            {"wf1": [{"cost": 1.0}], "wf2": []},
+            {"wf1": [{"cost": 1.0}], "wf2": [{"cost": None}]},
+        ],
+    )
+    def test_check_bq_query_results(self, workflows_query_rows: dict):
+        with pytest.raises(ValueError, match="wf2"):
+            cost_command.check_bq_query_results(
+                workflows_query_rows=workflows_query_rows
+            )
+
+        cost_command.check_bq_query_results(
+            workflows_query_rows={"wf1": workflows_query_rows["wf1"]}
+        )
+
+    def test_query_bigquery_skip_unavailable(self):
+        client = MagicMock()
+        client.query.return_value.errors = None
+        client.query.return_value.result.return_value = [
+            {"cromwell_workflow_id": "cromwell-wf1", "cost": 1.0}
+        ]
+        query_kwargs = dict(
+            workflow_ids=["wf1", "wf2"],
+            bq_cost_table="cost:table",
+            start_date=datetime(2022, 1, 1, tzinfo=timezone.utc),
+            end_date=datetime(2022, 1, 3, tzinfo=timezone.utc),
+            detailed=False,
+        )
+
+        with patch.object(cost_command, "get_bigquery_client", return_value=client):
+            # A fully call cached workflow has no cost entries
+            with pytest.raises(ValueError, match="wf2"):
+                cost_command.query_bigquery(**query_kwargs)
+
+            assert cost_command.query_bigquery(
+                **query_kwargs, skip_unavailable=True
+            ) == {"wf1": [{"cromwell_workflow_id": "cromwell-wf1", "cost": 1.0}]}
+
+    def test_get_workflow_time_ranges_skip_unavailable(self):
+        def get_metadata(status: str, finished: datetime = None) -> dict:
+            events = [
+                {"description": "PickedUp", "timestamp": "2022-01-01T00:00:00.000Z"}
+            ]
+            if finished:
+                events.append(
+                    {
+                        "description": "Finished",
+                        "timestamp": finished.strftime("%Y-%m-%dT%H:%M:%S.%f%z"),
+                    }
+                )
+            return {"status": status, "workflowProcessingEvents": events}
+
+        now = datetime.now(timezone.utc)
+        workflows_metadata = {
+            "finished": get_metadata("Succeeded", now - timedelta(days=2)),
+            "running": get_metadata("Running"),
+            "recent": get_metadata("Failed", now - timedelta(hours=1)),
+        }
+
+        with patch.object(
+            cost_command, "get_workflows_metadata", return_value=workflows_metadata
+        ):
+            workflow_time_ranges = cost_command.get_workflow_time_ranges(
+                metadata_requests=dict.fromkeys(workflows_metadata),
+                skip_unavailable=True,
+            )
+            assert list(workflow_time_ranges) == ["finished"]
+
+            # A single workflow is still checked strictly
+            with pytest.raises(Exception, match="terminal state"):
+                cost_command.get_workflow_time_ranges(
+                    metadata_requests=dict.fromkeys(workflows_metadata)
+                )
+
+    @pytest.mark.parametrize(
+        "status, end_hours_ago, expected_reason",
+        [
+            ["Succeeded", 48, None],
+            ["Running", None, "not finished"],
+            ["Aborting", 48, "not finished"],
+            ["Failed", 1, "less than 24 hours"],
+        ],
+    )
+    def test_get_cost_unavailable_reason(
+        self, status: str, end_hours_ago: int, expected_reason: str
+    ):
+        end_time = (
+            (datetime.now(timezone.utc) - timedelta(hours=end_hours_ago)).strftime(
+                "%Y-%m-%dT%H:%M:%S.%f%z"
+            )
+            if end_hours_ago
+            else None
+        )
+
+        reason = cost_command.get_cost_unavailable_reason(
+            workflow_status=status,
+            start_time="2022-01-01T00:00:00.000Z",
+            end_time=end_time,
+        )
+
+        if expected_reason is None:
+            assert reason is None
+        else:
+            assert expected_reason in reason
 
     @pytest.mark.parametrize(
         "hours_passed, min_hours_needed_to_be_passed, expected_minimum_time_passed",
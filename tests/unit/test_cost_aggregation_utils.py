@@ -0,0 +1,108 @@
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+from cromshell.utilities import cost_aggregation_utils
+
+
+class TestCostAggregationUtils:
+    """Test the cost aggregation functions"""
+
+    @pytest.fixture
+    def workflows_query_rows(self) -> dict:
+        # Costs are split per service, a task may have several rows
+        return {
+            f"wf{i}": [
+                {"task_name": "Align", "description": "Compute Engine", "cost": 1.0},
+                {"task_name": "Align", "description": "Cloud Storage", "cost": 0.5},
+                {"task_name": "Call", "description": "Compute Engine", "cost": 0.25},
+            ]
+            for i in range(9)
+        } | {
+            "wf9": [
+                {"task_name": "Align", "description": "Compute Engine", "cost": 15.0},
+            ]
+        }
+
+    def test_aggregate_workflow_costs(self, workflows_query_rows: dict) -> None:
+        aggregated_costs = cost_aggregation_utils.aggregate_workflow_costs(
+            workflows_query_rows=workflows_query_rows
+        )
+
+        assert [row["TASK"] for row in aggregated_costs] == [
+            "Align",
+            "Call",
+            cost_aggregation_utils.ALL_TASKS,
+        ]
+
+        align, call, all_tasks = aggregated_costs
+        assert align["WORKFLOWS"] == 10
+        assert align["TOTAL"] == pytest.approx(9 * 1.5 + 15)
+        assert align["P50"] == pytest.approx(1.5)
+        assert align["MAX"] == 15.0
+        assert align["OUTLIERS"] == 1
+
+        assert call["WORKFLOWS"] == 9
+        assert call["OUTLIERS"] == 0
+
+        assert all_tasks["WORKFLOWS"] == 10
+        assert all_tasks["TOTAL"] == pytest.approx(9 * 1.75 + 15)
+
+    def test_summarize_costs_single_workflow(self) -> None:
+        assert cost_aggregation_utils.summarize_costs(task="Align", costs=[2.0]) == {
+            "TASK": "Align",
+            "WORKFLOWS": 1,
+            "TOTAL": 2.0,
+            "MEAN": 2.0,
+            "P50": 2.0,
+            "P90": 2.0,
+            "P99": 2.0,
+            "MAX": 2.0,
+            "OUTLIERS": 0,
+        }
+
+    def test_write_aggregated_costs_csv(
+        self, workflows_query_rows: dict, tmp_path: Path
+    ) -> None:
+        aggregated_costs = cost_aggregation_utils.aggregate_workflow_costs(
+            workflows_query_rows=workflows_query_rows
+        )
+        output_path = tmp_path / "costs.csv"
+
+        cost_aggregation_utils.write_aggregated_costs(
+            aggregated_costs=aggregated_costs, output_path=output_path
+        )
+
+        with open(output_path) as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        assert list(rows[0]) == cost_aggregation_utils.AGGREGATED_COST_COLUMNS
+        assert [row["TASK"] for row in rows] == [
+            row["TASK"] for row in aggregated_costs
+        ]
+
+    def test_write_aggregated_costs_parquet(
+        self, workflows_query_rows: dict, tmp_path: Path
+    ) -> None:
+        pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+        aggregated_costs = cost_aggregation_utils.aggregate_workflow_costs(
+            workflows_query_rows=workflows_query_rows
+        )
+        output_path = tmp_path / "costs.parquet"
+
+        cost_aggregation_utils.write_aggregated_costs(
+            aggregated_costs=aggregated_costs, output_path=output_path
+        )
+
+        assert pyarrow_parquet.read_table(output_path).to_pylist() == aggregated_costs
+
+    def test_write_aggregated_costs_parquet_without_pyarrow(
+        self, tmp_path: Path, monkeypatch
+    ) -> None:
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+        with pytest.raises(cost_aggregation_utils.ParquetUnavailableError):
+            cost_aggregation_utils.write_aggregated_costs(
+                aggregated_costs=[], output_path=tmp_path / "costs.parquet"
+            )
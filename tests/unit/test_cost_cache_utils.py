@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from cromshell.utilities import cost_cache_utils
+
+
+class TestCostCacheUtils:
+    """Test the cost cache functions"""
+
+    def test_cache_workflow_cost(self, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cost_cache"
+        query_rows = [{"task_name": "HelloWorld", "cost": 0.5}]
+
+        assert (
+            cost_cache_utils.get_cached_workflow_cost(
+                cache_dir=cache_dir,
+                workflow_id="wf1",
+                detailed=True,
+                bq_cost_table="table",
+            )
+            is None
+        )
+
+        cost_cache_utils.cache_workflow_cost(
+            cache_dir=cache_dir,
+            workflow_id="wf1",
+            detailed=True,
+            bq_cost_table="table",
+            query_rows=query_rows,
+        )
+
+        assert (
+            cost_cache_utils.get_cached_workflow_cost(
+                cache_dir=cache_dir,
+                workflow_id="wf1",
+                detailed=True,
+                bq_cost_table="table",
+            )
+            == query_rows
+        )
+        # Summary and detailed costs are cached separately
+        assert (
+            cost_cache_utils.get_cached_workflow_cost(
+                cache_dir=cache_dir,
+                workflow_id="wf1",
+                detailed=False,
+                bq_cost_table="table",
+            )
+            is None
+        )
+        # As are costs from another table
+        assert (
+            cost_cache_utils.get_cached_workflow_cost(
+                cache_dir=cache_dir,
+                workflow_id="wf1",
+                detailed=True,
+                bq_cost_table="other_table",
+            )
+            is None
+        )
+
+    def test_get_cached_workflow_cost_unreadable(self, tmp_path: Path) -> None:
+        cost_cache_utils.get_cost_cache_path(
+            cache_dir=tmp_path, workflow_id="wf1", detailed=False
+        ).write_text("{")
+
+        assert (
+            cost_cache_utils.get_cached_workflow_cost(
+                cache_dir=tmp_path,
+                workflow_id="wf1",
+                detailed=False,
+                bq_cost_table="table",
+            )
+            is None
+        )
+
+    @pytest.mark.parametrize(
+        "days_since_finished, settle_days, expected_settled",
+        [[4, 3, True], [2, 3, False], [1, 0, True]],
+    )
+    def test_is_workflow_cost_settled(
+        self, days_since_finished: int, settle_days: int, expected_settled: bool
+    ) -> None:
+        end_time = (
+            datetime.now(timezone.utc) - timedelta(days=days_since_finished)
+        ).strftime("%Y-%m-%dT%H:%M:%S.%f%z")
+
+        assert (
+            cost_cache_utils.is_workflow_cost_settled(
+                end_time=end_time, settle_window=timedelta(days=settle_days)
+            )
+            == expected_settled
+        )
+
+    def test_get_cost_settle_window(self) -> None:
+        assert cost_cache_utils.get_cost_settle_window({}) == timedelta(
+            days=cost_cache_utils.DEFAULT_COST_SETTLE_DAYS
+        )
+        assert cost_cache_utils.get_cost_settle_window(
+            {"cost_settle_days": 7}
+        ) == timedelta(days=7)
+
+        with pytest.raises(ValueError):
+            cost_cache_utils.get_cost_settle_window({"cost_settle_days": -1})
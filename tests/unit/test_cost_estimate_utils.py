@@ -0,0 +1,97 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from cromshell.utilities import cost_estimate_utils
+
+
+class TestCostEstimateUtils:
+    """Test the cost estimation functions"""
+
+    @pytest.mark.parametrize(
+        "memory, expected_gb",
+        [["3 GB", 3.0], ["3.75GB", 3.75], ["2048 MiB", 2.147483648], ["4G", 4.0]],
+    )
+    def test_parse_memory_gb(self, memory: str, expected_gb: float) -> None:
+        assert cost_estimate_utils.parse_memory_gb(memory) == pytest.approx(expected_gb)
+
+    def test_parse_memory_gb_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            cost_estimate_utils.parse_memory_gb("3 parsecs")
+
+    def test_parse_disks_gb(self) -> None:
+        assert cost_estimate_utils.parse_disks_gb(
+            "local-disk 100 HDD, /mnt/a 50 SSD, /mnt/b 25 SSD"
+        ) == {"HDD": 100.0, "SSD": 75.0}
+
+    def test_estimate_workflow_cost(self, mock_data_path) -> None:
+        workflow_metadata = json.loads(
+            mock_data_path.joinpath("succeeded_helloworld_metadata.json").read_text()
+        )
+        price_table = {
+            "cpu_hour": 1.0,
+            "memory_gb_hour": 1.0,
+            "disk_gb_month": {"HDD": cost_estimate_utils.HOURS_PER_MONTH},
+        }
+
+        rows = cost_estimate_utils.estimate_workflow_cost(
+            workflow_metadata=workflow_metadata, price_table=price_table
+        )
+
+        # The worker ran from 19:10:15.348 to 19:12:08.760 with 1 cpu, 3 GB of
+        # memory, a 100 GB disk and a 15 GB boot disk.
+        hours = 113.412 / 3600
+        assert rows == [
+            {
+                "task_name": "HelloWorld.HelloWorldTask",
+                "cost": pytest.approx(hours * (1 + 3 + 100 + 15)),
+            }
+        ]
+
+    def test_estimate_call_cost_running_and_cached(self) -> None:
+        price_table = cost_estimate_utils.load_price_table()
+        now = datetime(2022, 1, 1, 1, tzinfo=timezone.utc)
+        call = {
+            "start": "2022-01-01T00:00:00.000Z",
+            "preemptible": True,
+            "runtimeAttributes": {
+                "cpu": "2",
+                "memory": "4 GB",
+                "disks": "local-disk 10 SSD",
+                "bootDiskSizeGb": "0",
+            },
+        }
+
+        # A running call is billed until now
+        assert cost_estimate_utils.estimate_call_cost(
+            call, price_table=price_table, now=now
+        ) == pytest.approx(
+            2 * price_table["cpu_hour_preemptible"]
+            + 4 * price_table["memory_gb_hour_preemptible"]
+            + 10 * price_table["disk_gb_month"]["SSD"] / 730
+        )
+
+        call["callCaching"] = {"hit": True}
+        assert (
+            cost_estimate_utils.estimate_call_cost(
+                call, price_table=price_table, now=now
+            )
+            == 0.0
+        )
+
+    def test_load_price_table(self, tmp_path: Path) -> None:
+        price_table_path = tmp_path / "prices.json"
+        price_table_path.write_text(
+            json.dumps({"cpu_hour": 1.0, "disk_gb_month": {"SSD": 2.0}})
+        )
+
+        price_table = cost_estimate_utils.load_price_table(price_table_path)
+
+        assert price_table["cpu_hour"] == 1.0
+        assert price_table["disk_gb_month"]["SSD"] == 2.0
+        assert (
+            price_table["disk_gb_month"]["HDD"]
+            == cost_estimate_utils.DEFAULT_PRICE_TABLE["disk_gb_month"]["HDD"]
+        )
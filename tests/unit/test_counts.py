@@ -4,6 +4,7 @@ import re
 import pytest
 
 from cromshell.counts import command as counts_command
+from cromshell.utilities import metadata_record_utils
 
 
 class TestCounts:
@@ -34,13 +35,51 @@ class TestCounts:
             workflow_summary = f.read()
 
         counts_command.print_workflow_status(
-            workflow_metadata=workflow_metadata, indent="\t"
+            workflow_record=metadata_record_utils.build_workflow_record(
+                workflow_metadata
+            ),
+            indent="\t",
         )
 
         captured = capsys.readouterr()
 
         assert ansi_escape.sub("", captured.out) == workflow_summary
 
+    def test_workflow_status_scattered_subworkflow(self, ansi_escape, capsys):
+        workflow_metadata = {
+            "calls": {
+                "Main.sub": [
+                    {
+                        "shardIndex": shard,
+                        "subWorkflowMetadata": {
+                            "calls": {
+                                "Sub.task": [
+                                    {"shardIndex": 0, "executionStatus": "Done"},
+                                    {"shardIndex": 1, "executionStatus": status},
+                                ]
+                            }
+                        },
+                    }
+                    for shard, status in enumerate(["Done", "Running"])
+                ],
+                "Main.task": [{"shardIndex": -1, "executionStatus": "Done"}],
+            }
+        }
+
+        counts_command.print_workflow_status(
+            workflow_record=metadata_record_utils.build_workflow_record(
+                workflow_metadata
+            ),
+            indent="\t",
+        )
+
+        assert ansi_escape.sub("", capsys.readouterr().out).splitlines() == [
+            "\tSubWorkflow Main.sub",
+            "\t\tSub.task\t0 Running, 2 Done, 0 Preempted, 0 Failed",
+            "\t\tSub.task\t1 Running, 1 Done, 0 Preempted, 0 Failed",
+            "\tMain.task\t0 Running, 1 Done, 0 Preempted, 0 Failed",
+        ]
+
     @pytest.mark.parametrize(
         "metadata_name, call_name, metadata_summary",
         [
@@ -70,10 +109,10 @@ class TestCounts:
         with open(mock_data_path.joinpath(metadata_name), "r") as f:
             workflow_metadata = json.load(f)
 
+        workflow_record = metadata_record_utils.build_workflow_record(workflow_metadata)
+
         counts_command.print_call_status(
-            call=call_name,
-            indent="\t",
-            workflow_calls_metadata=workflow_metadata["calls"],
+            call_record=workflow_record.calls[call_name], indent="\t"
         )
 
         captured = capsys.readouterr()
@@ -108,116 +147,16 @@ class TestCounts:
             workflow_metadata = json.load(f)
 
         counts_command.print_task_status_summary(
-            workflow_metadata=workflow_metadata, print_color=False
+            workflow_record=metadata_record_utils.build_workflow_record(
+                workflow_metadata
+            ),
+            print_color=False,
         )
         captured = capsys.readouterr()
         assert captured.out.rstrip() == json.dumps(
             task_summary, indent=4, sort_keys=True
         )
 
-    @pytest.mark.parametrize(
-        "test_shards, shard_count",
-        # The test_shards is a very minimal representation of a task call for a
-        # workflow metadata. Normally the list contains several other pieces of call
-        # info but for this test the focus is on executionStatus and shardIndex
-        [
-            [
-                # test_shard 1: having one failed shard
-                [{"executionStatus": "Failed", "shardIndex": -1}],
-                # failed_shards
-                {"Failed": 1},
-            ],
-            [
-                # test_shard 2: having more than one shard and different statuses
-                [
-                    {"executionStatus": "Done", "shardIndex": 0},
-                    {"executionStatus": "Failed", "shardIndex": 1},
-                    {"executionStatus": "Done", "shardIndex": 2},
-                    {"executionStatus": "Failed", "shardIndex": 3},
-                ],
-                # failed_shards
-                {"Done": 2, "Failed": 2},
-            ],
-        ],
-    )
-    def test_get_shard_status_count(self, test_shards, shard_count):
-        assert (
-            counts_command.get_shard_status_count(
-                shards=test_shards,
-            )
-            == shard_count
-        )
-
-    @pytest.mark.parametrize(
-        "test_shards, failed_index",
-        [
-            [
-                # test_shard 1: having one failed shard
-                [{"executionStatus": "Failed", "shardIndex": -1}],
-                # failed_shards
-                [-1],
-            ],
-            [
-                # test_shard 2: having more than one shard and different statuses
-                [
-                    {"executionStatus": "Done", "shardIndex": 0},
-                    {"executionStatus": "Failed", "shardIndex": 1},
-                    {"executionStatus": "Done", "shardIndex": 2},
-                    {"executionStatus": "Failed", "shardIndex": 3},
-                ],
-                # failed_shards
-                [1, 3],
-            ],
-            [
-                # test_shard 1: having no failed shard
-                [{"executionStatus": "Done", "shardIndex": -1}],
-                # failed_shards
-                [],
-            ],
-        ],
-    )
-    def test_get_list_of_failed_shards(self, test_shards, failed_index):
-        assert (
-            counts_command.get_list_of_failed_shards(
-                shards=test_shards,
-            )
-            == failed_index
-        )
-
-    @pytest.mark.parametrize(
-        "test_shards, grouped_shards",
-        [
-            [
-                # test_shard 1: having one shard
-                [{"executionStatus": "Done", "shardIndex": -1}],
-                # grouped_shard 1
-                {"Done": [{"executionStatus": "Done", "shardIndex": -1}]},
-            ],
-            [
-                # test_shard 2: having more than one shard and different statuses
-                [
-                    {"executionStatus": "Done", "shardIndex": 0},
-                    {"executionStatus": "Failed", "shardIndex": 1},
-                    {"executionStatus": "Done", "shardIndex": 2},
-                    {"executionStatus": "Failed", "shardIndex": 3},
-                ],
-                # grouped_shard 2
-                {
-                    "Done": [
-                        {"executionStatus": "Done", "shardIndex": 0},
-                        {"executionStatus": "Done", "shardIndex": 2},
-                    ],
-                    "Failed": [
-                        {"executionStatus": "Failed", "shardIndex": 1},
-                        {"executionStatus": "Failed", "shardIndex": 3},
-                    ],
-                },
-            ],
-        ],
-    )
-    def test_group_shards_by_status(self, test_shards, grouped_shards):
-        assert counts_command.group_shards_by_status(test_shards) == grouped_shards
-
     @pytest.mark.parametrize(
         "shard_status_count",
         [
@@ -272,6 +272,83 @@ class TestCromshellConfig:
             cromshellconfig.referer_header_url == "from_cli@example.com"
         ), "CLI overrides config"
 
+    def test_resolve_lazy_subworkflows_default(self, test_config_empty):
+        reload(cromshellconfig)
+        cromshellconfig.cromshell_config_options = test_config_empty
+        cromshellconfig.resolve_lazy_subworkflows(None)
+
+        assert not cromshellconfig.lazy_subworkflows, "Server expands by default"
+
+    def test_resolve_lazy_subworkflows_config(self):
+        reload(cromshellconfig)
+        cromshellconfig.cromshell_config_options = {"lazy_subworkflows": True}
+        cromshellconfig.resolve_lazy_subworkflows(None)
+
+        assert cromshellconfig.lazy_subworkflows, "Use config value in absence of CLI"
+
+    def test_resolve_lazy_subworkflows_cli(self, test_config_empty):
+        reload(cromshellconfig)
+        cromshellconfig.cromshell_config_options = test_config_empty
+        cromshellconfig.resolve_lazy_subworkflows(True)
+
+        assert cromshellconfig.lazy_subworkflows, "CLI overrides default"
+
+    def test_resolve_requests_read_timeout_config(self):
+        reload(cromshellconfig)
+        cromshellconfig.cromshell_config_options = {"metadata_read_timeout": 900}
+        cromshellconfig.resolve_requests_read_timeout(None)
+
+        assert cromshellconfig.requests_read_timeout == 60, "Default read timeout"
+        assert cromshellconfig.metadata_read_timeout == 900, "Use config value"
+
+    def test_resolve_requests_read_timeout_cli(self):
+        reload(cromshellconfig)
+        cromshellconfig.cromshell_config_options = {"requests_read_timeout": 10}
+        cromshellconfig.resolve_requests_read_timeout(30)
+
+        assert cromshellconfig.requests_read_timeout == 30, "CLI overrides config"
+        assert cromshellconfig.metadata_read_timeout == 30, "CLI overrides default"
+
+    def test_resolve_requests_retries(self, test_config_empty):
+        reload(cromshellconfig)
+        cromshellconfig.cromshell_config_options = {
+            "requests_max_retries": 5,
+            "requests_retry_budget": 50,
+        }
+        cromshellconfig.resolve_requests_retries(0)
+
+        assert cromshellconfig.requests_max_retries == 0, "CLI overrides config"
+        assert cromshellconfig.requests_retry_budget == 50, "Use config value"
+
+    def test_resolve_request_rate_limits(self):
+        reload(cromshellconfig)
+        cromshellconfig.cromshell_config_options = {"requests_per_second": 2.5}
+        cromshellconfig.resolve_request_rate_limits()
+
+        assert cromshellconfig.requests_per_second == 2.5, "Use config value"
+        assert cromshellconfig.max_requests_in_flight == 8, "Default limit"
+
+    def test_resolve_request_rate_limits_invalid(self):
+        reload(cromshellconfig)
+        cromshellconfig.cromshell_config_options = {"max_requests_in_flight": 0}
+
+        with pytest.raises(ValueError):
+            cromshellconfig.resolve_request_rate_limits()
+        assert cromshellconfig.max_requests_in_flight == 8, "Keep the default"
+
+    def test_resolve_http_engine(self):
+        reload(cromshellconfig)
+        cromshellconfig.cromshell_config_options = {"http_engine": "async"}
+        cromshellconfig.resolve_http_engine(None)
+        assert cromshellconfig.http_engine == "async", "Use config value"
+
+        cromshellconfig.resolve_http_engine("threads")
+        assert cromshellconfig.http_engine == "threads", "CLI overrides config"
+
+        cromshellconfig.cromshell_config_options = {"http_engine": "fibers"}
+        with pytest.raises(ValueError):
+            cromshellconfig.resolve_http_engine(None)
+
     @pytest.fixture
     def mock_data_path(self):
         return os.path.join(os.path.dirname(__file__), "mock_data/")
@@ -1,7 +1,13 @@
+import io
+import tempfile
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
 import pytest
+import requests
 from requests.models import Response
 
-from cromshell.utilities import http_utils
+from cromshell.utilities import cromshellconfig, http_utils, rate_limit_utils
 
 
 class TestHTTPUtilities:
@@ -21,6 +27,216 @@ class TestHTTPUtilities:
                 short_error_message="TEST", response=mock_failed_response
             ), "If response.ok is False then exception should be raised"
 
+    @pytest.mark.parametrize("read_size", [-1, 1, 7, 8192])
+    def test_multipart_form_data_stream(self, tmp_path, monkeypatch, read_size):
+        wdl = tmp_path / "wf.wdl"
+        wdl.write_bytes(b"version 1.0\nworkflow wf {}\n")
+        spooled_zip = tempfile.SpooledTemporaryFile()
+        spooled_zip.write(b"PK\x03\x04" + bytes(range(256)) * 10)
+        spooled_zip.seek(0)
+
+        monkeypatch.setattr("urllib3.filepost.choose_boundary", lambda: "fixedboundary")
+        monkeypatch.setattr(http_utils, "choose_boundary", lambda: "fixedboundary")
+
+        with wdl.open("rb") as wdl_file:
+            expected_body = (
+                requests.Request(
+                    "POST",
+                    "http://localhost",
+                    files={
+                        "workflowSource": wdl_file,
+                        "workflowDependencies": ("workflowDependencies", spooled_zip),
+                    },
+                )
+                .prepare()
+                .body
+            )
+            wdl_file.seek(0)
+            spooled_zip.seek(0)
+
+            body = http_utils.MultipartFormDataStream(
+                {
+                    "workflowSource": wdl_file,
+                    "workflowOptions": None,
+                    "workflowDependencies": spooled_zip,
+                }
+            )
+            assert len(body) == len(expected_body)
+
+            streamed_body = io.BytesIO()
+            while True:
+                chunk = body.read(read_size)
+                if not chunk:
+                    break
+                streamed_body.write(chunk)
+
+        assert streamed_body.getvalue() == expected_body
+        assert body.content_type == "multipart/form-data; boundary=fixedboundary"
+
+    def test_write_response_content(self, mock_pass_response):
+        content = b'{"id": "wf", "calls": {}}' * 1000
+        mock_pass_response.raw = io.BytesIO(content)
+        output = io.BytesIO()
+
+        http_utils.write_response_content(
+            response=mock_pass_response, output=output, chunk_size=7
+        )
+
+        assert output.getvalue() == content + b"\n"
+
+    def test_parse_retry_after(self):
+        retry_date = datetime.now(timezone.utc) + timedelta(seconds=120)
+
+        assert http_utils.parse_retry_after("7") == 7.0
+        assert http_utils.parse_retry_after("-1") == 0.0
+        assert 100 < http_utils.parse_retry_after(format_datetime(retry_date)) <= 120
+        assert http_utils.parse_retry_after("soon") is None
+        assert http_utils.parse_retry_after(None) is None
+
+    def test_get_retry_delay(self, mock_failed_response):
+        for retry in range(10):
+            assert (
+                0
+                <= http_utils.get_retry_delay(retry)
+                <= min(
+                    http_utils.RETRY_MAX_DELAY, http_utils.RETRY_BASE_DELAY * 2**retry
+                )
+            )
+
+        mock_failed_response.headers["Retry-After"] = "3"
+        assert http_utils.get_retry_delay(0, mock_failed_response) == 3.0
+        mock_failed_response.headers["Retry-After"] = "3600"
+        assert (
+            http_utils.get_retry_delay(0, mock_failed_response)
+            == http_utils.RETRY_MAX_DELAY
+        )
+
+    def test_send_request_retries(self, retry_config, monkeypatch):
+        status_codes = [503, 502, 200]
+        requested_timeouts = []
+
+        def request(method, url, timeout, **kwargs):
+            requested_timeouts.append(timeout)
+            response = Response()
+            response.status_code = status_codes.pop(0)
+            response.raw = io.BytesIO()
+            return response
+
+        monkeypatch.setattr(requests, "request", request)
+
+        response = http_utils.send_request("GET", "http://localhost/status")
+
+        assert response.status_code == 200
+        assert requested_timeouts == [(5, 60)] * 3
+
+    @pytest.mark.parametrize(
+        "method, retry, requests_sent",
+        [
+            ["GET", None, 4],  # Retried up to requests_max_retries times
+            ["POST", None, 1],
+            ["POST", True, 4],
+            ["GET", False, 1],
+        ],
+    )
+    def test_send_request_retries_safe_requests(
+        self, retry_config, monkeypatch, method, retry, requests_sent
+    ):
+        requests_received = []
+
+        def request(method, url, **kwargs):
+            requests_received.append(method)
+            response = Response()
+            response.status_code = 504
+            response.raw = io.BytesIO()
+            return response
+
+        monkeypatch.setattr(requests, "request", request)
+
+        response = http_utils.send_request(method, "http://localhost/", retry=retry)
+
+        assert response.status_code == 504
+        assert len(requests_received) == requests_sent
+
+    def test_send_request_retry_budget(self, retry_config, monkeypatch):
+        requests_received = []
+
+        def request(method, url, **kwargs):
+            requests_received.append(url)
+            raise requests.exceptions.ConnectionError("Connection reset")
+
+        monkeypatch.setattr(requests, "request", request)
+        monkeypatch.setattr(cromshellconfig, "requests_retry_budget", 5)
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            http_utils.send_request("GET", "http://localhost/1")
+        with pytest.raises(requests.exceptions.ConnectionError):
+            http_utils.send_request("GET", "http://localhost/2")
+
+        # 3 retries of the first request and the 2 left in the budget for the second
+        assert len(requests_received) == 7
+
+    def test_send_request_overloaded(self, retry_config, monkeypatch):
+        status_codes = [429, 503, 200]
+
+        def request(method, url, **kwargs):
+            response = Response()
+            response.status_code = status_codes.pop(0)
+            response.raw = io.BytesIO()
+            return response
+
+        monkeypatch.setattr(requests, "request", request)
+
+        http_utils.send_request("GET", "http://localhost:8000/api/workflows/v1/abc")
+
+        rate_limiter = rate_limit_utils.get_server_rate_limiter("http://localhost:8000")
+        # Halved twice from 8, then increased by a successful request
+        assert int(rate_limiter.concurrency_limit.limit) == 2
+        assert rate_limiter.concurrency_limit.in_flight == 0
+
+    def test_send_requests(self, retry_config, monkeypatch):
+        def request(method, url, **kwargs):
+            if url.endswith("down"):
+                raise requests.exceptions.ConnectionError("Connection refused")
+            response = Response()
+            response.status_code = 200
+            response.raw = io.BytesIO(url.encode())
+            return response
+
+        monkeypatch.setattr(
+            requests.Session,
+            "request",
+            lambda session, method, url, **kwargs: request(method, url, **kwargs),
+        )
+        urls = [f"http://localhost:8000/{i}" for i in range(50)]
+
+        responses = http_utils.send_requests("GET", urls)
+        assert [response.text for response in responses] == urls
+
+        responses = http_utils.send_requests(
+            "GET", ["http://localhost:8000/down", *urls], return_exceptions=True
+        )
+        assert isinstance(responses[0], requests.exceptions.ConnectionError)
+        assert [response.text for response in responses[1:]] == urls
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            http_utils.send_requests("GET", [*urls, "http://localhost:8000/down"])
+
+    @pytest.fixture
+    def retry_config(self, monkeypatch):
+        """Default retry options, a fresh retry budget, no rate limit and no
+        waiting"""
+
+        monkeypatch.setattr(cromshellconfig, "requests_connect_timeout", 5)
+        monkeypatch.setattr(cromshellconfig, "requests_read_timeout", 60)
+        monkeypatch.setattr(cromshellconfig, "requests_max_retries", 3)
+        monkeypatch.setattr(cromshellconfig, "requests_retry_budget", 20)
+        monkeypatch.setattr(http_utils, "_retries_used", 0)
+        monkeypatch.setattr(cromshellconfig, "requests_per_second", 0)
+        monkeypatch.setattr(cromshellconfig, "max_requests_in_flight", 8)
+        monkeypatch.setattr(rate_limit_utils, "_server_rate_limiters", {})
+        monkeypatch.setattr(cromshellconfig, "http_engine", "threads")
+        monkeypatch.setattr(http_utils.time, "sleep", lambda seconds: None)
+
     @pytest.fixture
     def mock_pass_response(self):
         """Create requests response object to be hold mock response"""
@@ -1,9 +1,13 @@
 import csv
+import hashlib
 import io
+import json
 import os
 import re
 import shutil
+import sys
 import tempfile
+import unittest.mock
 from contextlib import redirect_stdout
 from pathlib import Path
 from tempfile import NamedTemporaryFile
@@ -119,6 +123,40 @@ class TestIOUtilities:
         # assert the function stdout is the same as the expected out
         assert func_stdout.getvalue() == test_output
 
+    @pytest.mark.parametrize("orjson_installed", [True, False])
+    def test_dumps_pretty_json(self, orjson_installed, monkeypatch) -> None:
+        if not orjson_installed:
+            monkeypatch.setitem(sys.modules, "orjson", None)
+        loaded_json = {
+            "status": "Running",
+            "calls": {"wf.task": [{"shardIndex": 0, "end": None}, {"attempt": 2}]},
+            "inputs": {"text": "line 1\n  line 2", "empty": [], "ratio": 0.5},
+        }
+
+        assert io_utils.dumps_pretty_json(loaded_json) == json.dumps(
+            loaded_json, indent=4, sort_keys=True
+        )
+
+    @pytest.mark.parametrize("orjson_installed", [True, False])
+    def test_dumps_pretty_json_non_ascii(self, orjson_installed, monkeypatch) -> None:
+        if not orjson_installed:
+            monkeypatch.setitem(sys.modules, "orjson", None)
+
+        assert io_utils.dumps_pretty_json({"sample": "Zoë-ß"}) == (
+            '{\n    "sample": "Zoë-ß"\n}'
+        )
+
+    def test_dumps_pretty_json_non_string_keys(self) -> None:
+        assert io_utils.dumps_pretty_json({1: "a"}) == '{\n    "1": "a"\n}'
+
+    def test_pretty_print_json_large_no_color(self, monkeypatch) -> None:
+        monkeypatch.setattr(io_utils, "MAX_COLOR_JSON_SIZE", 10)
+        func_stdout = io.StringIO()
+        with redirect_stdout(func_stdout):
+            io_utils.pretty_print_json({"id": "a" * 10}, add_color=True)
+
+        assert func_stdout.getvalue() == '{\n    "id": "aaaaaaaaaa"\n}\n'
+
     def test_open_or_zip_directory(self, tmp_path: Path) -> None:
         zip_dir = tmp_path / "my_dir"
         sub_dir = zip_dir / "sub_dir"
@@ -139,6 +177,107 @@ class TestIOUtilities:
                     "sub_dir/3.txt",
                 ]
 
+    def test_open_or_zip_directory_cached(self, tmp_path: Path) -> None:
+        zip_dir = tmp_path / "my_dir"
+        cache_dir = tmp_path / "cache"
+        (zip_dir / "sub_dir").mkdir(parents=True)
+        (zip_dir / "1.wdl").write_text("version 1.0")
+        (zip_dir / "sub_dir" / "2.wdl").write_text("version 1.0")
+
+        with io_utils.open_or_zip(zip_dir, cache_dir=cache_dir) as content:
+            with ZipFile(content, "r") as zip_obj:
+                assert sorted(zip_obj.namelist()) == [
+                    "1.wdl",
+                    "sub_dir/",
+                    "sub_dir/2.wdl",
+                ]
+        cached_zips = list(cache_dir.iterdir())
+        assert len(cached_zips) == 1
+
+        # An identical tree in another location reuses the cached zip
+        copied_dir = tmp_path / "copy"
+        shutil.copytree(zip_dir, copied_dir)
+        assert io_utils.zip_dir_cached(copied_dir, cache_dir) == cached_zips[0]
+
+        # Changing a file produces a new zip
+        (copied_dir / "1.wdl").write_text("version development")
+        assert io_utils.zip_dir_cached(copied_dir, cache_dir) != cached_zips[0]
+        assert len(list(cache_dir.iterdir())) == 2
+
+    def test_hash_dir(self, tmp_path: Path) -> None:
+        dir_1 = tmp_path / "1"
+        dir_2 = tmp_path / "2"
+        for directory in [dir_1, dir_2]:
+            (directory / "sub").mkdir(parents=True)
+            (directory / "a.wdl").write_text("a")
+        (dir_1 / "sub" / "b.wdl").write_text("b")
+        (dir_2 / "sub" / "b.wdl").write_text("c")
+
+        assert io_utils.hash_dir(dir_1) != io_utils.hash_dir(dir_2)
+        (dir_2 / "sub" / "b.wdl").write_text("b")
+        assert io_utils.hash_dir(dir_1) == io_utils.hash_dir(dir_2)
+        (dir_2 / "sub" / "b.wdl").rename(dir_2 / "b.wdl")
+        assert io_utils.hash_dir(dir_1) != io_utils.hash_dir(dir_2)
+
+    def test_hash_file(self, tmp_path: Path) -> None:
+        file_path = tmp_path / "a.wdl"
+        file_path.write_text("version 1.0")
+
+        assert (
+            io_utils.hash_file(file_path) == hashlib.sha256(b"version 1.0").hexdigest()
+        )
+        digest = hashlib.sha256(b"prefix")
+        assert io_utils.hash_file(file_path, digest=digest) == (
+            hashlib.sha256(b"prefixversion 1.0").hexdigest()
+        )
+
+    def test_resolve_local_wdl_imports(self, tmp_path: Path) -> None:
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "main.wdl").write_text(
+            'import "sub/a.wdl"\nimport "b.wdl"\n'
+            'import "https://example.com/remote.wdl"\n'
+        )
+        (tmp_path / "sub" / "a.wdl").write_text('import "../b.wdl"')
+        # Cyclic import
+        (tmp_path / "b.wdl").write_text('  import "main.wdl" as main')
+
+        resolved = io_utils.resolve_local_wdl_imports(tmp_path / "main.wdl")
+
+        assert resolved[0] == (tmp_path / "main.wdl").resolve()
+        assert sorted(resolved) == sorted(
+            p.resolve()
+            for p in [
+                tmp_path / "main.wdl",
+                tmp_path / "sub" / "a.wdl",
+                tmp_path / "b.wdl",
+            ]
+        )
+
+    def test_find_wdl_files(self, tmp_path: Path) -> None:
+        (tmp_path / "sub" / "deeper").mkdir(parents=True)
+        for wdl in ["a.wdl", "sub/b.wdl", "sub/deeper/c.wdl"]:
+            (tmp_path / wdl).write_text("version 1.0")
+        (tmp_path / "sub" / "inputs.json").write_text("{}")
+
+        all_wdls = [tmp_path / "a.wdl", tmp_path / "sub/b.wdl"]
+        all_wdls.append(tmp_path / "sub/deeper/c.wdl")
+
+        assert io_utils.find_wdl_files(tmp_path) == all_wdls
+        assert io_utils.find_wdl_files(tmp_path / "a.wdl") == all_wdls[:1]
+        assert io_utils.find_wdl_files(f"{tmp_path}/**/*.wdl") == all_wdls
+        assert io_utils.find_wdl_files(f"{tmp_path}/sub/*") == all_wdls[1:]
+        assert io_utils.find_wdl_files(f"{tmp_path}/*.json") == []
+
+    def test_prune_zip_cache(self, tmp_path: Path) -> None:
+        for i in range(5):
+            zip_path = tmp_path / f"{i}.zip"
+            zip_path.touch()
+            os.utime(zip_path, (i, i))
+
+        io_utils.prune_zip_cache(cache_dir=tmp_path, max_cached_zips=2)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["3.zip", "4.zip"]
+
     def test_open_or_zip_file(self, tmp_path: Path) -> None:
         zip_dir = tmp_path / "my_dir"
         existing_zip = zip_dir / "existing.zip"
@@ -446,6 +585,105 @@ class TestIOUtilities:
         # Clean up the temporary directory
         tempdir.cleanup()
 
+    @staticmethod
+    def write_import_tree(root: Path, file_count: int) -> Path:
+        """Write a tree of WDLs where each WDL i imports WDLs 2i+1 and 2i+2
+        from a subdirectory and every WDL imports a shared library (diamond
+        imports), returning the path of the top level WDL"""
+
+        (root / "lib").mkdir(parents=True)
+        (root / "lib" / "library.wdl").write_text("version 1.0\ntask Lib {}\n")
+        for i in range(file_count):
+            depth = len(bin(i + 1)) - 3
+            wdl = root.joinpath(*["sub"] * depth, f"wdl_{i}.wdl")
+            wdl.parent.mkdir(parents=True, exist_ok=True)
+            imports = [f'import "{"../" * depth}lib/library.wdl" as lib\n']
+            for child in [2 * i + 1, 2 * i + 2]:
+                if child < file_count:
+                    imports.append(f'import "sub/wdl_{child}.wdl"\n')
+            wdl.write_text("version 1.0\n" + "".join(imports))
+
+        return root / "wdl_0.wdl"
+
+    def test_flatten_nested_dependencies_import_tree(self, tmp_path: Path) -> None:
+        wdl = self.write_import_tree(tmp_path / "tree", file_count=1000)
+        tempdir = tempfile.TemporaryDirectory()
+
+        read_paths = []
+        read_text = Path.read_text
+
+        def counting_read_text(path, *args, **kwargs):
+            read_paths.append(path)
+            return read_text(path, *args, **kwargs)
+
+        with unittest.mock.patch.object(Path, "read_text", counting_read_text):
+            import_graph = io_utils.get_wdl_import_graph(wdl)
+            assert io_utils.has_nested_dependencies(wdl, import_graph=import_graph)
+            flattened_wdl = io_utils.flatten_nested_dependencies(
+                tempdir, wdl, import_graph=import_graph
+            )
+
+        # Every WDL, including the library imported by all of them, is read once
+        assert len(read_paths) == len(set(read_paths)) == 1001
+        flattened_files = sorted(Path(tempdir.name).iterdir())
+        assert len(flattened_files) == 1001
+        assert flattened_wdl == io_utils.get_flattened_filename(tempdir.name, wdl)
+
+        # Imports point to flattened files, and keep their namespace
+        flattened_names = {path.name for path in flattened_files}
+        for flattened_file in flattened_files:
+            for m in io_utils.wdl_import_statement_pattern.finditer(
+                flattened_file.read_text()
+            ):
+                assert m.group(2) in flattened_names
+                assert io_utils.wdl_import_alias_pattern.match(m.group(3))
+
+        tempdir.cleanup()
+
+    def test_flatten_nested_dependencies_cyclic_imports(self, tmp_path: Path) -> None:
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a.wdl").write_text('  import "sub/b.wdl" as b\n')
+        (tmp_path / "sub" / "b.wdl").write_text(
+            'import "../a.wdl"\nimport "https://example.com/c.wdl" as c\n'
+        )
+        tempdir = tempfile.TemporaryDirectory()
+
+        flattened_wdl = io_utils.flatten_nested_dependencies(
+            tempdir, tmp_path / "a.wdl"
+        )
+
+        b_name = io_utils.get_flattened_filename(tempdir.name, tmp_path / "sub/b.wdl")
+        assert flattened_wdl.read_text() == f'  import "{b_name.name}" as b\n'
+        assert b_name.read_text() == (
+            f'import "{flattened_wdl.name}" as a\n'
+            'import "https://example.com/c.wdl" as c\n'
+        )
+
+        tempdir.cleanup()
+
+    def test_flatten_nested_dependencies_struct_aliases(self, tmp_path: Path) -> None:
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "main.wdl").write_text(
+            'import "sub/a.wdl" alias Sample as ASample  # structs\n'
+            'import "sub/b.wdl" as b alias Sample as BSample\n'
+        )
+        (tmp_path / "sub" / "a.wdl").write_text("version 1.0\n")
+        (tmp_path / "sub" / "b.wdl").write_text("version 1.0\n")
+        tempdir = tempfile.TemporaryDirectory()
+
+        flattened_wdl = io_utils.flatten_nested_dependencies(
+            tempdir, tmp_path / "main.wdl"
+        )
+
+        a_name = io_utils.get_flattened_filename(tempdir.name, tmp_path / "sub/a.wdl")
+        b_name = io_utils.get_flattened_filename(tempdir.name, tmp_path / "sub/b.wdl")
+        assert flattened_wdl.read_text() == (
+            f'import "{a_name.name}" as a alias Sample as ASample  # structs\n'
+            f'import "{b_name.name}" as b alias Sample as BSample\n'
+        )
+
+        tempdir.cleanup()
+
     @pytest.fixture
     def mock_data_path(self):
         return Path(__file__).parent.joinpath("mock_data/")
@@ -3,6 +3,7 @@ import json
 import pytest
 
 from cromshell.list_outputs import command as list_outputs_command
+from cromshell.utilities import metadata_record_utils
 
 
 class TestListOutputs:
@@ -32,11 +33,45 @@ class TestListOutputs:
 
         assert (
             list_outputs_command.filter_outputs_from_workflow_metadata(
-                workflow_metadata
+                metadata_record_utils.build_workflow_record(
+                    workflow_metadata, keep_shards=True
+                )
             )
             == outputs_metadata
         )
 
+    def test_filter_outputs_from_workflow_metadata_subworkflows(self):
+        workflow_metadata = {
+            "id": "main",
+            "calls": {
+                "Main.sub": [
+                    {
+                        "shardIndex": shard,
+                        "subWorkflowMetadata": {
+                            "id": f"sub-{shard}",
+                            "calls": {
+                                "Sub.task": [{"outputs": {"out": f"gs://{shard}"}}]
+                            },
+                        },
+                    }
+                    for shard in range(2)
+                ],
+                "Main.task": [{"outputs": {"out": "/main"}}],
+            },
+        }
+
+        assert list_outputs_command.filter_outputs_from_workflow_metadata(
+            metadata_record_utils.build_workflow_record(
+                workflow_metadata, keep_shards=True
+            )
+        ) == {
+            "Main.sub": [
+                {"Sub.task": [{"out": "gs://0"}]},
+                {"Sub.task": [{"out": "gs://1"}]},
+            ],
+            "Main.task": [{"out": "/main"}],
+        }
+
     @pytest.mark.parametrize(
         "outputs_metadata_file_path, expected_task_level_outputs_file_path",
         [
@@ -203,3 +238,90 @@ class TestListOutputs:
                 )
                 is None
             )
+
+    def test_get_task_output_files(self, tests_metadata_path, mock_data_path):
+        with open(
+            tests_metadata_path.joinpath("succeeded_helloworld.metadata.json"), "r"
+        ) as f:
+            workflow_metadata = json.load(f)
+
+        with open(
+            mock_data_path.joinpath(
+                "list_outputs/succeeded_helloworld.outputs.metadata.json"
+            ),
+            "r",
+        ) as f:
+            outputs_metadata = json.load(f)
+
+        assert list_outputs_command.get_task_output_files(
+            metadata_record_utils.build_workflow_record(
+                workflow_metadata, keep_shards=True
+            )
+        ) == {
+            "HelloWorld.HelloWorldTask": list(
+                outputs_metadata["HelloWorld.HelloWorldTask"][0].values()
+            )
+        }
+
+    @pytest.mark.parametrize(
+        "output_value, expected_values",
+        [
+            ["/a.txt", ["/a.txt"]],
+            ["not_a_file", []],
+            [1, []],
+            [["gs://a", ["gs://b", "c"]], ["gs://a", "gs://b"]],
+            [{"left": "/l.txt", "right": {"x": "gs://r"}}, ["/l.txt", "gs://r"]],
+            [None, []],
+        ],
+    )
+    def test_get_file_like_values(self, output_value, expected_values):
+        assert (
+            list(list_outputs_command.get_file_like_values(output_value))
+            == expected_values
+        )
+
+    def test_get_task_output_stats(self, tmp_path):
+        file_a = tmp_path / "a.txt"
+        file_b = tmp_path / "b.txt"
+        file_a.write_text("12345")
+        file_b.write_text("123")
+        missing = str(tmp_path / "missing.txt")
+
+        workflow_metadata = {
+            "id": "wf",
+            "calls": {
+                "wf.A": [
+                    {"shardIndex": 0, "outputs": {"out": str(file_a)}},
+                    {"shardIndex": 1, "outputs": {"out": missing}},
+                ],
+                "wf.Sub": [
+                    {
+                        "shardIndex": -1,
+                        "subWorkflowMetadata": {
+                            "calls": {
+                                "sub.B": [
+                                    {
+                                        "shardIndex": -1,
+                                        "outputs": {"out": [str(file_b), 3]},
+                                    }
+                                ]
+                            }
+                        },
+                    }
+                ],
+            },
+        }
+
+        output_stats = list_outputs_command.get_task_output_stats(
+            metadata_record_utils.build_workflow_record(
+                workflow_metadata, keep_shards=True
+            )
+        )
+
+        assert output_stats["total_bytes"] == 8
+        assert output_stats["file_count"] == 3
+        assert output_stats["missing_count"] == 1
+        assert output_stats["tasks"]["wf.A"]["total_bytes"] == 5
+        assert output_stats["tasks"]["wf.A"]["missing_count"] == 1
+        assert output_stats["tasks"]["sub.B"]["total_bytes"] == 3
+        assert output_stats["tasks"]["sub.B"]["files"][0]["path"] == str(file_b)
@@ -4,6 +4,7 @@ import os
 import pytest
 
 from cromshell.logs import command as logs_command
+from cromshell.utilities import metadata_record_utils
 
 
 class TestLogs:
@@ -28,7 +29,9 @@ class TestLogs:
             workflow_metadata = json.load(f)
 
         logs_output = logs_command.print_workflow_logs(
-            workflow_metadata=workflow_metadata,
+            workflow_record=metadata_record_utils.build_workflow_record(
+                workflow_metadata, keep_shards=True
+            ),
             expand_sub_workflows=True,
             indent="",
             status_keys=status_keys,
@@ -58,9 +61,51 @@ class TestLogs:
         with open(workflow_metadata_path, "r") as f:
             workflow_metadata = json.load(f)
 
-        shard_list = workflow_metadata["calls"][task]
+        shard_record = metadata_record_utils.ShardRecord.from_metadata(
+            workflow_metadata["calls"][task][0]
+        )
+
+        assert logs_command.get_backend_logs(task_instance=shard_record) == expect_logs
+
+    def test_print_workflow_logs_scattered_subworkflow(self, capsys):
+        workflow_metadata = {
+            "calls": {
+                "Main.sub": [
+                    {
+                        "shardIndex": shard,
+                        "subWorkflowMetadata": {
+                            "calls": {
+                                "Sub.task": [
+                                    {
+                                        "shardIndex": -1,
+                                        "executionStatus": "Failed",
+                                        "backendLogs": {"log": f"gs://sub-{shard}.log"},
+                                    }
+                                ]
+                            }
+                        },
+                    }
+                    for shard in range(2)
+                ]
+            }
+        }
+
+        assert logs_command.print_workflow_logs(
+            workflow_record=metadata_record_utils.build_workflow_record(
+                workflow_metadata, keep_shards=True
+            ),
+            expand_sub_workflows=True,
+            indent="",
+            status_keys=["Failed"],
+            cat_logs=False,
+        )
 
-        assert logs_command.get_backend_logs(task_instance=shard_list[0]) == expect_logs
+        # Every shard of the subworkflow, including the last one
+        assert capsys.readouterr().out.splitlines() == [
+            "SubWorkflow Main.sub",
+            "\tSub.task:\tFailed\t gs://sub-0.log",
+            "\tSub.task:\tFailed\t gs://sub-1.log",
+        ]
 
     @pytest.mark.parametrize(
         "metadata_json",
@@ -1,7 +1,12 @@
+import copy
+
 import pytest
+import requests
 
 from cromshell.metadata import command as metadata_command
 
+API_WORKFLOWS = "http://localhost:8000/api/workflows/v1"
+
 
 class TestMetadata:
     """Test the metadata command functions"""
@@ -80,3 +85,128 @@ class TestMetadata:
             )
             == test_keys_string_out
         )
+
+    def test_get_workflow_metadata_lazily(self, unexpanded_metadata, monkeypatch):
+        requested_params = []
+
+        def request(method, url, params, **kwargs):
+            requested_params.append(params)
+            return FakeResponse(copy.deepcopy(unexpanded_metadata[url.split("/")[-2]]))
+
+        mock_requests(monkeypatch, request)
+
+        workflow_metadata = metadata_command.get_workflow_metadata(
+            meta_params={"includeKey": ["id", "calls"], "expandSubWorkflows": "true"},
+            api_workflow_id=f"{API_WORKFLOWS}/main",
+            timeout=5,
+            verify_certs=True,
+            headers={},
+            lazy_subworkflows=True,
+        )
+
+        assert workflow_metadata == expand_metadata("main", unexpanded_metadata)
+        assert len(requested_params) == len(unexpanded_metadata)
+        assert all(
+            params == {"includeKey": ["id", "calls", "subWorkflowId"]}
+            for params in requested_params
+        )
+
+    def test_get_workflow_metadata_lazily_exclude_keys(
+        self, unexpanded_metadata, monkeypatch
+    ):
+        requested_params = []
+
+        def request(method, url, params, **kwargs):
+            requested_params.append(params)
+            return FakeResponse(copy.deepcopy(unexpanded_metadata[url.split("/")[-2]]))
+
+        mock_requests(monkeypatch, request)
+
+        workflow_metadata = metadata_command.get_workflow_metadata_lazily(
+            meta_params={
+                "excludeKey": ["inputs", "subWorkflowId"],
+                "expandSubWorkflows": "true",
+            },
+            api_workflow_id=f"{API_WORKFLOWS}/main",
+            timeout=5,
+            verify_certs=True,
+            headers={},
+        )
+
+        # Every level of nested subworkflows is expanded
+        assert workflow_metadata == expand_metadata("main", unexpanded_metadata)
+        # The ids of the subworkflows are not excluded, they are needed to fetch them
+        assert all(params == {"excludeKey": ["inputs"]} for params in requested_params)
+
+    @pytest.fixture
+    def unexpanded_metadata(self) -> dict:
+        """Metadata of a workflow and its subworkflows, by id, as returned by
+        the server without expanding subworkflows"""
+
+        def task_shard(shard_index: int) -> dict:
+            return {"shardIndex": shard_index, "executionStatus": "Done"}
+
+        return {
+            "main": {
+                "id": "main",
+                "calls": {
+                    "Main.task": [task_shard(-1)],
+                    "Main.scatter_sub": [
+                        {"shardIndex": 0, "subWorkflowId": "scatter-0"},
+                        {"shardIndex": 1, "subWorkflowId": "scatter-1"},
+                    ],
+                    "Main.nested_sub": [{"shardIndex": -1, "subWorkflowId": "nested"}],
+                },
+            },
+            "scatter-0": {"id": "scatter-0", "calls": {"Sub.task": [task_shard(0)]}},
+            "scatter-1": {"id": "scatter-1", "calls": {"Sub.task": [task_shard(1)]}},
+            "nested": {
+                "id": "nested",
+                "calls": {
+                    "Nested.sub": [{"shardIndex": -1, "subWorkflowId": "nested-inner"}]
+                },
+            },
+            "nested-inner": {
+                "id": "nested-inner",
+                "calls": {"Inner.task": [task_shard(-1)]},
+            },
+        }
+
+
+class FakeResponse:
+    """Successful response of the metadata endpoint"""
+
+    ok = True
+    status_code = 200
+
+    def __init__(self, metadata: dict):
+        self.metadata = metadata
+
+    def json(self) -> dict:
+        return self.metadata
+
+
+def mock_requests(monkeypatch, request) -> None:
+    """Answer the requests sent alone, and those sent at once (which share a
+    session), with the request function"""
+
+    monkeypatch.setattr(requests, "request", request)
+    monkeypatch.setattr(
+        requests.Session,
+        "request",
+        lambda session, method, url, **kwargs: request(method, url, **kwargs),
+    )
+
+
+def expand_metadata(workflow_id: str, unexpanded_metadata: dict) -> dict:
+    """Expand the subworkflows of a workflow the way the server does"""
+
+    workflow_metadata = copy.deepcopy(unexpanded_metadata[workflow_id])
+    for shards in workflow_metadata["calls"].values():
+        for shard in shards:
+            if "subWorkflowId" in shard:
+                shard["subWorkflowMetadata"] = expand_metadata(
+                    shard.pop("subWorkflowId"), unexpanded_metadata
+                )
+
+    return workflow_metadata
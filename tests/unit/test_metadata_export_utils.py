@@ -0,0 +1,125 @@
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from cromshell.utilities import metadata_export_utils
+from cromshell.utilities.cost_aggregation_utils import ParquetUnavailableError
+
+
+@pytest.fixture
+def workflow_metadata() -> dict:
+    return {
+        "calls": {
+            "Main.task": [
+                {
+                    "shardIndex": shard,
+                    "attempt": attempt,
+                    "executionStatus": "Done",
+                    "runtimeAttributes": {"cpu": "2", "memory": "4 GB"},
+                    "backendLogs": {"log": f"gs://bucket/task-{shard}.log"},
+                }
+                for shard in range(3)
+                for attempt in (1, 2)
+            ],
+            "Main.sub": [
+                {
+                    "subWorkflowMetadata": {
+                        "calls": {
+                            "Sub.task": [{"executionStatus": "Failed", "returnCode": 1}]
+                        }
+                    }
+                }
+            ],
+        }
+    }
+
+
+class TestMetadataExportUtils:
+    """Test the export of the calls of a workflow"""
+
+    def test_iter_call_rows(self, workflow_metadata: dict) -> None:
+        call_rows = list(metadata_export_utils.iter_call_rows(workflow_metadata))
+
+        assert len(call_rows) == 7
+        assert all(
+            list(row) == metadata_export_utils.CALL_EXPORT_COLUMNS for row in call_rows
+        )
+        assert call_rows[0]["task"] == "Main.task"
+        assert call_rows[0]["cpu"] == "2"
+        assert call_rows[0]["disks"] is None
+        assert call_rows[0]["log"] == "gs://bucket/task-0.log"
+        assert json.loads(call_rows[0]["runtime_attributes"]) == {
+            "cpu": "2",
+            "memory": "4 GB",
+        }
+        assert call_rows[-1]["task"] == "Sub.task"
+        assert call_rows[-1]["shard"] == -1
+        assert call_rows[-1]["return_code"] == 1
+
+    def test_iter_batches(self) -> None:
+        batches = list(metadata_export_utils.iter_batches(iter(range(5)), 2))
+
+        assert batches == [[0, 1], [2, 3], [4]]
+
+    def test_write_call_rows_csv(self, workflow_metadata: dict, tmp_path: Path) -> None:
+        output_path = tmp_path / "calls.csv"
+
+        row_count = metadata_export_utils.write_call_rows(
+            metadata_export_utils.iter_call_rows(workflow_metadata),
+            output_path=output_path,
+            batch_size=2,
+        )
+
+        with open(output_path) as output_file:
+            rows = list(csv.DictReader(output_file))
+        assert row_count == len(rows) == 7
+        assert [row["attempt"] for row in rows[:2]] == ["1", "2"]
+
+    def test_write_call_rows_jsonl(
+        self, workflow_metadata: dict, tmp_path: Path
+    ) -> None:
+        output_path = tmp_path / "calls.jsonl"
+
+        metadata_export_utils.write_call_rows(
+            metadata_export_utils.iter_call_rows(workflow_metadata),
+            output_path=output_path,
+            batch_size=4,
+        )
+
+        rows = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert rows == list(metadata_export_utils.iter_call_rows(workflow_metadata))
+
+    def test_write_call_rows_parquet(
+        self, workflow_metadata: dict, tmp_path: Path
+    ) -> None:
+        pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+        output_path = tmp_path / "calls.parquet"
+
+        metadata_export_utils.write_call_rows(
+            metadata_export_utils.iter_call_rows(workflow_metadata),
+            output_path=output_path,
+            batch_size=3,
+        )
+
+        assert pyarrow_parquet.read_table(output_path).to_pylist() == list(
+            metadata_export_utils.iter_call_rows(workflow_metadata)
+        )
+
+    def test_write_call_rows_parquet_without_pyarrow(
+        self, tmp_path: Path, monkeypatch
+    ) -> None:
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+        with pytest.raises(ParquetUnavailableError):
+            metadata_export_utils.write_call_rows(
+                [], output_path=tmp_path / "calls.parquet"
+            )
+
+    def test_write_call_rows_unsupported_format(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            metadata_export_utils.write_call_rows(
+                [], output_path=tmp_path / "calls.xlsx"
+            )
@@ -0,0 +1,155 @@
+import tracemalloc
+
+import pytest
+
+from cromshell.utilities import metadata_record_utils
+
+
+def build_call_record(shards: list) -> metadata_record_utils.CallRecord:
+    call_record = metadata_record_utils.CallRecord(name="wf.task")
+    for shard in shards:
+        call_record.add_shard(shard)
+
+    return call_record
+
+
+class TestMetadataRecordUtils:
+    """Test the compact records of workflow metadata"""
+
+    @pytest.mark.parametrize(
+        "test_shards, shard_count, failed_index",
+        # The test_shards is a very minimal representation of a task call for a
+        # workflow metadata. Normally the list contains several other pieces of call
+        # info but for this test the focus is on executionStatus and shardIndex
+        [
+            [
+                # test_shard 1: having one failed shard
+                [{"executionStatus": "Failed", "shardIndex": -1}],
+                {"Failed": 1},
+                [-1],
+            ],
+            [
+                # test_shard 2: having more than one shard and different statuses
+                [
+                    {"executionStatus": "Failed", "shardIndex": 0},
+                    {"executionStatus": "Done", "shardIndex": 1},
+                    {"executionStatus": "Done", "shardIndex": 2},
+                    {"executionStatus": "Failed", "shardIndex": 3},
+                ],
+                {"Done": 2, "Failed": 2},
+                [0, 3],
+            ],
+            [
+                # test_shard 3: having no failed shard
+                [{"executionStatus": "Done", "shardIndex": -1}],
+                {"Done": 1},
+                [],
+            ],
+        ],
+    )
+    def test_call_record(self, test_shards, shard_count, failed_index):
+        call_record = build_call_record(test_shards)
+
+        assert len(call_record) == len(test_shards)
+        assert call_record.get_status_counts() == shard_count
+        # Sorted by status
+        assert list(call_record.get_status_counts()) == sorted(shard_count)
+        assert call_record.get_shard_indices_with_status("Failed") == failed_index
+        assert call_record.shards is None
+
+    def test_call_record_unseen_status(self):
+        call_record = build_call_record([{"executionStatus": "Done"}])
+
+        assert call_record.get_shard_indices_with_status("NeverSeenStatus") == []
+
+    def test_shard_record(self):
+        shard_record = metadata_record_utils.ShardRecord.from_metadata(
+            {
+                "shardIndex": 3,
+                "attempt": 2,
+                "executionStatus": "Done",
+                "backendLogs": {"log": "gs://bucket/task.log"},
+                "outputs": {"out": "gs://bucket/out.txt"},
+                "commandLine": "echo hello",
+            }
+        )
+
+        assert shard_record.shard_index == 3
+        assert shard_record.attempt == 2
+        assert shard_record.status == "Done"
+        assert shard_record.backend is None
+        assert shard_record.backend_log == "gs://bucket/task.log"
+        assert shard_record.outputs == {"out": "gs://bucket/out.txt"}
+        assert not hasattr(shard_record, "__dict__")
+
+    def test_build_workflow_record(self):
+        workflow_metadata = {
+            "id": "main",
+            "status": "Running",
+            "calls": {
+                "Main.sub": [
+                    {
+                        "shardIndex": shard,
+                        "executionStatus": "Running",
+                        "subWorkflowMetadata": {
+                            "id": f"sub-{shard}",
+                            "status": "Running",
+                            "calls": {
+                                "Sub.task": [
+                                    {"shardIndex": -1, "executionStatus": "Done"}
+                                ]
+                            },
+                        },
+                    }
+                    for shard in range(2)
+                ],
+                "Main.task": [{"shardIndex": -1, "executionStatus": "Failed"}],
+            },
+        }
+
+        workflow_record = metadata_record_utils.build_workflow_record(
+            workflow_metadata, keep_shards=True
+        )
+
+        assert (workflow_record.id, workflow_record.status) == ("main", "Running")
+        assert list(workflow_record.calls) == ["Main.sub", "Main.task"]
+        subworkflows = workflow_record.calls["Main.sub"].subworkflows
+        assert [subworkflow.id for subworkflow in subworkflows] == ["sub-0", "sub-1"]
+        assert [
+            shard.status for shard in workflow_record.calls["Main.task"].shards
+        ] == ["Failed"]
+        assert [
+            (depth, call_record.name)
+            for depth, call_record in metadata_record_utils.iter_call_records(
+                workflow_record
+            )
+        ] == [(0, "Main.sub"), (1, "Sub.task"), (1, "Sub.task"), (0, "Main.task")]
+
+    def test_build_workflow_record_memory(self):
+        shards = 1_000_000
+        # The same shard metadata is reused to keep the test light on memory
+        workflow_metadata = {
+            "calls": {
+                "Main.scatter": [
+                    {
+                        "shardIndex": 0,
+                        "executionStatus": "Done",
+                        "commandLine": "echo hello",
+                    }
+                ]
+                * shards
+            }
+        }
+
+        tracemalloc.start()
+        try:
+            workflow_record = metadata_record_utils.build_workflow_record(
+                workflow_metadata
+            )
+            record_size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert len(workflow_record.calls["Main.scatter"]) == shards
+        # About 10 bytes per shard, for the shard index and status code
+        assert record_size < 20 * 1024 * 1024
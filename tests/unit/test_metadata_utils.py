@@ -0,0 +1,146 @@
+import json
+import sys
+from datetime import datetime, timezone
+
+from cromshell.utilities import metadata_utils
+
+
+class TestMetadataUtils:
+    """Test the metadata utility functions"""
+
+    def test_iter_workflow_calls(self, mock_data_path) -> None:
+        workflow_metadata = json.loads(
+            mock_data_path.joinpath("succeeded_helloworld_metadata.json").read_text()
+        )
+
+        assert [
+            call_name
+            for call_name, _ in metadata_utils.iter_workflow_calls(workflow_metadata)
+        ] == ["HelloWorld.HelloWorldTask"]
+
+    def test_iter_workflow_calls_subworkflows(self) -> None:
+        workflow_metadata = {
+            "calls": {
+                "Main.task": [{"shardIndex": 0}, {"shardIndex": 1}],
+                "Main.sub": [
+                    {
+                        "subWorkflowMetadata": {
+                            "calls": {"Sub.task": [{"shardIndex": -1}]}
+                        }
+                    }
+                ],
+            }
+        }
+
+        assert sorted(
+            (call_name, call["shardIndex"])
+            for call_name, call in metadata_utils.iter_workflow_calls(workflow_metadata)
+        ) == [("Main.task", 0), ("Main.task", 1), ("Sub.task", -1)]
+
+    def test_iter_workflow_calls_deeply_nested(self) -> None:
+        depth = sys.getrecursionlimit() * 2
+        workflow_metadata = {"calls": {"Leaf.task": [{}]}}
+        for _ in range(depth):
+            workflow_metadata = {
+                "calls": {"Nested.sub": [{"subWorkflowMetadata": workflow_metadata}]}
+            }
+
+        assert list(metadata_utils.iter_workflow_calls(workflow_metadata)) == [
+            ("Leaf.task", {})
+        ]
+
+    def test_walk_workflow_calls(self) -> None:
+        sub_shards = [
+            {"shardIndex": shard, "subWorkflowMetadata": {"calls": {"Sub.task": [{}]}}}
+            for shard in range(2)
+        ]
+        workflow_metadata = {
+            "calls": {
+                "Main.sub": sub_shards,
+                "Main.task": [{"shardIndex": 0}, {"shardIndex": 1}],
+            }
+        }
+
+        assert [
+            (path, call_name)
+            for path, call_name, _ in metadata_utils.walk_workflow_calls(
+                workflow_metadata
+            )
+        ] == [
+            ((), "Main.sub"),
+            ((("Main.sub", 0),), "Sub.task"),
+            ((), "Main.sub"),
+            ((("Main.sub", 1),), "Sub.task"),
+            ((), "Main.task"),
+            ((), "Main.task"),
+        ]
+        assert [
+            call_name
+            for _, call_name, _ in metadata_utils.walk_workflow_calls(
+                workflow_metadata, expand_subworkflows=False
+            )
+        ] == ["Main.sub", "Main.sub", "Main.task", "Main.task"]
+
+    def test_walk_workflow_calls_deep(self) -> None:
+        workflow_metadata = {"calls": {"Leaf.task": [{}]}}
+        for _ in range(50):
+            workflow_metadata = {
+                "calls": {
+                    "Nested.task": [{}, {}],
+                    "Nested.sub": [{"subWorkflowMetadata": workflow_metadata}],
+                }
+            }
+
+        walked_calls = list(metadata_utils.walk_workflow_calls(workflow_metadata))
+
+        assert len(walked_calls) == 50 * 3 + 1
+        path, call_name, _ = walked_calls[-1]
+        assert call_name == "Leaf.task"
+        assert path == (("Nested.sub", -1),) * 50
+
+    def test_walk_workflow_calls_wide(self) -> None:
+        shards = 1_000_000
+        # The same shard metadata is reused to keep the test light on memory
+        workflow_metadata = {"calls": {"Main.scatter": [{"shardIndex": 0}] * shards}}
+
+        assert (
+            sum(1 for _ in metadata_utils.walk_workflow_calls(workflow_metadata))
+            == shards
+        )
+
+    def test_get_call_run_time(self) -> None:
+        now = datetime(2022, 1, 2, tzinfo=timezone.utc)
+        call = {
+            "start": "2022-01-01T00:00:00.000Z",
+            "end": "2022-01-01T02:00:00.000Z",
+            "executionEvents": [
+                {
+                    "description": "Worker abc assigned in us-central1-b",
+                    "startTime": "2022-01-01T00:10:00.000Z",
+                },
+                {
+                    "description": "Worker released",
+                    "startTime": "2022-01-01T01:50:00.000Z",
+                },
+            ],
+        }
+
+        # The worker lifetime is billed when known
+        assert metadata_utils.get_call_run_time(call, now=now) == (
+            datetime(2022, 1, 1, 0, 10, tzinfo=timezone.utc),
+            datetime(2022, 1, 1, 1, 50, tzinfo=timezone.utc),
+        )
+
+        # A finished call without a release event ends with the call
+        del call["executionEvents"][1]
+        assert metadata_utils.get_call_run_time(call, now=now) == (
+            datetime(2022, 1, 1, 0, 10, tzinfo=timezone.utc),
+            datetime(2022, 1, 1, 2, tzinfo=timezone.utc),
+        )
+
+        # A running call ends now
+        del call["end"]
+        assert metadata_utils.get_call_run_time(call, now=now) == (
+            datetime(2022, 1, 1, 0, 10, tzinfo=timezone.utc),
+            now,
+        )
@@ -1,5 +1,7 @@
 import zipfile
+from collections import Counter
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -35,3 +37,156 @@ class TestMiniwdlUtilities:
     def test_resolve_wdl_dependencies_invalid(self):
         with pytest.raises(FileNotFoundError):
             miniwdl_utils.resolve_wdl_dependencies("nonexistent_file_or_directory")
+
+
+class TestMiniwdlValidator:
+    """Test the MiniwdlValidator and its document cache"""
+
+    LIBRARY_WDL = (
+        "version 1.0\n"
+        "task Greet {\n"
+        "    input {\n"
+        "        String name\n"
+        "    }\n"
+        "    command <<< echo ~{name} >>>\n"
+        "    output {\n"
+        "        String out = read_string(stdout())\n"
+        "    }\n"
+        "}\n"
+    )
+    WORKFLOW_WDL = (
+        "version 1.0\n"
+        'import "lib/library.wdl" as lib\n'
+        "workflow Main{i} {{\n"
+        '    call lib.Greet {{ input: name = "{i}" }}\n'
+        "}}\n"
+    )
+
+    @pytest.fixture
+    def workflows_dir(self, tmp_path: Path) -> Path:
+        (tmp_path / "lib").mkdir()
+        (tmp_path / "lib" / "library.wdl").write_text(self.LIBRARY_WDL)
+        for i in range(3):
+            (tmp_path / f"main_{i}.wdl").write_text(self.WORKFLOW_WDL.format(i=i))
+        return tmp_path
+
+    def count_parsed_documents(self, validator, wdls) -> Counter:
+        import WDL
+
+        parsed_documents = Counter()
+        parse_document = WDL.parse_document
+
+        def counting_parse_document(txt, *args, **kwargs):
+            parsed_documents[Path(kwargs["uri"]).name] += 1
+            return parse_document(txt, *args, **kwargs)
+
+        with patch("WDL.parse_document", side_effect=counting_parse_document):
+            for wdl in wdls:
+                assert validator.validate(wdl) == []
+
+        return parsed_documents
+
+    def test_validate_shared_library_loaded_once(self, workflows_dir: Path) -> None:
+        validator = miniwdl_utils.MiniwdlValidator()
+        wdls = sorted(workflows_dir.glob("main_*.wdl"))
+
+        parsed_documents = self.count_parsed_documents(validator, wdls)
+        assert parsed_documents == Counter(
+            {"library.wdl": 1, "main_0.wdl": 1, "main_1.wdl": 1, "main_2.wdl": 1}
+        )
+
+        # Nothing is parsed again until a file changes
+        assert self.count_parsed_documents(validator, wdls) == Counter()
+
+        library = workflows_dir / "lib" / "library.wdl"
+        library.write_text(self.LIBRARY_WDL + "\n")
+        parsed_documents = self.count_parsed_documents(validator, wdls[:1])
+        assert parsed_documents == Counter({"library.wdl": 1, "main_0.wdl": 1})
+
+    def test_validate_errors(self, workflows_dir: Path) -> None:
+        validator = miniwdl_utils.MiniwdlValidator()
+        (workflows_dir / "lib" / "library.wdl").write_text("version 1.0\ntask {")
+
+        diagnostics = validator.validate(workflows_dir / "main_0.wdl")
+
+        assert [(d.severity, d.kind, d.line) for d in diagnostics] == [
+            ("error", "ImportError", 2),
+            ("error", "SyntaxError", 2),
+        ]
+        assert diagnostics[1].uri == str(workflows_dir / "lib" / "library.wdl")
+
+    def test_validate_warnings(self, tmp_path: Path) -> None:
+        validator = miniwdl_utils.MiniwdlValidator()
+        wdl = tmp_path / "unused.wdl"
+        wdl.write_text(
+            "version 1.0\n"
+            "workflow Unused {\n"
+            "    input {\n"
+            "        Int unused\n"
+            "    }\n"
+            "}\n"
+        )
+
+        diagnostics = validator.validate(wdl)
+        assert [(d.severity, d.kind) for d in diagnostics] == [
+            ("warning", "UnusedDeclaration")
+        ]
+        assert [d.severity for d in validator.validate(wdl, strict=True)] == ["error"]
+        assert validator.validate(wdl, suppress=["UnusedDeclaration"]) == []
+
+    def test_validate_url_import(self, workflows_dir: Path, tmp_path: Path) -> None:
+        validator = miniwdl_utils.MiniwdlValidator()
+        library_url = "https://example.com/wdl/lib/library.wdl"
+        wdl = tmp_path / "main_url.wdl"
+        wdl.write_text(
+            self.WORKFLOW_WDL.format(i="Url").replace("lib/library.wdl", library_url)
+        )
+        downloaded_urls = []
+
+        def urlretrieve(url, filename):
+            downloaded_urls.append(url)
+            Path(filename).write_text(self.LIBRARY_WDL)
+
+        with patch("urllib.request.urlretrieve", side_effect=urlretrieve):
+            assert validator.validate(wdl) == []
+            # Documents importing URLs are not cached, the library is
+            # downloaded again
+            assert self.count_parsed_documents(validator, [wdl]) == Counter(
+                {"main_url.wdl": 1}
+            )
+            # while local documents still are
+            assert self.count_parsed_documents(
+                validator, [workflows_dir / "main_0.wdl"] * 2
+            ) == Counter({"main_0.wdl": 1, "library.wdl": 1})
+
+        assert downloaded_urls == [library_url] * 2
+
+    def test_resolve_wdl_import(self, workflows_dir: Path, tmp_path: Path) -> None:
+        importer = str(workflows_dir / "main_0.wdl")
+        library = str(workflows_dir / "lib" / "library.wdl")
+
+        assert (
+            miniwdl_utils.resolve_wdl_import(
+                "lib/library.wdl", path=[], importer_abspath=importer
+            )
+            == library
+        )
+        # Imports not relative to the importer are looked up in the path
+        assert (
+            miniwdl_utils.resolve_wdl_import(
+                "library.wdl",
+                path=[str(workflows_dir / "lib")],
+                importer_abspath=importer,
+            )
+            == library
+        )
+        with pytest.raises(FileNotFoundError):
+            miniwdl_utils.resolve_wdl_import(
+                "library.wdl", path=[], importer_abspath=importer
+            )
+        # URLs are left to miniwdl
+        url = "https://example.com/library.wdl"
+        assert (
+            miniwdl_utils.resolve_wdl_import(url, path=[], importer_abspath=importer)
+            == url
+        )
@@ -0,0 +1,201 @@
+import json
+
+import pytest
+import requests
+
+from cromshell.metadata import command as metadata_command
+from cromshell.utilities import cromshellconfig, http_utils
+from tests.mock_cromwell.metadata_generators import SyntheticWorkflow, make_workflow
+
+
+class TestMockCromwell:
+    """Test the mock Cromwell server, and cromshell commands run against it"""
+
+    def test_make_workflow(self):
+        workflow = make_workflow(shards=100, subworkflows=2, depth=2)
+
+        workflows = list(workflow.iter_workflows())
+        assert len(workflows) == 7
+        assert sum(served.shards for served in workflows) == 100
+        assert workflow.get_call_names() == [
+            "Synthetic.ScatterTask",
+            "Synthetic.SubWorkflow0",
+            "Synthetic.SubWorkflow1",
+        ]
+
+    def test_status_outputs_and_backends(self, mock_cromwell):
+        workflow = mock_cromwell.add_workflow(
+            make_workflow(shards=3, failed_shards=1, status="Succeeded")
+        )
+        api = f"{mock_cromwell.url}/api/workflows/v1"
+
+        assert requests.get(f"{api}/{workflow.id}/status").json() == {
+            "id": workflow.id,
+            "status": "Succeeded",
+        }
+        assert requests.get(f"{api}/{workflow.id}/outputs").json()["outputs"] == {
+            "Synthetic.outs": [
+                f"{workflow.get_root()}/call-ScatterTask/shard-{shard}/execution/out.txt"
+                for shard in (1, 2)
+            ]
+        }
+        assert requests.get(f"{api}/backends").json()["supportedBackends"] == ["Local"]
+        assert requests.get(f"{api}/unknown/status").status_code == 404
+        assert mock_cromwell.request_counts[("GET", "status")] == 2
+
+    def test_metadata(self, mock_cromwell):
+        workflow = mock_cromwell.add_workflow(
+            make_workflow(shards=9, subworkflows=2, failed_shards=1)
+        )
+        metadata_url = f"{mock_cromwell.url}/api/workflows/v1/{workflow.id}/metadata"
+
+        metadata = requests.get(metadata_url).json()
+        assert metadata["status"] == "Running"
+        assert [
+            shard["executionStatus"]
+            for shard in metadata["calls"]["Synthetic.ScatterTask"]
+        ] == ["Failed", "Running", "Running"]
+        assert metadata["calls"]["Synthetic.SubWorkflow0"][0]["subWorkflowId"] == (
+            workflow.subworkflows[0].id
+        )
+
+        metadata = requests.get(
+            metadata_url,
+            params={
+                "includeKey": ["executionStatus", "subWorkflowId"],
+                "expandSubWorkflows": "true",
+            },
+        ).json()
+        assert set(metadata) == {"id", "calls"}
+        subworkflow_shard = metadata["calls"]["Synthetic.SubWorkflow1"][0]
+        assert set(subworkflow_shard) == {
+            "shardIndex",
+            "attempt",
+            "executionStatus",
+            "subWorkflowMetadata",
+        }
+        assert subworkflow_shard["subWorkflowMetadata"]["calls"][
+            "SyntheticSub1.ScatterTask"
+        ][2] == {"shardIndex": 2, "attempt": 1, "executionStatus": "Running"}
+
+        metadata = requests.get(
+            metadata_url, params={"excludeKey": ["calls", "inputs"]}
+        ).json()
+        assert "calls" not in metadata and "inputs" not in metadata
+        assert metadata["workflowName"] == "Synthetic"
+
+        response = requests.get(
+            metadata_url, params={"includeKey": "id", "excludeKey": "calls"}
+        )
+        assert response.status_code == 400
+
+    def test_server_and_lazy_expansion_agree(self, mock_cromwell, monkeypatch):
+        workflow = mock_cromwell.add_workflow(
+            make_workflow(shards=20, subworkflows=2, depth=2)
+        )
+        monkeypatch.setattr(cromshellconfig, "requests_per_second", 0)
+        meta_params = metadata_command.format_metadata_params(
+            list_of_keys=["executionStatus", "subWorkflowMetadata", "subWorkflowId"],
+            exclude_keys=False,
+            expand_subworkflows=True,
+        )
+        api_workflow_id = f"{mock_cromwell.url}/api/workflows/v1/{workflow.id}"
+
+        expanded_metadata = metadata_command.get_workflow_metadata(
+            meta_params=meta_params,
+            api_workflow_id=api_workflow_id,
+            timeout=5,
+            verify_certs=True,
+            headers=None,
+            lazy_subworkflows=False,
+        )
+        lazily_expanded_metadata = metadata_command.get_workflow_metadata(
+            meta_params=meta_params,
+            api_workflow_id=api_workflow_id,
+            timeout=5,
+            verify_certs=True,
+            headers=None,
+            lazy_subworkflows=True,
+        )
+
+        assert lazily_expanded_metadata == expanded_metadata
+        # One request for the workflow, and one for each of its 6 subworkflows
+        assert mock_cromwell.request_counts[("GET", "metadata")] == 1 + 1 + 6
+
+    def test_query_and_abort(self, mock_cromwell):
+        running = mock_cromwell.add_workflow(make_workflow(shards=1, subworkflows=1))
+        succeeded = mock_cromwell.add_workflow(SyntheticWorkflow(status="Succeeded"))
+        api = f"{mock_cromwell.url}/api/workflows/v1"
+
+        query = requests.get(
+            f"{api}/query",
+            params={"status": "Running", "includeSubworkflows": "false"},
+        ).json()
+        assert [result["id"] for result in query["results"]] == [running.id]
+        query = requests.post(
+            f"{api}/query", json=[{"status": "Running"}, {"status": "Succeeded"}]
+        ).json()
+        assert query["totalResultsCount"] == 3
+
+        response = requests.post(f"{api}/{running.id}/abort")
+        assert response.json() == {"id": running.id, "status": "Aborting"}
+        assert running.status == "Aborted"
+        assert requests.post(f"{api}/{succeeded.id}/abort").status_code == 403
+
+    def test_describe(self, mock_cromwell):
+        response = requests.post(
+            f"{mock_cromwell.url}/api/womtool/v1/describe",
+            files={"workflowSource": b"version 1.0\nworkflow Empty {}\n"},
+        )
+
+        assert response.json()["valid"]
+
+    def test_injected_errors_are_retried(self, mock_cromwell, monkeypatch):
+        workflow = mock_cromwell.add_workflow(SyntheticWorkflow())
+        monkeypatch.setattr(cromshellconfig, "requests_max_retries", 2)
+        monkeypatch.setattr(http_utils, "_retries_used", 0)
+        mock_cromwell.fail_next(2, status_code=503, retry_after="0")
+        status_url = f"{mock_cromwell.url}/api/workflows/v1/{workflow.id}/status"
+
+        response = http_utils.send_request("GET", status_url)
+
+        assert response.status_code == 200
+        assert mock_cromwell.request_counts[("GET", "status")] == 3
+
+        mock_cromwell.error_rate = 1.0
+        mock_cromwell.error_status_code = 500
+        assert http_utils.send_request("GET", status_url).status_code == 500
+
+    @pytest.mark.parametrize("subworkflows", [0, 2])
+    def test_counts(self, mock_cromwell, offline_cromshell, subworkflows):
+        workflow = mock_cromwell.add_workflow(
+            make_workflow(shards=30, subworkflows=subworkflows, failed_shards=2)
+        )
+
+        result = offline_cromshell(["counts", "--json-summary", workflow.id])
+
+        counts = json.loads(result.output)
+        assert counts["Synthetic.ScatterTask"] == {
+            "Failed": 2,
+            "Running": 30 // (subworkflows + 1) - 2 + 30 % (subworkflows + 1),
+        }
+
+    def test_status_logs_and_list(self, mock_cromwell, offline_cromshell):
+        workflow = mock_cromwell.add_workflow(make_workflow(shards=5, failed_shards=1))
+        with open(cromshellconfig.submission_file_path, "a") as submission_file:
+            submission_file.write(
+                f"2024-01-01\t{mock_cromwell.url}\t{workflow.id}\tsynthetic.wdl\t"
+                "Submitted\t\n"
+            )
+
+        result = offline_cromshell(["status", workflow.id], exit_code=0)
+        assert "DOOMED" in result.output
+
+        result = offline_cromshell(["logs", workflow.id])
+        assert f"{workflow.get_root()}/call-ScatterTask/shard-0/execution/log" in (
+            result.output
+        )
+
+        offline_cromshell(["list", "-u"])
+        with open(cromshellconfig.submission_file_path) as submission_file:
+            assert submission_file.read().splitlines()[1].split("\t")[4] == "Running"
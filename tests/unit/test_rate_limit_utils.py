@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from cromshell.utilities import cromshellconfig, rate_limit_utils
+
+
+class FakeClock:
+    """Clock advanced by sleeping"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestRateLimitUtils:
+    """Test the rate and concurrency limits of requests"""
+
+    def test_token_bucket(self):
+        clock = FakeClock()
+        token_bucket = rate_limit_utils.TokenBucket(
+            rate=10, capacity=5, clock=clock, sleep=clock.sleep
+        )
+
+        # A burst of up to the capacity is sent right away...
+        for _ in range(5):
+            token_bucket.acquire()
+        assert clock.now == 0
+        # ...then requests are sent at the rate
+        for _ in range(20):
+            token_bucket.acquire()
+        assert clock.now == pytest.approx(2.0)
+
+        # Tokens accumulate up to the capacity while idle
+        clock.now += 60
+        for _ in range(5):
+            token_bucket.acquire()
+        assert clock.now == pytest.approx(62.0)
+
+    def test_adaptive_concurrency_limit(self):
+        concurrency_limit = rate_limit_utils.AdaptiveConcurrencyLimit(max_limit=8)
+
+        concurrency_limit.acquire()
+        concurrency_limit.release(overloaded=True)
+        assert concurrency_limit.limit == 4
+        for _ in range(3):
+            concurrency_limit.acquire()
+            concurrency_limit.release(overloaded=True)
+        assert concurrency_limit.limit == 1
+
+        # Additive increase: one step every `limit` successful requests
+        for _ in range(10):
+            concurrency_limit.acquire()
+            concurrency_limit.release()
+        assert 4 <= concurrency_limit.limit < 5
+        for _ in range(100):
+            concurrency_limit.acquire()
+            concurrency_limit.release()
+        assert concurrency_limit.limit == 8
+        assert concurrency_limit.in_flight == 0
+
+    def test_adaptive_concurrency_limit_blocks(self):
+        concurrency_limit = rate_limit_utils.AdaptiveConcurrencyLimit(max_limit=2)
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = []
+
+        def send_request():
+            concurrency_limit.acquire()
+            with lock:
+                in_flight.append(1)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+            concurrency_limit.release()
+
+        threads = [threading.Thread(target=send_request) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(max_in_flight) == 2
+
+    def test_get_server_rate_limiter(self, monkeypatch):
+        monkeypatch.setattr(rate_limit_utils, "_server_rate_limiters", {})
+        monkeypatch.setattr(cromshellconfig, "requests_per_second", 0)
+        monkeypatch.setattr(cromshellconfig, "max_requests_in_flight", 3)
+
+        rate_limiter = rate_limit_utils.get_server_rate_limiter(
+            "http://localhost:8000/api/workflows/v1/abc/metadata"
+        )
+
+        assert rate_limiter is rate_limit_utils.get_server_rate_limiter(
+            "http://localhost:8000/api/womtool/v1/describe"
+        )
+        assert rate_limiter is not rate_limit_utils.get_server_rate_limiter(
+            "http://localhost:8001/api/workflows/v1/abc/metadata"
+        )
+        assert rate_limiter.token_bucket is None
+        assert rate_limiter.concurrency_limit.max_limit == 3
@@ -4,6 +4,7 @@ import os
 import pytest
 
 from cromshell.status import command as status_command
+from cromshell.utilities import metadata_record_utils
 
 
 class TestStatus:
@@ -16,7 +17,12 @@ class TestStatus:
         with open(workflow_metadata_path, "r") as f:
             workflow_metadata = json.load(f)
 
-        assert status_command.workflow_failed(workflow_metadata) is True, (
+        assert (
+            status_command.workflow_failed(
+                metadata_record_utils.build_workflow_record(workflow_metadata)
+            )
+            is True
+        ), (
             "A running doomed workflow metadata should have "
             "output 'True' to indicate workflow "
             "has failed."
@@ -29,12 +35,51 @@ class TestStatus:
         with open(workflow_metadata_path, "r") as f:
             workflow_metadata = json.load(f)
 
-        assert status_command.workflow_failed(workflow_metadata) is False, (
+        assert (
+            status_command.workflow_failed(
+                metadata_record_utils.build_workflow_record(workflow_metadata)
+            )
+            is False
+        ), (
             "A running workflow metadata should have "
             "output 'False' to indicate workflow is "
             "still running."
         )
 
+    @pytest.mark.parametrize(
+        "subworkflow_status, sub_task_status, failed",
+        [
+            ["Running", "Running", False],
+            ["Running", "Failed", True],
+            ["Failed", "Done", True],
+        ],
+    )
+    def test_workflow_failed_in_subworkflow(
+        self, subworkflow_status, sub_task_status, failed
+    ):
+        workflow_metadata = {
+            "status": "Running",
+            "calls": {
+                "Main.sub": [
+                    {
+                        "subWorkflowMetadata": {
+                            "status": subworkflow_status,
+                            "calls": {
+                                "Sub.task": [{"executionStatus": sub_task_status}]
+                            },
+                        }
+                    }
+                ]
+            },
+        }
+
+        assert (
+            status_command.workflow_failed(
+                metadata_record_utils.build_workflow_record(workflow_metadata)
+            )
+            is failed
+        )
+
     @pytest.fixture
     def mock_data_path(self):
         return os.path.join(os.path.dirname(__file__), "mock_data/")
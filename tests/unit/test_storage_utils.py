@@ -0,0 +1,90 @@
+import pytest
+
+from cromshell.utilities import storage_utils
+
+
+class TestStorageUtilities:
+    """Test storage_utils functions and variables"""
+
+    def test_group_paths_by_prefix(self):
+        assert storage_utils.group_paths_by_prefix(
+            ["gs://b/x/1.txt", "gs://b/x/2.txt", "gs://b/y/3.txt"]
+        ) == {
+            "gs://b/x": ["gs://b/x/1.txt", "gs://b/x/2.txt"],
+            "gs://b/y": ["gs://b/y/3.txt"],
+        }
+
+    def test_get_file_stats_local(self, tmp_path):
+        sub_dir = tmp_path / "sub"
+        sub_dir.mkdir()
+        (tmp_path / "1.txt").write_text("1")
+        (tmp_path / "2.txt").write_text("22")
+        (sub_dir / "3.txt").write_text("333")
+
+        paths = [
+            str(tmp_path / "1.txt"),
+            str(tmp_path / "2.txt"),
+            str(tmp_path / "missing.txt"),
+            str(sub_dir / "3.txt"),
+            str(tmp_path / "missing_dir" / "4.txt"),
+            "http://example.com/5.txt",
+        ]
+        file_stats = storage_utils.get_file_stats(paths)
+
+        assert list(file_stats) == paths
+        assert [f.exists for f in file_stats.values()] == [
+            True,
+            True,
+            False,
+            True,
+            False,
+            False,
+        ]
+        assert [f.size for f in file_stats.values()] == [1, 2, None, 3, None, None]
+        assert file_stats[str(sub_dir / "3.txt")].modified is not None
+
+    def test_get_file_stats_directory_is_not_a_file(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "1.txt").write_text("1")
+
+        file_stats = storage_utils.get_file_stats(
+            [str(tmp_path / "sub"), str(tmp_path / "1.txt")]
+        )
+
+        assert file_stats[str(tmp_path / "sub")].exists is False
+
+    @pytest.mark.parametrize(
+        "num_bytes, expected",
+        [
+            [None, "-"],
+            [0, "0 B"],
+            [1023, "1023 B"],
+            [1536, "1.50 KiB"],
+            [5 * 1024**3, "5.00 GiB"],
+            [3 * 1024**5, "3072.00 TiB"],
+        ],
+    )
+    def test_format_bytes(self, num_bytes, expected):
+        assert storage_utils.format_bytes(num_bytes) == expected
+
+    def test_find_files(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "1.txt").write_text("1")
+        (tmp_path / "sub" / "2.txt").write_text("22")
+
+        files = storage_utils.find_files(str(tmp_path))
+
+        assert sorted(files) == [str(tmp_path / "1.txt"), str(tmp_path / "sub/2.txt")]
+        assert files[str(tmp_path / "sub/2.txt")].size == 2
+        assert storage_utils.find_files(str(tmp_path / "missing")) == {}
+
+    def test_delete_files(self, tmp_path):
+        paths = []
+        for i in range(7):
+            path = tmp_path / f"{i}.txt"
+            path.write_text(str(i))
+            paths.append(str(path))
+
+        assert storage_utils.delete_files(paths, batch_size=3, max_workers=2) == 7
+        assert list(tmp_path.iterdir()) == []
+        assert storage_utils.delete_files([]) == 0
@@ -1,4 +1,9 @@
+import csv
 import os
+import shutil
+from datetime import date
+
+import pytest
 
 from cromshell.utilities import submissions_file_utils as sfu
 from cromshell.utilities.submissions_file_utils import update_submission_db_format
@@ -59,3 +64,74 @@ class TestSubmissionsFileUtils:
         assert (
             not old_format
         ), "An old database was not fixed by cromshellconfig.__ensure_correct_submission_database_format"
+
+    @pytest.mark.parametrize(
+        "filters, expected_workflow_ids",
+        [
+            [
+                {"since": date(2020, 5, 1)},
+                [
+                    "d689adec-c600-4e4b-be37-4e30e65848c7",
+                    "d7cad898-f13a-4547-b301-f0c9dbb8865d",
+                ],
+            ],
+            [
+                {"until": date(2020, 5, 7), "wdl_name": "PBCCS*"},
+                ["d689adec-c600-4e4b-be37-4e30e65848c7"],
+            ],
+            [
+                {"wdl_name": "ValidateBam.wdl", "since": date(2020, 1, 10)},
+                [
+                    "a63aa10c-a43e-4ca7-9be9-c2d2aa08b96d",
+                    "b3b197b3-fdca-4647-9fd8-bf16d2cb734d",
+                    "682f3e72-0285-40ec-8128-1feb877706ce",
+                ],
+            ],
+            [{"wdl_name": "Other.wdl"}, []],
+        ],
+    )
+    def test_filter_submission_file(
+        self, filters: dict, expected_workflow_ids: list, mock_data_path
+    ):
+        assert (
+            sfu.filter_submission_file(
+                submission_file_path=os.path.join(
+                    mock_data_path, "all.workflow.database.tsv"
+                ),
+                **filters,
+            )
+            == expected_workflow_ids
+        )
+
+    def test_update_column_values_in_submission_db(self, mock_data_path, tmpdir):
+        database_path = str(tmpdir.join("all.workflow.database.tsv"))
+        shutil.copy(
+            os.path.join(mock_data_path, "all.workflow.database.tsv"), database_path
+        )
+        updated_values = {
+            "a63aa10c-a43e-4ca7-9be9-c2d2aa08b96d": "Running",
+            "682f3e72-0285-40ec-8128-1feb877706ce": "Aborted",
+        }
+
+        sfu.update_column_values_in_submission_db(
+            workflow_database_path=database_path,
+            column_to_update="STATUS",
+            updated_values=updated_values,
+        )
+
+        with open(database_path) as database_file:
+            statuses = {
+                row["RUN_ID"]: row["STATUS"]
+                for row in csv.DictReader(database_file, delimiter="\t")
+            }
+        assert {
+            workflow_id: statuses[workflow_id] for workflow_id in updated_values
+        } == updated_values
+        assert statuses["b3b197b3-fdca-4647-9fd8-bf16d2cb734d"] == "Succeeded"
+
+        with pytest.raises(KeyError):
+            sfu.update_column_values_in_submission_db(
+                workflow_database_path=database_path,
+                column_to_update="RUN_ID",
+                updated_values=updated_values,
+            )
@@ -63,3 +63,31 @@ class TestSubmit:
             # which would be difficult to coordinate a comparison.
             for i in range(1, len(last_line_columns)):
                 assert last_line_columns[i] == testing_submission_row[i]
+
+    def test_add_submissions_to_all_database_tsv(self, mock_data_path, tmp_path):
+        temp_submission_file = str(tmp_path) + "/submission_file.text"
+        shutil.copyfile(
+            mock_data_path.joinpath("submit/submission_file_template.text"),
+            temp_submission_file,
+        )
+        with open(temp_submission_file) as f:
+            original_line_count = len(f.readlines())
+
+        submit_command.add_submissions_to_all_database_tsv(
+            cromwell_server="https://cromwell-UnitTest.dsde-methods.broadinstitute.org",
+            submissions_file=temp_submission_file,
+            wdl="/made/up/path/UnitTest.wdl",
+            workflow_statuses=[
+                {"id": "73650b78-64e5-4ce7-a73e-3eb264133f20", "status": "Submitted"},
+                {"id": "83650b78-64e5-4ce7-a73e-3eb264133f20", "status": "Submitted"},
+            ],
+        )
+
+        with open(temp_submission_file) as f:
+            lines = f.readlines()
+
+        assert len(lines) == original_line_count + 2
+        assert [line.split("\t")[2] for line in lines[-2:]] == [
+            "73650b78-64e5-4ce7-a73e-3eb264133f20",
+            "83650b78-64e5-4ce7-a73e-3eb264133f20",
+        ]
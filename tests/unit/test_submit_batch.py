@@ -0,0 +1,150 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from requests.models import Response
+
+from cromshell.submit_batch import command as submit_batch_command
+
+
+class TestSubmitBatch:
+    """Test the submit-batch command functions"""
+
+    def test_load_batch_inputs(self, tmp_path):
+        single_json = tmp_path / "single.json"
+        single_json.write_text(json.dumps({"wf.sample": "a"}))
+        list_json = tmp_path / "list.json"
+        list_json.write_text(json.dumps([{"wf.sample": "b"}, {"wf.sample": "c"}]))
+        inputs_tsv = tmp_path / "inputs.tsv"
+        inputs_tsv.write_text(
+            "wf.sample\twf.count\twf.files\n"
+            'd\t1\t["gs://x", "gs://y"]\n'
+            "e\t2.5\tnot json\n"
+        )
+
+        assert submit_batch_command.load_batch_inputs(
+            [str(single_json), str(list_json), str(inputs_tsv)]
+        ) == [
+            {"wf.sample": "a"},
+            {"wf.sample": "b"},
+            {"wf.sample": "c"},
+            {"wf.sample": "d", "wf.count": "1", "wf.files": ["gs://x", "gs://y"]},
+            {"wf.sample": "e", "wf.count": "2.5", "wf.files": "not json"},
+        ]
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            # Values of String inputs are kept as they are
+            ["123", "123"],
+            ["true", "true"],
+            ["null", "null"],
+            ["1e5", "1e5"],
+            ["007", "007"],
+            # Arrays and objects are parsed
+            ['["a", "b"]', ["a", "b"]],
+            ['{"left": 1, "right": "x"}', {"left": 1, "right": "x"}],
+            ["[not json", "[not json"],
+        ],
+    )
+    def test_parse_tsv_value(self, value, expected):
+        assert submit_batch_command.parse_tsv_value(value) == expected
+
+    def test_load_batch_inputs_invalid(self, tmp_path):
+        invalid_json = tmp_path / "invalid.json"
+        invalid_json.write_text(json.dumps(["wf.sample"]))
+        empty_json = tmp_path / "empty.json"
+        empty_json.write_text(json.dumps([]))
+
+        with pytest.raises(ValueError):
+            submit_batch_command.load_batch_inputs([str(invalid_json)])
+        with pytest.raises(ValueError):
+            submit_batch_command.load_batch_inputs([str(empty_json)])
+
+    @pytest.mark.parametrize(
+        "workflow_statuses, expected_count, error",
+        [
+            [
+                [
+                    {
+                        "id": "73650b78-64e5-4ce7-a73e-3eb264133f20",
+                        "status": "Submitted",
+                    },
+                    {
+                        "id": "83650b78-64e5-4ce7-a73e-3eb264133f20",
+                        "status": "Submitted",
+                    },
+                ],
+                2,
+                None,
+            ],
+            [
+                [{"id": "73650b78-64e5-4ce7-a73e-3eb264133f20", "status": "Submitted"}],
+                2,
+                submit_batch_command.BatchSubmissionError,
+            ],
+            [
+                # Rejected workflows are checked once tracked
+                [{"id": "73650b78-64e5-4ce7-a73e-3eb264133f20", "status": "Failed"}],
+                1,
+                None,
+            ],
+        ],
+    )
+    def test_check_batch_response(self, workflow_statuses, expected_count, error):
+        response = Response()
+        response.status_code = 201
+        response._content = json.dumps(workflow_statuses).encode()
+
+        if error is None:
+            assert (
+                submit_batch_command.check_batch_response(
+                    request_out=response, expected_count=expected_count
+                )
+                == workflow_statuses
+            )
+        else:
+            with pytest.raises(error):
+                submit_batch_command.check_batch_response(
+                    request_out=response, expected_count=expected_count
+                )
+
+    def test_rejected_workflows_are_tracked(self, tmp_path):
+        workflow_statuses = [
+            {"id": "73650b78-64e5-4ce7-a73e-3eb264133f20", "status": "Submitted"},
+            {"id": "83650b78-64e5-4ce7-a73e-3eb264133f20", "status": "Failed"},
+            {"status": "fail", "message": "Invalid inputs"},
+        ]
+        wdl = tmp_path / "workflow.wdl"
+        wdl.write_text("version 1.0\nworkflow wf {}\n")
+        submission_file = tmp_path / "all.workflow.database.tsv"
+        config = SimpleNamespace(
+            config_dir=str(tmp_path),
+            cromwell_server="http://localhost:8000",
+            submission_file_path=str(submission_file),
+            get_local_folder_name=lambda: "localhost_8000",
+        )
+
+        submit_batch_command.post_batch_submission_logging(
+            wdl=str(wdl),
+            workflow_inputs=[{"wf.sample": sample} for sample in "abc"],
+            options_json=None,
+            config=config,
+            workflow_statuses=workflow_statuses,
+        )
+        with pytest.raises(submit_batch_command.BatchSubmissionError):
+            submit_batch_command.check_submitted_workflows(workflow_statuses)
+
+        # The workflows with an id are tracked, even the rejected one
+        assert [
+            row.split("\t")[2:5] for row in submission_file.read_text().splitlines()
+        ] == [
+            [workflow_statuses[0]["id"], "workflow.wdl", "Submitted"],
+            [workflow_statuses[1]["id"], "workflow.wdl", "Failed"],
+        ]
+        inputs_json = Path(tmp_path, "localhost_8000", workflow_statuses[1]["id"])
+        assert json.loads(inputs_json.joinpath("inputs.json").read_text()) == {
+            "wf.sample": "b"
+        }
+        submit_batch_command.check_submitted_workflows(workflow_statuses[:1])
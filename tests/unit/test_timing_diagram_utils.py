@@ -0,0 +1,93 @@
+import json
+
+from cromshell.utilities import timing_diagram_utils, timing_utils
+from cromshell.utilities.timing_utils import CallTiming
+
+
+def call_timing(
+    task: str, start: float, end: float, shard: int = -1, status: str = "Done"
+) -> CallTiming:
+    return CallTiming(
+        task=task,
+        shard=shard,
+        attempt=1,
+        start=start,
+        end=end,
+        queue_seconds=0.0,
+        cpu_hours=0.0,
+        status=status,
+    )
+
+
+class TestTimingDiagramUtils:
+    """Test the timing diagram functions"""
+
+    def test_assign_lanes(self) -> None:
+        calls = [
+            call_timing("task", start=0, end=10, shard=0),
+            call_timing("task", start=1, end=5, shard=1),
+            call_timing("task", start=5, end=8, shard=2),
+            call_timing("task", start=9, end=12, shard=3),
+        ]
+
+        # Shard 2 reuses the lane of shard 1, shard 3 the lane of shard 2
+        assert timing_diagram_utils.assign_lanes(calls) == [0, 1, 1, 1]
+        assert timing_diagram_utils.assign_lanes([]) == []
+
+    def test_get_concurrency_histogram(self) -> None:
+        calls = [
+            call_timing("task", start=0, end=10, shard=0),
+            call_timing("task", start=0, end=4.5, shard=1),
+            call_timing("task", start=8, end=10, shard=2),
+        ]
+
+        assert timing_diagram_utils.get_concurrency_histogram(
+            calls, start=0, end=10, buckets=5
+        ) == [2, 2, 2, 1, 2]
+
+    def test_render_timing_svg(self) -> None:
+        svg = timing_diagram_utils.render_timing_svg(
+            [
+                call_timing("wf.<task>", start=0, end=3600, status="Failed"),
+                call_timing("wf.other", start=3600, end=7200),
+            ],
+            title="wf & co",
+        )
+
+        assert svg.startswith("<svg") and svg.endswith("</svg>")
+        assert "wf.&lt;task&gt; (1)" in svg
+        assert "<title>wf &amp; co</title>" in svg
+        assert svg.count("<rect") == 2
+        assert timing_diagram_utils.STATUS_COLORS["Failed"] in svg
+
+    def test_render_timing_svg_large_scatter(self) -> None:
+        shards = 200_000
+        calls = [
+            call_timing("wf.scatter", start=i % 1000, end=i % 1000 + 3600, shard=i)
+            for i in range(shards)
+        ]
+
+        svg = timing_diagram_utils.render_timing_svg(calls, title="scatter")
+
+        # Drawn as a histogram of the running calls, not one bar per shard
+        assert svg.count("<rect") <= timing_diagram_utils.TIME_BUCKETS
+        assert len(svg) < 200_000
+
+    def test_write_timing_diagram(self, tmp_path, mock_data_path) -> None:
+        workflow_metadata = json.loads(
+            mock_data_path.joinpath("succeeded_helloworld_metadata.json").read_text()
+        )
+        call_timings = list(timing_utils.iter_call_timings(workflow_metadata))
+
+        html_path = tmp_path / "timing.html"
+        timing_diagram_utils.write_timing_diagram(
+            call_timings, output_path=html_path, title="helloworld"
+        )
+        svg_path = tmp_path / "timing.svg"
+        timing_diagram_utils.write_timing_diagram(
+            call_timings, output_path=svg_path, title="helloworld"
+        )
+
+        assert html_path.read_text().startswith("<!DOCTYPE html>")
+        assert "HelloWorld.HelloWorldTask" in html_path.read_text()
+        assert svg_path.read_text().startswith("<svg")
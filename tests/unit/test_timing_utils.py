@@ -0,0 +1,107 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from cromshell.utilities import timing_utils
+from cromshell.utilities.timing_utils import CallTiming
+
+
+def call_timing(task: str, start: float, end: float, shard: int = -1) -> CallTiming:
+    return CallTiming(
+        task=task,
+        shard=shard,
+        attempt=1,
+        start=start,
+        end=end,
+        queue_seconds=0.0,
+        cpu_hours=0.0,
+    )
+
+
+class TestTimingUtils:
+    """Test the timing report functions"""
+
+    def test_get_timing_report(self, mock_data_path) -> None:
+        workflow_metadata = json.loads(
+            mock_data_path.joinpath("succeeded_helloworld_metadata.json").read_text()
+        )
+
+        timing_report = timing_utils.get_timing_report(workflow_metadata)
+
+        assert timing_report["calls"] == 1
+        # The worker ran 113.412 seconds with 1 cpu
+        assert timing_report["cpu_hours"] == pytest.approx(113.412 / 3600)
+        task = timing_report["tasks"][0]
+        assert task["task"] == "HelloWorld.HelloWorldTask"
+        # Call start to worker assignment
+        assert task["mean_queue_minutes"] == pytest.approx(27.3 / 60)
+        assert [c["task"] for c in timing_report["critical_path"]] == [
+            "HelloWorld.HelloWorldTask"
+        ]
+        assert timing_report["longest_shards"] == timing_report["critical_path"]
+        # The report is JSON serializable
+        json.dumps(timing_report)
+
+    def test_get_critical_path(self) -> None:
+        prepare = call_timing("prepare", start=0, end=10)
+        scatter = [
+            call_timing("scatter", start=10, end=20 + i, shard=i) for i in range(5)
+        ]
+        unrelated = call_timing("unrelated", start=0, end=5)
+        gather = call_timing("gather", start=24, end=30)
+
+        assert timing_utils.get_critical_path(
+            [gather, unrelated, *scatter, prepare]
+        ) == [prepare, scatter[4], gather]
+
+    def test_get_critical_path_instant_calls(self) -> None:
+        calls = [call_timing("instant", start=5, end=5, shard=i) for i in range(3)]
+
+        assert len(timing_utils.get_critical_path(calls)) == 3
+        assert timing_utils.get_critical_path([]) == []
+
+    def test_summarize_task_timings(self) -> None:
+        task_summaries = timing_utils.summarize_task_timings(
+            [
+                call_timing("short", start=0, end=3600),
+                call_timing("long", start=0, end=7200, shard=0),
+                call_timing("long", start=0, end=3600, shard=1),
+            ]
+        )
+
+        assert [summary["task"] for summary in task_summaries] == ["long", "short"]
+        assert task_summaries[0]["calls"] == 2
+        assert task_summaries[0]["wall_hours"] == 3
+        assert task_summaries[0]["max_wall_hours"] == 2
+
+    def test_get_timing_report_large_scatter(self) -> None:
+        shards = 100_000
+        workflow_metadata = {
+            "id": "large",
+            "status": "Succeeded",
+            "start": "2022-01-01T00:00:00.000Z",
+            "end": "2022-01-02T00:00:00.000Z",
+            "calls": {
+                "Large.scatter": [
+                    {
+                        "shardIndex": i,
+                        "attempt": 1,
+                        "start": "2022-01-01T00:00:00.000Z",
+                        "end": f"2022-01-01T{i % 23 + 1:02}:00:00.000Z",
+                        "runtimeAttributes": {"cpu": "2"},
+                    }
+                    for i in range(shards)
+                ]
+            },
+        }
+
+        timing_report = timing_utils.get_timing_report(
+            workflow_metadata,
+            longest_shards=3,
+            now=datetime(2022, 1, 3, tzinfo=timezone.utc),
+        )
+
+        assert timing_report["calls"] == shards
+        assert [c["shard"] for c in timing_report["longest_shards"]] == [22, 45, 68]
+        assert len(timing_report["critical_path"]) == 1
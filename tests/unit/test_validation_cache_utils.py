@@ -0,0 +1,110 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from cromshell.utilities import validation_cache_utils
+
+
+class TestValidationCacheUtils:
+    """Test the validation cache functions"""
+
+    @pytest.fixture
+    def workflow(self, tmp_path: Path) -> dict:
+        (tmp_path / "main.wdl").write_text('version 1.0\nimport "task.wdl"\n')
+        (tmp_path / "task.wdl").write_text("version 1.0\n")
+        (tmp_path / "inputs.json").write_text('{"main.x": 1}')
+        return {
+            "wdl": tmp_path / "main.wdl",
+            "wdl_json": tmp_path / "inputs.json",
+            "dependencies": None,
+            "validator_versions": {"miniwdl": "1.0"},
+            "validation_options": {"strict": False, "suppress": []},
+        }
+
+    def test_get_validation_cache_key(self, workflow: dict, tmp_path: Path) -> None:
+        key = validation_cache_utils.get_validation_cache_key(**workflow)
+        assert key == validation_cache_utils.get_validation_cache_key(**workflow)
+
+        # Changing an import changes the key
+        (tmp_path / "task.wdl").write_text("version 1.0\n\n")
+        changed_import_key = validation_cache_utils.get_validation_cache_key(**workflow)
+        assert changed_import_key != key
+
+        # As do the inputs, validator versions and options
+        for changed_param in [
+            {"wdl_json": None},
+            {"validator_versions": {"miniwdl": "2.0"}},
+            {"validation_options": {"strict": True, "suppress": []}},
+        ]:
+            assert (
+                validation_cache_utils.get_validation_cache_key(
+                    **{**workflow, **changed_param}
+                )
+                != changed_import_key
+            )
+
+    def test_get_validation_cache_key_is_location_independent(
+        self, workflow: dict, tmp_path: Path
+    ) -> None:
+        copied_dir = tmp_path / "copy"
+        copied_dir.mkdir()
+        for file_name in ["main.wdl", "task.wdl", "inputs.json"]:
+            (copied_dir / file_name).write_bytes((tmp_path / file_name).read_bytes())
+
+        assert validation_cache_utils.get_validation_cache_key(
+            **workflow
+        ) == validation_cache_utils.get_validation_cache_key(
+            **{
+                **workflow,
+                "wdl": copied_dir / "main.wdl",
+                "wdl_json": copied_dir / "inputs.json",
+            }
+        )
+
+    def test_cache_validation_success(self, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+
+        assert not validation_cache_utils.is_validation_cached("key", cache_dir)
+        validation_cache_utils.cache_validation_success("key", cache_dir, wdl="a.wdl")
+        assert validation_cache_utils.is_validation_cached("key", cache_dir)
+
+        # A missing key is never cached
+        validation_cache_utils.cache_validation_success(None, cache_dir, wdl="a.wdl")
+        assert not validation_cache_utils.is_validation_cached(None, cache_dir)
+
+    def test_cache_validation_success_prunes_oldest(self, tmp_path: Path) -> None:
+        for i in range(3):
+            validation_cache_utils.cache_validation_success(
+                str(i), tmp_path, wdl="a.wdl"
+            )
+            os.utime(tmp_path / str(i), (i, i))
+
+        validation_cache_utils.cache_validation_success(
+            "3", tmp_path, wdl="a.wdl", max_cached_validations=2
+        )
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["2", "3"]
+
+    def test_get_validator_versions(self) -> None:
+        config = SimpleNamespace(cromwell_server="http://localhost:8000")
+
+        with patch(
+            "cromshell.utilities.http_utils.get_cromwell_version", return_value="86"
+        ):
+            assert validation_cache_utils.get_validator_versions(
+                config=config, use_miniwdl=False, use_womtool=True
+            ) == {"womtool": "http://localhost:8000@86"}
+
+        # The result of an unknown womtool version can't be cached
+        with patch(
+            "cromshell.utilities.http_utils.get_cromwell_version", return_value=None
+        ):
+            assert (
+                validation_cache_utils.get_validator_versions(
+                    config=config, use_miniwdl=True, use_womtool=True
+                )
+                is None
+            )
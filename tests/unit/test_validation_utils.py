@@ -0,0 +1,105 @@
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from cromshell.utilities import validation_utils
+
+
+class TestValidationUtils:
+    """Test the concurrent validation functions"""
+
+    def test_run_validators_concurrently(self) -> None:
+        # Each validator waits for the other one to start, which only
+        # succeeds if they run at the same time.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def failing_validator():
+            barrier.wait()
+            raise ValueError("Not valid")
+
+        results = validation_utils.run_validators(
+            validators={"womtool": barrier.wait, "miniwdl": failing_validator}
+        )
+
+        assert list(results) == ["womtool", "miniwdl"]
+        assert results["womtool"] is None
+        assert isinstance(results["miniwdl"], ValueError)
+        assert validation_utils.validation_failed(results)
+
+    def test_run_validators_fail_fast(self) -> None:
+        release_slow_validator = threading.Event()
+
+        def failing_validator():
+            raise ValueError("Not valid")
+
+        try:
+            results = validation_utils.run_validators(
+                validators={
+                    "womtool": release_slow_validator.wait,
+                    "miniwdl": failing_validator,
+                },
+                fail_fast=True,
+            )
+        finally:
+            release_slow_validator.set()
+
+        assert isinstance(results["womtool"], CancelledError)
+        assert isinstance(results["miniwdl"], ValueError)
+
+    def test_run_validators_passed(self) -> None:
+        results = validation_utils.run_validators(
+            validators={"womtool": lambda: None, "miniwdl": lambda: None},
+            fail_fast=True,
+        )
+
+        assert results == {"womtool": None, "miniwdl": None}
+        assert not validation_utils.validation_failed(results)
+
+    @pytest.mark.parametrize(
+        "results, expected_report",
+        [
+            (
+                {"womtool": None, "miniwdl": None},
+                "womtool: passed\nminiwdl: passed\n",
+            ),
+            (
+                {"womtool": CancelledError(), "miniwdl": ValueError("Bad WDL")},
+                "womtool: skipped, another validator failed\nminiwdl: failed\nBad WDL\n",
+            ),
+        ],
+    )
+    def test_print_validation_report(self, results, expected_report, capsys) -> None:
+        validation_utils.print_validation_report(results)
+
+        assert capsys.readouterr().out.endswith(expected_report)
+
+    @pytest.mark.parametrize("max_processes", [1, 2])
+    def test_validate_wdls_with_miniwdl(self, max_processes, tmp_path) -> None:
+        wdls = []
+        for i in range(4):
+            wdls.append(tmp_path / f"valid_{i}.wdl")
+            wdls[-1].write_text(f"version 1.0\nworkflow Valid{i} {{}}\n")
+        wdls.append(tmp_path / "invalid.wdl")
+        wdls[-1].write_text("version 1.0\nworkflow {\n")
+
+        results = validation_utils.validate_wdls_with_miniwdl(
+            wdls=wdls, max_processes=max_processes
+        )
+
+        assert list(results) == [str(wdl) for wdl in wdls]
+        assert all(results[str(wdl)] == [] for wdl in wdls[:4])
+        assert [d.kind for d in results[str(wdls[4])]] == ["SyntaxError"]
+
+        summary = validation_utils.get_validation_summary(
+            results=results, cached_wdls=["cached.wdl"]
+        )
+        assert (summary["total"], summary["valid"], summary["invalid"]) == (6, 5, 1)
+        assert summary["wdls"][-1] == {
+            "wdl": "cached.wdl",
+            "valid": True,
+            "cached": True,
+            "diagnostics": [],
+        }
+        invalid_summary = next(s for s in summary["wdls"] if not s["valid"])
+        assert invalid_summary["diagnostics"][0]["kind"] == "SyntaxError"
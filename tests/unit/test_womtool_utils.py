@@ -0,0 +1,42 @@
+import requests
+
+from cromshell.utilities import cromshellconfig, http_utils, womtool_utils
+
+
+class TestWomtoolUtils:
+    """Test the womtool validation functions"""
+
+    def test_womtool_validate_to_server_retried(
+        self, mock_cromwell, tmp_path, monkeypatch
+    ):
+        wdl = tmp_path / "workflow.wdl"
+        wdl.write_text("version 1.0\nworkflow Empty {}\n")
+        wdl_json = tmp_path / "inputs.json"
+        wdl_json.write_text("{}")
+        monkeypatch.setattr(cromshellconfig, "cromwell_server", mock_cromwell.url)
+        monkeypatch.setattr(cromshellconfig, "requests_max_retries", 2)
+        monkeypatch.setattr(http_utils, "_retries_used", 0)
+        mock_cromwell.fail_next(1, status_code=503, retry_after="0")
+
+        sent_files = []
+        send_request = requests.request
+
+        def request(method, url, files, **kwargs):
+            sent_files.append(files)
+            return send_request(method, url, files=files, **kwargs)
+
+        monkeypatch.setattr(requests, "request", request)
+
+        response = womtool_utils.womtool_validate_to_server(
+            wdl=str(wdl), wdl_json=str(wdl_json), config=cromshellconfig
+        )
+
+        assert response.status_code == 200
+        assert response.json()["valid"]
+        # The retry sends the files again
+        assert sent_files == [
+            {
+                "workflowSource": ("workflow.wdl", wdl.read_bytes()),
+                "workflowInputs": ("inputs.json", b"{}"),
+            }
+        ] * 2
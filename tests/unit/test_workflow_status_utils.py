@@ -0,0 +1,20 @@
+import pytest
+
+from cromshell.utilities import workflow_status_utils
+
+
+class TestWorkflowStatusUtilities:
+    """Test workflow_status_utils functions and variables"""
+
+    @pytest.mark.parametrize("workflow_status", ["Submitted", "Running", "Aborting"])
+    def test_confirm_workflow_in_terminal_status_fails(self, workflow_status):
+        with pytest.raises(Exception):
+            workflow_status_utils.confirm_workflow_in_terminal_status(
+                workflow_status=workflow_status
+            )
+
+    @pytest.mark.parametrize("workflow_status", ["Succeeded", "Failed", "Aborted"])
+    def test_confirm_workflow_in_terminal_status(self, workflow_status):
+        workflow_status_utils.confirm_workflow_in_terminal_status(
+            workflow_status=workflow_status
+        )